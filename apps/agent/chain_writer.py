@@ -4,25 +4,51 @@ Handles autonomous contract interactions
 """
 
 import os
+import uuid
 import logging
-from typing import List, Dict, Any, Optional
+import importlib.util
+from decimal import Decimal
+from typing import List, Dict, Any, Optional, Union
+
+from rpc_client import RpcClient, RpcError
 
 logger = logging.getLogger(__name__)
 
-# Try to import CDP AgentKit
-try:
-    from coinbase_agentkit import AgentKit, CdpWalletProvider
-    CDP_AVAILABLE = True
-except ImportError:
-    CDP_AVAILABLE = False
-    logger.warning("CDP AgentKit not installed. Chain writes will be simulated.")
+# CDP AgentKit takes seconds to import, so it is only looked up here and
+# imported when a live wallet is actually configured (see _init_agent)
+CDP_AVAILABLE = importlib.util.find_spec("coinbase_agentkit") is not None
+
+
+def _require_chain_extra(module: str, feature: str):
+    """Local signing and score commitments need web3's eth packages (the 'chain' extra)"""
+    if importlib.util.find_spec(module) is None:
+        raise ImportError(f"{feature} needs {module}; install baserank-agent[chain]")
+
+# Simulated sends get unique placeholder hashes with this prefix, since the
+# confirmation tracker and journal key transactions by hash
+SIMULATED_TX_PREFIX = "0x_simulated_tx_"
+
+
+def simulated_tx_hash() -> str:
+    return SIMULATED_TX_PREFIX + uuid.uuid4().hex
+
+
+def is_simulated_tx(tx_hash: str) -> bool:
+    return tx_hash.startswith(SIMULATED_TX_PREFIX)
 
-# Fallback to web3 for basic operations
-try:
-    from web3 import Web3
-    WEB3_AVAILABLE = True
-except ImportError:
-    WEB3_AVAILABLE = False
+# keccak256("updateScore(address,uint256)")[:4]
+UPDATE_SCORE_SELECTOR = "65d97724"
+# keccak256("batchUpdateScores(address[],uint256[])")[:4]
+BATCH_UPDATE_SCORES_SELECTOR = "340458da"
+# keccak256("batchUpdateScoresPacked(bytes)")[:4]
+BATCH_UPDATE_SCORES_PACKED_SELECTOR = "0b942b36"
+
+# keccak256("commitScoreRoot(uint64,bytes32,uint256)")[:4]
+COMMIT_SCORE_ROOT_SELECTOR = "2d36c352"
+
+# Packed record: address (20 bytes) || uint32 score (4 bytes)
+PACKED_RECORD_SIZE = 24
+MAX_PACKED_SCORE = 2 ** 32 - 1
 
 
 # ReputationRegistry ABI (minimal for writes)
@@ -47,9 +73,92 @@ REGISTRY_ABI = [
         "outputs": [],
         "stateMutability": "nonpayable"
     },
+    {
+        "type": "function",
+        "name": "batchUpdateScoresPacked",
+        "inputs": [
+            {"name": "packed", "type": "bytes"}
+        ],
+        "outputs": [],
+        "stateMutability": "nonpayable"
+    },
+    {
+        "type": "function",
+        "name": "commitScoreRoot",
+        "inputs": [
+            {"name": "epoch", "type": "uint64"},
+            {"name": "root", "type": "bytes32"},
+            {"name": "leafCount", "type": "uint256"}
+        ],
+        "outputs": [],
+        "stateMutability": "nonpayable"
+    },
 ]
 
 
+def _word(value: int) -> str:
+    return format(value, "064x")
+
+
+def encode_update_score(address: str, score: int) -> str:
+    """ABI-encode an updateScore(address, uint256) call as 0x-hex calldata"""
+    return "0x" + UPDATE_SCORE_SELECTOR + _word(int(address, 16)) + _word(score)
+
+
+def encode_batch_update_scores(addresses: List[str], scores: List[int]) -> str:
+    """ABI-encode a batchUpdateScores(address[], uint256[]) call as 0x-hex calldata"""
+    n = len(addresses)
+    head = _word(0x40) + _word(0x40 + 32 * (n + 1))
+    users = _word(n) + "".join(_word(int(a, 16)) for a in addresses)
+    values = _word(n) + "".join(_word(s) for s in scores)
+    return "0x" + BATCH_UPDATE_SCORES_SELECTOR + head + users + values
+
+
+def encode_packed_scores(updates: List[Dict[str, Any]]) -> bytes:
+    """
+    Pack updates as 24-byte records for batchUpdateScoresPacked
+    Raises ValueError if a score does not fit in uint32
+    """
+    out = bytearray()
+    for u in updates:
+        score = u["score"]
+        if not 0 <= score <= MAX_PACKED_SCORE:
+            raise ValueError(f"Score {score} for {u['address']} does not fit in uint32")
+        out += bytes.fromhex(u["address"][2:].rjust(40, "0"))
+        out += score.to_bytes(4, "big")
+    return bytes(out)
+
+
+def decode_packed_scores(data: bytes) -> List[Dict[str, Any]]:
+    """Inverse of encode_packed_scores"""
+    if len(data) % PACKED_RECORD_SIZE:
+        raise ValueError(f"Packed data length {len(data)} is not a multiple of {PACKED_RECORD_SIZE}")
+    return [
+        {
+            "address": "0x" + data[i:i + 20].hex(),
+            "score": int.from_bytes(data[i + 20:i + PACKED_RECORD_SIZE], "big"),
+        }
+        for i in range(0, len(data), PACKED_RECORD_SIZE)
+    ]
+
+
+def encode_batch_update_scores_packed(updates: List[Dict[str, Any]]) -> str:
+    """ABI-encode a batchUpdateScoresPacked(bytes) call as 0x-hex calldata"""
+    packed = encode_packed_scores(updates)
+    padded = packed + b"\x00" * (-len(packed) % 32)
+    return "0x" + BATCH_UPDATE_SCORES_PACKED_SELECTOR + _word(0x20) + _word(len(packed)) + padded.hex()
+
+
+def encode_commit_score_root(epoch: int, root: bytes, leaf_count: int) -> str:
+    """ABI-encode a commitScoreRoot(uint64, bytes32, uint256) call as 0x-hex calldata"""
+    return "0x" + COMMIT_SCORE_ROOT_SELECTOR + _word(epoch) + root.hex() + _word(leaf_count)
+
+
+def fits_packed(updates: List[Dict[str, Any]]) -> bool:
+    """True if every score in the batch fits the packed uint32 encoding"""
+    return all(0 <= u["score"] <= MAX_PACKED_SCORE for u in updates)
+
+
 class ChainWriter:
     """
     Handles on-chain writes using CDP AgentKit
@@ -60,20 +169,64 @@ class ChainWriter:
         self,
         registry_address: str,
         rpc_url: str,
-        chain_id: int = 8453
+        chain_id: int = 8453,
+        rpc: Optional[RpcClient] = None,
+        packed: bool = False,
+        commitment_path: Optional[str] = None,
+        signer_keys: Optional[List[str]] = None,
+        pool_options: Optional[Dict[str, Any]] = None,
+        signers: Optional[List[Any]] = None
     ):
         self.registry_address = registry_address
         self.rpc_url = rpc_url
         self.chain_id = chain_id
         self.agent = None
-        self.web3 = None
+        # Use batchUpdateScoresPacked (needs a registry that has it)
+        self.packed = packed
+        # Commitment mode: keep a Merkle tree of every score in this file and
+        # post only its root (needs a registry with commitScoreRoot)
+        self.commitment_path = commitment_path
+        self.commitments = None
+        if commitment_path:
+            _require_chain_extra("eth_hash", "SCORE_COMMITMENTS_PATH")
+            from merkle import MerkleTree
+            self.commitments = (
+                MerkleTree.load(commitment_path) if os.path.exists(commitment_path) else MerkleTree()
+            )
+
+        # Reads go through the shared pooled client, independent of CDP
+        self.rpc = rpc or (RpcClient(rpc_url) if rpc_url else None)
 
-        self._init_agent()
+        # Explicit signers (e.g. a simulated chain's) replace the CDP wallet
+        if signers is None:
+            self._init_agent()
+
+        # Several updater wallets with independent nonces: the CDP wallet plus
+        # any locally held keys (e.g. prefunded devnet accounts)
+        self.signer = None
+        self.pool = None
+        extra = list(signers or [])
+        if signer_keys:
+            _require_chain_extra("eth_account", "SIGNER_PRIVATE_KEYS")
+            from signer_pool import LocalSigner
+
+            if not self.rpc:
+                raise ValueError("Local signers need an RPC URL")
+            extra += [LocalSigner(key, self.rpc, chain_id) for key in signer_keys]
+        if extra:
+            from signer_pool import SignerPool, CdpSigner
+
+            wallets = ([CdpSigner(self.agent)] if self.agent else []) + extra
+            if len(wallets) == 1:
+                self.signer = wallets[0]
+            else:
+                self.pool = SignerPool(wallets, **(pool_options or {}))
+                logger.info(f"Signer pool with {len(wallets)} wallets")
 
     def _init_agent(self):
         """Initialize CDP AgentKit if credentials available"""
         if not CDP_AVAILABLE:
-            logger.info("CDP AgentKit not available, running in simulation mode")
+            logger.warning("CDP AgentKit not installed. Chain writes will be simulated.")
             return
 
         api_key_name = os.getenv("CDP_API_KEY_NAME")
@@ -84,6 +237,8 @@ class ChainWriter:
             return
 
         try:
+            from coinbase_agentkit import AgentKit, CdpWalletProvider
+
             wallet_provider = CdpWalletProvider(
                 api_key_name=api_key_name,
                 api_key_private_key=api_key_private,
@@ -94,14 +249,10 @@ class ChainWriter:
         except Exception as e:
             logger.error(f"Failed to initialize CDP AgentKit: {e}")
 
-        # Also init web3 for reading
-        if WEB3_AVAILABLE:
-            self.web3 = Web3(Web3.HTTPProvider(self.rpc_url))
-
     @property
     def is_live(self) -> bool:
         """Check if we can make real transactions"""
-        return self.agent is not None
+        return self.agent is not None or self.pool is not None or self.signer is not None
 
     def update_score(self, user_address: str, score: int) -> Optional[str]:
         """
@@ -113,13 +264,9 @@ class ChainWriter:
             return None
 
         try:
-            result = self.agent.invoke_contract(
-                contract_address=self.registry_address,
-                method="updateScore",
-                abi=REGISTRY_ABI,
-                args=[user_address, score]
+            tx_hash = self._invoke(
+                "updateScore", [user_address, score], encode_update_score(user_address, score), user_address
             )
-            tx_hash = result.get("transaction_hash")
             logger.info(f"Score updated for {user_address}: {score} (tx: {tx_hash})")
             return tx_hash
         except Exception as e:
@@ -134,67 +281,296 @@ class ChainWriter:
         if not updates:
             return None
 
-        addresses = [u["address"] for u in updates]
-        scores = [u["score"] for u in updates]
+        if self.commitments is not None:
+            return self._commit_scores(updates)
+
+        method, args, data = self._batch_call(updates)
 
         if not self.is_live:
-            logger.info(f"[SIMULATED] batchUpdateScores({len(updates)} accounts)")
+            logger.info(f"[SIMULATED] {method}({len(updates)} accounts)")
             for u in updates[:5]:  # Log first 5
                 logger.debug(f"  {u['address']}: {u['score']}")
             if len(updates) > 5:
                 logger.debug(f"  ... and {len(updates) - 5} more")
-            return "0x_simulated_tx_hash"
+            return simulated_tx_hash()
 
         try:
-            result = self.agent.invoke_contract(
-                contract_address=self.registry_address,
-                method="batchUpdateScores",
-                abi=REGISTRY_ABI,
-                args=[addresses, scores]
-            )
-            tx_hash = result.get("transaction_hash")
+            tx_hash = self._invoke(method, args, data, updates[0]["address"])
             logger.info(f"Batch update complete for {len(updates)} accounts (tx: {tx_hash})")
             return tx_hash
         except Exception as e:
             logger.error(f"Batch update failed: {e}")
             raise
 
+    def _commit_scores(self, updates: List[Dict[str, Any]]) -> Optional[str]:
+        """
+        Fold updates into the score tree and commit its root as the next epoch
+        The tree is only saved once the root is sent; on failure it is rolled
+        back, so the saved tree always matches a root that went out. A root
+        that is sent but dropped is healed by the next commit, which covers
+        every leaf again.
+        """
+        tree = self.commitments
+        epoch = tree.epoch + 1
+        undo = tree.update(updates, epoch)
+        root = tree.root
+
+        if not self.is_live:
+            logger.info(f"[SIMULATED] commitScoreRoot({epoch}, 0x{root.hex()}, {len(tree)}) for {len(updates)} updates")
+            self._save_commitments(epoch)
+            return simulated_tx_hash()
+
+        try:
+            # Always from the registry's signer lane, so epochs go out in order.
+            # A slow commit is awaited, not resent (see SignerPool.send): a
+            # second copy of the epoch would revert with StaleScoreEpoch
+            tx_hash = self._invoke(
+                "commitScoreRoot",
+                [epoch, "0x" + root.hex(), len(tree)],
+                encode_commit_score_root(epoch, root, len(tree)),
+                self.registry_address
+            )
+        except Exception as e:
+            tree.revert(undo)
+            logger.error(f"Score root commit failed: {e}")
+            raise
+
+        self._save_commitments(epoch)
+        logger.info(f"Committed score root for epoch {epoch}: {len(tree)} leaves, {len(updates)} updates (tx: {tx_hash})")
+        return tx_hash
+
+    def _call(self, method: str, args: list, data: str) -> Dict[str, Any]:
+        return {"to": self.registry_address, "method": method, "abi": REGISTRY_ABI, "args": args, "data": data}
+
+    def _invoke(self, method: str, args: list, data: str, key: str) -> str:
+        """Send one registry call, from the pool's signer for `key` if pooled"""
+        if self.pool is not None:
+            tx_hash = self.pool.send_one(self._call(method, args, data), key)
+        elif self.signer is not None:
+            tx_hash = self.signer.send(self._call(method, args, data))
+        else:
+            result = self.agent.invoke_contract(
+                contract_address=self.registry_address,
+                method=method,
+                abi=REGISTRY_ABI,
+                args=args
+            )
+            tx_hash = result.get("transaction_hash")
+        if self.rpc:
+            self.rpc.invalidate("eth_getTransactionCount")
+        return tx_hash
+
+    def plan_batches(self, updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Split updates into the batches send_batches will send:
+        one per signer lane with a pool, otherwise a single batch
+        """
+        if self.pool is None or self.commitments is not None:
+            return [{"signer": None, "updates": updates}]
+        return self.pool.partition(updates)
+
+    def send_batches(self, batches: List[Dict[str, Any]]) -> List[Union[str, Exception]]:
+        """
+        Send planned batches, concurrently across signers
+        Returns a tx hash, or the exception that stopped the batch, per batch
+        """
+        if self.pool is None or self.commitments is not None:
+            results = []
+            for batch in batches:
+                try:
+                    results.append(self.batch_update_scores(batch["updates"]))
+                except Exception as e:
+                    results.append(e)
+            return results
+
+        results = self.pool.send(batches, lambda updates: self._call(*self._batch_call(updates)))
+        if self.rpc:
+            self.rpc.invalidate("eth_getTransactionCount")
+        for batch, result in zip(batches, results):
+            if not isinstance(result, Exception):
+                logger.info(
+                    f"Batch update complete for {len(batch['updates'])} accounts "
+                    f"from {self.pool.signers[batch['signer']].address} (tx: {result})"
+                )
+        return results
+
+    def refresh_signers(self):
+        """Reweight the signer pool by each wallet's current balance"""
+        if self.pool is not None and self.rpc:
+            self.pool.refresh_balances(self.get_wallet_balance)
+
+    def _save_commitments(self, epoch: int):
+        self.commitments.epoch = epoch
+        self.commitments.save(self.commitment_path)
+
+    def seed_commitments(self, accounts) -> int:
+        """
+        Add leaves for accounts not yet in the score tree, from their stored
+        scores; they are committed with the next root. Returns leaves added.
+        """
+        tree = self.commitments
+        before = len(tree)
+        tree.update(
+            (
+                {"address": a["id"], "score": int(a.get("total_score") or 0)}
+                for a in accounts
+                if tree.get(a["id"]) is None
+            ),
+            tree.epoch + 1
+        )
+        return len(tree) - before
+
+    def get_score_proof(self, user_address: str) -> Optional[Dict[str, Any]]:
+        """
+        Proof of an address's committed score, for ReputationRegistry.verifyScore
+        None outside commitment mode or if the address has no leaf
+        """
+        if self.commitments is None:
+            return None
+        leaf = self.commitments.get(user_address)
+        if leaf is None:
+            return None
+
+        score, epoch = leaf
+        return {
+            "address": user_address.lower(),
+            "score": score,
+            "epoch": epoch,
+            "proof": ["0x" + node.hex() for node in self.commitments.proof(user_address)],
+            "root": "0x" + self.commitments.root.hex(),
+            "committed_epoch": self.commitments.epoch,
+        }
+
+    def _use_packed(self, updates: List[Dict[str, Any]]) -> bool:
+        if not self.packed:
+            return False
+        if not fits_packed(updates):
+            logger.warning("Score exceeds uint32, falling back to unpacked batchUpdateScores")
+            return False
+        return True
+
+    def _batch_call(self, updates: List[Dict[str, Any]]):
+        """Pick the registry method, args and calldata for a batch update"""
+        if self._use_packed(updates):
+            return (
+                "batchUpdateScoresPacked",
+                ["0x" + encode_packed_scores(updates).hex()],
+                encode_batch_update_scores_packed(updates)
+            )
+        return "batchUpdateScores", [
+            [u["address"] for u in updates],
+            [u["score"] for u in updates],
+        ], encode_batch_update_scores(
+            [u["address"] for u in updates],
+            [u["score"] for u in updates]
+        )
+
+    def encode_batch_calldata(self, updates: List[Dict[str, Any]]) -> str:
+        """Calldata for the batch update this writer would send"""
+        if self.commitments is not None:
+            # Same size and gas as the real commit; the root is not known yet
+            tree = self.commitments
+            return encode_commit_score_root(tree.epoch + 1, tree.root, len(tree) + len(updates))
+        return self._batch_call(updates)[2]
+
     def get_wallet_address(self) -> Optional[str]:
-        """Get the agent's wallet address"""
+        """Get the agent's wallet address (the first signer's, with a pool)"""
         if self.agent:
             return self.agent.wallet_address
+        if self.pool is not None:
+            return self.pool.signers[0].address
+        if self.signer is not None:
+            return self.signer.address
         return None
 
-    def get_wallet_balance(self) -> Optional[float]:
-        """Get the agent wallet's ETH balance"""
-        if not self.web3 or not self.agent:
+    def get_wallet_balance(self, address: Optional[str] = None) -> Optional[Decimal]:
+        """Get the ETH balance of `address`, by default the agent wallet's"""
+        address = address or self.get_wallet_address()
+        if not self.rpc or not address:
             return None
 
         try:
-            balance_wei = self.web3.eth.get_balance(self.agent.wallet_address)
-            return self.web3.from_wei(balance_wei, "ether")
-        except Exception as e:
+            balance_wei = int(self.rpc.call("eth_getBalance", [address, "latest"]), 16)
+            return Decimal(balance_wei) / Decimal(10 ** 18)
+        except RpcError as e:
             logger.error(f"Failed to get balance: {e}")
             return None
 
+    def get_nonce(self) -> Optional[int]:
+        """Get the agent wallet's next nonce, including pending transactions"""
+        address = self.get_wallet_address()
+        if not self.rpc or not address:
+            return None
+
+        try:
+            return int(self.rpc.call("eth_getTransactionCount", [address, "pending"]), 16)
+        except RpcError as e:
+            logger.error(f"Failed to get nonce: {e}")
+            return None
+
+    def get_gas_price(self) -> Optional[int]:
+        """Get the current gas price in wei"""
+        if not self.rpc:
+            return None
+
+        try:
+            return int(self.rpc.call("eth_gasPrice"), 16)
+        except RpcError as e:
+            logger.error(f"Failed to get gas price: {e}")
+            return None
+
+    def get_block_number(self) -> Optional[int]:
+        """Get the latest block number"""
+        if not self.rpc:
+            return None
+
+        try:
+            return int(self.rpc.call("eth_blockNumber"), 16)
+        except RpcError as e:
+            logger.error(f"Failed to get block number: {e}")
+            return None
+
+    def get_chain_state(self) -> Dict[str, Any]:
+        """
+        Fetch block number, gas price, and the wallet's balance and nonce
+        in a single batched request. Missing values are None.
+        """
+        state = {"block_number": None, "gas_price": None, "balance_wei": None, "nonce": None}
+        if not self.rpc:
+            return state
+
+        address = self.get_wallet_address()
+        calls = [("eth_blockNumber", []), ("eth_gasPrice", [])]
+        if address:
+            calls.append(("eth_getBalance", [address, "latest"]))
+            calls.append(("eth_getTransactionCount", [address, "pending"]))
+
+        try:
+            results = self.rpc.batch(calls)
+        except RpcError as e:
+            logger.error(f"Failed to get chain state: {e}")
+            return state
+
+        for name, result in zip(("block_number", "gas_price", "balance_wei", "nonce"), results):
+            if not isinstance(result, RpcError) and result is not None:
+                state[name] = int(result, 16)
+        return state
+
     def estimate_gas(self, updates: List[Dict[str, Any]]) -> Optional[int]:
         """Estimate gas for a batch update"""
-        if not self.web3:
+        if not self.rpc:
             return None
 
         try:
-            contract = self.web3.eth.contract(
-                address=self.registry_address,
-                abi=REGISTRY_ABI
-            )
-            addresses = [u["address"] for u in updates]
-            scores = [u["score"] for u in updates]
-
-            gas = contract.functions.batchUpdateScores(
-                addresses, scores
-            ).estimate_gas({"from": self.get_wallet_address()})
+            tx = {
+                "to": self.registry_address,
+                "data": self.encode_batch_calldata(updates),
+            }
+            sender = self.get_wallet_address()
+            if sender:
+                tx["from"] = sender
 
-            return gas
-        except Exception as e:
+            return int(self.rpc.call("eth_estimateGas", [tx]), 16)
+        except RpcError as e:
             logger.error(f"Gas estimation failed: {e}")
             return None
@@ -0,0 +1,111 @@
+"""
+In-memory index of Zora collection deploy times
+Lets timeliness checks run without a per-mint join against `collection`
+"""
+
+import logging
+from typing import Optional, Dict, Any, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+class CollectionIndex:
+    """
+    Maps collection address -> deployed_at timestamp.
+    Loaded once from the `collection` table and refreshed incrementally
+    using the highest deployed_at seen so far as a watermark.
+    Base and Zora are indexed side by side, so a collection from the lagging
+    chain can be inserted after newer ones from the other: each refresh
+    re-reads overlap_seconds behind the watermark, and reloads everything
+    if the table still holds more collections than the index.
+    """
+
+    def __init__(self, overlap_seconds: int = 900):
+        self._deployed_at: Dict[str, int] = {}
+        self.watermark: Optional[int] = None
+        self.overlap_seconds = overlap_seconds
+
+    def __len__(self) -> int:
+        return len(self._deployed_at)
+
+    def __contains__(self, address: str) -> bool:
+        return address.lower() in self._deployed_at
+
+    def load(self, collections: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add collection rows ({"address", "deployed_at"}) to the index
+        Returns the number of addresses not previously indexed
+        """
+        added = 0
+        for row in collections:
+            address = row["address"].lower()
+            deployed_at = row["deployed_at"]
+            if address not in self._deployed_at:
+                added += 1
+            self._deployed_at[address] = deployed_at
+            if self.watermark is None or deployed_at > self.watermark:
+                self.watermark = deployed_at
+        return added
+
+    def refresh(self, db) -> int:
+        """
+        Pull collections deployed since the last refresh, less the overlap
+        The first call loads the whole table
+        """
+        since = None if self.watermark is None else self.watermark - self.overlap_seconds
+        added = self.load(db.get_collections(deployed_since=since))
+        if since is not None and db.count_collections() > len(self):
+            # Indexed later than the overlap covers: catch up with a full load
+            added += self.load(db.get_collections(deployed_since=None))
+        if added:
+            logger.info(f"Collection index: +{added} collections ({len(self)} total)")
+        return added
+
+    def get_deployed_at(self, address: Optional[str]) -> Optional[int]:
+        """Get the deploy timestamp for a collection, if indexed"""
+        if not address:
+            return None
+        return self._deployed_at.get(address.lower())
+
+    def backfill_early_mints(
+        self,
+        db,
+        window_seconds: int,
+        batch_size: int = 5000
+    ) -> int:
+        """
+        Fill in collection_deployed_at / is_early_mint on historical mints
+        that were indexed before their collection's deploy time was known.
+        Walks the affected rows in id order so it can be stopped and rerun.
+        Returns the number of mint rows updated.
+        """
+        updated = 0
+        after_id = None
+
+        while True:
+            mints = db.get_mints_missing_deploy_time(after_id=after_id, limit=batch_size)
+            if not mints:
+                break
+            after_id = mints[-1]["id"]
+
+            rows = []
+            for mint in mints:
+                deployed_at = self.get_deployed_at(mint["contract_address"])
+                if deployed_at is None:
+                    continue
+                time_diff = mint["minted_at"] - deployed_at
+                rows.append({
+                    "id": mint["id"],
+                    "collection_deployed_at": deployed_at,
+                    "is_early_mint": 0 <= time_diff < window_seconds,
+                })
+
+            if rows:
+                db.update_mint_timeliness(rows)
+                updated += len(rows)
+
+            if len(mints) < batch_size:
+                break
+
+        logger.info(f"Backfilled timeliness for {updated} mints")
+        return updated
@@ -0,0 +1,152 @@
+"""
+Tracks submitted score-update transactions until they are confirmed
+Receipts for all outstanding transactions are polled in one JSON-RPC batch
+"""
+
+import time
+import logging
+from typing import List, Dict, Any, Optional, Tuple
+
+from rpc_client import RpcClient, RpcError
+from chain_writer import is_simulated_tx
+
+logger = logging.getLogger(__name__)
+
+
+class ConfirmationTracker:
+    """
+    Holds outstanding tx hashes with the updates they carry.
+    A poll settles each one as:
+    - confirmed: receipt succeeded and is `confirmations` blocks deep
+    - requeued: receipt reverted, or the node has not known the tx for
+      drop_timeout_seconds (dropped from the mempool or replaced by
+      another tx at its nonce)
+    - pending: anything else, checked again on the next poll
+    """
+
+    def __init__(
+        self,
+        rpc: Optional[RpcClient],
+        confirmations: int = 3,
+        drop_timeout_seconds: int = 300,
+        batch_size: int = 100
+    ):
+        self.rpc = rpc
+        self.confirmations = max(1, confirmations)
+        self.drop_timeout_seconds = drop_timeout_seconds
+        self.batch_size = batch_size
+        self.pending: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+    def track(
+        self,
+        tx_hash: str,
+        updates: List[Dict[str, Any]],
+        cycle_id: Optional[int] = None
+    ):
+        """Start tracking a submitted transaction"""
+        self.pending[tx_hash] = {
+            "tx_hash": tx_hash,
+            "updates": updates,
+            "cycle_id": cycle_id,
+            "submitted_at": int(time.time()),
+        }
+
+    def in_flight_addresses(self) -> set:
+        """Addresses whose latest update has not been confirmed yet"""
+        return {
+            u["address"]
+            for entry in self.pending.values()
+            for u in entry["updates"]
+        }
+
+    def poll(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Check receipts for every outstanding transaction
+        Returns (confirmed, requeued) lists of tracked entries
+        """
+        confirmed, requeued = [], []
+        if not self.pending:
+            return confirmed, requeued
+
+        # Simulated writes never reach a node
+        for tx_hash in [h for h in self.pending if is_simulated_tx(h)]:
+            confirmed.append(self.pending.pop(tx_hash))
+
+        if not self.pending:
+            return confirmed, requeued
+
+        if self.rpc is None:
+            logger.warning(f"No RPC client; {len(self.pending)} transactions left unconfirmed")
+            return confirmed, requeued
+
+        hashes = list(self.pending)
+        for start in range(0, len(hashes), self.batch_size):
+            chunk = hashes[start:start + self.batch_size]
+            calls = [("eth_blockNumber", [])]
+            for tx_hash in chunk:
+                calls.append(("eth_getTransactionReceipt", [tx_hash]))
+                calls.append(("eth_getTransactionByHash", [tx_hash]))
+
+            try:
+                results = self.rpc.batch(calls)
+            except RpcError as e:
+                logger.error(f"Receipt poll failed: {e}")
+                return confirmed, requeued
+
+            head = results[0]
+            if isinstance(head, RpcError):
+                logger.error(f"Failed to fetch block number: {head}")
+                continue
+            head = int(head, 16)
+
+            for i, tx_hash in enumerate(chunk):
+                receipt = results[1 + 2 * i]
+                tx = results[2 + 2 * i]
+                if isinstance(receipt, RpcError) or isinstance(tx, RpcError):
+                    continue
+
+                outcome = self._settle(self.pending[tx_hash], receipt, tx, head)
+                if outcome == "confirmed":
+                    confirmed.append(self.pending.pop(tx_hash))
+                elif outcome == "requeued":
+                    requeued.append(self.pending.pop(tx_hash))
+
+        if confirmed or requeued:
+            logger.info(
+                f"Confirmations: {len(confirmed)} confirmed, {len(requeued)} requeued, "
+                f"{len(self.pending)} pending"
+            )
+        return confirmed, requeued
+
+    def _settle(
+        self,
+        entry: Dict[str, Any],
+        receipt: Optional[Dict[str, Any]],
+        tx: Optional[Dict[str, Any]],
+        head: int
+    ) -> str:
+        """Classify one transaction as confirmed, requeued or pending"""
+        tx_hash = entry["tx_hash"]
+
+        if receipt is not None:
+            if int(receipt.get("status", "0x0"), 16) != 1:
+                logger.warning(f"Transaction {tx_hash} reverted; requeueing {len(entry['updates'])} accounts")
+                return "requeued"
+            depth = head - int(receipt["blockNumber"], 16) + 1
+            return "confirmed" if depth >= self.confirmations else "pending"
+
+        # Still known to the node: waiting in the mempool. Requeueing now
+        # could let a stale score land after a newer one, so keep waiting.
+        if tx is not None:
+            return "pending"
+
+        # Unknown right after submission can just be propagation delay
+        age = int(time.time()) - entry["submitted_at"]
+        if age < self.drop_timeout_seconds:
+            return "pending"
+
+        logger.warning(f"Transaction {tx_hash} dropped or replaced; requeueing {len(entry['updates'])} accounts")
+        return "requeued"
@@ -0,0 +1,151 @@
+"""
+Write-ahead journal of agent cycles
+Lets the agent resume after a crash without rescoring and resubmitting a batch
+"""
+
+import json
+import time
+import sqlite3
+import logging
+from typing import List, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Cycle lifecycle:
+#   scored -> submitted -> confirmed -> completed
+#                      \-> failed / abandoned
+STATUS_SCORED = "scored"
+STATUS_SUBMITTED = "submitted"
+STATUS_CONFIRMED = "confirmed"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+STATUS_ABANDONED = "abandoned"
+
+OPEN_STATUSES = (STATUS_SCORED, STATUS_SUBMITTED, STATUS_CONFIRMED)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cycle (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    accounts TEXT NOT NULL,
+    tx_hash TEXT
+);
+CREATE INDEX IF NOT EXISTS cycle_status_idx ON cycle (status);
+CREATE TABLE IF NOT EXISTS cycle_update (
+    cycle_id INTEGER NOT NULL REFERENCES cycle (id) ON DELETE CASCADE,
+    address TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    PRIMARY KEY (cycle_id, address)
+);
+"""
+
+
+class CycleJournal:
+    """
+    SQLite-backed journal recording, per cycle: the selected accounts,
+    the computed score updates, the submitted tx hash and its status.
+    Every state change is committed before the agent moves on.
+    """
+
+    def __init__(self, path: str = "agent_journal.db"):
+        self.path = path
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=FULL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+        logger.info(f"Cycle journal opened at {path}")
+
+    def close(self):
+        self.conn.close()
+
+    def begin_cycle(self, accounts: List[str], updates: List[Dict[str, Any]]) -> int:
+        """
+        Record a scored cycle before anything is sent on-chain
+        Returns the cycle id
+        """
+        now = int(time.time())
+        with self.conn:
+            self.conn.execute("BEGIN")
+            cursor = self.conn.execute(
+                "INSERT INTO cycle (started_at, updated_at, status, accounts) VALUES (?, ?, ?, ?)",
+                (now, now, STATUS_SCORED, json.dumps(accounts))
+            )
+            cycle_id = cursor.lastrowid
+            self.conn.executemany(
+                "INSERT INTO cycle_update (cycle_id, address, score) VALUES (?, ?, ?)",
+                [(cycle_id, u["address"], u["score"]) for u in updates]
+            )
+        return cycle_id
+
+    def record_submission(self, cycle_id: int, tx_hash: str):
+        """Record the tx hash of a submitted batch"""
+        self._set_status(cycle_id, STATUS_SUBMITTED, tx_hash=tx_hash)
+
+    def record_confirmation(self, cycle_id: int):
+        """Record that the batch tx was confirmed on-chain"""
+        self._set_status(cycle_id, STATUS_CONFIRMED)
+
+    def complete_cycle(self, cycle_id: int):
+        """Record that all accounts in the cycle were marked updated"""
+        self._set_status(cycle_id, STATUS_COMPLETED)
+
+    def fail_cycle(self, cycle_id: int):
+        """Record that the batch tx failed or reverted"""
+        self._set_status(cycle_id, STATUS_FAILED)
+
+    def abandon_cycle(self, cycle_id: int):
+        """Give up on a cycle; its accounts will be picked up again"""
+        self._set_status(cycle_id, STATUS_ABANDONED)
+
+    def _set_status(self, cycle_id: int, status: str, tx_hash: Optional[str] = None):
+        now = int(time.time())
+        if tx_hash is not None:
+            self.conn.execute(
+                "UPDATE cycle SET status = ?, tx_hash = ?, updated_at = ? WHERE id = ?",
+                (status, tx_hash, now, cycle_id)
+            )
+        else:
+            self.conn.execute(
+                "UPDATE cycle SET status = ?, updated_at = ? WHERE id = ?",
+                (status, now, cycle_id)
+            )
+
+    def get_cycle(self, cycle_id: int) -> Optional[Dict[str, Any]]:
+        """Get a cycle with its score updates"""
+        row = self.conn.execute("SELECT * FROM cycle WHERE id = ?", (cycle_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def incomplete_cycles(self) -> List[Dict[str, Any]]:
+        """Get cycles that were interrupted before completion, oldest first"""
+        placeholders = ", ".join("?" for _ in OPEN_STATUSES)
+        rows = self.conn.execute(
+            f"SELECT * FROM cycle WHERE status IN ({placeholders}) ORDER BY id ASC",
+            OPEN_STATUSES
+        ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def prune(self, older_than_seconds: int = 7 * 86400) -> int:
+        """Delete finished cycles older than the given age"""
+        cutoff = int(time.time()) - older_than_seconds
+        placeholders = ", ".join("?" for _ in OPEN_STATUSES)
+        cursor = self.conn.execute(
+            f"DELETE FROM cycle WHERE updated_at < ? AND status NOT IN ({placeholders})",
+            (cutoff, *OPEN_STATUSES)
+        )
+        return cursor.rowcount
+
+    def _to_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
+        cycle = dict(row)
+        cycle["accounts"] = json.loads(cycle["accounts"])
+        cycle["updates"] = [
+            {"address": u["address"], "score": u["score"]}
+            for u in self.conn.execute(
+                "SELECT address, score FROM cycle_update WHERE cycle_id = ? ORDER BY rowid",
+                (cycle["id"],)
+            )
+        ]
+        return cycle
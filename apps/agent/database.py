@@ -2,28 +2,253 @@
 Database interface for reading Ponder-indexed data
 """
 
+import io
+import json
+import time
+import select
 import logging
-from typing import Optional, List, Dict, Any
+from datetime import datetime, timezone
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Any, Set, Tuple, Iterator, Iterable
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
+from snapshot import SnapshotWriter, SNAPSHOT_TABLES
+
 logger = logging.getLogger(__name__)
 
+# Statement timeouts (ms) for reads that can scan large parts of zora_mint;
+# other reads use read_timeout_ms
+QUERY_TIMEOUTS_MS = {
+    "get_accounts_needing_update": 60000,
+    "get_update_candidates": 60000,
+    "get_early_minters": 120000,
+    "get_top_accounts": 30000,
+    "get_mints_for_accounts": 30000,
+    # Full-table scans for offline analysis (what_if.py)
+    "iter_scoring_accounts": 600000,
+    "iter_scoring_linked_wallets": 600000,
+    "iter_scoring_mints": 1800000,
+    "export_snapshot": 1800000,
+    "get_score_history_chunk": 600000,
+    "insert_score_snapshots": 600000,
+    "backfill_mint_partitions": 600000,
+    # Startup DDL on the primary: MIN(minted_at) over zora_mint, and the
+    # trigger swaps wait for a lock behind the indexer's writes
+    "ensure_mint_partitions": 600000,
+    "ensure_early_mint_counter_tables": 300000,
+    "ensure_early_minter_rank_table": 300000,
+    "install_mint_notify_trigger": 300000,
+}
+
+# Agent-owned side table of per-minter counters (see early_mint_counters.py)
+EARLY_MINT_COUNTER_COLUMNS = (
+    "mint_quantity",
+    "early_mint_count",
+    "early_quantity",
+    "quantity_1h",
+    "quantity_24h",
+    "quantity_7d",
+)
+EARLY_MINT_COUNTER_CURSOR_KEY = "early_mint_counter_cursor"
+# Mints counted within the overlap window behind the cursor, kept so late
+# inserts and reorged-out rows can be reconciled
+EARLY_MINT_APPLIED_COLUMNS = (
+    "id", "minter", "contract_address", "quantity",
+    "minted_at", "is_early_mint", "collection_deployed_at",
+)
+
+# Agent-owned key/value progress markers (counter cursor, backfill chunks)
+AGENT_STATE_DDL = text("""
+    CREATE TABLE IF NOT EXISTS agent_state (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    )
+""")
+
+# Optional copy of zora_mint partitioned by month of minted_at, kept in step
+# by a trigger, so reads bounded by a recent minted_at prune to the newest
+# partitions (see ensure_mint_partitions)
+MINT_PARTITION_TABLE = "zora_mint_by_month"
+MINT_PARTITION_BACKFILL_KEY = "mint_partition_backfill"
+MINT_COLUMNS = (
+    "id", "minter", "contract_address", "token_id", "quantity",
+    "minted_at", "network", "is_early_mint", "collection_deployed_at",
+)
+MINT_PARTITION_DDL = [
+    text(f"""
+        CREATE TABLE IF NOT EXISTS {MINT_PARTITION_TABLE} (
+            id TEXT NOT NULL,
+            minter TEXT NOT NULL,
+            contract_address TEXT NOT NULL,
+            token_id NUMERIC(78, 0) NOT NULL,
+            quantity INTEGER NOT NULL,
+            minted_at INTEGER NOT NULL,
+            network TEXT NOT NULL,
+            is_early_mint BOOLEAN NOT NULL DEFAULT false,
+            collection_deployed_at INTEGER,
+            PRIMARY KEY (minted_at, id)
+        ) PARTITION BY RANGE (minted_at)
+    """),
+    text(f"""
+        CREATE INDEX IF NOT EXISTS {MINT_PARTITION_TABLE}_minter_idx
+            ON {MINT_PARTITION_TABLE} (minter, minted_at)
+    """),
+    # Safety net for rows outside every monthly partition; kept empty by
+    # creating partitions ahead of time
+    text(f"CREATE TABLE IF NOT EXISTS {MINT_PARTITION_TABLE}_default PARTITION OF {MINT_PARTITION_TABLE} DEFAULT"),
+]
+MINT_MIRROR_DDL = [
+    text(f"""
+        CREATE OR REPLACE FUNCTION mirror_zora_mint() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM {MINT_PARTITION_TABLE} WHERE minted_at = OLD.minted_at AND id = OLD.id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO {MINT_PARTITION_TABLE} ({", ".join(MINT_COLUMNS)})
+                VALUES ({", ".join("NEW." + c for c in MINT_COLUMNS)})
+                ON CONFLICT (minted_at, id) DO NOTHING;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """),
+    text("DROP TRIGGER IF EXISTS zora_mint_mirror ON zora_mint"),
+    text("""
+        CREATE TRIGGER zora_mint_mirror
+        AFTER INSERT OR UPDATE OR DELETE ON zora_mint
+        FOR EACH ROW EXECUTE FUNCTION mirror_zora_mint()
+    """),
+]
+
+
+def month_bounds(timestamp: int) -> Tuple[int, int]:
+    """Unix start and end of the UTC calendar month containing timestamp"""
+    start = datetime.fromtimestamp(timestamp, timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    end = start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+    return int(start.timestamp()), int(end.timestamp())
+
+
+REPLICA_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM NOW() - pg_last_xact_replay_timestamp()), 0)
+    END AS lag_seconds
+""")
+
 
 class Database:
     """Interface to the Ponder Postgres database"""
 
-    def __init__(self, database_url: str):
-        self.engine = create_engine(database_url, echo=False)
+    def __init__(
+        self,
+        database_url: str,
+        replica_url: Optional[str] = None,
+        read_timeout_ms: int = 15000,
+        write_timeout_ms: int = 5000,
+        max_replica_lag_seconds: float = 30.0,
+        lag_check_interval_seconds: float = 10.0,
+        query_timeouts_ms: Optional[Dict[str, int]] = None
+    ):
+        # Primary: writes, plus reads when no healthy replica is available.
+        # Its connections default to the write timeout; reads override it.
+        self.engine = create_engine(
+            database_url,
+            echo=False,
+            connect_args=self._timeout_args(database_url, write_timeout_ms)
+        )
         self.Session = sessionmaker(bind=self.engine)
-        logger.info("Database connection established")
+
+        # Optional replica for heavy reads, so they stay off the primary the
+        # indexer is writing to
+        self.replica_engine = None
+        self.ReplicaSession = None
+        if replica_url:
+            self.replica_engine = create_engine(
+                replica_url,
+                echo=False,
+                connect_args=self._timeout_args(replica_url, read_timeout_ms)
+            )
+            self.ReplicaSession = sessionmaker(bind=self.replica_engine)
+
+        self.read_timeout_ms = read_timeout_ms
+        self.max_replica_lag_seconds = max_replica_lag_seconds
+        self.lag_check_interval_seconds = lag_check_interval_seconds
+        self.query_timeouts_ms = {**QUERY_TIMEOUTS_MS, **(query_timeouts_ms or {})}
+        self.replica_lag: Optional[float] = None
+        self._lag_checked_at = 0.0
+        # Table read by minted_at-bounded queries; see use_mint_partitions
+        self.mint_table = "zora_mint"
+
+        logger.info(
+            "Database connection established"
+            + (" (with read replica)" if replica_url else "")
+        )
+
+    @staticmethod
+    def _timeout_args(url: str, timeout_ms: int) -> Dict[str, Any]:
+        """Default statement_timeout for every connection of an engine"""
+        if not url.startswith("postgres"):
+            return {}
+        return {"options": f"-c statement_timeout={int(timeout_ms)}"}
+
+    def _set_local_timeout(self, session, query_name: str):
+        """Statement timeout of query_name for the rest of session's transaction"""
+        session.execute(
+            text("SELECT set_config('statement_timeout', :timeout, true)"),
+            {"timeout": str(int(self.query_timeouts_ms.get(query_name, self.read_timeout_ms)))}
+        )
+
+    def _replica_healthy(self) -> bool:
+        """
+        Check (at most every lag_check_interval_seconds) whether the replica
+        is within max_replica_lag_seconds of the primary
+        """
+        now = time.monotonic()
+        if now - self._lag_checked_at >= self.lag_check_interval_seconds:
+            self._lag_checked_at = now
+            try:
+                with self.ReplicaSession() as session:
+                    self.replica_lag = float(session.execute(REPLICA_LAG_QUERY).scalar() or 0)
+            except Exception as e:
+                logger.warning(f"Replica lag check failed, reading from primary: {e}")
+                self.replica_lag = None
+
+            if self.replica_lag is not None and self.replica_lag > self.max_replica_lag_seconds:
+                logger.warning(
+                    f"Replica lag {self.replica_lag:.1f}s exceeds "
+                    f"{self.max_replica_lag_seconds}s, reading from primary"
+                )
+
+        return self.replica_lag is not None and self.replica_lag <= self.max_replica_lag_seconds
+
+    @contextmanager
+    def _read_session(self, query_name: str, repeatable_read: bool = False):
+        """
+        Session for a read query: the replica when it is configured and
+        caught up, otherwise the primary, with the query's statement timeout
+        repeatable_read gives every statement of the session one consistent view
+        """
+        Session = self.Session
+        if self.ReplicaSession is not None and self._replica_healthy():
+            Session = self.ReplicaSession
+
+        with Session() as session:
+            if repeatable_read:
+                session.execute(text("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY"))
+            self._set_local_timeout(session, query_name)
+            yield session
 
     def get_accounts_needing_update(self, limit: int = 50) -> List[Dict[str, Any]]:
         """
         Get accounts that haven't been updated recently
         or have new activity since last update
         """
-        query = text("""
+        # The EXISTS only matters for accounts updated since stale_before, so
+        # its mints are newer than that too; the literal bound lets a
+        # partitioned mint table prune to the newest partitions
+        query = text(f"""
             SELECT 
                 a.id,
                 a.base_score,
@@ -34,18 +259,75 @@ class Database:
                 a.first_tx_timestamp,
                 a.last_updated
             FROM account a
-            WHERE a.last_updated < (EXTRACT(EPOCH FROM NOW()) - 3600)
+            WHERE a.last_updated < :stale_before
                OR EXISTS (
-                   SELECT 1 FROM zora_mint m 
+                   SELECT 1 FROM {self.mint_table} m 
                    WHERE m.minter = a.id 
+                   AND m.minted_at > :stale_before
                    AND m.minted_at > a.last_updated
                )
             ORDER BY a.last_updated ASC
             LIMIT :limit
         """)
 
-        with self.Session() as session:
-            result = session.execute(query, {"limit": limit})
+        with self._read_session("get_accounts_needing_update") as session:
+            result = session.execute(query, {"limit": limit, "stale_before": int(time.time()) - 3600})
+            return [dict(row._mapping) for row in result]
+
+    def get_update_candidates(
+        self,
+        limit: int = 500,
+        activity_horizon_seconds: int = 7 * 86400
+    ) -> List[Dict[str, Any]]:
+        """
+        Get a pool of accounts for the priority scheduler: the most active
+        accounts (mints since their last update) plus the stalest ones.
+        Each row carries new_mint_quantity / new_early_quantity since last_updated.
+        """
+        query = text(f"""
+            WITH active AS (
+                SELECT 
+                    m.minter AS id,
+                    SUM(m.quantity) AS new_mint_quantity,
+                    SUM(CASE WHEN m.is_early_mint THEN m.quantity ELSE 0 END) AS new_early_quantity
+                FROM {self.mint_table} m
+                JOIN account a ON a.id = m.minter
+                WHERE m.minted_at > :active_since
+                  AND m.minted_at > a.last_updated
+                GROUP BY m.minter
+                ORDER BY new_early_quantity DESC, new_mint_quantity DESC
+                LIMIT :limit
+            ),
+            stale AS (
+                SELECT id
+                FROM account
+                WHERE last_updated < :stale_before
+                ORDER BY last_updated ASC
+                LIMIT :limit
+            )
+            SELECT 
+                a.id,
+                a.base_score,
+                a.zora_score,
+                a.timely_score,
+                a.total_score,
+                a.tier,
+                a.first_tx_timestamp,
+                a.last_updated,
+                COALESCE(act.new_mint_quantity, 0) AS new_mint_quantity,
+                COALESCE(act.new_early_quantity, 0) AS new_early_quantity
+            FROM account a
+            LEFT JOIN active act ON act.id = a.id
+            WHERE a.id IN (SELECT id FROM active UNION SELECT id FROM stale)
+        """)
+
+        with self._read_session("get_update_candidates") as session:
+            now = int(time.time())
+            result = session.execute(query, {
+                "limit": limit,
+                "active_since": now - activity_horizon_seconds,
+                "stale_before": now - 3600,
+            })
             return [dict(row._mapping) for row in result]
 
     def get_account(self, address: str) -> Optional[Dict[str, Any]]:
@@ -64,14 +346,21 @@ class Database:
             WHERE id = :address
         """)
 
-        with self.Session() as session:
+        with self._read_session("get_account") as session:
             result = session.execute(query, {"address": address.lower()})
             row = result.fetchone()
             return dict(row._mapping) if row else None
 
-    def get_mints_for_account(self, address: str) -> List[Dict[str, Any]]:
-        """Get all mints for an account (including linked wallets)"""
-        query = text("""
+    def get_mints_for_account(self, address: str, since: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get all mints for an account (including linked wallets), newest first
+        since limits them to mints after that minted_at, which only touches
+        the newest partitions of a partitioned mint table
+        """
+        table, recent, params = "zora_mint", "", {"address": address.lower()}
+        if since is not None:
+            table, recent, params["since"] = self.mint_table, "AND m.minted_at > :since", since
+        query = text(f"""
             SELECT 
                 m.id,
                 m.minter,
@@ -82,16 +371,19 @@ class Database:
                 m.network,
                 m.is_early_mint,
                 m.collection_deployed_at
-            FROM zora_mint m
-            WHERE m.minter = :address
-               OR m.minter IN (
-                   SELECT address FROM linked_wallet WHERE main_account_id = :address
-               )
+            FROM {table} m
+            WHERE (
+                m.minter = :address
+                OR m.minter IN (
+                    SELECT address FROM linked_wallet WHERE main_account_id = :address
+                )
+            )
+            {recent}
             ORDER BY m.minted_at DESC
         """)
 
-        with self.Session() as session:
-            result = session.execute(query, {"address": address.lower()})
+        with self._read_session("get_mints_for_account") as session:
+            result = session.execute(query, params)
             return [dict(row._mapping) for row in result]
 
     def get_linked_wallets(self, main_address: str) -> List[Dict[str, Any]]:
@@ -107,10 +399,170 @@ class Database:
             WHERE main_account_id = :address
         """)
 
-        with self.Session() as session:
+        with self._read_session("get_linked_wallets") as session:
             result = session.execute(query, {"address": main_address.lower()})
             return [dict(row._mapping) for row in result]
 
+    def get_collections(self, deployed_since: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get collection deploy times
+        When deployed_since is given, only collections deployed at or after it
+        """
+        query = text("""
+            SELECT 
+                address,
+                deployed_at
+            FROM collection
+            WHERE CAST(:deployed_since AS INTEGER) IS NULL
+               OR deployed_at >= :deployed_since
+            ORDER BY deployed_at ASC
+        """)
+
+        with self._read_session("get_collections") as session:
+            result = session.execute(query, {"deployed_since": deployed_since})
+            return [dict(row._mapping) for row in result]
+
+    def count_collections(self) -> int:
+        """Number of indexed collections"""
+        with self._read_session("count_collections") as session:
+            return session.execute(text("SELECT COUNT(*) FROM collection")).scalar() or 0
+
+    def get_mints_missing_deploy_time(
+        self,
+        after_id: Optional[str] = None,
+        limit: int = 5000
+    ) -> List[Dict[str, Any]]:
+        """
+        Get mints indexed without a collection deploy time, in id order
+        Pass the last id of the previous page as after_id to continue
+        """
+        query = text("""
+            SELECT 
+                m.id,
+                m.contract_address,
+                m.minted_at
+            FROM zora_mint m
+            WHERE m.collection_deployed_at IS NULL
+              AND (CAST(:after_id AS TEXT) IS NULL OR m.id > :after_id)
+            ORDER BY m.id ASC
+            LIMIT :limit
+        """)
+
+        with self._read_session("get_mints_missing_deploy_time") as session:
+            result = session.execute(query, {"after_id": after_id, "limit": limit})
+            return [dict(row._mapping) for row in result]
+
+    def update_mint_timeliness(self, rows: List[Dict[str, Any]]):
+        """
+        Set collection_deployed_at and is_early_mint on a batch of mints
+        Rows format: [{"id": ..., "collection_deployed_at": ..., "is_early_mint": ...}, ...]
+        """
+        if not rows:
+            return
+
+        query = text("""
+            UPDATE zora_mint
+            SET collection_deployed_at = :collection_deployed_at,
+                is_early_mint = :is_early_mint
+            WHERE id = :id
+        """)
+
+        with self.Session() as session:
+            session.execute(query, rows)
+            session.commit()
+
+    def get_mints_for_accounts(self, addresses: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get scoring columns of all mints for many accounts in one query
+        Each account's mints include its linked wallets, as in get_mints_for_account
+        Returns {address: [mint, ...]} with an entry for every requested address
+        """
+        addresses = [a.lower() for a in addresses]
+        if not addresses:
+            return {}
+
+        query = text("""
+            SELECT 
+                owner.account_id,
+                m.id,
+                m.minter,
+                m.contract_address,
+                m.quantity,
+                m.minted_at,
+                m.is_early_mint,
+                m.collection_deployed_at
+            FROM (
+                SELECT a AS account_id, a AS minter
+                FROM unnest(CAST(:addresses AS TEXT[])) AS a
+                UNION ALL
+                SELECT lw.main_account_id, lw.address
+                FROM linked_wallet lw
+                WHERE lw.main_account_id = ANY(:addresses)
+            ) owner
+            JOIN zora_mint m ON m.minter = owner.minter
+        """)
+
+        mints: Dict[str, List[Dict[str, Any]]] = {a: [] for a in addresses}
+        with self._read_session("get_mints_for_accounts") as session:
+            result = session.execute(query, {"addresses": addresses})
+            for row in result:
+                mint = dict(row._mapping)
+                mints[mint.pop("account_id")].append(mint)
+        return mints
+
+    def get_linked_wallets_for_accounts(self, main_addresses: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get linked wallets for many main accounts in one query
+        Returns {main_address: [wallet, ...]} with an entry for every requested address
+        """
+        main_addresses = [a.lower() for a in main_addresses]
+        if not main_addresses:
+            return {}
+
+        query = text("""
+            SELECT 
+                main_account_id,
+                address,
+                linked_at,
+                zora_mint_count,
+                early_mint_count,
+                first_tx_timestamp
+            FROM linked_wallet
+            WHERE main_account_id = ANY(:addresses)
+        """)
+
+        wallets: Dict[str, List[Dict[str, Any]]] = {a: [] for a in main_addresses}
+        with self._read_session("get_linked_wallets_for_accounts") as session:
+            result = session.execute(query, {"addresses": main_addresses})
+            for row in result:
+                wallet = dict(row._mapping)
+                wallets[wallet.pop("main_account_id")].append(wallet)
+        return wallets
+
+    def get_accounts(self, addresses: List[str]) -> List[Dict[str, Any]]:
+        """Get many accounts by address in one query"""
+        addresses = [a.lower() for a in addresses]
+        if not addresses:
+            return []
+
+        query = text("""
+            SELECT 
+                id,
+                base_score,
+                zora_score,
+                timely_score,
+                total_score,
+                tier,
+                first_tx_timestamp,
+                last_updated
+            FROM account
+            WHERE id = ANY(:addresses)
+        """)
+
+        with self._read_session("get_accounts") as session:
+            result = session.execute(query, {"addresses": addresses})
+            return [dict(row._mapping) for row in result]
+
     def mark_account_updated(self, address: str):
         """Mark an account as recently updated"""
         query = text("""
@@ -123,27 +575,214 @@ class Database:
             session.execute(query, {"address": address.lower()})
             session.commit()
 
-    def get_early_minters(self, hours: int = 24) -> List[Dict[str, Any]]:
-        """
-        Find users who minted within N hours of collection deployment
-        This is the core "Timeliness" logic
-        """
-        query = text("""
+    @staticmethod
+    def _early_minters_aggregate() -> str:
+        # is_early_mint means "within 24h", so it also counts for wider windows;
+        # otherwise fall back to the denormalized deploy time
+        return """
             SELECT 
                 m.minter,
                 COUNT(*) as early_mint_count,
                 SUM(m.quantity) as total_early_quantity
             FROM zora_mint m
-            WHERE m.is_early_mint = true
+            WHERE (m.is_early_mint = true AND :window >= 86400)
+               OR (m.collection_deployed_at IS NOT NULL
+                   AND m.minted_at >= m.collection_deployed_at
+                   AND m.minted_at < m.collection_deployed_at + :window)
             GROUP BY m.minter
-            HAVING COUNT(*) > 0
-            ORDER BY COUNT(*) DESC
+        """
+
+    def ensure_early_minter_rank_table(self):
+        """Create the agent's early-minter ranking table if missing"""
+        statements = [
+            text("""
+                CREATE TABLE IF NOT EXISTS agent_early_minter_rank (
+                    window_seconds INTEGER NOT NULL,
+                    minter TEXT NOT NULL,
+                    early_mint_count BIGINT NOT NULL,
+                    total_early_quantity BIGINT NOT NULL,
+                    PRIMARY KEY (window_seconds, minter)
+                )
+            """),
+            text("""
+                CREATE INDEX IF NOT EXISTS agent_early_minter_rank_keyset_idx
+                    ON agent_early_minter_rank (window_seconds, early_mint_count DESC, minter DESC)
+            """),
+        ]
+        with self.Session() as session:
+            self._set_local_timeout(session, "ensure_early_minter_rank_table")
+            for statement in statements:
+                session.execute(statement)
+            session.commit()
+
+    def rank_early_minters(self, hours: int = 24) -> int:
+        """
+        Aggregate zora_mint once into agent_early_minter_rank for an hours
+        window, replacing the previous ranking of that window. Run on a
+        timer by the agent (main.refresh_early_minter_ranks), not by
+        readers. The swap is one transaction, so pages keep reading the old
+        ranking until it commits; concurrent refreshes of a window queue on
+        an advisory lock. Returns the number of minters ranked
+        """
+        insert = text(f"""
+            INSERT INTO agent_early_minter_rank (window_seconds, minter, early_mint_count, total_early_quantity)
+            SELECT :window, ranked.minter, ranked.early_mint_count, ranked.total_early_quantity
+            FROM ({self._early_minters_aggregate()}) ranked
         """)
 
+        window = hours * 3600
         with self.Session() as session:
-            result = session.execute(query)
+            self._set_local_timeout(session, "get_early_minters")
+            session.execute(
+                text("SELECT pg_advisory_xact_lock(hashtext('agent_early_minter_rank'), :window)"),
+                {"window": window}
+            )
+            session.execute(
+                text("DELETE FROM agent_early_minter_rank WHERE window_seconds = :window"),
+                {"window": window}
+            )
+            ranked = session.execute(insert, {"window": window}).rowcount
+            session.commit()
+        return ranked
+
+    def get_early_minters(
+        self,
+        hours: int = 24,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[int, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find users who minted within N hours of collection deployment
+        This is the core "Timeliness" logic
+        Pages come from the last rank_early_minters run for the window; pass
+        (early_mint_count, minter) of the last row of a page as `after` to
+        get the next page
+        """
+        keyset = "AND (early_mint_count, minter) < (:after_count, :after_minter)" if after is not None else ""
+        query = text(f"""
+            SELECT 
+                minter,
+                early_mint_count,
+                total_early_quantity
+            FROM agent_early_minter_rank
+            WHERE window_seconds = :window
+            {keyset}
+            ORDER BY early_mint_count DESC, minter DESC
+            LIMIT :limit
+        """)
+
+        params = {"window": hours * 3600, "limit": limit}
+        if after is not None:
+            params["after_count"], params["after_minter"] = after
+
+        with self._read_session("get_early_minters_page") as session:
+            result = session.execute(query, params)
             return [dict(row._mapping) for row in result]
 
+    def iter_early_minters(self, hours: int = 24, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Stream every early minter with constant memory
+        Runs the aggregate once and reads it through a server-side cursor
+        in batch_size chunks, instead of materializing the whole result
+        """
+        query = text(
+            self._early_minters_aggregate() + "ORDER BY COUNT(*) DESC, m.minter DESC"
+        ).execution_options(
+            stream_results=True,
+            yield_per=batch_size
+        )
+
+        with self._read_session("get_early_minters") as session:
+            result = session.execute(query, {"window": hours * 3600})
+            for row in result:
+                yield dict(row._mapping)
+
+    def _stream(self, query_name: str, query, batch_size: int) -> Iterator[Dict[str, Any]]:
+        """Read a whole-table query through a server-side cursor"""
+        query = query.execution_options(stream_results=True, yield_per=batch_size)
+        with self._read_session(query_name) as session:
+            for row in session.execute(query):
+                yield dict(row._mapping)
+
+    def iter_scoring_accounts(self, batch_size: int = 10000) -> Iterator[Dict[str, Any]]:
+        """Stream the scoring columns of every account"""
+        query = text("""
+            SELECT 
+                id,
+                total_score,
+                tier,
+                first_tx_timestamp
+            FROM account
+        """)
+        return self._stream("iter_scoring_accounts", query, batch_size)
+
+    def iter_scoring_linked_wallets(self, batch_size: int = 10000) -> Iterator[Dict[str, Any]]:
+        """Stream the scoring columns of every linked wallet"""
+        query = text("""
+            SELECT 
+                main_account_id,
+                zora_mint_count,
+                early_mint_count,
+                first_tx_timestamp
+            FROM linked_wallet
+        """)
+        return self._stream("iter_scoring_linked_wallets", query, batch_size)
+
+    def iter_scoring_mints(self, batch_size: int = 10000) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the scoring columns of every mint, tagged with the account it
+        scores for (its minter, or the main account of a linked minter)
+        """
+        query = text("""
+            SELECT 
+                m.minter AS account_id,
+                m.contract_address,
+                m.quantity,
+                m.minted_at,
+                m.is_early_mint,
+                m.collection_deployed_at
+            FROM zora_mint m
+            JOIN account a ON a.id = m.minter
+            UNION ALL
+            SELECT 
+                lw.main_account_id,
+                m.contract_address,
+                m.quantity,
+                m.minted_at,
+                m.is_early_mint,
+                m.collection_deployed_at
+            FROM zora_mint m
+            JOIN linked_wallet lw ON lw.address = m.minter
+        """)
+        return self._stream("iter_scoring_mints", query, batch_size)
+
+    def export_snapshot(self, path: str, batch_size: int = 10000) -> Dict[str, int]:
+        """
+        Dump the scoring columns of account, linked_wallet, zora_mint and
+        collection into a columnar snapshot directory (see snapshot.py)
+        All tables are read in one repeatable-read transaction, so the
+        snapshot is consistent across tables
+        Returns {table: rows}
+        """
+        started = time.monotonic()
+        writer = SnapshotWriter(path)
+        counts = {}
+
+        with self._read_session("export_snapshot", repeatable_read=True) as session:
+            for table, columns in SNAPSHOT_TABLES.items():
+                query = text(
+                    f"SELECT {', '.join(columns)} FROM {table}"
+                ).execution_options(stream_results=True, yield_per=batch_size)
+                rows = (dict(row._mapping) for row in session.execute(query))
+                counts[table] = writer.write_table(table, rows)
+
+        writer.finish()
+        logger.info(
+            f"Exported snapshot to {path} in {time.monotonic() - started:.1f}s: "
+            + ", ".join(f"{t}={n}" for t, n in counts.items())
+        )
+        return counts
+
     def get_tier_distribution(self) -> Dict[str, int]:
         """Get count of accounts in each tier"""
         query = text("""
@@ -152,13 +791,22 @@ class Database:
             GROUP BY tier
         """)
 
-        with self.Session() as session:
+        with self._read_session("get_tier_distribution") as session:
             result = session.execute(query)
             return {row.tier: row.count for row in result}
 
-    def get_top_accounts(self, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get top accounts by score"""
-        query = text("""
+    def get_top_accounts(
+        self,
+        limit: int = 100,
+        after: Optional[Tuple[int, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get top accounts by score
+        Pass (total_score, id) of the last row of a page as `after` to get
+        the next page; each page is an index range scan, however deep
+        """
+        keyset = "WHERE (total_score, id) < (:after_score, :after_id)" if after is not None else ""
+        query = text(f"""
             SELECT 
                 id,
                 total_score,
@@ -167,10 +815,733 @@ class Database:
                 zora_score,
                 timely_score
             FROM account
-            ORDER BY total_score DESC
+            {keyset}
+            ORDER BY total_score DESC, id DESC
+            LIMIT :limit
+        """)
+
+        params = {"limit": limit}
+        if after is not None:
+            params["after_score"], params["after_id"] = after
+
+        with self._read_session("get_top_accounts") as session:
+            result = session.execute(query, params)
+            return [dict(row._mapping) for row in result]
+
+    def iter_top_accounts(self, page_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Stream all accounts by score, highest first, one keyset page at a time"""
+        after = None
+        while True:
+            page = self.get_top_accounts(limit=page_size, after=after)
+            yield from page
+            if len(page) < page_size:
+                return
+            after = (page[-1]["total_score"], page[-1]["id"])
+
+    def ensure_early_mint_counter_tables(self):
+        """Create the agent's counter and state tables if missing"""
+        statements = [
+            text("""
+                CREATE TABLE IF NOT EXISTS agent_early_mint_counter (
+                    minter TEXT PRIMARY KEY,
+                    mint_quantity BIGINT NOT NULL DEFAULT 0,
+                    early_mint_count BIGINT NOT NULL DEFAULT 0,
+                    early_quantity BIGINT NOT NULL DEFAULT 0,
+                    quantity_1h BIGINT NOT NULL DEFAULT 0,
+                    quantity_24h BIGINT NOT NULL DEFAULT 0,
+                    quantity_7d BIGINT NOT NULL DEFAULT 0,
+                    last_minted_at INTEGER,
+                    updated_at INTEGER NOT NULL
+                )
+            """),
+            # Counters created before last_minted_at was tracked
+            text("ALTER TABLE agent_early_mint_counter ADD COLUMN IF NOT EXISTS last_minted_at INTEGER"),
+            text("""
+                UPDATE agent_early_mint_counter c
+                SET last_minted_at = (SELECT MAX(m.minted_at) FROM zora_mint m WHERE m.minter = c.minter)
+                WHERE c.last_minted_at IS NULL
+            """),
+            text("""
+                CREATE TABLE IF NOT EXISTS agent_early_mint_applied (
+                    id TEXT PRIMARY KEY,
+                    minter TEXT NOT NULL,
+                    contract_address TEXT NOT NULL,
+                    quantity INTEGER NOT NULL,
+                    minted_at INTEGER NOT NULL,
+                    is_early_mint BOOLEAN NOT NULL,
+                    collection_deployed_at INTEGER
+                )
+            """),
+            text("""
+                CREATE INDEX IF NOT EXISTS agent_early_mint_applied_minted_at_idx
+                    ON agent_early_mint_applied (minted_at)
+            """),
+            AGENT_STATE_DDL,
+        ]
+
+        with self.Session() as session:
+            self._set_local_timeout(session, "ensure_early_mint_counter_tables")
+            for statement in statements:
+                session.execute(statement)
+            session.commit()
+
+    def get_early_mint_counter_cursor(self) -> Optional[Tuple[int, str]]:
+        """(minted_at, id) of the last mint folded into the counters"""
+        query = text("SELECT value FROM agent_state WHERE key = :key")
+
+        # Read from the primary: the cursor must match the counters it guards
+        with self.Session() as session:
+            value = session.execute(query, {"key": EARLY_MINT_COUNTER_CURSOR_KEY}).scalar()
+        return tuple(json.loads(value)) if value else None
+
+    def get_mints_after(
+        self,
+        after: Optional[Tuple[int, str]] = None,
+        limit: int = 5000
+    ) -> List[Dict[str, Any]]:
+        """
+        Get scoring columns of mints in (minted_at, id) order
+        Pass the (minted_at, id) of the last row of a page as `after` to continue
+        """
+        # The plain minted_at bound is implied by the row comparison, but only
+        # it can prune partitions
+        keyset = (
+            "WHERE m.minted_at >= :after_minted_at AND (m.minted_at, m.id) > (:after_minted_at, :after_id)"
+            if after else ""
+        )
+        query = text(f"""
+            SELECT 
+                m.id,
+                m.minter,
+                m.contract_address,
+                m.quantity,
+                m.minted_at,
+                m.is_early_mint,
+                m.collection_deployed_at
+            FROM {self.mint_table} m
+            {keyset}
+            ORDER BY m.minted_at ASC, m.id ASC
+            LIMIT :limit
+        """)
+
+        params = {"limit": limit}
+        if after:
+            params["after_minted_at"], params["after_id"] = after
+
+        with self._read_session("get_mints_after") as session:
+            result = session.execute(query, params)
+            return [dict(row._mapping) for row in result]
+
+    def get_mints_between(self, since: int, through: Tuple[int, str]) -> List[Dict[str, Any]]:
+        """
+        Get scoring columns of mints with minted_at >= since, up to and
+        including the (minted_at, id) position `through`
+        """
+        query = text(f"""
+            SELECT 
+                m.id,
+                m.minter,
+                m.contract_address,
+                m.quantity,
+                m.minted_at,
+                m.is_early_mint,
+                m.collection_deployed_at
+            FROM {self.mint_table} m
+            WHERE m.minted_at >= :since
+              AND m.minted_at <= :through_minted_at
+              AND (m.minted_at, m.id) <= (:through_minted_at, :through_id)
+        """)
+
+        # The primary, like the cursor and ledger it is compared with
+        with self.Session() as session:
+            self._set_local_timeout(session, "get_mints_between")
+            result = session.execute(query, {
+                "since": since,
+                "through_minted_at": through[0],
+                "through_id": through[1],
+            })
+            return [dict(row._mapping) for row in result]
+
+    def get_applied_early_mints(self, since: int) -> Dict[str, Dict[str, Any]]:
+        """Mints counted into the counters with minted_at >= since, by id"""
+        query = text(f"""
+            SELECT {", ".join(EARLY_MINT_APPLIED_COLUMNS)}
+            FROM agent_early_mint_applied
+            WHERE minted_at >= :since
+        """)
+
+        with self.Session() as session:
+            result = session.execute(query, {"since": since})
+            return {row.id: dict(row._mapping) for row in result}
+
+    def apply_early_mint_counters(
+        self,
+        deltas: Dict[str, Dict[str, int]],
+        cursor: Tuple[int, str],
+        applied: Iterable[Dict[str, Any]] = (),
+        removed: Iterable[str] = (),
+        horizon: Optional[int] = None,
+        recheck_last_minted: Iterable[str] = ()
+    ):
+        """
+        Add per-minter counter deltas (negative to subtract) and advance the
+        cursor in one transaction, recording the `applied` mints and
+        forgetting the `removed` ids and every recorded mint older than horizon.
+        last_minted_at only moves forward; recheck_last_minted re-reads it
+        from zora_mint for minters that lost a mint
+        """
+        columns = ", ".join(EARLY_MINT_COUNTER_COLUMNS)
+        values = ", ".join(f":{c}" for c in EARLY_MINT_COUNTER_COLUMNS)
+        increments = ",\n                ".join(
+            f"{c} = agent_early_mint_counter.{c} + EXCLUDED.{c}"
+            for c in EARLY_MINT_COUNTER_COLUMNS
+        )
+        upsert = text(f"""
+            INSERT INTO agent_early_mint_counter (minter, {columns}, last_minted_at, updated_at)
+            VALUES (:minter, {values}, :last_minted_at, EXTRACT(EPOCH FROM NOW()))
+            ON CONFLICT (minter) DO UPDATE SET
+                {increments},
+                last_minted_at = GREATEST(agent_early_mint_counter.last_minted_at, EXCLUDED.last_minted_at),
+                updated_at = EXCLUDED.updated_at
+        """)
+        recheck = text("""
+            UPDATE agent_early_mint_counter c
+            SET last_minted_at = (SELECT MAX(m.minted_at) FROM zora_mint m WHERE m.minter = c.minter)
+            WHERE c.minter = ANY(:minters)
+        """)
+        record = text(f"""
+            INSERT INTO agent_early_mint_applied ({", ".join(EARLY_MINT_APPLIED_COLUMNS)})
+            VALUES ({", ".join(":" + c for c in EARLY_MINT_APPLIED_COLUMNS)})
+            ON CONFLICT (id) DO NOTHING
+        """)
+        save_cursor = text("""
+            INSERT INTO agent_state (key, value)
+            VALUES (:key, :value)
+            ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value
+        """)
+
+        rows = [{"minter": minter, "last_minted_at": None, **counters} for minter, counters in deltas.items()]
+        recheck_last_minted = sorted(recheck_last_minted)
+        applied = [
+            {**{c: mint.get(c) for c in EARLY_MINT_APPLIED_COLUMNS}, "is_early_mint": bool(mint.get("is_early_mint"))}
+            for mint in applied
+        ]
+        removed = list(removed)
+        with self.Session() as session:
+            if rows:
+                session.execute(upsert, rows)
+            if recheck_last_minted:
+                session.execute(recheck, {"minters": recheck_last_minted})
+            if removed:
+                session.execute(
+                    text("DELETE FROM agent_early_mint_applied WHERE id = ANY(:ids)"),
+                    {"ids": removed}
+                )
+            if applied:
+                session.execute(record, applied)
+            if horizon is not None:
+                session.execute(
+                    text("DELETE FROM agent_early_mint_applied WHERE minted_at < :horizon"),
+                    {"horizon": horizon}
+                )
+            session.execute(save_cursor, {
+                "key": EARLY_MINT_COUNTER_CURSOR_KEY,
+                "value": json.dumps(list(cursor)),
+            })
+            session.commit()
+
+    def reset_early_mint_counters(self):
+        """Clear all counters and their cursor"""
+        with self.Session() as session:
+            session.execute(text("TRUNCATE agent_early_mint_counter, agent_early_mint_applied"))
+            session.execute(
+                text("DELETE FROM agent_state WHERE key = :key"),
+                {"key": EARLY_MINT_COUNTER_CURSOR_KEY}
+            )
+            session.commit()
+
+    def get_mint_counters_for_accounts(self, addresses: List[str]) -> Dict[str, Dict[str, int]]:
+        """
+        Summed counters for many accounts, including their linked wallets
+        (the same ownership rule as get_mints_for_accounts), with the latest
+        last_minted_at among them for score decay
+        Returns {address: counters}; accounts without mints get zeros
+        """
+        addresses = [a.lower() for a in addresses]
+        if not addresses:
+            return {}
+
+        sums = ",\n                ".join(
+            f"COALESCE(SUM(c.{col}), 0) AS {col}" for col in EARLY_MINT_COUNTER_COLUMNS
+        )
+        query = text(f"""
+            SELECT 
+                owner.account_id,
+                {sums},
+                MAX(c.last_minted_at) AS last_minted_at
+            FROM (
+                SELECT a AS account_id, a AS minter
+                FROM unnest(CAST(:addresses AS TEXT[])) AS a
+                UNION ALL
+                SELECT lw.main_account_id, lw.address
+                FROM linked_wallet lw
+                WHERE lw.main_account_id = ANY(:addresses)
+            ) owner
+            JOIN agent_early_mint_counter c ON c.minter = owner.minter
+            GROUP BY owner.account_id
+        """)
+
+        counters = {
+            a: {**{col: 0 for col in EARLY_MINT_COUNTER_COLUMNS}, "last_minted_at": None}
+            for a in addresses
+        }
+        with self._read_session("get_mint_counters_for_accounts") as session:
+            result = session.execute(query, {"addresses": addresses})
+            for row in result:
+                values = dict(row._mapping)
+                account_id = values.pop("account_id")
+                counters[account_id] = {k: None if v is None else int(v) for k, v in values.items()}
+        return counters
+
+    def get_early_minters_from_counters(
+        self,
+        window: str = "24h",
+        limit: Optional[int] = 100,
+        after: Optional[Tuple[int, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Early-minter report from the counters table, ranked by quantity
+        minted within `window` ("1h", "24h" or "7d") of collection deploy
+        Pass (quantity, minter) of the last row of a page as `after` to continue
+        """
+        column = f"quantity_{window}"
+        if column not in EARLY_MINT_COUNTER_COLUMNS:
+            raise ValueError(f"Unknown early-mint window: {window}")
+
+        keyset = f"AND ({column}, minter) < (:after_quantity, :after_minter)" if after else ""
+        query = text(f"""
+            SELECT 
+                minter,
+                early_mint_count,
+                early_quantity AS total_early_quantity,
+                {column} AS window_quantity
+            FROM agent_early_mint_counter
+            WHERE {column} > 0
+            {keyset}
+            ORDER BY {column} DESC, minter DESC
             LIMIT :limit
         """)
 
+        params = {"limit": limit}
+        if after:
+            params["after_quantity"], params["after_minter"] = after
+
+        with self._read_session("get_early_minters_from_counters") as session:
+            result = session.execute(query, params)
+            return [dict(row._mapping) for row in result]
+
+    def ensure_agent_state_table(self):
+        """Create the agent's key/value state table if missing"""
+        with self.Session() as session:
+            session.execute(AGENT_STATE_DDL)
+            session.commit()
+
+    def get_agent_state(self, prefix: str) -> Dict[str, str]:
+        """All agent_state entries whose key starts with prefix"""
+        query = text("SELECT key, value FROM agent_state WHERE key LIKE :pattern")
+        pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+        with self.Session() as session:
+            result = session.execute(query, {"pattern": pattern})
+            return {row.key: row.value for row in result}
+
+    @staticmethod
+    def _address_range(
+        column: str,
+        lo: Optional[str],
+        hi: Optional[str],
+        placeholders: Tuple[str, str] = (":lo", ":hi")
+    ) -> str:
+        """SQL predicate for lo <= column < hi, open-ended when a bound is None"""
+        clauses = []
+        if lo is not None:
+            clauses.append(f"{column} >= {placeholders[0]}")
+        if hi is not None:
+            clauses.append(f"{column} < {placeholders[1]}")
+        return " AND ".join(clauses) or "TRUE"
+
+    def get_score_history_chunk(
+        self,
+        lo: Optional[str],
+        hi: Optional[str]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Scoring history inputs for accounts with lo <= id < hi:
+        (accounts, linked wallets, mints tagged with account_id and minter)
+        Mints come ordered by account_id, minted_at
+        """
+        accounts_query = text(f"""
+            SELECT id, first_tx_timestamp
+            FROM account
+            WHERE {self._address_range("id", lo, hi)}
+            ORDER BY id
+        """)
+        linked_query = text(f"""
+            SELECT main_account_id, address, linked_at, first_tx_timestamp
+            FROM linked_wallet
+            WHERE {self._address_range("main_account_id", lo, hi)}
+        """)
+        mints_query = text(f"""
+            SELECT 
+                owner.account_id,
+                m.minter,
+                m.contract_address,
+                m.quantity,
+                m.minted_at,
+                m.is_early_mint,
+                m.collection_deployed_at
+            FROM (
+                SELECT a.id AS account_id, a.id AS minter
+                FROM account a
+                WHERE {self._address_range("a.id", lo, hi)}
+                UNION ALL
+                SELECT lw.main_account_id, lw.address
+                FROM linked_wallet lw
+                WHERE {self._address_range("lw.main_account_id", lo, hi)}
+            ) owner
+            JOIN zora_mint m ON m.minter = owner.minter
+            ORDER BY owner.account_id, m.minted_at
+        """)
+
+        params = {"lo": lo, "hi": hi}
+        with self._read_session("get_score_history_chunk", repeatable_read=True) as session:
+            accounts = [dict(row._mapping) for row in session.execute(accounts_query, params)]
+            linked = [dict(row._mapping) for row in session.execute(linked_query, params)]
+            mints = [dict(row._mapping) for row in session.execute(mints_query, params)]
+        return accounts, linked, mints
+
+    def insert_score_snapshots(
+        self,
+        rows: Iterable[Tuple[str, str, int, str, int]],
+        state_key: str,
+        state_value: str
+    ) -> int:
+        """
+        Bulk-load backfilled score_snapshot rows (id, account_id, score, tier,
+        timestamp) through a COPY into a staging table and record state_key
+        as done, in one transaction. The indexer writes the same table (and
+        the same address-timestamp ids) from ScoreUpdated events, so existing
+        rows always win: nothing is deleted or overwritten.
+        Returns the number of rows inserted
+        """
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write("\t".join(str(value) for value in row))
+            buffer.write("\n")
+        buffer.seek(0)
+
+        insert = """
+            INSERT INTO score_snapshot (id, account_id, score, tier, timestamp)
+            SELECT id, account_id, score, tier, timestamp
+            FROM score_snapshot_staging
+            ON CONFLICT (id) DO NOTHING
+        """
+        save_state = """
+            INSERT INTO agent_state (key, value)
+            VALUES (%(key)s, %(value)s)
+            ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value
+        """
+
+        # A primary connection defaults to the short write timeout; a chunk's
+        # COPY and INSERT need the longer one, for this transaction only
+        connection = self.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(
+                "SELECT set_config('statement_timeout', %(timeout)s, true)",
+                {"timeout": str(int(self.query_timeouts_ms["insert_score_snapshots"]))}
+            )
+            cursor.execute(
+                "CREATE TEMP TABLE score_snapshot_staging "
+                "(LIKE score_snapshot INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+            cursor.copy_expert(
+                "COPY score_snapshot_staging (id, account_id, score, tier, timestamp) FROM STDIN",
+                buffer
+            )
+            cursor.execute(insert)
+            inserted = cursor.rowcount
+            cursor.execute(save_state, {"key": state_key, "value": state_value})
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+        return inserted
+
+    def get_mint_watermark(self) -> int:
+        """Latest minted_at in zora_mint (0 if empty)"""
+        query = text(f"SELECT COALESCE(MAX(minted_at), 0) AS watermark FROM {self.mint_table}")
+
+        with self._read_session("get_mint_watermark") as session:
+            return session.execute(query).scalar() or 0
+
+    def get_mints_since(self, since: int) -> List[Dict[str, Any]]:
+        """Id, minter and minted_at of every mint with minted_at after `since`"""
+        query = text(f"""
+            SELECT 
+                id,
+                minter,
+                minted_at
+            FROM {self.mint_table}
+            WHERE minted_at > :since
+        """)
+
+        with self._read_session("get_mints_since") as session:
+            result = session.execute(query, {"since": since})
+            return [dict(row._mapping) for row in result]
+
+    def install_mint_notify_trigger(self, channel: str):
+        """
+        Create (or replace) a trigger that NOTIFYs `channel` with the minter
+        address on every zora_mint insert. Opt-in: it adds a small cost to
+        each insert on the indexer side.
+        """
+        statements = [
+            text(f"""
+                CREATE OR REPLACE FUNCTION notify_zora_mint_inserted() RETURNS trigger AS $$
+                BEGIN
+                    PERFORM pg_notify('{channel}', NEW.minter);
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql
+            """),
+            text("DROP TRIGGER IF EXISTS zora_mint_notify ON zora_mint"),
+            text("""
+                CREATE TRIGGER zora_mint_notify
+                AFTER INSERT ON zora_mint
+                FOR EACH ROW EXECUTE FUNCTION notify_zora_mint_inserted()
+            """),
+        ]
+
+        with self.Session() as session:
+            self._set_local_timeout(session, "install_mint_notify_trigger")
+            for statement in statements:
+                session.execute(statement)
+            session.commit()
+        logger.info(f"Installed zora_mint NOTIFY trigger on channel '{channel}'")
+
+    def listen(self, channel: str):
+        """
+        Open a dedicated autocommit connection LISTENing on `channel`
+        The caller owns the returned DBAPI connection and must close it
+        """
+        connection = self.engine.raw_connection()
+        connection.driver_connection.autocommit = True
+        cursor = connection.cursor()
+        cursor.execute(f'LISTEN "{channel}"')
+        cursor.close()
+        return connection
+
+    def poll_notifications(self, connection, timeout: float) -> Set[str]:
+        """
+        Wait up to `timeout` seconds on a LISTEN connection
+        Returns the distinct payloads (minter addresses) received
+        """
+        driver = connection.driver_connection
+        if not driver.notifies:
+            ready, _, _ = select.select([driver], [], [], timeout)
+            if not ready:
+                return set()
+            driver.poll()
+
+        payloads = {n.payload.lower() for n in driver.notifies if n.payload}
+        driver.notifies.clear()
+        return payloads
+
+    def get_indexes(self, tables: List[str]) -> List[Dict[str, Any]]:
+        """
+        Indexes on the given tables (as resolved by search_path): key columns
+        in order, partial-index predicate and whether the index is valid
+        Expression key columns appear as empty strings
+        """
+        query = text("""
+            SELECT 
+                t.relname AS table_name,
+                c.relname AS index_name,
+                i.indisvalid AS valid,
+                pg_get_expr(i.indpred, i.indrelid) AS predicate,
+                ARRAY(
+                    SELECT COALESCE(a.attname::text, '')
+                    FROM generate_series(0, i.indnkeyatts - 1) AS k(n)
+                    LEFT JOIN pg_attribute a
+                        ON a.attrelid = i.indrelid AND a.attnum = i.indkey[k.n]
+                    ORDER BY k.n
+                ) AS columns
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            JOIN pg_class t ON t.oid = i.indrelid
+            WHERE t.relname = ANY(:tables)
+              AND pg_table_is_visible(t.oid)
+        """)
+
+        # The primary: a build in progress shows there first
         with self.Session() as session:
-            result = session.execute(query, {"limit": limit})
+            result = session.execute(query, {"tables": tables})
             return [dict(row._mapping) for row in result]
+
+    def explain(self, query, params: Dict[str, Any], allow_seqscan: bool = True) -> Any:
+        """
+        EXPLAIN (FORMAT JSON) of a read, without running it
+        With allow_seqscan=False the planner avoids sequential scans wherever
+        an index can answer the query, so a Seq Scan left in the plan means
+        no usable index exists
+        """
+        with self.Session() as session:
+            try:
+                session.execute(text("SET TRANSACTION READ ONLY"))
+                if not allow_seqscan:
+                    session.execute(text("SET LOCAL enable_seqscan = off"))
+                plan = session.execute(text(f"EXPLAIN (FORMAT JSON) {query}"), params).scalar()
+            finally:
+                session.rollback()
+        return json.loads(plan) if isinstance(plan, str) else plan
+
+    def create_index_concurrently(self, statement: str, drop_invalid: Optional[str] = None):
+        """
+        Run a CREATE INDEX CONCURRENTLY statement outside a transaction and
+        without a statement timeout. drop_invalid first drops an index of
+        that name left INVALID by an earlier failed build. The session's
+        timeout is restored before the connection goes back to the pool.
+        """
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("SET statement_timeout = 0"))
+            try:
+                if drop_invalid:
+                    conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{drop_invalid}"'))
+                conn.execute(text(statement))
+            finally:
+                try:
+                    conn.execute(text("RESET statement_timeout"))
+                except Exception:
+                    # Never pool a connection left without a timeout
+                    conn.invalidate()
+                    raise
+
+    def ensure_mint_partitions(self, start: Optional[int] = None, months_ahead: int = 2) -> int:
+        """
+        Create the monthly-partitioned copy of zora_mint and its mirroring
+        trigger if missing, with a partition for every month from `start`
+        (default: the oldest mint) through months_ahead months from now.
+        Opt-in: the trigger adds a row write to every zora_mint change.
+        Returns the number of monthly partitions checked
+        """
+        with self.Session() as session:
+            self._set_local_timeout(session, "ensure_mint_partitions")
+            for statement in MINT_PARTITION_DDL:
+                session.execute(statement)
+            if start is None:
+                start = session.execute(text("SELECT MIN(minted_at) FROM zora_mint")).scalar()
+
+            now = int(time.time())
+            month_start, month_end = month_bounds(start or now)
+            _, last_end = month_bounds(now)
+            for _ in range(months_ahead):
+                _, last_end = month_bounds(last_end)
+
+            months = 0
+            while month_start < last_end:
+                name = f"{MINT_PARTITION_TABLE}_p{datetime.fromtimestamp(month_start, timezone.utc):%Y%m}"
+                session.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {MINT_PARTITION_TABLE} "
+                    f"FOR VALUES FROM ({month_start}) TO ({month_end})"
+                ))
+                months += 1
+                month_start, month_end = month_bounds(month_end)
+
+            # Mirror from here on; rows already in zora_mint come from the backfill
+            installed = session.execute(
+                text("SELECT 1 FROM pg_trigger WHERE tgname = 'zora_mint_mirror' AND NOT tgisinternal")
+            ).scalar()
+            if not installed:
+                for statement in MINT_MIRROR_DDL:
+                    session.execute(statement)
+            session.commit()
+
+        return months
+
+    def backfill_mint_partitions(self, batch_size: int = 50000, max_batches: Optional[int] = None) -> int:
+        """
+        Copy zora_mint rows into the partitioned table in (minted_at, id)
+        order, one committed batch at a time, resuming from the cursor in
+        agent_state. Rows the trigger already mirrored are skipped (a row
+        deleted by a reorg while its batch is being copied can survive it).
+        Returns the number of rows copied
+        """
+        columns = ", ".join(MINT_COLUMNS)
+        copy = text(f"""
+            WITH batch AS (
+                SELECT {columns}
+                FROM zora_mint
+                WHERE minted_at >= :after_minted_at
+                  AND (minted_at, id) > (:after_minted_at, :after_id)
+                ORDER BY minted_at, id
+                LIMIT :limit
+            ),
+            copied AS (
+                INSERT INTO {MINT_PARTITION_TABLE} ({columns})
+                SELECT {columns} FROM batch
+                ON CONFLICT (minted_at, id) DO NOTHING
+            )
+            SELECT minted_at, id, (SELECT COUNT(*) FROM batch) AS batch_rows
+            FROM batch
+            ORDER BY minted_at DESC, id DESC
+            LIMIT 1
+        """)
+        save = text("""
+            INSERT INTO agent_state (key, value) VALUES (:key, :value)
+            ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value
+        """)
+
+        self.ensure_agent_state_table()
+        state = self.get_agent_state(MINT_PARTITION_BACKFILL_KEY).get(MINT_PARTITION_BACKFILL_KEY)
+        if state == "done":
+            return 0
+        after = tuple(json.loads(state)) if state else (-1, "")
+
+        copied = batches = 0
+        while max_batches is None or batches < max_batches:
+            with self.Session() as session:
+                self._set_local_timeout(session, "backfill_mint_partitions")
+                last = session.execute(copy, {
+                    "after_minted_at": after[0], "after_id": after[1], "limit": batch_size
+                }).fetchone()
+                done = last is None or last.batch_rows < batch_size
+                if last is not None:
+                    after = (last.minted_at, last.id)
+                    copied += last.batch_rows
+                session.execute(save, {
+                    "key": MINT_PARTITION_BACKFILL_KEY,
+                    "value": "done" if done else json.dumps(list(after)),
+                })
+                session.commit()
+            batches += 1
+            if done:
+                logger.info(f"Mint partition backfill complete ({copied} rows this run)")
+                break
+            logger.info(f"Mint partition backfill at minted_at {after[0]} ({copied} rows this run)")
+        return copied
+
+    def use_mint_partitions(self) -> bool:
+        """
+        Read minted_at-bounded queries from the partitioned table, once its
+        backfill is complete. Returns whether it is in use
+        """
+        self.ensure_agent_state_table()
+        if self.get_agent_state(MINT_PARTITION_BACKFILL_KEY).get(MINT_PARTITION_BACKFILL_KEY) != "done":
+            logger.info("Mint partitions are not backfilled yet; reading zora_mint")
+            return False
+        self.mint_table = MINT_PARTITION_TABLE
+        logger.info(f"Reading recent mints from {MINT_PARTITION_TABLE}")
+        return True
@@ -0,0 +1,179 @@
+"""
+Per-minter mint counters maintained incrementally by the agent
+Timeliness scoring and the early-minter report read these instead of
+rescanning zora_mint
+"""
+
+import logging
+from typing import List, Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Buckets by time between collection deploy and mint
+WINDOWS = {
+    "1h": 3600,
+    "24h": 24 * 3600,
+    "7d": 7 * 24 * 3600,
+}
+
+COUNTER_COLUMNS = (
+    "mint_quantity",
+    "early_mint_count",
+    "early_quantity",
+    "quantity_1h",
+    "quantity_24h",
+    "quantity_7d",
+)
+
+
+def empty_counters() -> Dict[str, Any]:
+    """Zero deltas; last_minted_at (what score decay counts from) is a maximum, not a sum"""
+    return {**{column: 0 for column in COUNTER_COLUMNS}, "last_minted_at": None}
+
+
+def merge(deltas: Dict[str, Dict[str, Any]], other: Dict[str, Dict[str, Any]], sign: int = 1):
+    """
+    Add (sign=1) or subtract (sign=-1) other's counter deltas into deltas
+    A maximum cannot be subtracted: last_minted_at only merges on adds
+    """
+    for minter, counters in other.items():
+        target = deltas.setdefault(minter, empty_counters())
+        for column in COUNTER_COLUMNS:
+            target[column] += sign * counters[column]
+        if sign > 0 and counters["last_minted_at"] is not None:
+            target["last_minted_at"] = max(target["last_minted_at"] or 0, counters["last_minted_at"])
+
+
+class EarlyMintCounters:
+    """
+    Folds newly indexed mints into per-minter counters:
+    total quantity, early mint count/quantity (the scoring definition of
+    early), and quantity minted within each WINDOWS bucket of deploy.
+    Progress is a (minted_at, id) cursor stored with the counters, so a
+    batch and its cursor move together and a crash never double counts.
+
+    Base and Zora are indexed side by side, so a mint from the lagging chain
+    can be inserted behind the cursor, and a reorg can delete a mint already
+    counted. The ids of mints counted within overlap_seconds of the cursor
+    are kept with the counters; each update compares them with zora_mint
+    over that window, counts the mints that are new and subtracts the ones
+    that are gone.
+    """
+
+    def __init__(self, db, calculator, batch_size: int = 5000, overlap_seconds: int = 900):
+        self.db = db
+        self.calculator = calculator
+        self.batch_size = batch_size
+        self.overlap_seconds = overlap_seconds
+
+    def aggregate(self, mints: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Per-minter counter deltas for a batch of mint rows"""
+        deltas: Dict[str, Dict[str, Any]] = {}
+        index = self.calculator.collection_index
+
+        for mint in mints:
+            quantity = mint.get("quantity", 1)
+            counters = deltas.setdefault(mint["minter"], empty_counters())
+            counters["mint_quantity"] += quantity
+            minted_at = mint.get("minted_at")
+            if minted_at and (counters["last_minted_at"] is None or minted_at > counters["last_minted_at"]):
+                counters["last_minted_at"] = minted_at
+
+            if mint.get("is_early_mint") or self.calculator._is_early_mint(mint):
+                counters["early_mint_count"] += 1
+                counters["early_quantity"] += quantity
+
+            deployed_at = mint.get("collection_deployed_at")
+            if deployed_at is None and index is not None:
+                deployed_at = index.get_deployed_at(mint.get("contract_address"))
+            if deployed_at is None or mint.get("minted_at") is None:
+                continue
+
+            since_deploy = mint["minted_at"] - deployed_at
+            if since_deploy < 0:
+                continue
+            for name, window in WINDOWS.items():
+                if since_deploy < window:
+                    counters[f"quantity_{name}"] += quantity
+
+        return deltas
+
+    def update(self, max_batches: Optional[int] = None) -> int:
+        """
+        Fold every mint past the stored cursor into the counters, then
+        reconcile the overlap window behind it
+        Returns the number of mint rows processed
+        """
+        cursor = self.db.get_early_mint_counter_cursor()
+        processed = 0
+        batches = 0
+
+        while max_batches is None or batches < max_batches:
+            mints = self.db.get_mints_after(after=cursor, limit=self.batch_size)
+            if not mints:
+                break
+
+            cursor = (mints[-1]["minted_at"], mints[-1]["id"])
+            horizon = cursor[0] - self.overlap_seconds
+            self.db.apply_early_mint_counters(
+                self.aggregate(mints),
+                cursor,
+                applied=[mint for mint in mints if mint["minted_at"] >= horizon],
+                horizon=horizon
+            )
+            processed += len(mints)
+            batches += 1
+
+            if len(mints) < self.batch_size:
+                break
+
+        if processed:
+            logger.info(f"Early-mint counters: folded in {processed} mints")
+        if cursor is not None:
+            processed += self.reconcile(cursor)
+        return processed
+
+    def reconcile(self, cursor: Tuple[int, str]) -> int:
+        """
+        Count mints indexed behind the cursor since they were passed, and
+        subtract counted mints that are no longer indexed, within
+        overlap_seconds of the cursor. Returns the number of mints changed
+        """
+        since = cursor[0] - self.overlap_seconds
+        indexed = {mint["id"]: mint for mint in self.db.get_mints_between(since, cursor)}
+        applied = self.db.get_applied_early_mints(since)
+
+        late = [
+            mint for mint_id, mint in indexed.items()
+            if mint_id not in applied or applied[mint_id]["minted_at"] != mint["minted_at"]
+        ]
+        gone = [
+            mint for mint_id, mint in applied.items()
+            if mint_id not in indexed or indexed[mint_id]["minted_at"] != mint["minted_at"]
+        ]
+        if not late and not gone:
+            return 0
+
+        deltas = self.aggregate(late)
+        merge(deltas, self.aggregate(gone), sign=-1)
+        self.db.apply_early_mint_counters(
+            deltas,
+            cursor,
+            applied=late,
+            removed=[mint["id"] for mint in gone],
+            horizon=since,
+            recheck_last_minted={mint["minter"] for mint in gone}
+        )
+        logger.info(
+            f"Early-mint counters: {len(late)} late mints counted, "
+            f"{len(gone)} removed mints subtracted"
+        )
+        return len(late) + len(gone)
+
+    def rebuild(self) -> int:
+        """
+        Recount from scratch, e.g. after is_early_mint was backfilled on
+        historical rows that were already counted
+        """
+        self.db.reset_early_mint_counters()
+        return self.update()
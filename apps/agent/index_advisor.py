@@ -0,0 +1,305 @@
+"""
+Index advisor for the agent's queries
+Ponder creates only primary keys, so the agent's filters on zora_mint,
+linked_wallet and account need indexes of their own (migrations/*.sql).
+At startup the advisor checks that each required index exists and is valid,
+and EXPLAINs a probe of every hot access path with sequential scans disabled:
+a Seq Scan that survives means no index can answer it. Problems are logged
+as errors (INDEX_CHECK=warn) or stop the agent (INDEX_CHECK=fail);
+APPLY_INDEX_MIGRATIONS=true builds missing indexes CONCURRENTLY first.
+
+Usage: python index_advisor.py check [--json]
+       python index_advisor.py migrate [--dry-run]
+"""
+
+import os
+import re
+import sys
+import json
+import logging
+import argparse
+from typing import List, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Mirrors migrations/001_analytics_indexes.sql and 002_agent_query_indexes.sql
+REQUIRED_INDEXES: List[Dict[str, Any]] = [
+    {
+        "name": "account_score_keyset_idx",
+        "table": "account",
+        "key": "total_score DESC, id DESC",
+        "include": "tier, base_score, zora_score, timely_score",
+        "used_by": "get_top_accounts, iter_top_accounts",
+    },
+    {
+        "name": "zora_mint_minter_timeliness_idx",
+        "table": "zora_mint",
+        "key": "minter",
+        "include": "quantity, is_early_mint, minted_at, collection_deployed_at",
+        "used_by": "get_mints_for_accounts, rank_early_minters, get_update_candidates",
+    },
+    {
+        "name": "zora_mint_minted_at_idx",
+        "table": "zora_mint",
+        "key": "minted_at, id",
+        "used_by": "get_update_candidates, get_mints_since, get_mints_after",
+    },
+    {
+        "name": "linked_wallet_main_account_idx",
+        "table": "linked_wallet",
+        "key": "main_account_id",
+        "include": "address",
+        "used_by": "get_mints_for_accounts, get_linked_wallets_for_accounts",
+    },
+    {
+        "name": "account_last_updated_idx",
+        "table": "account",
+        "key": "last_updated",
+        "used_by": "get_update_candidates, get_accounts_needing_update",
+    },
+    {
+        "name": "zora_mint_missing_deploy_time_idx",
+        "table": "zora_mint",
+        "key": "id",
+        "where": "collection_deployed_at IS NULL",
+        "used_by": "get_mints_missing_deploy_time",
+    },
+]
+
+# One probe per access path the cycle depends on: the filter and ordering
+# of the real query, with representative parameters
+PLAN_PROBES: List[Dict[str, Any]] = [
+    {
+        "name": "mints by minter",
+        "sql": "SELECT quantity, minted_at FROM zora_mint WHERE minter = ANY(:addresses)",
+        "params": {"addresses": ["0x0000000000000000000000000000000000000001"]},
+    },
+    {
+        "name": "recent mints",
+        "sql": "SELECT id, minter, minted_at FROM zora_mint WHERE minted_at > :since",
+        "params": {"since": 2 ** 31 - 1},
+    },
+    {
+        "name": "mint keyset page",
+        "sql": "SELECT id FROM zora_mint WHERE (minted_at, id) > (:after_minted_at, :after_id) "
+               "ORDER BY minted_at, id LIMIT 1000",
+        "params": {"after_minted_at": 0, "after_id": ""},
+    },
+    {
+        "name": "linked wallets of accounts",
+        "sql": "SELECT address FROM linked_wallet WHERE main_account_id = ANY(:addresses)",
+        "params": {"addresses": ["0x0000000000000000000000000000000000000001"]},
+    },
+    {
+        "name": "stalest accounts",
+        "sql": "SELECT id FROM account WHERE last_updated < :before ORDER BY last_updated LIMIT 500",
+        "params": {"before": 0},
+    },
+    {
+        "name": "top accounts",
+        "sql": "SELECT id, total_score FROM account ORDER BY total_score DESC, id DESC LIMIT 100",
+        "params": {},
+    },
+]
+
+
+def key_columns(spec: Dict[str, Any]) -> List[str]:
+    """Column names of an index key, without ordering options"""
+    return [part.split()[0] for part in spec["key"].split(",")]
+
+
+def _normalize_predicate(predicate: Optional[str]) -> Optional[str]:
+    if predicate is None:
+        return None
+    return re.sub(r"\s+", " ", predicate.replace("(", " ").replace(")", " ")).strip().lower()
+
+
+def create_statement(spec: Dict[str, Any]) -> str:
+    """CREATE INDEX CONCURRENTLY statement for a required index"""
+    statement = f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {spec['name']} ON {spec['table']} ({spec['key']})"
+    if spec.get("include"):
+        statement += f" INCLUDE ({spec['include']})"
+    if spec.get("where"):
+        statement += f" WHERE {spec['where']}"
+    return statement
+
+
+def serves(spec: Dict[str, Any], index: Dict[str, Any]) -> bool:
+    """
+    Whether an existing index can stand in for spec: same table, the required
+    columns as a prefix of its key and the same partial predicate (if any)
+    """
+    columns = key_columns(spec)
+    return (
+        index["table_name"] == spec["table"]
+        and list(index["columns"][:len(columns)]) == columns
+        and _normalize_predicate(index["predicate"]) == _normalize_predicate(spec.get("where"))
+    )
+
+
+def find_index(spec: Dict[str, Any], indexes: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    The existing index for spec, valid ones first, whatever its name; failing
+    that, an index that took spec's name but does not serve it
+    """
+    matches = [index for index in indexes if serves(spec, index)]
+    matches.sort(key=lambda index: (not index["valid"], index["index_name"] != spec["name"]))
+    if matches:
+        return matches[0]
+    return next((index for index in indexes if index["index_name"] == spec["name"]), None)
+
+
+def seq_scans(plan: Any, tables: List[str]) -> List[str]:
+    """Relations among `tables` read by a Seq Scan anywhere in an EXPLAIN (FORMAT JSON) plan"""
+    found = []
+    nodes = [entry["Plan"] for entry in plan] if isinstance(plan, list) else [plan["Plan"]]
+    while nodes:
+        node = nodes.pop()
+        if node.get("Node Type") == "Seq Scan" and node.get("Relation Name") in tables:
+            found.append(node["Relation Name"])
+        nodes.extend(node.get("Plans", []))
+    return sorted(found)
+
+
+class IndexAdvisor:
+    """Checks (and optionally creates) the indexes the agent's queries need"""
+
+    def __init__(self, db, required: Optional[List[Dict[str, Any]]] = None, probes: Optional[List[Dict[str, Any]]] = None):
+        self.db = db
+        self.required = REQUIRED_INDEXES if required is None else required
+        self.probes = PLAN_PROBES if probes is None else probes
+
+    def check_indexes(self) -> List[Dict[str, Any]]:
+        """Required indexes that are missing or invalid: [{"spec", "problem", "index"}]"""
+        tables = sorted({spec["table"] for spec in self.required})
+        indexes = self.db.get_indexes(tables)
+
+        problems = []
+        for spec in self.required:
+            index = find_index(spec, indexes)
+            if index is None:
+                problems.append({"spec": spec, "problem": "missing", "index": None})
+            elif not index["valid"]:
+                problems.append({"spec": spec, "problem": "invalid", "index": index["index_name"]})
+            elif not serves(spec, index):
+                problems.append({"spec": spec, "problem": "mismatched", "index": index["index_name"]})
+        return problems
+
+    def check_plans(self) -> List[Dict[str, Any]]:
+        """Probes whose plan still reads a checked table sequentially"""
+        tables = sorted({spec["table"] for spec in self.required})
+        problems = []
+        for probe in self.probes:
+            try:
+                plan = self.db.explain(probe["sql"], probe["params"], allow_seqscan=False)
+            except Exception as e:
+                problems.append({"probe": probe["name"], "error": str(e)})
+                continue
+            scanned = seq_scans(plan, tables)
+            if scanned:
+                problems.append({"probe": probe["name"], "seq_scans": scanned})
+        return problems
+
+    def apply(self, problems: List[Dict[str, Any]], dry_run: bool = False) -> List[str]:
+        """Build the missing and invalid indexes one by one; returns the statements"""
+        statements = []
+        for problem in problems:
+            if problem["problem"] not in ("missing", "invalid"):
+                continue
+            spec = problem["spec"]
+            statement = create_statement(spec)
+            statements.append(statement)
+            if dry_run:
+                continue
+
+            logger.info(f"Creating index {spec['name']} on {spec['table']} (concurrently)...")
+            drop = problem["index"] if problem["problem"] == "invalid" else None
+            self.db.create_index_concurrently(statement, drop_invalid=drop)
+            logger.info(f"Created index {spec['name']}")
+        return statements
+
+    def check(self, apply: bool = False) -> Dict[str, Any]:
+        """Full check; with apply=True, fixes what it can and checks again"""
+        indexes = self.check_indexes()
+        if apply and indexes:
+            self.apply(indexes)
+            indexes = self.check_indexes()
+        return {"indexes": indexes, "plans": self.check_plans()}
+
+
+def log_report(report: Dict[str, Any]) -> bool:
+    """Log every problem in a check report; True if there were none"""
+    for problem in report["indexes"]:
+        spec = problem["spec"]
+        detail = f" ({problem['index']})" if problem["index"] else ""
+        logger.error(
+            f"Index {spec['name']} on {spec['table']} ({spec['key']}) is {problem['problem']}{detail}; "
+            f"{spec['used_by']} will scan {spec['table']} sequentially"
+        )
+    for problem in report["plans"]:
+        if "error" in problem:
+            logger.error(f"Could not plan '{problem['probe']}': {problem['error']}")
+        else:
+            logger.error(
+                f"Query '{problem['probe']}' has no usable index: "
+                f"sequential scan of {', '.join(problem['seq_scans'])}"
+            )
+
+    ok = not report["indexes"] and not report["plans"]
+    if ok:
+        logger.info(f"All {len(REQUIRED_INDEXES)} required indexes present; query plans use them")
+    return ok
+
+
+def ensure_indexes(db, mode: str = "warn", apply: bool = False) -> bool:
+    """
+    Startup check. mode "warn" logs problems, "fail" raises RuntimeError on
+    them, "off" skips the check
+    """
+    if mode == "off":
+        return True
+    if mode not in ("warn", "fail"):
+        raise ValueError(f"Unknown index check mode: {mode}")
+
+    ok = log_report(IndexAdvisor(db).check(apply=apply))
+    if not ok and mode == "fail":
+        raise RuntimeError(
+            "Required indexes are missing or unusable; run `python index_advisor.py migrate` "
+            "or set APPLY_INDEX_MIGRATIONS=true"
+        )
+    return ok
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Check or create the indexes the agent's queries need")
+    sub = parser.add_subparsers(dest="command", required=True)
+    check = sub.add_parser("check", help="Report missing indexes and sequential-scan plans")
+    check.add_argument("--json", action="store_true", help="Print results as JSON")
+    migrate = sub.add_parser("migrate", help="Create missing indexes CONCURRENTLY")
+    migrate.add_argument("--dry-run", action="store_true", help="Print the statements without running them")
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    from database import Database
+
+    load_dotenv()
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), format="%(asctime)s [%(levelname)s] %(message)s")
+    advisor = IndexAdvisor(Database(os.getenv("DATABASE_URL")))
+
+    if args.command == "migrate":
+        for statement in advisor.apply(advisor.check_indexes(), dry_run=args.dry_run):
+            print(statement + ";")
+    report = advisor.check()
+
+    if getattr(args, "json", False):
+        json.dump(report, sys.stdout, indent=2, default=str)
+        sys.stdout.write("\n")
+        ok = not report["indexes"] and not report["plans"]
+    else:
+        ok = log_report(report)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
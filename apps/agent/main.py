@@ -4,14 +4,28 @@ Autonomous score calculation and on-chain updates using CDP AgentKit
 """
 
 import os
+import sys
 import time
+import signal
 import logging
 import schedule
 from dotenv import load_dotenv
 
-from database import Database
+from database import Database, month_bounds
 from score_calculator import ScoreCalculator
+from scoring_rules import load_rules
 from chain_writer import ChainWriter
+from collection_index import CollectionIndex
+from cycle_journal import CycleJournal, STATUS_SCORED, STATUS_SUBMITTED
+from rpc_client import RpcClient
+from confirmation_tracker import ConfirmationTracker
+from scheduler import PriorityScheduler
+from mint_trigger import MintTrigger, MicroBatchPolicy, MINT_CHANNEL
+from early_mint_counters import EarlyMintCounters
+from update_buffer import UpdateBuffer
+from profiler import CycleProfiler
+from index_advisor import ensure_indexes
+from score_service import ScoreCache, ScoreService
 
 # Load environment
 load_dotenv()
@@ -34,73 +48,419 @@ class BaseRankAgent:
     """
 
     def __init__(self):
-        self.db = Database(os.getenv("DATABASE_URL"))
-        self.calculator = ScoreCalculator()
+        self.db = Database(
+            os.getenv("DATABASE_URL"),
+            replica_url=os.getenv("DATABASE_REPLICA_URL") or None,
+            read_timeout_ms=int(os.getenv("DB_READ_TIMEOUT_MS", "15000")),
+            write_timeout_ms=int(os.getenv("DB_WRITE_TIMEOUT_MS", "5000")),
+            max_replica_lag_seconds=float(os.getenv("DB_MAX_REPLICA_LAG_SECONDS", "30"))
+        )
+        # How far one chain's rows can trail the other's in the index
+        self.chain_index_lag_seconds = int(os.getenv("CHAIN_INDEX_LAG_SECONDS", "900"))
+        self.collections = CollectionIndex(overlap_seconds=self.chain_index_lag_seconds)
+        rules_path = os.getenv("SCORING_RULES_PATH")
+        self.calculator = ScoreCalculator(
+            collection_index=self.collections,
+            rules=load_rules(rules_path) if rules_path else None
+        )
+        if rules_path:
+            logger.info(f"Loaded scoring rules from {rules_path}")
+        # Shared pooled RPC client for chain reads and receipt polling
+        rpc_url = os.getenv("RPC_URL")
+        self.rpc = RpcClient(rpc_url) if rpc_url else None
+        signers = None
+        if os.getenv("CHAIN_BACKEND", "cdp") == "simulated":
+            # Offline: an in-process chain serves both reads and writes
+            from sim_chain import SimulatedChain, SimulatedSigner
+
+            self.rpc = SimulatedChain(
+                block_time=float(os.getenv("SIM_BLOCK_TIME_SECONDS", "2")),
+                gas_limit=int(os.getenv("SIM_GAS_LIMIT", "30000000")),
+                latency=float(os.getenv("SIM_LATENCY_SECONDS", "0")),
+                drop_rate=float(os.getenv("SIM_DROP_RATE", "0")),
+                revert_rate=float(os.getenv("SIM_REVERT_RATE", "0")),
+                chain_id=int(os.getenv("CHAIN_ID", "8453"))
+            )
+            signers = [
+                SimulatedSigner(self.rpc, "0x" + format(i + 1, "040x"))
+                for i in range(int(os.getenv("SIM_SIGNERS", "1")))
+            ]
+            logger.info(f"Using a simulated chain with {len(signers)} signer(s)")
         self.writer = ChainWriter(
             registry_address=os.getenv("REGISTRY_ADDRESS"),
-            rpc_url=os.getenv("RPC_URL"),
-            chain_id=int(os.getenv("CHAIN_ID", "8453"))
+            rpc_url=rpc_url,
+            chain_id=int(os.getenv("CHAIN_ID", "8453")),
+            rpc=self.rpc,
+            signers=signers,
+            packed=os.getenv("REGISTRY_PACKED_UPDATES", "false").lower() == "true",
+            commitment_path=os.getenv("SCORE_COMMITMENTS_PATH") or None,
+            signer_keys=[k.strip() for k in os.getenv("SIGNER_PRIVATE_KEYS", "").split(",") if k.strip()],
+            pool_options={
+                "min_balance_wei": int(float(os.getenv("SIGNER_MIN_BALANCE_ETH", "0.001")) * 10 ** 18),
+                "cooldown_seconds": float(os.getenv("SIGNER_COOLDOWN_SECONDS", "300")),
+                "send_timeout_seconds": float(os.getenv("SIGNER_SEND_TIMEOUT_SECONDS", "60")),
+            }
         )
         self.batch_size = int(os.getenv("BATCH_SIZE", "50"))
         self.badge_threshold = int(os.getenv("SCORE_THRESHOLD_FOR_BADGE", "1000"))
+        self.scheduler = PriorityScheduler(
+            self.calculator,
+            badge_threshold=self.badge_threshold,
+            weights={
+                "delta": float(os.getenv("PRIORITY_WEIGHT_DELTA", "1.0")),
+                "threshold": float(os.getenv("PRIORITY_WEIGHT_THRESHOLD", "500")),
+                "staleness": float(os.getenv("PRIORITY_WEIGHT_STALENESS", "2.0")),
+            },
+            max_wait_seconds=int(float(os.getenv("PRIORITY_MAX_WAIT_HOURS", "24")) * 3600),
+            fairness_share=float(os.getenv("PRIORITY_FAIRNESS_SHARE", "0.2"))
+        )
+        # With decay enabled, a score drop is only written once it crosses a
+        # tier or moves this many points; in between it is evaluated lazily
+        self.decay_write_threshold = int(os.getenv("DECAY_WRITE_THRESHOLD", "50"))
+        # Candidates fetched per free batch slot, for the scheduler to rank
+        self.candidate_pool_factor = int(os.getenv("PRIORITY_CANDIDATE_POOL_FACTOR", "10"))
+        self.journal = CycleJournal(os.getenv("AGENT_JOURNAL_PATH", "agent_journal.db"))
+
+        self.tracker = ConfirmationTracker(
+            self.rpc,
+            confirmations=int(os.getenv("CONFIRMATION_DEPTH", "3")),
+            drop_timeout_seconds=int(os.getenv("TX_DROP_TIMEOUT_SECONDS", "300"))
+        )
+        # Accounts rescored ahead of the scheduler: those whose tx was dropped
+        # or reverted, and fresh minters reported by the continuous-mode trigger
+        self.rescore_first: list = []
+
+        # Score from precomputed per-minter counters instead of mint rows
+        self.early_mint_counters = None
+        if os.getenv("EARLY_MINT_COUNTERS", "false").lower() == "true":
+            self.early_mint_counters = EarlyMintCounters(
+                self.db,
+                self.calculator,
+                batch_size=int(os.getenv("EARLY_MINT_COUNTER_BATCH_SIZE", "5000")),
+                overlap_seconds=self.chain_index_lag_seconds
+            )
+
+        # Coalesce score changes across cycles and write them in one flush
+        self.buffer = None
+        if os.getenv("UPDATE_BUFFER", "false").lower() == "true":
+            self.buffer = UpdateBuffer(
+                self.calculator.get_tier,
+                max_size=int(os.getenv("UPDATE_BUFFER_MAX_SIZE", "200")),
+                max_age_seconds=float(os.getenv("UPDATE_BUFFER_MAX_AGE_SECONDS", "3600"))
+            )
+
+        # Profile every cycle ("always") or the next one after SIGUSR1 ("signal")
+        self.profiler = None
+        profile_mode = os.getenv("PROFILE_CYCLES", "off")
+        if profile_mode in ("always", "signal"):
+            self.profiler = CycleProfiler(
+                os.getenv("PROFILE_DIR", "profiles"),
+                [self.db.engine, self.db.replica_engine],
+                interval_seconds=float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000,
+                slow_query_ms=float(os.getenv("PROFILE_SLOW_QUERY_MS", "500")),
+                always=profile_mode == "always"
+            )
+
+        # Read minted_at-bounded queries from a monthly-partitioned copy of zora_mint
+        self.mint_partitions = os.getenv("MINT_PARTITIONS", "false").lower() == "true"
+        self.mint_partition_months_ahead = int(os.getenv("MINT_PARTITION_MONTHS_AHEAD", "2"))
+        # Start of the month whose partitions were last ensured; the DDL only
+        # needs to run again once the month rolls over
+        self.mint_partitions_month = None
+
+        # Scores served by the read-side HTTP service, filled as accounts are scored
+        self.score_cache = None
+        if os.getenv("SCORE_SERVICE_PORT"):
+            self.score_cache = ScoreCache(max_entries=int(os.getenv("SCORE_CACHE_MAX_ENTRIES", "100000")))
+
+        # Windows (hours) whose early-minter ranking get_early_minters pages over
+        self.early_minter_rank_hours = [
+            int(h) for h in os.getenv("EARLY_MINTER_RANK_HOURS", "24").split(",") if h.strip()
+        ]
+
+    def resume_pending_cycles(self):
+        """
+        Finish cycles interrupted by a crash or restart.
+        Submitted batches go back to the confirmation tracker so they are
+        settled by their receipt instead of being rescored and resubmitted.
+        """
+        for cycle in self.journal.incomplete_cycles():
+            cycle_id = cycle["id"]
+
+            if cycle["status"] == STATUS_SCORED:
+                # Never got a tx hash back; the accounts will be picked up again
+                logger.info(f"Abandoning unsubmitted cycle {cycle_id}")
+                self.journal.abandon_cycle(cycle_id)
+                continue
+
+            if cycle["status"] == STATUS_SUBMITTED:
+                logger.info(f"Resuming cycle {cycle_id}: waiting on {cycle['tx_hash']}")
+                self.tracker.track(cycle["tx_hash"], cycle["updates"], cycle_id=cycle_id)
+                continue
+
+            logger.info(f"Resuming cycle {cycle_id}: marking {len(cycle['updates'])} accounts updated")
+            self._finish_cycle(cycle_id, cycle["updates"])
+
+        self.journal.prune()
+        self.poll_confirmations()
+
+    def poll_confirmations(self):
+        """Settle outstanding transactions: mark confirmed accounts, requeue the rest"""
+        confirmed, requeued = self.tracker.poll()
+
+        for entry in confirmed:
+            if entry["cycle_id"] is not None:
+                self.journal.record_confirmation(entry["cycle_id"])
+                self._finish_cycle(entry["cycle_id"], entry["updates"])
+
+        for entry in requeued:
+            if entry["cycle_id"] is not None:
+                self.journal.fail_cycle(entry["cycle_id"])
+            self.prioritize(u["address"] for u in entry["updates"])
+
+    def prioritize(self, addresses):
+        """Rescore these accounts ahead of the scheduler's picks"""
+        for address in addresses:
+            address = address.lower()
+            if address not in self.rescore_first:
+                self.rescore_first.append(address)
+
+    def has_priority_work(self) -> bool:
+        """True if a prioritized account is ready to be rescored now"""
+        in_flight = self.tracker.in_flight_addresses()
+        return any(address not in in_flight for address in self.rescore_first)
 
-    def run_cycle(self):
-        """Execute one full agent cycle"""
+    def _finish_cycle(self, cycle_id: int, updates: list):
+        """Mark a confirmed cycle's accounts as updated and close it"""
+        for update in updates:
+            self.db.mark_account_updated(update["address"])
+        self.journal.complete_cycle(cycle_id)
+
+    def run_cycle(self) -> bool:
+        """
+        Execute one full agent cycle, profiled if the profiler asks for it
+        Returns False if the cycle or its chain write failed
+        """
+        if self.profiler and self.profiler.should_profile():
+            with self.profiler.profile():
+                return self._run_cycle()
+        return self._run_cycle()
+
+    def _run_cycle(self) -> bool:
         logger.info("Starting agent cycle...")
 
         try:
+            # Pick up collections deployed since the last cycle
+            self.collections.refresh(self.db)
+            self.advance_mint_partitions()
+            if self.early_mint_counters:
+                self.early_mint_counters.update()
+
+            self.poll_confirmations()
+            self.writer.refresh_signers()
+
             # 1. Get accounts that need score updates
-            accounts = self.db.get_accounts_needing_update(limit=self.batch_size)
+            accounts = self._select_accounts()
             logger.info(f"Found {len(accounts)} accounts to process")
 
-            if not accounts:
+            # A buffer may still be due for an age flush
+            if not accounts and not self.buffer:
                 logger.info("No accounts need updates")
-                return
+                return True
+
+            # 2. Calculate scores for the whole batch in one pass
+            breakdowns = self._score_accounts(accounts) if accounts else {}
+            if self.score_cache is not None:
+                self.score_cache.put_many(breakdowns)
 
-            # 2. Calculate scores for each account
             updates = []
+            now = int(time.time())
             for account in accounts:
-                try:
-                    new_score = self.calculator.calculate_total_score(
-                        account_id=account["id"],
-                        mints=self.db.get_mints_for_account(account["id"]),
-                        first_tx_timestamp=account.get("first_tx_timestamp"),
-                        linked_wallets=self.db.get_linked_wallets(account["id"])
+                breakdown = breakdowns.get(account["id"])
+                if breakdown is None:
+                    continue
+
+                new_score = breakdown["total_score"]
+                chain_score = account.get("total_score", 0)
+                write = self.calculator.needs_write(breakdown, chain_score, self.decay_write_threshold)
+                self.scheduler.schedule_reanchor(
+                    account["id"],
+                    self.calculator.next_reanchor_time(
+                        breakdown, new_score if write else chain_score, now, self.decay_write_threshold
                     )
+                )
 
-                    if new_score != account.get("total_score", 0):
-                        updates.append({
-                            "address": account["id"],
-                            "score": new_score
-                        })
-                        logger.debug(f"Score change for {account['id']}: {account.get('total_score', 0)} -> {new_score}")
+                if self.buffer is not None:
+                    # A deferred decay drop cancels anything buffered, like an unchanged score
+                    self.buffer.add(account["id"], new_score if write else chain_score, chain_score)
+                elif write:
+                    updates.append({
+                        "address": account["id"],
+                        "score": new_score
+                    })
+                    logger.debug(f"Score change for {account['id']}: {chain_score} -> {new_score}")
 
-                except Exception as e:
-                    logger.error(f"Error calculating score for {account['id']}: {e}")
+            if self.buffer is not None:
+                updates = self.buffer.flush()
+                if not updates:
+                    logger.info(f"{len(self.buffer)} score changes buffered, no flush due")
+                    return True
 
             if not updates:
                 logger.info("No score changes detected")
-                return
+                return True
 
             logger.info(f"Preparing to update {len(updates)} scores on-chain")
 
+            # One batch per signer when sending through a signer pool; each
+            # is journaled as its own cycle before touching the chain
+            batches = self.writer.plan_batches(updates)
+            cycle_ids = [
+                self.journal.begin_cycle(
+                    [a["id"] for a in accounts] if len(batches) == 1 and self.buffer is None
+                    else [u["address"] for u in batch["updates"]],
+                    batch["updates"]
+                )
+                for batch in batches
+            ]
+
             # 3. Batch update scores on-chain
-            try:
-                tx_hash = self.writer.batch_update_scores(updates)
-                logger.info(f"Batch update submitted: {tx_hash}")
+            submitted = True
+            for cycle_id, batch, result in zip(cycle_ids, batches, self.writer.send_batches(batches)):
+                try:
+                    if isinstance(result, Exception):
+                        raise result
+                    logger.info(f"Batch update submitted: {result}")
+                    self.journal.record_submission(cycle_id, result)
 
-                # 4. Mark accounts as updated in DB
-                for update in updates:
-                    self.db.mark_account_updated(update["address"])
+                    # 4. Accounts are marked updated once the tx is confirmed
+                    self.tracker.track(result, batch["updates"], cycle_id=cycle_id)
 
-            except Exception as e:
-                logger.error(f"Chain write failed: {e}")
+                except Exception as e:
+                    logger.error(f"Chain write failed: {e}")
+                    submitted = False
+                    if self.journal.get_cycle(cycle_id)["status"] != STATUS_SUBMITTED:
+                        self.journal.fail_cycle(cycle_id)
+
+            self.poll_confirmations()
 
             # 5. Check for badge eligibility
             self._check_badge_eligibility(updates)
+            return submitted
 
         except Exception as e:
             logger.error(f"Agent cycle failed: {e}")
+            return False
+
+    def _score_accounts(self, accounts: list) -> dict:
+        """Fetch mints and linked wallets for all accounts in bulk and score them"""
+        addresses = [a["id"] for a in accounts]
+        try:
+            linked = self.db.get_linked_wallets_for_accounts(addresses)
+            if self.early_mint_counters:
+                totals = self.db.get_mint_counters_for_accounts(addresses)
+                return self.calculator.calculate_breakdowns(
+                    accounts, {}, linked, totals_by_account=totals
+                )
+            mints = self.db.get_mints_for_accounts(addresses)
+            return self.calculator.calculate_breakdowns(accounts, mints, linked)
+        except Exception as e:
+            logger.error(f"Error calculating scores for {len(accounts)} accounts: {e}")
+            return {}
+
+    def get_score_breakdowns(self, addresses: list) -> dict:
+        """Score and breakdown for many accounts, e.g. for profile pages"""
+        breakdowns = self._score_accounts(self.db.get_accounts(addresses))
+        if self.score_cache is not None:
+            self.score_cache.put_many(breakdowns)
+        return breakdowns
+
+    def warm_score_cache(self) -> int:
+        """Score accounts requested from the score service but not cached yet"""
+        if self.score_cache is None:
+            return 0
+        addresses = self.score_cache.take_misses(self.batch_size)
+        if not addresses:
+            return 0
+        return len(self.get_score_breakdowns(addresses))
+
+    def _select_accounts(self) -> list:
+        """
+        Prioritized accounts first, then the highest-priority candidates from
+        the DB, skipping any whose update is still awaiting confirmation.
+        Accounts held in the update buffer stay eligible: rescoring them
+        replaces their held score, so a flush writes their latest one
+        """
+        # Decayed scores due to cross a tier or the write threshold
+        self.prioritize(self.scheduler.due_reanchors())
+        in_flight = self.tracker.in_flight_addresses()
+
+        # In-flight accounts stay queued until their pending tx settles
+        take, keep = [], []
+        for address in self.rescore_first:
+            if address in in_flight or len(take) >= self.batch_size:
+                keep.append(address)
+            else:
+                take.append(address)
+        self.rescore_first = keep
+
+        accounts = self.db.get_accounts(take) if take else []
+        seen = {a["id"] for a in accounts}
+
+        remaining = self.batch_size - len(accounts)
+        if remaining > 0:
+            candidates = [
+                account
+                for account in self.db.get_update_candidates(
+                    limit=remaining * self.candidate_pool_factor + len(in_flight)
+                )
+                if account["id"] not in in_flight and account["id"] not in seen
+            ]
+            accounts.extend(self.scheduler.select(candidates, remaining))
+
+        return accounts
+
+    def advance_mint_partitions(self):
+        """
+        Keep monthly mint partitions ahead of time and continue their backfill;
+        reads switch to the partitioned table once it completes
+        """
+        if not self.mint_partitions:
+            return
+        now = int(time.time())
+        month, _ = month_bounds(now)
+        if month != self.mint_partitions_month:
+            self.db.ensure_mint_partitions(start=now, months_ahead=self.mint_partition_months_ahead)
+            self.mint_partitions_month = month
+        if self.db.mint_table == "zora_mint":
+            self.db.backfill_mint_partitions(
+                batch_size=int(os.getenv("MINT_PARTITION_BACKFILL_BATCH_SIZE", "50000")),
+                max_batches=int(os.getenv("MINT_PARTITION_BACKFILL_BATCHES_PER_CYCLE", "10"))
+            )
+            self.db.use_mint_partitions()
+
+    def refresh_early_minter_ranks(self):
+        """Re-rank early minters for every configured window, off the read path"""
+        for hours in self.early_minter_rank_hours:
+            try:
+                ranked = self.db.rank_early_minters(hours)
+                logger.info(f"Ranked {ranked} early minters for the {hours}h window")
+            except Exception as e:
+                logger.error(f"Early-minter ranking for the {hours}h window failed: {e}")
+
+    def backfill_early_mints(self) -> int:
+        """Backfill is_early_mint on historical mints from the collection index"""
+        self.collections.refresh(self.db)
+        updated = self.collections.backfill_early_mints(
+            self.db,
+            window_seconds=self.calculator.EARLY_MINT_WINDOW_SECONDS,
+            batch_size=int(os.getenv("BACKFILL_BATCH_SIZE", "5000"))
+        )
+
+        # Counters already folded in those rows under their old flag
+        if updated and self.early_mint_counters:
+            self.early_mint_counters.rebuild()
+        return updated
 
     def _check_badge_eligibility(self, updates: list):
         """Check if any accounts crossed the badge threshold"""
@@ -113,14 +473,81 @@ class BaseRankAgent:
                     # self.writer.mint_badge(update["address"])
 
 
-def main():
-    """Main entry point"""
+def start_agent() -> BaseRankAgent:
+    """Create the agent and finish any work left over from the last run"""
     logger.info("=" * 50)
     logger.info("BaseRank Agent Starting")
     logger.info("=" * 50)
 
     agent = BaseRankAgent()
 
+    # Missing indexes turn every cycle into sequential scans; say so up front
+    ensure_indexes(
+        agent.db,
+        mode=os.getenv("INDEX_CHECK", "warn"),
+        apply=os.getenv("APPLY_INDEX_MIGRATIONS", "false").lower() == "true"
+    )
+    agent.resume_pending_cycles()
+
+    if agent.profiler and not agent.profiler.always and hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, agent.profiler.arm)
+        logger.info("Send SIGUSR1 to profile the next cycle")
+
+    if agent.early_mint_counters:
+        agent.db.ensure_early_mint_counter_tables()
+    if agent.early_minter_rank_hours:
+        agent.db.ensure_early_minter_rank_table()
+
+    # Partitions back to the oldest mint, before the backfill fills them
+    if agent.mint_partitions:
+        months = agent.db.ensure_mint_partitions(months_ahead=agent.mint_partition_months_ahead)
+        agent.mint_partitions_month, _ = month_bounds(int(time.time()))
+        logger.info(f"Mint partitions ready for {months} months")
+        agent.advance_mint_partitions()
+
+    # The first root covers every account, not just the first cycle's batch
+    if agent.writer.commitments is not None and not len(agent.writer.commitments):
+        seeded = agent.writer.seed_commitments(agent.db.iter_scoring_accounts())
+        logger.info(f"Seeded score tree with {seeded} accounts")
+
+    if os.getenv("BACKFILL_EARLY_MINTS", "false").lower() == "true":
+        agent.backfill_early_mints()
+
+    return agent
+
+
+def run_once() -> int:
+    """
+    Run a single cycle and exit, for cron-style and autoscaled deployments
+    Transactions still unconfirmed after RUN_ONCE_CONFIRM_WAIT_SECONDS are
+    left in the journal and settled by the next run
+    Returns the process exit code
+    """
+    agent = start_agent()
+    # Nothing would be left running to flush a buffer later
+    agent.buffer = None
+    ok = agent.run_cycle()
+
+    wait_seconds = float(os.getenv("RUN_ONCE_CONFIRM_WAIT_SECONDS", "0"))
+    poll_seconds = float(os.getenv("CONFIRMATION_POLL_SECONDS", "15"))
+    deadline = time.monotonic() + wait_seconds
+    while len(agent.tracker) and time.monotonic() < deadline:
+        time.sleep(min(poll_seconds, max(0.0, deadline - time.monotonic())))
+        agent.poll_confirmations()
+
+    if len(agent.tracker):
+        logger.info(f"{len(agent.tracker)} transactions still pending; the next run will settle them")
+    logger.info("Single cycle finished" if ok else "Single cycle failed")
+    return 0 if ok else 1
+
+
+def main():
+    """Main entry point"""
+    if sys.argv[1:2] == ["run-once"] or os.getenv("AGENT_MODE") == "once":
+        sys.exit(run_once())
+
+    agent = start_agent()
+
     # Run immediately on start
     agent.run_cycle()
 
@@ -128,12 +555,72 @@ def main():
     interval = int(os.getenv("AGENT_INTERVAL_MINUTES", "60"))
     schedule.every(interval).minutes.do(agent.run_cycle)
 
+    # Poll receipts between cycles so confirmed accounts are marked promptly
+    poll_seconds = int(os.getenv("CONFIRMATION_POLL_SECONDS", "15"))
+    schedule.every(poll_seconds).seconds.do(agent.poll_confirmations)
+
     logger.info(f"Scheduled to run every {interval} minutes")
 
+    # Early-minter report pages read the last ranking; rebuild it on a timer
+    if agent.early_minter_rank_hours:
+        agent.refresh_early_minter_ranks()
+        schedule.every(int(os.getenv("EARLY_MINTER_RANK_REFRESH_MINUTES", "60"))).minutes.do(
+            agent.refresh_early_minter_ranks
+        )
+
+    if agent.score_cache is not None:
+        ScoreService(
+            agent.score_cache,
+            host=os.getenv("SCORE_SERVICE_HOST", "127.0.0.1"),
+            port=int(os.getenv("SCORE_SERVICE_PORT")),
+            max_batch=int(os.getenv("SCORE_SERVICE_MAX_BATCH", "500")),
+            calculator=agent.calculator
+        ).start()
+        # Accounts asked for before they were scored are filled in between cycles
+        schedule.every(int(os.getenv("SCORE_CACHE_WARM_SECONDS", "10"))).seconds.do(agent.warm_score_cache)
+
+    if os.getenv("AGENT_MODE", "interval") == "continuous":
+        run_continuous(agent)
+
     # Keep running
     while True:
         schedule.run_pending()
-        time.sleep(60)
+        time.sleep(1)
+
+
+def run_continuous(agent: BaseRankAgent):
+    """
+    Rescore as new mints arrive instead of waiting for the next interval.
+    The interval schedule keeps running as a sweep for stale accounts.
+    """
+    if os.getenv("INSTALL_MINT_NOTIFY_TRIGGER", "false").lower() == "true":
+        agent.db.install_mint_notify_trigger(MINT_CHANNEL)
+
+    trigger = MintTrigger(
+        agent.db,
+        MicroBatchPolicy(
+            min_batch_size=int(os.getenv("MICROBATCH_MIN_SIZE", "20")),
+            max_latency_seconds=float(os.getenv("MICROBATCH_MAX_LATENCY_SECONDS", "60")),
+            debounce_seconds=float(os.getenv("MICROBATCH_DEBOUNCE_SECONDS", "2"))
+        ),
+        mode=os.getenv("MINT_TRIGGER", "notify"),
+        poll_interval_seconds=float(os.getenv("MINT_POLL_SECONDS", "5")),
+        overlap_seconds=agent.chain_index_lag_seconds,
+        max_reconnect_backoff_seconds=float(os.getenv("MINT_LISTEN_MAX_BACKOFF_SECONDS", "60"))
+    )
+    trigger.start()
+    logger.info("Running in continuous mode")
+
+    try:
+        while True:
+            minters = trigger.wait(timeout=1.0)
+            if minters:
+                agent.prioritize(minters)
+            if minters or agent.has_priority_work():
+                agent.run_cycle()
+            schedule.run_pending()
+    finally:
+        trigger.stop()
 
 
 if __name__ == "__main__":
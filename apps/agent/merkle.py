@@ -0,0 +1,239 @@
+"""
+Incremental Merkle tree over account scores
+Leaves are keccak256(abi.encodePacked(address, uint256 score, uint64 epoch)),
+where epoch is the commitment epoch in which that score was last set. Pairs
+are hashed in sorted order and an odd node is carried up unchanged, matching
+solady's MerkleProofLib, so proofs verify against ReputationRegistry.verifyScore.
+
+Every level is kept in memory as packed 32-byte hashes; an update only
+rehashes the paths above the leaves it changed.
+"""
+
+import os
+import sys
+import struct
+import logging
+from array import array
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+
+from eth_hash.auto import keccak
+
+logger = logging.getLogger(__name__)
+
+HASH_SIZE = 32
+ADDRESS_SIZE = 20
+EMPTY_ROOT = b"\x00" * HASH_SIZE
+
+FILE_MAGIC = b"BSMT"
+FILE_VERSION = 1
+# magic, version, committed epoch, leaf count
+_HEADER = struct.Struct(">4sIQQ")
+
+
+def leaf_hash(address: bytes, score: int, epoch: int) -> bytes:
+    """Leaf for a 20-byte address; 60 bytes hashed, so never mistaken for a node"""
+    return keccak(address + score.to_bytes(32, "big") + epoch.to_bytes(8, "big"))
+
+
+def hash_pair(a: bytes, b: bytes) -> bytes:
+    return keccak(a + b if a < b else b + a)
+
+
+def verify_proof(proof: List[bytes], root: bytes, leaf: bytes) -> bool:
+    """Python equivalent of MerkleProofLib.verify"""
+    node = leaf
+    for sibling in proof:
+        node = hash_pair(node, sibling)
+    return node == root
+
+
+def _big_endian(values: array) -> array:
+    """Copy of a uint64 array in big-endian byte order, or back again"""
+    values = array("Q", values)
+    if sys.byteorder == "little":
+        values.byteswap()
+    return values
+
+
+def _address_bytes(address: str) -> bytes:
+    raw = bytes.fromhex(address[2:] if address.startswith("0x") else address)
+    if len(raw) != ADDRESS_SIZE:
+        raise ValueError(f"Not a 20-byte address: {address}")
+    return raw
+
+
+class MerkleTree:
+    """
+    Leaves keep the position of their first insertion. `epoch` is the last
+    epoch committed on chain; leaves set since then carry a later one.
+    """
+
+    def __init__(self):
+        self.epoch = 0
+        self.addresses = bytearray()
+        self.scores = array("Q")
+        self.epochs = array("Q")
+        # levels[0] holds the leaf hashes, levels[-1] the root
+        self.levels: List[bytearray] = [bytearray()]
+        self._positions: Dict[bytes, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    @property
+    def root(self) -> bytes:
+        if not self.scores:
+            return EMPTY_ROOT
+        return bytes(self.levels[-1][:HASH_SIZE])
+
+    def get(self, address: str) -> Optional[Tuple[int, int]]:
+        """(score, epoch) of an address, or None if it has no leaf"""
+        position = self._positions.get(_address_bytes(address))
+        if position is None:
+            return None
+        return self.scores[position], self.epochs[position]
+
+    def update(self, updates: Iterable[Dict[str, Any]], epoch: int) -> List[Tuple]:
+        """
+        Set scores ({"address", "score"}) as of `epoch`; unchanged scores keep
+        their leaf. Returns an undo record for revert().
+        """
+        undo: List[Tuple] = []
+        size = len(self)
+        dirty = []
+        leaves = self.levels[0]
+
+        for u in updates:
+            address = _address_bytes(u["address"])
+            score = int(u["score"])
+            position = self._positions.get(address)
+
+            if position is None:
+                position = len(self.scores)
+                self._positions[address] = position
+                self.addresses += address
+                self.scores.append(score)
+                self.epochs.append(epoch)
+                leaves += leaf_hash(address, score, epoch)
+            elif self.scores[position] == score:
+                continue
+            else:
+                undo.append((position, self.scores[position], self.epochs[position]))
+                self.scores[position] = score
+                self.epochs[position] = epoch
+                start = position * HASH_SIZE
+                leaves[start:start + HASH_SIZE] = leaf_hash(address, score, epoch)
+            dirty.append(position)
+
+        if dirty:
+            self._rehash(dirty)
+        return [size] + undo
+
+    def revert(self, undo: List[Tuple]):
+        """Roll back an update() whose root was never committed"""
+        size, changes = undo[0], undo[1:]
+
+        for i in range(size, len(self)):
+            del self._positions[self._address(i)]
+        del self.addresses[size * ADDRESS_SIZE:]
+        del self.scores[size:]
+        del self.epochs[size:]
+        del self.levels[0][size * HASH_SIZE:]
+
+        leaves = self.levels[0]
+        changes = [c for c in reversed(changes) if c[0] < size]
+        for position, score, epoch in changes:
+            self.scores[position] = score
+            self.epochs[position] = epoch
+            start = position * HASH_SIZE
+            leaves[start:start + HASH_SIZE] = leaf_hash(self._address(position), score, epoch)
+
+        self._rehash([position for position, _, _ in changes])
+
+    def _address(self, position: int) -> bytes:
+        start = position * ADDRESS_SIZE
+        return bytes(self.addresses[start:start + ADDRESS_SIZE])
+
+    def _rehash(self, positions: List[int]):
+        """Recompute every node above the given leaf positions"""
+        count = len(self)
+        level = 0
+        while count > 1:
+            below = self.levels[level]
+            width = (count + 1) // 2
+            if level + 1 == len(self.levels):
+                self.levels.append(bytearray())
+            above = self.levels[level + 1]
+            if len(above) != width * HASH_SIZE:
+                del above[width * HASH_SIZE:]
+                above.extend(bytes(width * HASH_SIZE - len(above)))
+
+            # The last parent changes whenever the level grew or shrank
+            parents = {p >> 1 for p in positions}
+            parents.add(width - 1)
+            # Rebuilding a whole level is cheaper than tracking most of it
+            indexes = range(width) if len(parents) * 2 > width else sorted(parents)
+            for parent in indexes:
+                left = parent * 2 * HASH_SIZE
+                if parent * 2 + 1 < count:
+                    node = hash_pair(below[left:left + HASH_SIZE], below[left + HASH_SIZE:left + 2 * HASH_SIZE])
+                else:
+                    node = below[left:left + HASH_SIZE]  # odd node carried up
+                above[parent * HASH_SIZE:(parent + 1) * HASH_SIZE] = node
+
+            positions = indexes
+            count = width
+            level += 1
+
+        del self.levels[level + 1:]
+
+    def proof(self, address: str) -> Optional[List[bytes]]:
+        """Sibling hashes from the address's leaf up to the root"""
+        position = self._positions.get(_address_bytes(address))
+        if position is None:
+            return None
+
+        proof = []
+        for level in self.levels[:-1]:
+            sibling = position ^ 1
+            if sibling * HASH_SIZE < len(level):
+                proof.append(bytes(level[sibling * HASH_SIZE:(sibling + 1) * HASH_SIZE]))
+            position >>= 1
+        return proof
+
+    def save(self, path: str):
+        """Write leaves and levels to `path`, replacing it atomically"""
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(FILE_MAGIC, FILE_VERSION, self.epoch, len(self)))
+            f.write(self.addresses)
+            f.write(_big_endian(self.scores).tobytes())
+            f.write(_big_endian(self.epochs).tobytes())
+            for level in self.levels:
+                f.write(level)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "MerkleTree":
+        tree = cls()
+        with open(path, "rb") as f:
+            magic, version, epoch, count = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != FILE_MAGIC or version != FILE_VERSION:
+                raise ValueError(f"{path} is not a version {FILE_VERSION} score tree")
+
+            tree.epoch = epoch
+            tree.addresses = bytearray(f.read(count * ADDRESS_SIZE))
+            tree.scores = _big_endian(array("Q", f.read(count * 8)))
+            tree.epochs = _big_endian(array("Q", f.read(count * 8)))
+
+            tree.levels = []
+            width = count
+            while True:
+                tree.levels.append(bytearray(f.read(width * HASH_SIZE)))
+                if width <= 1:
+                    break
+                width = (width + 1) // 2
+
+        tree._positions = {tree._address(i): i for i in range(count)}
+        logger.info(f"Loaded score tree with {count} leaves at epoch {epoch}")
+        return tree
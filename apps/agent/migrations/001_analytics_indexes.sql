@@ -0,0 +1,17 @@
+-- Covering indexes for the agent's paginated / streamed analytics queries.
+-- CONCURRENTLY cannot run inside a transaction block; apply with:
+--   psql "$DATABASE_URL" -f migrations/001_analytics_indexes.sql
+
+-- get_top_accounts / iter_top_accounts: keyset on (total_score, id),
+-- answered by an index-only range scan per page
+CREATE INDEX CONCURRENTLY IF NOT EXISTS account_score_keyset_idx
+    ON account (total_score DESC, id DESC)
+    INCLUDE (tier, base_score, zora_score, timely_score);
+
+-- rank_early_minters / iter_early_minters: rows are read in minter order so
+-- the aggregate streams without a sort, and never touch the heap. Pages of
+-- get_early_minters then read agent_early_minter_rank, which the agent
+-- creates with its own keyset index and re-ranks on a timer
+CREATE INDEX CONCURRENTLY IF NOT EXISTS zora_mint_minter_timeliness_idx
+    ON zora_mint (minter)
+    INCLUDE (quantity, is_early_mint, minted_at, collection_deployed_at);
@@ -0,0 +1,28 @@
+-- Indexes behind the agent's per-cycle lookups. Ponder only creates primary
+-- keys, so without these the filters below fall back to sequential scans.
+-- index_advisor.py checks for them at startup and can create them itself
+-- (APPLY_INDEX_MIGRATIONS=true); to apply by hand:
+--   psql "$DATABASE_URL" -f migrations/002_agent_query_indexes.sql
+-- A CONCURRENTLY build that fails leaves an INVALID index behind, which
+-- IF NOT EXISTS then skips: drop it (DROP INDEX CONCURRENTLY) and re-run.
+
+-- get_update_candidates (activity horizon), get_mints_since,
+-- get_mint_watermark and the get_mints_after keyset
+CREATE INDEX CONCURRENTLY IF NOT EXISTS zora_mint_minted_at_idx
+    ON zora_mint (minted_at, id);
+
+-- Linked wallets of a batch of accounts (get_mints_for_accounts,
+-- get_linked_wallets_for_accounts, get_mint_counters_for_accounts)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS linked_wallet_main_account_idx
+    ON linked_wallet (main_account_id)
+    INCLUDE (address);
+
+-- Stalest accounts first (get_update_candidates, get_accounts_needing_update)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS account_last_updated_idx
+    ON account (last_updated);
+
+-- Timeliness backfill (get_mints_missing_deploy_time): only the mints still
+-- waiting for a deploy time, so the index shrinks as the backfill runs
+CREATE INDEX CONCURRENTLY IF NOT EXISTS zora_mint_missing_deploy_time_idx
+    ON zora_mint (id)
+    WHERE collection_deployed_at IS NULL;
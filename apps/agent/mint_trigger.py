@@ -0,0 +1,199 @@
+"""
+Event-driven trigger for continuous mode
+Turns new zora_mint inserts into debounced micro-batches of minters to rescore
+"""
+
+import time
+import logging
+from typing import Optional, Set, Dict
+
+logger = logging.getLogger(__name__)
+
+MINT_CHANNEL = "zora_mint_inserted"
+
+
+class MicroBatchPolicy:
+    """
+    Decides when accumulated mint events are worth a cycle:
+    - as soon as min_batch_size events have arrived and the stream has been
+      quiet for debounce_seconds, so a burst lands in one transaction
+    - or once the oldest pending event is max_latency_seconds old,
+      so a trickle of mints is never held back indefinitely
+    """
+
+    def __init__(
+        self,
+        min_batch_size: int = 20,
+        max_latency_seconds: float = 60.0,
+        debounce_seconds: float = 2.0
+    ):
+        self.min_batch_size = min_batch_size
+        self.max_latency_seconds = max_latency_seconds
+        self.debounce_seconds = debounce_seconds
+        self.reset()
+
+    def reset(self):
+        self.pending = 0
+        self.first_event_at: Optional[float] = None
+        self.last_event_at: Optional[float] = None
+
+    def add(self, count: int, now: float):
+        if count <= 0:
+            return
+        if self.first_event_at is None:
+            self.first_event_at = now
+        self.last_event_at = now
+        self.pending += count
+
+    def ready(self, now: float) -> bool:
+        if not self.pending:
+            return False
+        if now - self.first_event_at >= self.max_latency_seconds:
+            return True
+        return (
+            self.pending >= self.min_batch_size
+            and now - self.last_event_at >= self.debounce_seconds
+        )
+
+
+class MintTrigger:
+    """
+    Watches for new mints either through Postgres LISTEN/NOTIFY (mode "notify",
+    needs the trigger from Database.install_mint_notify_trigger) or by polling
+    a minted_at watermark (mode "poll"), and releases the set of minters once
+    the micro-batch policy fires.
+
+    Base and Zora are indexed side by side, so a mint from the lagging chain
+    can be inserted with a minted_at behind the watermark: polls re-read
+    overlap_seconds behind it and skip the mint ids already seen. A dropped
+    LISTEN connection is re-opened with exponential backoff, and mints since
+    shortly before the drop are read back once it is.
+    """
+
+    def __init__(
+        self,
+        db,
+        policy: MicroBatchPolicy,
+        mode: str = "notify",
+        poll_interval_seconds: float = 5.0,
+        overlap_seconds: int = 900,
+        reconnect_backoff_seconds: float = 1.0,
+        max_reconnect_backoff_seconds: float = 60.0
+    ):
+        if mode not in ("notify", "poll"):
+            raise ValueError(f"Unknown mint trigger mode: {mode}")
+        self.db = db
+        self.policy = policy
+        self.mode = mode
+        self.poll_interval_seconds = poll_interval_seconds
+        self.overlap_seconds = overlap_seconds
+        self.reconnect_backoff_seconds = reconnect_backoff_seconds
+        self.max_reconnect_backoff_seconds = max_reconnect_backoff_seconds
+        self.minters: Set[str] = set()
+        self.connection = None
+        self.watermark: Optional[int] = None
+        # Mint id -> minted_at of polled mints still inside the overlap window
+        self.seen: Dict[str, int] = {}
+        self._last_poll = 0.0
+        self._dropped_at: Optional[float] = None
+        self._reconnect_at = 0.0
+        self._reconnect_delay = reconnect_backoff_seconds
+
+    def start(self):
+        """Open the LISTEN connection or seed the polling watermark"""
+        if self.mode == "notify":
+            self.connection = self.db.listen(MINT_CHANNEL)
+            logger.info(f"Listening for new mints on '{MINT_CHANNEL}'")
+        else:
+            self.watermark = self.db.get_mint_watermark()
+            # Mints already in the overlap window are not news
+            self._read_new_mints()
+            logger.info(f"Polling for new mints every {self.poll_interval_seconds}s")
+
+    def stop(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def wait(self, timeout: float = 1.0) -> Optional[Set[str]]:
+        """
+        Wait up to `timeout` seconds for mint events
+        Returns the minters of the micro-batch when it is ready, else None
+        """
+        if self.mode == "notify":
+            minters = self._notifications(timeout)
+        else:
+            minters = self._poll_watermark(timeout)
+
+        now = time.monotonic()
+        self.minters.update(minters)
+        self.policy.add(len(minters), now)
+
+        if not self.policy.ready(now):
+            return None
+
+        batch, self.minters = self.minters, set()
+        logger.info(f"Mint trigger fired: {self.policy.pending} events, {len(batch)} minters")
+        self.policy.reset()
+        return batch
+
+    def _notifications(self, timeout: float) -> Set[str]:
+        if self.connection is None:
+            return self._reconnect(timeout)
+        try:
+            return self.db.poll_notifications(self.connection, timeout)
+        except Exception as e:
+            logger.warning(f"LISTEN connection lost, reconnecting: {e}")
+            try:
+                self.connection.close()
+            except Exception:
+                pass
+            self.connection = None
+            self._dropped_at = time.time()
+            self._reconnect_at = time.monotonic()
+            self._reconnect_delay = self.reconnect_backoff_seconds
+            return set()
+
+    def _reconnect(self, timeout: float) -> Set[str]:
+        now = time.monotonic()
+        if now < self._reconnect_at:
+            time.sleep(min(timeout, self._reconnect_at - now))
+            return set()
+
+        try:
+            self.connection = self.db.listen(MINT_CHANNEL)
+        except Exception as e:
+            self._reconnect_at = now + self._reconnect_delay
+            logger.warning(f"LISTEN reconnect failed, retrying in {self._reconnect_delay:.0f}s: {e}")
+            self._reconnect_delay = min(self._reconnect_delay * 2, self.max_reconnect_backoff_seconds)
+            return set()
+
+        # Nobody was listening since the drop: read those mints back
+        self._reconnect_delay = self.reconnect_backoff_seconds
+        since = int(self._dropped_at or time.time()) - self.overlap_seconds
+        minters = {mint["minter"] for mint in self.db.get_mints_since(since)}
+        logger.info(f"Re-listening on '{MINT_CHANNEL}'; {len(minters)} minters since the drop")
+        return minters
+
+    def _poll_watermark(self, timeout: float) -> Set[str]:
+        now = time.monotonic()
+        due = self._last_poll + self.poll_interval_seconds
+        if now < due:
+            time.sleep(min(timeout, due - now))
+            return set()
+        self._last_poll = now
+        return self._read_new_mints()
+
+    def _read_new_mints(self) -> Set[str]:
+        """Minters of mints in the overlap window not seen by an earlier poll"""
+        minters = set()
+        for mint in self.db.get_mints_since((self.watermark or 0) - self.overlap_seconds):
+            if mint["id"] in self.seen:
+                continue
+            self.seen[mint["id"]] = mint["minted_at"]
+            minters.add(mint["minter"])
+            self.watermark = max(self.watermark or 0, mint["minted_at"])
+
+        horizon = (self.watermark or 0) - self.overlap_seconds
+        self.seen = {mint_id: minted_at for mint_id, minted_at in self.seen.items() if minted_at > horizon}
+        return minters
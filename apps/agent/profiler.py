@@ -0,0 +1,339 @@
+"""
+Opt-in per-cycle profiler
+Samples the cycle thread's Python stack, times every SQL statement through
+SQLAlchemy engine events and captures EXPLAIN (ANALYZE, BUFFERS) for slow
+SELECTs. Each profiled cycle leaves a directory holding profile.json and
+stacks.folded (collapsed stacks for flamegraph.pl or speedscope);
+`python profiler.py diff OLD NEW` compares two profile.json files, e.g.
+from two releases.
+
+Usage: python profiler.py diff <old profile.json> <new profile.json> [--top 20]
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Iterator
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+# Slow statements explained per cycle; EXPLAIN ANALYZE runs each one again
+MAX_EXPLAINS = 10
+
+
+def normalize_statement(statement: str) -> str:
+    return re.sub(r"\s+", " ", statement).strip()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Samples one thread's stack from a background thread at a fixed interval"""
+
+    def __init__(self, thread_id: int, interval_seconds: float = 0.005):
+        self.thread_id = thread_id
+        self.interval_seconds = interval_seconds
+        self.stacks: Dict[str, int] = {}
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval_seconds):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                folded = ";".join(reversed(stack))
+                self.stacks[folded] = self.stacks.get(folded, 0) + 1
+                self.samples += 1
+
+
+class QueryRecorder:
+    """Times statements run on the given engines while attached"""
+
+    def __init__(self, engines: List[Any], slow_query_ms: float = 500):
+        self.engines = engines
+        self.slow_query_ms = slow_query_ms
+        self.queries: Dict[str, Dict[str, Any]] = {}
+        self.slow: List[Dict[str, Any]] = []
+
+    def attach(self):
+        from sqlalchemy import event
+
+        for engine in self.engines:
+            event.listen(engine, "before_cursor_execute", self._before)
+            event.listen(engine, "after_cursor_execute", self._after)
+
+    def detach(self):
+        from sqlalchemy import event
+
+        for engine in self.engines:
+            event.remove(engine, "before_cursor_execute", self._before)
+            event.remove(engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("profile_started_at", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("profile_started_at")
+        if not started:
+            return
+        elapsed_ms = (time.perf_counter() - started.pop()) * 1000
+
+        key = normalize_statement(statement)
+        stats = self.queries.setdefault(key, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        stats["count"] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+        if elapsed_ms >= self.slow_query_ms and not executemany:
+            self.slow.append({
+                "statement": key,
+                "parameters": parameters,
+                "duration_ms": round(elapsed_ms, 2),
+                "engine": conn.engine,
+            })
+
+    def explain_slow(self) -> List[Dict[str, Any]]:
+        """
+        EXPLAIN (ANALYZE, BUFFERS) the slowest occurrence of each slow read,
+        in a read-only transaction that is rolled back. Call once detached.
+        """
+        slowest: Dict[str, Dict[str, Any]] = {}
+        for query in self.slow:
+            kept = slowest.get(query["statement"])
+            if kept is None or query["duration_ms"] > kept["duration_ms"]:
+                slowest[query["statement"]] = query
+
+        explained = []
+        ordered = sorted(slowest.values(), key=lambda q: q["duration_ms"], reverse=True)
+        for query in ordered[:MAX_EXPLAINS]:
+            entry = {"statement": query["statement"], "duration_ms": query["duration_ms"], "plan": None}
+            if not query["statement"].upper().startswith(("SELECT", "WITH")):
+                entry["plan"] = {"skipped": "not a read"}
+            else:
+                entry["plan"] = self._explain(query)
+            explained.append(entry)
+        return explained
+
+    @staticmethod
+    def _explain(query: Dict[str, Any]) -> Any:
+        try:
+            with query["engine"].connect() as conn:
+                transaction = conn.begin()
+                try:
+                    conn.exec_driver_sql("SET TRANSACTION READ ONLY")
+                    plan = conn.exec_driver_sql(
+                        "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + query["statement"],
+                        query["parameters"]
+                    ).scalar()
+                finally:
+                    transaction.rollback()
+            return json.loads(plan) if isinstance(plan, str) else plan
+        except Exception as e:
+            return {"error": str(e)}
+
+
+def summarize_stacks(stacks: Dict[str, int], top: int = 50) -> List[Dict[str, Any]]:
+    """Per-function sample counts: self (leaf) and total (anywhere on the stack)"""
+    functions: Dict[str, Dict[str, int]] = {}
+    for folded, count in stacks.items():
+        frames = folded.split(";")
+        for frame in set(frames):
+            functions.setdefault(frame, {"self": 0, "total": 0})["total"] += count
+        functions[frames[-1]]["self"] += count
+
+    ranked = sorted(functions.items(), key=lambda item: (item[1]["total"], item[1]["self"]), reverse=True)
+    return [{"function": name, **counts} for name, counts in ranked[:top]]
+
+
+class CycleProfiler:
+    """
+    Profiles cycles into PROFILE_DIR. With always=False only the next cycle
+    after arm() is profiled (armed from a signal handler).
+    """
+
+    def __init__(
+        self,
+        out_dir: str,
+        engines: List[Any],
+        interval_seconds: float = 0.005,
+        slow_query_ms: float = 500,
+        always: bool = False
+    ):
+        self.out_dir = out_dir
+        self.engines = [e for e in engines if e is not None]
+        self.interval_seconds = interval_seconds
+        self.slow_query_ms = slow_query_ms
+        self.always = always
+        self._armed = False
+
+    def arm(self, *_):
+        """Profile the next cycle; usable directly as a signal handler"""
+        self._armed = True
+
+    def should_profile(self) -> bool:
+        return self.always or self._armed
+
+    @contextmanager
+    def profile(self, label: str = "cycle") -> Iterator[None]:
+        self._armed = False
+        sampler = StackSampler(threading.get_ident(), self.interval_seconds)
+        recorder = QueryRecorder(self.engines, self.slow_query_ms)
+
+        started_at = time.time()
+        started = time.perf_counter()
+        recorder.attach()
+        sampler.start()
+        try:
+            yield
+        finally:
+            sampler.stop()
+            recorder.detach()
+            duration = time.perf_counter() - started
+            try:
+                self._write(label, started_at, duration, sampler, recorder)
+            except Exception as e:
+                logger.error(f"Failed to write cycle profile: {e}")
+
+    def _write(self, label, started_at, duration, sampler, recorder) -> str:
+        slow = recorder.explain_slow()
+        path = os.path.join(
+            self.out_dir,
+            time.strftime("%Y%m%dT%H%M%S", time.gmtime(started_at)) + f"-{label}"
+        )
+        os.makedirs(path, exist_ok=True)
+
+        queries = sorted(
+            ({"statement": s, **{k: round(v, 3) if isinstance(v, float) else v for k, v in q.items()}}
+             for s, q in recorder.queries.items()),
+            key=lambda q: q["total_ms"],
+            reverse=True
+        )
+        profile = {
+            "version": FORMAT_VERSION,
+            "label": label,
+            "release": os.getenv("AGENT_RELEASE", ""),
+            "python": sys.version.split()[0],
+            "started_at": int(started_at),
+            "duration_seconds": round(duration, 4),
+            "sample_interval_seconds": self.interval_seconds,
+            "samples": sampler.samples,
+            "functions": summarize_stacks(sampler.stacks),
+            "query_count": sum(q["count"] for q in queries),
+            "query_ms": round(sum(q["total_ms"] for q in queries), 3),
+            "queries": queries,
+            "slow_queries": slow,
+        }
+        with open(os.path.join(path, "profile.json"), "w") as f:
+            json.dump(profile, f, indent=2, default=str)
+        with open(os.path.join(path, "stacks.folded"), "w") as f:
+            for folded, count in sorted(sampler.stacks.items()):
+                f.write(f"{folded} {count}\n")
+
+        logger.info(
+            f"Profiled {label} in {duration:.2f}s: {sampler.samples} samples, "
+            f"{profile['query_count']} queries, {len(slow)} slow; written to {path}"
+        )
+        return path
+
+
+def diff_profiles(old: Dict[str, Any], new: Dict[str, Any], top: int = 20) -> Dict[str, Any]:
+    """
+    Compare two profiles: duration, per-function share of samples and
+    per-statement total time, largest changes first
+    """
+    def shares(profile):
+        samples = profile["samples"] or 1
+        return {f["function"]: f["total"] / samples for f in profile["functions"]}
+
+    old_shares, new_shares = shares(old), shares(new)
+    functions = sorted(
+        (
+            {"function": name, "old": round(old_shares.get(name, 0.0), 4), "new": round(new_shares.get(name, 0.0), 4)}
+            for name in set(old_shares) | set(new_shares)
+        ),
+        key=lambda f: abs(f["new"] - f["old"]),
+        reverse=True
+    )
+
+    old_queries = {q["statement"]: q for q in old["queries"]}
+    new_queries = {q["statement"]: q for q in new["queries"]}
+    queries = sorted(
+        (
+            {
+                "statement": statement,
+                "old_ms": old_queries.get(statement, {}).get("total_ms", 0.0),
+                "new_ms": new_queries.get(statement, {}).get("total_ms", 0.0),
+            }
+            for statement in set(old_queries) | set(new_queries)
+        ),
+        key=lambda q: abs(q["new_ms"] - q["old_ms"]),
+        reverse=True
+    )
+
+    return {
+        "duration_seconds": {"old": old["duration_seconds"], "new": new["duration_seconds"]},
+        "query_ms": {"old": old["query_ms"], "new": new["query_ms"]},
+        "functions": functions[:top],
+        "queries": queries[:top],
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Compare two cycle profiles")
+    sub = parser.add_subparsers(dest="command", required=True)
+    diff = sub.add_parser("diff", help="Show what changed between two profile.json files")
+    diff.add_argument("old")
+    diff.add_argument("new")
+    diff.add_argument("--top", type=int, default=20)
+    diff.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    result = diff_profiles(old, new, args.top)
+
+    if args.json:
+        json.dump(result, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return
+
+    d, q = result["duration_seconds"], result["query_ms"]
+    print(f"cycle: {d['old']:.3f}s -> {d['new']:.3f}s   sql: {q['old']:.1f}ms -> {q['new']:.1f}ms")
+    print("\nshare of samples (old -> new):")
+    for f in result["functions"]:
+        print(f"  {f['old']:6.1%} -> {f['new']:6.1%}  {f['function']}")
+    print("\nsql total ms (old -> new):")
+    for q in result["queries"]:
+        print(f"  {q['old_ms']:10.1f} -> {q['new_ms']:10.1f}  {q['statement'][:100]}")
+
+
+if __name__ == "__main__":
+    main()
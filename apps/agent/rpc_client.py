@@ -0,0 +1,225 @@
+"""
+Pooled JSON-RPC client for Base RPC reads
+Shares one keep-alive httpx connection pool, batches requests, coalesces
+identical in-flight reads and caches cheap chain-state reads for a short TTL
+"""
+
+import json
+import time
+import logging
+import itertools
+import threading
+from typing import List, Dict, Any, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional h2 package (httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+# Seconds a read result may be served from cache. Only methods whose
+# answer changes at most once per block (or never) belong here.
+DEFAULT_CACHE_TTLS = {
+    "eth_chainId": 3600.0,
+    "eth_blockNumber": 1.0,
+    "eth_gasPrice": 2.0,
+    "eth_maxPriorityFeePerGas": 2.0,
+    "eth_getBalance": 5.0,
+    "eth_getTransactionCount": 1.0,
+}
+
+
+class RpcError(Exception):
+    """JSON-RPC error returned by the node or a transport failure"""
+
+    def __init__(self, message: str, code: Optional[int] = None):
+        super().__init__(message)
+        self.code = code
+
+
+class _InFlight:
+    """A read that one caller is fetching and others are waiting on"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+
+    def resolve(self, result: Any):
+        self.result = result
+        self.event.set()
+
+
+class RpcClient:
+    """
+    JSON-RPC 2.0 client over a pooled httpx.Client.
+    One instance is meant to be shared by every component talking to the node,
+    so that concurrent identical reads collapse into a single request.
+    """
+
+    def __init__(
+        self,
+        rpc_url: str,
+        timeout: float = 10.0,
+        max_connections: int = 10,
+        cache_ttls: Optional[Dict[str, float]] = None,
+        client: Optional[httpx.Client] = None
+    ):
+        self.rpc_url = rpc_url
+        self.timeout = timeout
+        self.cache_ttls = DEFAULT_CACHE_TTLS if cache_ttls is None else cache_ttls
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+        self._inflight: Dict[str, _InFlight] = {}
+        self.stats = {"requests": 0, "calls": 0, "cache_hits": 0, "coalesced": 0}
+        self.client = client or httpx.Client(
+            http2=HTTP2_AVAILABLE,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            ),
+        )
+
+    def close(self):
+        self.client.close()
+
+    def invalidate(self, method: Optional[str] = None):
+        """Drop cached results, e.g. the nonce after sending a transaction"""
+        with self._lock:
+            if method is None:
+                self._cache.clear()
+            else:
+                prefix = f"{method}:"
+                for key in [k for k in self._cache if k.startswith(prefix)]:
+                    del self._cache[key]
+
+    def call(self, method: str, params: Optional[list] = None) -> Any:
+        """Make a single JSON-RPC call, raising RpcError on failure"""
+        result = self.batch([(method, params or [])])[0]
+        if isinstance(result, RpcError):
+            raise result
+        return result
+
+    def batch(self, calls: List[Tuple[str, list]]) -> List[Any]:
+        """
+        Send several calls in one JSON-RPC batch request
+        Cached reads are answered locally and reads already being fetched by
+        another thread are waited on rather than sent again.
+        Returns results in call order; a call that failed on the node is
+        returned as an RpcError instance in its slot instead of raising
+        """
+        results: List[Any] = [None] * len(calls)
+        to_send = []
+        waiting = []
+        owned: Dict[str, _InFlight] = {}
+        now = time.monotonic()
+
+        with self._lock:
+            for i, (method, params) in enumerate(calls):
+                key = self._cache_key(method, params)
+                if key is None:
+                    to_send.append((i, method, params, None))
+                    continue
+
+                cached = self._cache.get(key)
+                if cached is not None and cached[0] > now:
+                    results[i] = cached[1]
+                    self.stats["cache_hits"] += 1
+                    continue
+
+                inflight = self._inflight.get(key)
+                if inflight is not None:
+                    waiting.append((i, inflight))
+                    self.stats["coalesced"] += 1
+                    continue
+
+                inflight = _InFlight()
+                self._inflight[key] = inflight
+                owned[key] = inflight
+                to_send.append((i, method, params, key))
+
+        try:
+            sent = self._send([(method, params) for _, method, params, _ in to_send])
+        except RpcError as e:
+            self._release(owned, e)
+            raise
+
+        expires = time.monotonic()
+        with self._lock:
+            for (i, method, _, key), result in zip(to_send, sent):
+                results[i] = result
+                if key is None:
+                    continue
+                if not isinstance(result, RpcError):
+                    self._cache[key] = (expires + self.cache_ttls[method], result)
+                owned[key].resolve(result)
+                del self._inflight[key]
+
+        for i, inflight in waiting:
+            if not inflight.event.wait(self.timeout):
+                results[i] = RpcError("Timed out waiting for coalesced request")
+            else:
+                results[i] = inflight.result
+
+        return results
+
+    def _cache_key(self, method: str, params: list) -> Optional[str]:
+        if method not in self.cache_ttls:
+            return None
+        return f"{method}:{json.dumps(params, separators=(',', ':'))}"
+
+    def _release(self, owned: Dict[str, _InFlight], error: RpcError):
+        """Wake up anyone waiting on reads this call failed to fetch"""
+        with self._lock:
+            for key, inflight in owned.items():
+                inflight.resolve(error)
+                self._inflight.pop(key, None)
+
+    def _send(self, calls: List[Tuple[str, list]]) -> List[Any]:
+        """POST a batch to the node and match responses back to calls"""
+        if not calls:
+            return []
+
+        payload = []
+        for method, params in calls:
+            payload.append({
+                "jsonrpc": "2.0",
+                "id": next(self._ids),
+                "method": method,
+                "params": params,
+            })
+
+        self.stats["requests"] += 1
+        self.stats["calls"] += len(calls)
+        try:
+            response = self.client.post(self.rpc_url, json=payload)
+            response.raise_for_status()
+            body = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            raise RpcError(f"RPC batch of {len(calls)} calls failed: {e}")
+
+        # A node may answer a batch with a single error object
+        if isinstance(body, dict):
+            error = body.get("error") or {}
+            raise RpcError(error.get("message", "Invalid batch response"), error.get("code"))
+
+        # Responses may arrive in any order; match them back up by id
+        by_id = {item.get("id"): item for item in body}
+        results = []
+        for request in payload:
+            item = by_id.get(request["id"])
+            if item is None:
+                results.append(RpcError(f"No response for {request['method']}"))
+            elif "error" in item:
+                error = item["error"] or {}
+                results.append(RpcError(error.get("message", "RPC error"), error.get("code")))
+            else:
+                results.append(item.get("result"))
+        return results
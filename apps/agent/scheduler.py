@@ -0,0 +1,157 @@
+"""
+Priority scheduling of accounts for rescoring
+Ranks candidates by expected score change instead of staleness alone
+"""
+
+import time
+import heapq
+import logging
+from typing import List, Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_WEIGHTS = {
+    # Per point of expected score change
+    "delta": 1.0,
+    # Added when the expected change crosses a tier/badge boundary,
+    # scaled down linearly as the account sits further below one
+    "threshold": 500.0,
+    # Per hour since the account was last updated
+    "staleness": 2.0,
+}
+
+
+class PriorityScheduler:
+    """
+    Picks which accounts to rescore next.
+    Each candidate carries its current score, last_updated and counts of mints
+    since then (new_mint_quantity, new_early_quantity), from which the
+    expected score delta is estimated without running the full calculation.
+
+    Fairness: accounts waiting longer than max_wait_seconds always go first,
+    and fairness_share of every batch is reserved for the stalest accounts,
+    so low-activity accounts are never starved by busy ones.
+    """
+
+    def __init__(
+        self,
+        calculator,
+        badge_threshold: int,
+        weights: Optional[Dict[str, float]] = None,
+        proximity_window: int = 100,
+        max_wait_seconds: int = 24 * 3600,
+        fairness_share: float = 0.2
+    ):
+        self.calculator = calculator
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.proximity_window = proximity_window
+        self.max_wait_seconds = max_wait_seconds
+        self.fairness_share = min(max(fairness_share, 0.0), 1.0)
+        self.boundaries = sorted(
+            {t for t in calculator.TIER_THRESHOLDS.values() if t > 0} | {badge_threshold}
+        )
+        # Decay re-anchors: when an account's lazily decayed score next
+        # needs writing (see ScoreCalculator.next_reanchor_time)
+        self.reanchor_at: Dict[str, int] = {}
+        self._reanchors: List[Tuple[int, str]] = []
+
+    def schedule_reanchor(self, address: str, at: Optional[int]):
+        """Rescore an account at `at`; None cancels a scheduled re-anchor"""
+        if at is None:
+            self.reanchor_at.pop(address, None)
+            return
+        if self.reanchor_at.get(address) != at:
+            self.reanchor_at[address] = at
+            heapq.heappush(self._reanchors, (at, address))
+
+    def due_reanchors(self, now: Optional[int] = None) -> List[str]:
+        """Accounts whose re-anchor time has come, earliest first"""
+        if now is None:
+            now = int(time.time())
+        due = []
+        while self._reanchors and self._reanchors[0][0] <= now:
+            at, address = heapq.heappop(self._reanchors)
+            # Superseded heap entries are skipped
+            if self.reanchor_at.get(address) == at:
+                del self.reanchor_at[address]
+                due.append(address)
+        return due
+
+    def expected_delta(self, account: Dict[str, Any], now: int) -> int:
+        """Estimate how much the account's score will move when rescored"""
+        calc = self.calculator
+        delta = account.get("new_mint_quantity", 0) * calc.ZORA_MINT_POINTS
+        delta += account.get("new_early_quantity", 0) * calc.EARLY_MINT_BONUS
+        if account.get("first_tx_timestamp"):
+            idle_days = max(0, now - (account.get("last_updated") or now)) // 86400
+            delta += idle_days * calc.BASE_TENURE_POINTS_PER_DAY
+        return delta
+
+    def threshold_proximity(self, score: int, delta: int) -> float:
+        """
+        1.0 if score + delta crosses a boundary, otherwise a value in [0, 0.5)
+        that grows as the projected score gets within proximity_window of one
+        """
+        projected = score + delta
+        for boundary in self.boundaries:
+            if score < boundary <= projected:
+                return 1.0
+            if projected < boundary:
+                distance = boundary - projected
+                if distance < self.proximity_window:
+                    return 0.5 * (1 - distance / self.proximity_window)
+                return 0.0
+        return 0.0
+
+    def priority(self, account: Dict[str, Any], now: Optional[int] = None) -> float:
+        """Score a candidate; higher is rescored sooner"""
+        if now is None:
+            now = int(time.time())
+
+        delta = self.expected_delta(account, now)
+        score = int(account.get("total_score") or 0)
+        staleness_hours = max(0, now - (account.get("last_updated") or 0)) / 3600
+
+        return (
+            self.weights["delta"] * delta
+            + self.weights["threshold"] * self.threshold_proximity(score, delta)
+            + self.weights["staleness"] * staleness_hours
+        )
+
+    def select(
+        self,
+        candidates: List[Dict[str, Any]],
+        limit: int,
+        now: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Pick up to `limit` candidates to rescore, most valuable first"""
+        if now is None:
+            now = int(time.time())
+        if limit <= 0 or not candidates:
+            return []
+
+        by_age = sorted(candidates, key=lambda a: a.get("last_updated") or 0)
+
+        # Starvation guard, then the reserved stalest share
+        overdue = [a for a in by_age if now - (a.get("last_updated") or 0) >= self.max_wait_seconds]
+        selected = overdue[:limit]
+        fair_quota = min(limit, len(selected) + int(limit * self.fairness_share))
+        for account in by_age[len(selected):]:
+            if len(selected) >= fair_quota:
+                break
+            selected.append(account)
+
+        chosen = {a["id"] for a in selected}
+        ranked = sorted(
+            (a for a in candidates if a["id"] not in chosen),
+            key=lambda a: self.priority(a, now),
+            reverse=True
+        )
+        selected.extend(ranked[:limit - len(selected)])
+
+        logger.debug(
+            f"Scheduler picked {len(selected)} of {len(candidates)} candidates "
+            f"({min(len(overdue), limit)} overdue)"
+        )
+        return selected
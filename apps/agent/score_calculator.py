@@ -4,7 +4,10 @@ Score calculation logic for BaseRank Protocol
 
 import time
 import logging
-from typing import List, Dict, Any, Optional
+from array import array
+from typing import List, Dict, Any, Optional, Union, Iterator
+
+from scoring_rules import CompiledRules, compile_rules
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +18,9 @@ class ScoreCalculator:
     1. Base Tenure - Days since first transaction on Base
     2. Zora Mints - Number of NFTs minted
     3. Timeliness - Bonus for early mints (< 24h from collection deploy)
+
+    The constants below are the defaults; a rule config (see scoring_rules.py)
+    overrides them per instance.
     """
 
     # Score multipliers
@@ -32,6 +38,23 @@ class ScoreCalculator:
         "Novice": 0,
     }
 
+    def __init__(
+        self,
+        collection_index=None,
+        rules: Optional[Union[CompiledRules, Dict[str, Any]]] = None
+    ):
+        # Optional CollectionIndex used when a mint row lacks collection_deployed_at
+        self.collection_index = collection_index
+
+        if not isinstance(rules, CompiledRules):
+            rules = compile_rules(rules)
+        self.rules = rules
+        self.BASE_TENURE_POINTS_PER_DAY = rules.points_per_day
+        self.ZORA_MINT_POINTS = rules.mint_points_each
+        self.EARLY_MINT_BONUS = rules.early_bonus
+        self.EARLY_MINT_WINDOW_SECONDS = rules.early_window_seconds
+        self.TIER_THRESHOLDS = rules.tier_thresholds
+
     def calculate_total_score(
         self,
         account_id: str,
@@ -42,26 +65,9 @@ class ScoreCalculator:
         """
         Calculate the total reputation score for an account
         """
-        base_score = self._calculate_base_tenure(first_tx_timestamp)
-        zora_score = self._calculate_zora_score(mints)
-        timely_score = self._calculate_timeliness_score(mints)
-
-        # Include linked wallet scores
-        if linked_wallets:
-            for wallet in linked_wallets:
-                if wallet.get("first_tx_timestamp"):
-                    base_score += self._calculate_base_tenure(wallet["first_tx_timestamp"])
-                zora_score += wallet.get("zora_mint_count", 0) * self.ZORA_MINT_POINTS
-                timely_score += wallet.get("early_mint_count", 0) * self.EARLY_MINT_BONUS
-
-        total = base_score + zora_score + timely_score
-
-        logger.debug(
-            f"Score for {account_id}: base={base_score}, zora={zora_score}, "
-            f"timely={timely_score}, total={total}"
-        )
-
-        return total
+        return self.calculate_score_breakdown(
+            account_id, mints, first_tx_timestamp, linked_wallets
+        )["total_score"]
 
     def _calculate_base_tenure(self, first_tx_timestamp: Optional[int]) -> int:
         """
@@ -107,6 +113,9 @@ class ScoreCalculator:
         minted_at = mint.get("minted_at")
         deployed_at = mint.get("collection_deployed_at")
 
+        if deployed_at is None and self.collection_index is not None:
+            deployed_at = self.collection_index.get_deployed_at(mint.get("contract_address"))
+
         if not minted_at or not deployed_at:
             return False
 
@@ -117,42 +126,70 @@ class ScoreCalculator:
         """
         Get tier name from score
         """
-        for tier, threshold in sorted(
-            self.TIER_THRESHOLDS.items(),
-            key=lambda x: x[1],
-            reverse=True
-        ):
-            if score >= threshold:
-                return tier
-        return "Novice"
+        return self.rules.tier(score)
 
     def calculate_score_breakdown(
         self,
         account_id: str,
         mints: List[Dict[str, Any]],
         first_tx_timestamp: Optional[int] = None,
-        linked_wallets: Optional[List[Dict[str, Any]]] = None
+        linked_wallets: Optional[List[Dict[str, Any]]] = None,
+        now: Optional[int] = None,
+        mint_totals: Optional[Dict[str, int]] = None
     ) -> Dict[str, Any]:
         """
         Get detailed score breakdown
+        Mints are walked once; linked wallet counters are folded in the same
+        way the total score has always counted them.
+        mint_totals ({"mint_quantity", "early_quantity", "last_minted_at"},
+        see EarlyMintCounters) replaces the walk over mints when given
         """
-        base_score = self._calculate_base_tenure(first_tx_timestamp)
-        zora_score = self._calculate_zora_score(mints)
-        timely_score = self._calculate_timeliness_score(mints)
+        if now is None:
+            now = int(time.time())
 
-        # Count stats
-        total_mints = sum(m.get("quantity", 1) for m in mints)
-        early_mints = sum(
-            m.get("quantity", 1) for m in mints 
-            if m.get("is_early_mint") or self._is_early_mint(m)
-        )
+        rules = self.rules
+        total_mints = 0
+        early_mints = 0
+        last_active = None
+        if mint_totals is not None:
+            total_mints = mint_totals.get("mint_quantity", 0)
+            early_mints = mint_totals.get("early_quantity", 0)
+            last_active = mint_totals.get("last_minted_at")
+        for mint in mints:
+            quantity = mint.get("quantity", 1)
+            total_mints += quantity
+            if mint.get("is_early_mint") or self._is_early_mint(mint):
+                early_mints += quantity
+            minted_at = mint.get("minted_at")
+            if minted_at and (last_active is None or minted_at > last_active):
+                last_active = minted_at
 
-        # Tenure days
         tenure_days = 0
         if first_tx_timestamp:
-            tenure_days = (int(time.time()) - first_tx_timestamp) // 86400
+            tenure_days = max(0, (now - first_tx_timestamp) // 86400)
+        base_score = rules.tenure_points(tenure_days)
+
+        # Include linked wallet scores
+        linked_count = 0
+        for wallet in linked_wallets or []:
+            linked_count += 1
+            if wallet.get("first_tx_timestamp"):
+                wallet_days = max(0, (now - wallet["first_tx_timestamp"]) // 86400)
+                base_score += rules.tenure_points(wallet_days)
+            total_mints += wallet.get("zora_mint_count", 0)
+            early_mints += wallet.get("early_mint_count", 0)
 
-        total_score = base_score + zora_score + timely_score
+        zora_score = rules.mint_points(total_mints)
+        timely_score = rules.early_points(early_mints)
+        value = base_score + zora_score + timely_score
+
+        # Inactivity decay only applies when the rules enable it
+        total_score = self.decayed_score(value, last_active, now)
+
+        logger.debug(
+            f"Score for {account_id}: base={base_score}, zora={zora_score}, "
+            f"timely={timely_score}, total={total_score}"
+        )
 
         return {
             "total_score": total_score,
@@ -171,5 +208,169 @@ class ScoreCalculator:
                     "score": timely_score,
                     "early_adopter_count": early_mints,
                 },
+                "linked_wallets": {
+                    "count": linked_count,
+                },
+            },
+            # Undecayed score and the activity time decay counts from;
+            # decayed_score() evaluates them as of any later time
+            "decay": {
+                "value": value,
+                "reference_time": last_active,
             },
         }
+
+    def decayed_score(self, value: int, reference_time: Optional[int], as_of: int) -> int:
+        """Score of an undecayed value as of a time, decayed since reference_time"""
+        decay_factor = self.rules.decay_factor
+        if decay_factor is not None and reference_time is not None:
+            value = int(value * decay_factor(as_of - reference_time))
+        return self.rules.clamp(value)
+
+    def score_as_of(self, breakdown: Dict[str, Any], as_of: Optional[int] = None) -> int:
+        """A breakdown's total score re-evaluated lazily at another time"""
+        decay = breakdown.get("decay")
+        if decay is None:
+            return breakdown["total_score"]
+        return self.decayed_score(decay["value"], decay["reference_time"], int(time.time()) if as_of is None else as_of)
+
+    def _decay_steps(self, reference_time: int, after: int) -> Iterator[int]:
+        """Times after `after` at which the decay factor drops, until its floor"""
+        rules = self.rules
+        previous = 1.0
+        k = 0
+        while True:
+            # Same boundaries as decay_factor: grace + 1, then every period
+            inactive = rules.decay_grace_seconds + max(1, k * rules.decay_period_seconds)
+            factor = rules.decay_factor(inactive)
+            if factor >= previous:
+                return
+            if reference_time + inactive > after:
+                yield reference_time + inactive
+            previous = factor
+            k += 1
+
+    def needs_write(self, breakdown: Dict[str, Any], written_score: int, write_threshold: int = 0) -> bool:
+        """
+        Whether a fresh score must replace the one on chain. Tenure and mints
+        only add points, so a lower score is decay; it waits until it crosses
+        a tier or moves write_threshold from the written score.
+        """
+        score = breakdown["total_score"]
+        if score >= written_score or self.rules.decay_factor is None:
+            return score != written_score
+        return (
+            self.get_tier(score) != self.get_tier(written_score)
+            or written_score - score >= write_threshold
+        )
+
+    def next_reanchor_time(
+        self,
+        breakdown: Dict[str, Any],
+        written_score: int,
+        now: int,
+        write_threshold: int = 0
+    ) -> Optional[int]:
+        """
+        First decay step after now at which the lazily decayed score would
+        need writing over written_score (see needs_write); None if decay
+        never takes it there
+        """
+        decay = breakdown.get("decay")
+        if self.rules.decay_factor is None or decay is None or decay["reference_time"] is None:
+            return None
+        for at in self._decay_steps(decay["reference_time"], now):
+            score = self.decayed_score(decay["value"], decay["reference_time"], at)
+            if self.needs_write({"total_score": score}, written_score, write_threshold):
+                return at
+        return None
+
+    def calculate_breakdowns(
+        self,
+        accounts: List[Dict[str, Any]],
+        mints_by_account: Dict[str, List[Dict[str, Any]]],
+        linked_by_account: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+        now: Optional[int] = None,
+        totals_by_account: Optional[Dict[str, Dict[str, int]]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Score many accounts at once against a single as-of time
+        Accounts need "id" and "first_tx_timestamp"; mints and linked wallets
+        are keyed by account id (see Database.get_mints_for_accounts).
+        totals_by_account holds precomputed mint counters per account
+        (Database.get_mint_counters_for_accounts) to score without mint rows
+        Returns {account_id: breakdown}
+        """
+        if now is None:
+            now = int(time.time())
+        linked_by_account = linked_by_account or {}
+        totals_by_account = totals_by_account or {}
+
+        return {
+            account["id"]: self.calculate_score_breakdown(
+                account["id"],
+                mints_by_account.get(account["id"], []),
+                account.get("first_tx_timestamp"),
+                linked_by_account.get(account["id"]),
+                now=now,
+                mint_totals=totals_by_account.get(account["id"])
+            )
+            for account in accounts
+        }
+
+    def score_inputs(self, inputs, now: Optional[int] = None) -> array:
+        """
+        Score every account of a ScoringInputs (see scoring_inputs.py) in
+        column passes, with the same result as calculate_score_breakdown
+        Columns may be memory-mapped snapshot buffers; nothing is copied
+        Returns total scores by account position
+        """
+        if now is None:
+            now = int(time.time())
+
+        rules = self.rules
+        n = len(inputs)
+        window = rules.early_window_seconds
+        mints = [0] * n
+        early = [0] * n
+        last_active = [0] * n
+
+        for owner, linked_owner, quantity, minted_at, since_deploy, flag in zip(
+            inputs.mint_owner, inputs.mint_linked_owner, inputs.mint_quantity,
+            inputs.mint_minted_at, inputs.mint_since_deploy, inputs.mint_early_flag
+        ):
+            is_early = flag or 0 <= since_deploy < window
+            for i in (owner, linked_owner):
+                if i < 0:
+                    continue
+                mints[i] += quantity
+                if is_early:
+                    early[i] += quantity
+                if minted_at > last_active[i]:
+                    last_active[i] = minted_at
+
+        tenure_points = rules.tenure_points
+        base = [0] * n
+        for owner, first_tx, linked_mints, linked_early in zip(
+            inputs.linked_owner, inputs.linked_first_tx, inputs.linked_mints, inputs.linked_early
+        ):
+            if owner < 0:
+                continue
+            if first_tx:
+                base[owner] += tenure_points(max(0, (now - first_tx) // 86400))
+            mints[owner] += linked_mints
+            early[owner] += linked_early
+
+        mint_points = rules.mint_points
+        early_points = rules.early_points
+        decay_factor = rules.decay_factor
+        clamp = rules.clamp
+
+        scores = array("q", bytes(8 * n))
+        for i, first_tx in enumerate(inputs.first_tx):
+            days = max(0, (now - first_tx) // 86400) if first_tx else 0
+            total = tenure_points(days) + base[i] + mint_points(mints[i]) + early_points(early[i])
+            if decay_factor is not None and last_active[i]:
+                total = int(total * decay_factor(now - last_active[i]))
+            scores[i] = clamp(total)
+        return scores
@@ -0,0 +1,250 @@
+"""
+Backfill of historical score snapshots
+Replays every account's score at regular as-of times from its mint history
+and bulk-loads the results into score_snapshot, next to (never over) the
+snapshots the indexer records from ScoreUpdated. Work is split into address
+ranges processed by a pool of worker processes; each range is written in one
+transaction with its completion marker, so an interrupted run resumes with
+the ranges that are not done yet.
+
+Usage: python score_history.py --start 2024-01-01 --end 2025-01-01 [--interval-hours 24]
+       [--chunks 256] [--workers N]
+"""
+
+import os
+import json
+import time
+import logging
+import argparse
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Tuple
+
+from score_calculator import ScoreCalculator
+
+logger = logging.getLogger(__name__)
+
+JOB_PREFIX = "score_history"
+
+
+def address_ranges(chunks: int) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Split the address space into `chunks` [lo, hi) ranges on the first four
+    hex digits; the first and last ranges are open-ended
+    """
+    chunks = max(1, min(chunks, 0x10000))
+    bounds = [f"0x{(i * 0x10000) // chunks:04x}" for i in range(1, chunks)]
+    return list(zip([None] + bounds, bounds + [None]))
+
+
+def as_of_times(start: int, end: int, interval_seconds: int) -> List[int]:
+    """As-of times in [start, end], aligned to multiples of the interval"""
+    first = -(-start // interval_seconds) * interval_seconds
+    return list(range(first, end + 1, interval_seconds))
+
+
+def job_key(start: int, end: int, interval_seconds: int) -> str:
+    return f"{JOB_PREFIX}:{start}:{end}:{interval_seconds}"
+
+
+def chunk_key(job: str, lo: Optional[str]) -> str:
+    return f"{job}:{lo or '0x'}"
+
+
+def replay_chunk(
+    calculator: ScoreCalculator,
+    accounts: List[Dict[str, Any]],
+    linked: List[Dict[str, Any]],
+    mints: List[Dict[str, Any]],
+    times: List[int]
+) -> List[Tuple[str, str, int, str, int]]:
+    """
+    Score each account at each as-of time, from the first time it existed
+    (first transaction or first mint)
+    Linked wallets count from their linked_at: from then on their tenure and
+    all their mint rows, whenever minted, score for the account, as they do
+    live. Their aggregate mint counters are not historical and are left out
+    Returns score_snapshot rows (id, account_id, score, tier, timestamp)
+    """
+    mints_by_account: Dict[str, List[Dict[str, Any]]] = {}
+    for mint in mints:
+        mints_by_account.setdefault(mint["account_id"], []).append(mint)
+    linked_by_account: Dict[str, List[Dict[str, Any]]] = {}
+    linked_at: Dict[str, int] = {}
+    for wallet in linked:
+        linked_by_account.setdefault(wallet["main_account_id"], []).append(wallet)
+        linked_at[wallet["address"]] = wallet.get("linked_at") or 0
+
+    def counts_from(mint: Dict[str, Any]) -> int:
+        # A linked wallet's mint joins the account's totals once it is linked
+        return max(mint["minted_at"], linked_at.get(mint.get("minter"), 0))
+
+    rows = []
+    for account in accounts:
+        account_id = account["id"]
+        first_tx = account.get("first_tx_timestamp")
+        account_mints = sorted(mints_by_account.get(account_id, []), key=counts_from)
+        wallets = linked_by_account.get(account_id, [])
+
+        starts = [t for t in (first_tx, counts_from(account_mints[0]) if account_mints else None) if t]
+        if not starts:
+            continue
+        born = min(starts)
+
+        # Sweep mints forward as the as-of time advances
+        totals = {"mint_quantity": 0, "early_quantity": 0, "last_minted_at": None}
+        next_mint = 0
+        for as_of in times:
+            while next_mint < len(account_mints) and counts_from(account_mints[next_mint]) <= as_of:
+                mint = account_mints[next_mint]
+                quantity = mint.get("quantity", 1)
+                totals["mint_quantity"] += quantity
+                if mint.get("is_early_mint") or calculator._is_early_mint(mint):
+                    totals["early_quantity"] += quantity
+                totals["last_minted_at"] = max(totals["last_minted_at"] or 0, mint["minted_at"])
+                next_mint += 1
+
+            if as_of < born:
+                continue
+
+            linked_as_of = [
+                {"first_tx_timestamp": w.get("first_tx_timestamp")}
+                for w in wallets
+                if (w.get("linked_at") or 0) <= as_of
+            ]
+            score = calculator.calculate_score_breakdown(
+                account_id, [], first_tx, linked_as_of, now=as_of, mint_totals=totals
+            )["total_score"]
+            rows.append((f"{account_id}-{as_of}", account_id, score, calculator.get_tier(score), as_of))
+
+    return rows
+
+
+# Per-process state created by the pool initializer
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(database_url: str, rules: Optional[Dict[str, Any]]):
+    from database import Database
+    from collection_index import CollectionIndex
+
+    db = Database(database_url, replica_url=os.getenv("DATABASE_REPLICA_URL") or None)
+    collections = CollectionIndex()
+    collections.refresh(db)
+    _worker["db"] = db
+    _worker["calculator"] = ScoreCalculator(collection_index=collections, rules=rules)
+
+
+def backfill_chunk(
+    lo: Optional[str],
+    hi: Optional[str],
+    times: List[int],
+    job: str,
+    db=None,
+    calculator: Optional[ScoreCalculator] = None
+) -> int:
+    """Replay and write one address range; returns the rows inserted"""
+    db = db or _worker["db"]
+    calculator = calculator or _worker["calculator"]
+
+    started = time.monotonic()
+    accounts, linked, mints = db.get_score_history_chunk(lo, hi)
+    rows = replay_chunk(calculator, accounts, linked, mints, times)
+    # Snapshots the indexer already recorded from ScoreUpdated are kept
+    inserted = db.insert_score_snapshots(
+        rows,
+        state_key=chunk_key(job, lo),
+        state_value=json.dumps({"rows": len(rows), "completed_at": int(time.time())})
+    )
+    logger.info(
+        f"Chunk [{lo or '0x'}, {hi or 'end'}): {len(accounts)} accounts, "
+        f"{inserted} of {len(rows)} snapshots written in {time.monotonic() - started:.1f}s"
+    )
+    return inserted
+
+
+def run_backfill(
+    db,
+    database_url: str,
+    start: int,
+    end: int,
+    interval_seconds: int = 86400,
+    chunks: int = 256,
+    workers: Optional[int] = None,
+    rules: Optional[Dict[str, Any]] = None
+) -> int:
+    """
+    Backfill every address range not yet completed for this job
+    Returns the number of snapshot rows written by this run
+    """
+    times = as_of_times(start, end, interval_seconds)
+    if not times:
+        logger.warning("No as-of times in the requested range")
+        return 0
+
+    job = job_key(start, end, interval_seconds)
+    db.ensure_agent_state_table()
+    done = db.get_agent_state(f"{job}:")
+    pending = [(lo, hi) for lo, hi in address_ranges(chunks) if chunk_key(job, lo) not in done]
+    logger.info(
+        f"Score history {job}: {len(times)} as-of times, "
+        f"{len(pending)} of {chunks} chunks to do"
+    )
+
+    written = 0
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        initializer=_init_worker,
+        initargs=(database_url, rules)
+    ) as pool:
+        futures = {pool.submit(backfill_chunk, lo, hi, times, job): lo for lo, hi in pending}
+        for completed, future in enumerate(as_completed(futures), 1):
+            try:
+                written += future.result()
+            except Exception as e:
+                # Left unmarked, so the next run retries it
+                logger.error(f"Chunk starting at {futures[future] or '0x'} failed: {e}")
+            if completed % 10 == 0 or completed == len(futures):
+                logger.info(f"Score history: {completed}/{len(futures)} chunks processed")
+
+    return written
+
+
+def _parse_date(value: str) -> int:
+    return int(datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp())
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point"""
+    from dotenv import load_dotenv
+    from database import Database
+    from scoring_rules import load_rules
+
+    parser = argparse.ArgumentParser(description="Backfill historical score snapshots")
+    parser.add_argument("--start", required=True, help="First as-of date (YYYY-MM-DD, UTC)")
+    parser.add_argument("--end", required=True, help="Last as-of date (YYYY-MM-DD, UTC)")
+    parser.add_argument("--interval-hours", type=float, default=24)
+    parser.add_argument("--chunks", type=int, default=256, help="Address ranges to split the work into")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), format="%(asctime)s [%(levelname)s] %(message)s")
+
+    database_url = os.getenv("DATABASE_URL")
+    rules_path = os.getenv("SCORING_RULES_PATH")
+    written = run_backfill(
+        Database(database_url),
+        database_url,
+        start=_parse_date(args.start),
+        end=_parse_date(args.end),
+        interval_seconds=int(args.interval_hours * 3600),
+        chunks=args.chunks,
+        workers=args.workers,
+        rules=load_rules(rules_path) if rules_path else None
+    )
+    logger.info(f"Score history backfill wrote {written} snapshots")
+
+
+if __name__ == "__main__":
+    main()
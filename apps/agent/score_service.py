@@ -0,0 +1,267 @@
+"""
+Read-side score service
+Serves each account's score, tier and breakdown over HTTP from an in-memory
+cache the agent fills as it scores accounts, so reads never touch Postgres
+or the scoring path. Cold accounts are evicted least-recently-used first;
+a request for an account that is not cached is answered as missing and the
+address is queued for the agent to score off the request path.
+
+Endpoints:
+  GET  /scores/<address>              one account
+  GET  /scores?addresses=0x..,0x..    many accounts
+  POST /scores {"addresses": [...]}   many accounts
+  GET  /health                        cache size, version and hit rate
+Responses carry an ETag; send it back as If-None-Match to get a 304.
+"""
+
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+from typing import List, Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ADDRESS_PATTERN = re.compile(r"^0x[0-9a-f]{40}$")
+
+
+class ScoreCache:
+    """
+    LRU cache of score breakdowns keyed by lowercase address
+    Every stored change bumps a global version; an entry keeps the version
+    it was written at, which makes its ETag. Rescoring an account to the
+    same result keeps its version, so clients keep their cached copy.
+    """
+
+    def __init__(self, max_entries: int = 100000, max_misses: int = 10000):
+        self.max_entries = max_entries
+        self.max_misses = max_misses
+        self.version = 0
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.misses: "OrderedDict[str, None]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def put_many(self, breakdowns: Dict[str, Dict[str, Any]], computed_at: Optional[int] = None) -> int:
+        """Store breakdowns from calculate_breakdowns; returns how many changed"""
+        computed_at = int(time.time()) if computed_at is None else computed_at
+        changed = 0
+        with self._lock:
+            for address, breakdown in breakdowns.items():
+                address = address.lower()
+                self.misses.pop(address, None)
+                entry = self.entries.get(address)
+                if entry is not None and entry["total_score"] == breakdown["total_score"] \
+                        and entry["breakdown"] == breakdown["breakdown"] \
+                        and entry["decay"] == breakdown.get("decay"):
+                    entry["computed_at"] = computed_at
+                    self.entries.move_to_end(address)
+                    continue
+
+                self.version += 1
+                changed += 1
+                self.entries[address] = {
+                    "address": address,
+                    "total_score": breakdown["total_score"],
+                    "tier": breakdown["tier"],
+                    "breakdown": breakdown["breakdown"],
+                    "decay": breakdown.get("decay"),
+                    "computed_at": computed_at,
+                    "version": self.version,
+                }
+                self.entries.move_to_end(address)
+
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.stats["evictions"] += 1
+        return changed
+
+    def get_many(self, addresses: List[str]) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """Cached entries for addresses, and the addresses that were not cached"""
+        found: Dict[str, Dict[str, Any]] = {}
+        missing: List[str] = []
+        with self._lock:
+            for address in addresses:
+                entry = self.entries.get(address)
+                if entry is None:
+                    missing.append(address)
+                    self.misses[address] = None
+                    self.misses.move_to_end(address)
+                    continue
+                self.entries.move_to_end(address)
+                found[address] = entry
+
+            while len(self.misses) > self.max_misses:
+                self.misses.popitem(last=False)
+            self.stats["hits"] += len(found)
+            self.stats["misses"] += len(missing)
+        return found, missing
+
+    def take_misses(self, limit: int) -> List[str]:
+        """Most recently requested uncached addresses, for the agent to score"""
+        with self._lock:
+            taken = []
+            while self.misses and len(taken) < limit:
+                taken.append(self.misses.popitem(last=True)[0])
+        return taken
+
+
+def etag_for(entries: Dict[str, Dict[str, Any]], missing: List[str]) -> str:
+    """Weak validator over the versions of the entries in a response"""
+    digest = hashlib.blake2b(digest_size=12)
+    for address in sorted(entries):
+        entry = entries[address]
+        digest.update(f"{address}:{entry['version']}:{entry['total_score']};".encode())
+    for address in sorted(missing):
+        digest.update(f"{address}:-;".encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+class ScoreRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front of a ScoreService"""
+
+    server_version = "BaseRankScores/1.0"
+    service: "ScoreService"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/health":
+            self._reply(200, self.service.health())
+        elif url.path.startswith("/scores/"):
+            address = url.path[len("/scores/"):].lower()
+            if not ADDRESS_PATTERN.match(address):
+                self._reply(400, {"error": "invalid address"})
+                return
+            found, _ = self.service.cache.get_many([address])
+            if not found:
+                self._reply(404, {"error": "not scored yet", "address": address}, cache=False)
+                return
+            entry = self.service.present(found[address])
+            self._reply(200, entry, etag=f'W/"{entry["version"]}-{entry["total_score"]}"')
+        elif url.path == "/scores":
+            raw = ",".join(parse_qs(url.query).get("addresses", []))
+            self._bulk([a for a in raw.split(",") if a])
+        else:
+            self._reply(404, {"error": "not found"})
+
+    def do_POST(self):
+        if urlsplit(self.path).path != "/scores":
+            self._reply(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", "0"))
+            if length > self.service.max_body_bytes:
+                self._reply(413, {"error": "request too large"})
+                return
+            body = json.loads(self.rfile.read(length) or b"{}")
+            addresses = body.get("addresses") if isinstance(body, dict) else None
+            if not isinstance(addresses, list) or not all(isinstance(a, str) for a in addresses):
+                raise ValueError("addresses must be a list of strings")
+        except ValueError as e:
+            self._reply(400, {"error": str(e)})
+            return
+        self._bulk(addresses)
+
+    def _bulk(self, addresses: List[str]):
+        addresses = list(dict.fromkeys(a.strip().lower() for a in addresses))
+        if not addresses:
+            self._reply(400, {"error": "no addresses given"})
+            return
+        if len(addresses) > self.service.max_batch:
+            self._reply(400, {"error": f"at most {self.service.max_batch} addresses per request"})
+            return
+        invalid = [a for a in addresses if not ADDRESS_PATTERN.match(a)]
+        if invalid:
+            self._reply(400, {"error": "invalid address", "addresses": invalid[:10]})
+            return
+
+        found, missing = self.service.cache.get_many(addresses)
+        found = {address: self.service.present(entry) for address, entry in found.items()}
+        self._reply(200, {"scores": found, "missing": missing}, etag=etag_for(found, missing))
+
+    def _reply(self, status: int, body: Dict[str, Any], etag: Optional[str] = None, cache: bool = True):
+        if etag is not None and etag in [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        payload = json.dumps(body, separators=(",", ":")).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("X-Score-Version", str(self.service.cache.version))
+        if etag is not None:
+            self.send_header("ETag", etag)
+        # Clients revalidate with the ETag rather than trust a stale copy
+        self.send_header("Cache-Control", "no-cache" if cache else "no-store")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+class ScoreService:
+    """Threaded HTTP server over a ScoreCache"""
+
+    def __init__(
+        self,
+        cache: ScoreCache,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        max_batch: int = 500,
+        max_body_bytes: int = 64 * 1024,
+        calculator=None
+    ):
+        self.cache = cache
+        # Re-evaluates decayed scores at read time when given
+        self.calculator = calculator
+        self.max_batch = max_batch
+        self.max_body_bytes = max_body_bytes
+        handler = type("BoundScoreRequestHandler", (ScoreRequestHandler,), {"service": self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self.server.server_address[1]
+
+    def present(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """An entry as served: with decay, its score and tier as of now"""
+        if self.calculator is None or entry.get("decay") is None:
+            return entry
+        score = self.calculator.score_as_of(entry)
+        if score == entry["total_score"]:
+            return entry
+        return {**entry, "total_score": score, "tier": self.calculator.get_tier(score)}
+
+    def health(self) -> Dict[str, Any]:
+        stats = self.cache.stats
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            "entries": len(self.cache),
+            "version": self.cache.version,
+            "hit_rate": round(stats["hits"] / lookups, 4) if lookups else None,
+            **stats,
+        }
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="score-service", daemon=True)
+        self._thread.start()
+        logger.info(f"Score service listening on {self.server.server_address[0]}:{self.port}")
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread:
+            self._thread.join()
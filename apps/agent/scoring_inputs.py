@@ -0,0 +1,176 @@
+"""
+Column-oriented scoring inputs for every account
+Filled from the database or backed directly by a memory-mapped snapshot,
+and scored in bulk by ScoreCalculator.score_inputs
+"""
+
+import time
+import logging
+from array import array
+from typing import Dict, Any
+
+logger = logging.getLogger(__name__)
+
+# since_deploy value for mints whose collection deploy time is unknown
+UNKNOWN = -(2 ** 63)
+
+# Owner index meaning "not owned by any account"
+NO_OWNER = -1
+
+
+class ScoringInputs:
+    """
+    Accounts are addressed by position; mints and linked wallets point at
+    their account through an owner index. A mint minted by an account that
+    is also a linked wallet scores for both, hence the second owner column.
+    Timestamps of 0 mean unknown.
+    """
+
+    def __init__(self):
+        self.ids = []
+        self.first_tx = array("q")
+        self.current_score = array("q")
+
+        self.linked_owner = array("q")
+        self.linked_first_tx = array("q")
+        self.linked_mints = array("q")
+        self.linked_early = array("q")
+
+        self.mint_owner = array("q")
+        self.mint_linked_owner = array("q")
+        self.mint_quantity = array("q")
+        self.mint_minted_at = array("q")
+        self.mint_since_deploy = array("q")
+        self.mint_early_flag = array("b")
+
+        self._positions: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def mint_count(self) -> int:
+        return len(self.mint_owner)
+
+    def add_account(self, account: Dict[str, Any]):
+        self._positions[account["id"].lower()] = len(self.ids)
+        self.ids.append(account["id"].lower())
+        self.first_tx.append(account.get("first_tx_timestamp") or 0)
+        self.current_score.append(int(account.get("total_score") or 0))
+
+    def add_linked_wallet(self, wallet: Dict[str, Any]) -> bool:
+        owner = self._positions.get(wallet["main_account_id"].lower())
+        if owner is None:
+            return False
+        self.linked_owner.append(owner)
+        self.linked_first_tx.append(wallet.get("first_tx_timestamp") or 0)
+        self.linked_mints.append(wallet.get("zora_mint_count") or 0)
+        self.linked_early.append(wallet.get("early_mint_count") or 0)
+        return True
+
+    def add_mint(self, mint: Dict[str, Any], collection_index=None) -> bool:
+        """Add a mint already tagged with the account it scores for"""
+        owner = self._positions.get(mint["account_id"].lower())
+        if owner is None:
+            return False
+
+        deployed_at = mint.get("collection_deployed_at")
+        if deployed_at is None and collection_index is not None:
+            deployed_at = collection_index.get_deployed_at(mint.get("contract_address"))
+
+        self.mint_owner.append(owner)
+        self.mint_linked_owner.append(NO_OWNER)
+        self.mint_quantity.append(mint.get("quantity", 1))
+        self.mint_minted_at.append(mint.get("minted_at") or 0)
+        self.mint_since_deploy.append(_since_deploy(mint.get("minted_at"), deployed_at))
+        self.mint_early_flag.append(1 if mint.get("is_early_mint") else 0)
+        return True
+
+    @classmethod
+    def from_snapshot(cls, snapshot) -> "ScoringInputs":
+        """
+        Inputs backed by a Snapshot's memory-mapped columns
+        Only the owner and since-deploy columns are computed; every other
+        column is the snapshot's buffer itself
+        """
+        started = time.monotonic()
+        inputs = cls()
+
+        ids = snapshot.column("account", "id")
+        inputs.ids = ids
+        inputs.first_tx = snapshot.column("account", "first_tx_timestamp")
+        inputs.current_score = snapshot.column("account", "total_score")
+        positions = {ids.raw(i): i for i in range(len(ids))}
+
+        linked_addresses = snapshot.column("linked_wallet", "address")
+        linked_mains = snapshot.column("linked_wallet", "main_account_id")
+        inputs.linked_owner = array("q", (
+            positions.get(linked_mains.raw(i), NO_OWNER) for i in range(len(linked_mains))
+        ))
+        inputs.linked_first_tx = snapshot.column("linked_wallet", "first_tx_timestamp")
+        inputs.linked_mints = snapshot.column("linked_wallet", "zora_mint_count")
+        inputs.linked_early = snapshot.column("linked_wallet", "early_mint_count")
+        main_of_linked = {
+            linked_addresses.raw(i): owner
+            for i, owner in enumerate(inputs.linked_owner)
+        }
+
+        collection_addresses = snapshot.column("collection", "address")
+        deployed = dict(zip(
+            (collection_addresses.raw(i) for i in range(len(collection_addresses))),
+            snapshot.column("collection", "deployed_at")
+        ))
+
+        minters = snapshot.column("zora_mint", "minter")
+        contracts = snapshot.column("zora_mint", "contract_address")
+        minted_at = snapshot.column("zora_mint", "minted_at")
+        stored_deployed_at = snapshot.column("zora_mint", "collection_deployed_at")
+        owners = array("q")
+        linked_owners = array("q")
+        since_deploy = array("q")
+        for i in range(len(minters)):
+            minter = minters.raw(i)
+            owners.append(positions.get(minter, NO_OWNER))
+            linked_owners.append(main_of_linked.get(minter, NO_OWNER))
+            # Snapshots store NULL as 0; fall back to the collection table
+            deployed_at = stored_deployed_at[i] or deployed.get(contracts.raw(i))
+            since_deploy.append(_since_deploy(minted_at[i], deployed_at))
+
+        inputs.mint_owner = owners
+        inputs.mint_linked_owner = linked_owners
+        inputs.mint_quantity = snapshot.column("zora_mint", "quantity")
+        inputs.mint_minted_at = minted_at
+        inputs.mint_since_deploy = since_deploy
+        inputs.mint_early_flag = snapshot.column("zora_mint", "is_early_mint")
+
+        logger.info(
+            f"Mapped snapshot with {len(inputs)} accounts and {inputs.mint_count} mints "
+            f"in {time.monotonic() - started:.1f}s"
+        )
+        return inputs
+
+
+def _since_deploy(minted_at, deployed_at) -> int:
+    # Same truthiness rules as ScoreCalculator._is_early_mint
+    if not minted_at or not deployed_at:
+        return UNKNOWN
+    return minted_at - deployed_at
+
+
+def load_inputs(db, collection_index=None, batch_size: int = 10000) -> ScoringInputs:
+    """Stream accounts, linked wallets and mints from the database into columns"""
+    started = time.monotonic()
+    inputs = ScoringInputs()
+
+    for account in db.iter_scoring_accounts(batch_size):
+        inputs.add_account(account)
+    for wallet in db.iter_scoring_linked_wallets(batch_size):
+        inputs.add_linked_wallet(wallet)
+    for mint in db.iter_scoring_mints(batch_size):
+        inputs.add_mint(mint, collection_index)
+
+    logger.info(
+        f"Loaded {len(inputs)} accounts, {len(inputs.linked_owner)} linked wallets "
+        f"and {inputs.mint_count} mints in {time.monotonic() - started:.1f}s"
+    )
+    return inputs
@@ -0,0 +1,174 @@
+"""
+Declarative scoring rules for BaseRank Protocol
+A rule config (weights, windows, caps, decay, tiers) is validated and compiled
+once into plain closures that ScoreCalculator calls per account
+"""
+
+import json
+import math
+import bisect
+import logging
+from typing import Dict, Any, Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+
+# Mirrors the original hard-coded ScoreCalculator constants
+DEFAULT_RULES: Dict[str, Any] = {
+    "tenure": {
+        "points_per_day": 1,
+        "max_days": None,
+    },
+    "mints": {
+        "points": 10,
+        # "linear" or "log" (points * log2(1 + count), damps bulk minters)
+        "scale": "linear",
+        "max_count": None,
+    },
+    "early_mints": {
+        "bonus": 100,
+        "window_seconds": 24 * 60 * 60,
+        "max_count": None,
+    },
+    # Inactivity decay as described in docs/PVC_FRAMEWORK.md; off when rate is 0
+    "decay": {
+        "grace_days": 30,
+        "period_days": 30,
+        "rate": 0.0,
+        "max_decay": 0.5,
+    },
+    "max_score": None,
+    "tiers": {
+        "BASED": 1000,
+        "Gold": 850,
+        "Silver": 500,
+        "Bronze": 100,
+        "Novice": 0,
+    },
+}
+
+
+def merge_rules(overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Overlay a partial rule config on DEFAULT_RULES, section by section"""
+    rules = {
+        key: dict(value) if isinstance(value, dict) else value
+        for key, value in DEFAULT_RULES.items()
+    }
+    for key, value in (overrides or {}).items():
+        if key not in rules:
+            raise ValueError(f"Unknown scoring rule section: {key}")
+        if key == "tiers":
+            # Tiers replace the whole table, otherwise stale tiers would linger
+            rules[key] = dict(value)
+        elif isinstance(rules[key], dict):
+            unknown = set(value) - set(rules[key])
+            if unknown:
+                raise ValueError(f"Unknown {key} rule(s): {', '.join(sorted(unknown))}")
+            rules[key].update(value)
+        else:
+            rules[key] = value
+    return rules
+
+
+def load_rules(path: str) -> Dict[str, Any]:
+    """Read a JSON rule config and merge it over the defaults"""
+    with open(path) as f:
+        return merge_rules(json.load(f))
+
+
+def _counter(rate: float, cap: Optional[int], scale: str = "linear") -> Callable[[int], int]:
+    """Points for a count, specialized so caps and scaling cost nothing when unused"""
+    if scale == "log":
+        if cap is None:
+            return lambda n: int(rate * math.log2(1 + n))
+        return lambda n: int(rate * math.log2(1 + min(n, cap)))
+    if scale != "linear":
+        raise ValueError(f"Unknown mint scale: {scale}")
+    if cap is None:
+        return lambda n: int(n * rate)
+    return lambda n: int(min(n, cap) * rate)
+
+
+def _decay(grace_days: int, period_days: int, rate: float, max_decay: float) -> Optional[Callable[[int], float]]:
+    """Multiplier for a score after `inactive_seconds` without activity"""
+    if rate <= 0:
+        return None
+    grace = grace_days * 86400
+    period = period_days * 86400
+    floor = 1.0 - max_decay
+
+    def decay_factor(inactive_seconds: int) -> float:
+        if inactive_seconds <= grace:
+            return 1.0
+        periods = (inactive_seconds - grace) // period + 1
+        return max(floor, 1.0 - rate * periods)
+
+    return decay_factor
+
+
+def _tier_lookup(tiers: Dict[str, int]) -> Callable[[int], str]:
+    """Score to tier name via binary search over the sorted thresholds"""
+    ordered = sorted(tiers.items(), key=lambda t: t[1])
+    thresholds = [threshold for _, threshold in ordered]
+    names = [name for name, _ in ordered]
+    lowest = names[0]
+
+    def tier(score: int) -> str:
+        i = bisect.bisect_right(thresholds, score) - 1
+        return names[i] if i >= 0 else lowest
+
+    return tier
+
+
+class CompiledRules:
+    """
+    A validated rule config turned into callables:
+    tenure_points(days), mint_points(count), early_points(count),
+    decay_factor(inactive_seconds) or None, clamp(score) and tier(score)
+    """
+
+    def __init__(self, rules: Dict[str, Any]):
+        self.rules = rules
+
+        tenure = rules["tenure"]
+        mints = rules["mints"]
+        early = rules["early_mints"]
+        decay = rules["decay"]
+
+        if not rules["tiers"]:
+            raise ValueError("At least one tier is required")
+        if early["window_seconds"] <= 0:
+            raise ValueError("early_mints.window_seconds must be positive")
+        if not 0 <= decay["max_decay"] <= 1:
+            raise ValueError("decay.max_decay must be between 0 and 1")
+        if decay["rate"] > 0 and decay["period_days"] <= 0:
+            raise ValueError("decay.period_days must be positive when decay is enabled")
+        # Scores are written on chain as integers
+        if rules["max_score"] is not None and not isinstance(rules["max_score"], int):
+            raise ValueError("max_score must be an integer")
+
+        # Exposed under the original ScoreCalculator constant names
+        self.points_per_day = tenure["points_per_day"]
+        self.mint_points_each = mints["points"]
+        self.early_bonus = early["bonus"]
+        self.early_window_seconds = early["window_seconds"]
+        self.tier_thresholds = dict(rules["tiers"])
+
+        self.tenure_points = _counter(tenure["points_per_day"], tenure["max_days"])
+        self.mint_points = _counter(mints["points"], mints["max_count"], mints["scale"])
+        self.early_points = _counter(early["bonus"], early["max_count"])
+        self.decay_factor = _decay(
+            decay["grace_days"], decay["period_days"], decay["rate"], decay["max_decay"]
+        )
+        # The factor only changes at grace + k * period of inactivity
+        self.decay_grace_seconds = decay["grace_days"] * 86400
+        self.decay_period_seconds = decay["period_days"] * 86400
+
+        max_score = rules["max_score"]
+        self.clamp = (lambda s: s) if max_score is None else (lambda s: min(s, max_score))
+        self.tier = _tier_lookup(self.tier_thresholds)
+
+
+def compile_rules(rules: Optional[Dict[str, Any]] = None) -> CompiledRules:
+    """Compile a full or partial rule config (partial configs use the defaults)"""
+    return CompiledRules(merge_rules(rules))
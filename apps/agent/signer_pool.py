@@ -0,0 +1,288 @@
+"""
+Pool of updater wallets sending score batches in parallel
+Each signer has its own nonce sequence, so batches routed to different
+signers do not queue behind each other. Accounts are assigned to signers by
+weighted rendezvous hashing of the address: an account keeps its signer
+while the pool is stable, and only a benched signer's accounts move.
+Weights follow each signer's balance and recent send latency; a signer whose
+send fails or stalls is benched for a cooldown and its batch fails over.
+"""
+
+import time
+import math
+import hashlib
+import logging
+import threading
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Any, Optional, Callable, Union
+
+from rpc_client import RpcClient
+
+logger = logging.getLogger(__name__)
+
+
+class CdpSigner:
+    """Updater wallet backed by a CDP AgentKit instance"""
+
+    def __init__(self, agent):
+        self.agent = agent
+
+    @property
+    def address(self) -> str:
+        return self.agent.wallet_address
+
+    def send(self, call: Dict[str, Any]) -> str:
+        result = self.agent.invoke_contract(
+            contract_address=call["to"],
+            method=call["method"],
+            abi=call["abi"],
+            args=call["args"]
+        )
+        return result.get("transaction_hash")
+
+
+class LocalSigner:
+    """
+    Updater wallet holding its own key: signs locally and sends raw
+    transactions through the RPC client, tracking its nonce itself.
+    Meant for local devnets such as anvil and its prefunded accounts.
+    """
+
+    def __init__(self, private_key: str, rpc: RpcClient, chain_id: int, gas_multiplier: float = 1.2):
+        from eth_account import Account
+
+        self.account = Account.from_key(private_key)
+        self.rpc = rpc
+        self.chain_id = chain_id
+        self.gas_multiplier = gas_multiplier
+        self._nonce: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def address(self) -> str:
+        return self.account.address
+
+    def send(self, call: Dict[str, Any]) -> str:
+        with self._lock:
+            try:
+                if self._nonce is None:
+                    self._nonce = int(self.rpc.call("eth_getTransactionCount", [self.address, "pending"]), 16)
+                gas = int(self.rpc.call("eth_estimateGas", [
+                    {"from": self.address, "to": call["to"], "data": call["data"]}
+                ]), 16)
+                signed = self.account.sign_transaction({
+                    "to": call["to"],
+                    "data": call["data"],
+                    "value": 0,
+                    "nonce": self._nonce,
+                    "gas": int(gas * self.gas_multiplier),
+                    "gasPrice": int(self.rpc.call("eth_gasPrice"), 16),
+                    "chainId": self.chain_id,
+                })
+                tx_hash = self.rpc.call("eth_sendRawTransaction", ["0x" + bytes(signed.raw_transaction).hex()])
+            except Exception:
+                # Re-read the nonce next time rather than guess what the node has
+                self._nonce = None
+                raise
+            self._nonce += 1
+            return tx_hash
+
+
+class SignerPool:
+    """
+    Routes batches to signers and sends them concurrently
+    Signers need `address` and `send(call) -> tx_hash`
+    """
+
+    def __init__(
+        self,
+        signers: List[Any],
+        min_balance_wei: int = 10 ** 15,
+        cooldown_seconds: float = 300,
+        send_timeout_seconds: float = 60,
+        latency_smoothing: float = 0.3
+    ):
+        if not signers:
+            raise ValueError("A signer pool needs at least one signer")
+        self.signers = signers
+        self.min_balance_wei = min_balance_wei
+        self.cooldown_seconds = cooldown_seconds
+        self.send_timeout_seconds = send_timeout_seconds
+        self.latency_smoothing = latency_smoothing
+        self.stats = [
+            {"balance_wei": None, "latency": None, "benched_until": 0.0, "failures": 0}
+            for _ in signers
+        ]
+        # Spare threads so a stalled send does not starve the others
+        self._executor = ThreadPoolExecutor(max_workers=2 * len(signers), thread_name_prefix="signer")
+
+    def __len__(self) -> int:
+        return len(self.signers)
+
+    def weight(self, index: int, now: Optional[float] = None) -> float:
+        """
+        Routing weight: 0 while benched or below the minimum balance,
+        lower for signers that are slow or running low on funds
+        """
+        stats = self.stats[index]
+        if stats["benched_until"] > (time.monotonic() if now is None else now):
+            return 0.0
+
+        weight = 1.0
+        balance = stats["balance_wei"]
+        if balance is not None:
+            if balance < self.min_balance_wei:
+                return 0.0
+            weight *= min(1.0, balance / (10 * self.min_balance_wei))
+        if stats["latency"] is not None:
+            weight /= 1.0 + stats["latency"]
+        return weight
+
+    def route(self, address: str, exclude=()) -> Optional[int]:
+        """Signer index for an address, or None if no signer is available"""
+        now = time.monotonic()
+        best, best_score = None, 0.0
+        for index, signer in enumerate(self.signers):
+            weight = self.weight(index, now)
+            if index in exclude or weight <= 0:
+                continue
+            digest = hashlib.blake2b(f"{address.lower()}:{signer.address.lower()}".encode(), digest_size=8).digest()
+            u = (int.from_bytes(digest, "big") + 0.5) / 2 ** 64
+            score = -weight / math.log(u)
+            if score > best_score:
+                best, best_score = index, score
+        return best
+
+    def partition(self, updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Split updates into one batch per signer: [{"signer": index, "updates": [...]}]"""
+        batches: Dict[int, List[Dict[str, Any]]] = {}
+        for update in updates:
+            index = self.route(update["address"])
+            if index is None:
+                raise RuntimeError("No signer in the pool is available")
+            batches.setdefault(index, []).append(update)
+        return [{"signer": index, "updates": batch} for index, batch in sorted(batches.items())]
+
+    def refresh_balances(self, get_balance: Callable[[str], Optional[Decimal]]):
+        """Update each signer's balance from get_balance(address) -> ETH"""
+        for signer, stats in zip(self.signers, self.stats):
+            balance = get_balance(signer.address)
+            if balance is not None:
+                stats["balance_wei"] = int(balance * 10 ** 18)
+                if stats["balance_wei"] < self.min_balance_wei:
+                    logger.warning(f"Signer {signer.address} is below the minimum balance ({balance} ETH)")
+
+    def _record_latency(self, index: int, seconds: float):
+        stats = self.stats[index]
+        stats["failures"] = 0
+        if stats["latency"] is None:
+            stats["latency"] = seconds
+        else:
+            stats["latency"] += self.latency_smoothing * (seconds - stats["latency"])
+
+    def _bench(self, index: int, error: Exception):
+        stats = self.stats[index]
+        stats["failures"] += 1
+        stats["benched_until"] = time.monotonic() + self.cooldown_seconds
+        logger.warning(
+            f"Benching signer {self.signers[index].address} for {self.cooldown_seconds:.0f}s "
+            f"after {stats['failures']} failure(s): {error}"
+        )
+
+    def send(
+        self,
+        batches: List[Dict[str, Any]],
+        call_for: Callable[[List[Dict[str, Any]]], Dict[str, Any]],
+        resend_on_timeout: bool = False
+    ) -> List[Union[str, Exception]]:
+        """
+        Send each batch from its signer concurrently
+        A batch whose signer fails is resent whole by the next signer for its
+        key (default: its first address); one that no signer could send gets
+        the last error in its slot.
+        A signer that exceeds send_timeout_seconds is benched, but its send
+        is awaited rather than resent: it keeps running on its own nonce
+        lane, and an untracked copy could be mined after a newer write and
+        overwrite it with a stale score (or revert, for a root commit).
+        resend_on_timeout=True fails over anyway, for calls that are safe to
+        land twice.
+        Returns tx hashes (or exceptions) in batch order
+        """
+        results: List[Union[str, Exception, None]] = [None] * len(batches)
+        pending = {}
+        # Timed-out slots that are awaited rather than resent
+        overdue = set()
+
+        def submit(slot: int, index: int, tried: set):
+            call = call_for(batches[slot]["updates"])
+            future = self._executor.submit(self.signers[index].send, call)
+            pending[slot] = (index, future, tried | {index}, time.monotonic())
+
+        for slot, batch in enumerate(batches):
+            submit(slot, batch["signer"], set())
+
+        while pending:
+            now = time.monotonic()
+            deadlines = [
+                started + self.send_timeout_seconds
+                for slot, (_, _, _, started) in pending.items() if slot not in overdue
+            ]
+            timeout = max(0.0, min(deadlines) - now) if deadlines else None
+            wait([future for _, future, _, _ in pending.values()], timeout=timeout, return_when=FIRST_COMPLETED)
+
+            now = time.monotonic()
+            for slot, (index, future, tried, started) in list(pending.items()):
+                if future.done():
+                    error = future.exception()
+                    if error is None:
+                        self._record_latency(index, now - started)
+                        results[slot] = future.result()
+                        batches[slot]["signer"] = index
+                        del pending[slot]
+                        continue
+                    if slot in overdue:
+                        # Already benched for the timeout
+                        results[slot] = error
+                        del pending[slot]
+                        continue
+                elif slot in overdue:
+                    continue
+                elif now - started >= self.send_timeout_seconds:
+                    error = TimeoutError(f"send did not return within {self.send_timeout_seconds:.0f}s")
+                    if not resend_on_timeout:
+                        self._bench(index, error)
+                        overdue.add(slot)
+                        continue
+                else:
+                    continue
+
+                self._bench(index, error)
+                del pending[slot]
+                fallback = self.route(_route_key(batches[slot]), exclude=tried)
+                if fallback is None:
+                    results[slot] = error
+                else:
+                    logger.info(f"Failing batch over to signer {self.signers[fallback].address}")
+                    submit(slot, fallback, tried)
+
+        return results
+
+    def send_one(self, call: Dict[str, Any], key: str, resend_on_timeout: bool = False) -> str:
+        """Send a single call from the signer for `key`, with failover"""
+        index = self.route(key)
+        if index is None:
+            raise RuntimeError("No signer in the pool is available")
+        result = self.send(
+            [{"signer": index, "key": key, "updates": []}], lambda _: call, resend_on_timeout=resend_on_timeout
+        )[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+def _route_key(batch: Dict[str, Any]) -> str:
+    return batch.get("key") or batch["updates"][0]["address"]
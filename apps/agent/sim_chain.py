@@ -0,0 +1,418 @@
+"""
+In-process simulated chain for offline load tests
+Stands in for both the RPC client and the wallet: transactions wait in a
+mempool, are mined into blocks at a fixed block time under a block gas
+limit, can be dropped or reverted at configurable rates, and apply their
+writes to an in-memory ReputationRegistry. ConfirmationTracker polls it
+like a node.
+
+Usage: python sim_chain.py [--updates 20000] [--batch-size 200] [--signers 1]
+       [--block-time 0.2] [--gas-limit 30000000] [--latency 0.01]
+       [--drop-rate 0.01] [--revert-rate 0.01] [--json]
+"""
+
+import sys
+import json
+import time
+import random
+import hashlib
+import logging
+import argparse
+import statistics
+import threading
+from typing import List, Dict, Any, Optional, Tuple, Callable
+
+from rpc_client import RpcError
+from chain_writer import (
+    UPDATE_SCORE_SELECTOR,
+    BATCH_UPDATE_SCORES_SELECTOR,
+    BATCH_UPDATE_SCORES_PACKED_SELECTOR,
+    COMMIT_SCORE_ROOT_SELECTOR,
+    PACKED_RECORD_SIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+TX_BASE_GAS = 21000
+NEW_SLOT_GAS = 22100
+CHANGED_SLOT_GAS = 5000
+
+
+def calldata_gas(data: bytes) -> int:
+    return sum(16 if b else 4 for b in data)
+
+
+def decode_score_writes(data: bytes) -> Optional[List[Tuple[str, int]]]:
+    """
+    (address, score) writes made by a registry score call, [] for a root
+    commit, None for calldata the registry would reject
+    """
+    selector, body = data[:4].hex(), data[4:]
+
+    def word(i: int) -> int:
+        return int.from_bytes(body[32 * i:32 * i + 32], "big")
+
+    def address(value: int) -> str:
+        return "0x" + format(value, "040x")
+
+    try:
+        if selector == UPDATE_SCORE_SELECTOR:
+            return [(address(word(0)), word(1))]
+        if selector == BATCH_UPDATE_SCORES_SELECTOR:
+            users, scores = word(0) // 32, word(1) // 32
+            n = word(users)
+            if word(scores) != n:
+                return None
+            return [(address(word(users + 1 + i)), word(scores + 1 + i)) for i in range(n)]
+        if selector == BATCH_UPDATE_SCORES_PACKED_SELECTOR:
+            start = word(0) // 32
+            packed = body[32 * (start + 1):32 * (start + 1) + word(start)]
+            if len(packed) % PACKED_RECORD_SIZE:
+                return None
+            return [
+                ("0x" + packed[i:i + 20].hex(), int.from_bytes(packed[i + 20:i + PACKED_RECORD_SIZE], "big"))
+                for i in range(0, len(packed), PACKED_RECORD_SIZE)
+            ]
+        if selector == COMMIT_SCORE_ROOT_SELECTOR:
+            return []
+    except (IndexError, ValueError):
+        return None
+    return None
+
+
+class SimulatedChain:
+    """
+    A single-node chain with a FIFO mempool. Blocks are produced lazily from
+    the clock, so nothing runs in the background; every call first mines the
+    blocks whose time has passed.
+    """
+
+    def __init__(
+        self,
+        block_time: float = 2.0,
+        gas_limit: int = 30_000_000,
+        latency: float = 0.0,
+        drop_rate: float = 0.0,
+        revert_rate: float = 0.0,
+        gas_price: int = 10 ** 9,
+        chain_id: int = 8453,
+        initial_balance_wei: int = 10 ** 18,
+        seed: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.block_time = block_time
+        self.gas_limit = gas_limit
+        self.latency = latency
+        self.drop_rate = drop_rate
+        self.revert_rate = revert_rate
+        self.gas_price = gas_price
+        self.chain_id = chain_id
+        self.initial_balance_wei = initial_balance_wei
+        self.clock = clock
+        self.random = random.Random(seed)
+
+        self._lock = threading.Lock()
+        self.genesis_at = clock()
+        self.head = 0
+        self.mempool: List[Dict[str, Any]] = []
+        self.transactions: Dict[str, Dict[str, Any]] = {}
+        self.receipts: Dict[str, Dict[str, Any]] = {}
+        self.nonces: Dict[str, int] = {}
+        self.balances: Dict[str, int] = {}
+
+        # ReputationRegistry state
+        self.scores: Dict[str, int] = {}
+        self.score_root = b"\x00" * 32
+        self.score_epoch = 0
+
+        self.stats = {"submitted": 0, "dropped": 0, "mined": 0, "reverted": 0, "gas_used": 0, "blocks": 0}
+
+    # Wallet side
+
+    def submit(self, sender: str, to: str, data: str) -> str:
+        """Send a transaction; returns its hash even if it will be dropped"""
+        self._wait()
+        raw = bytes.fromhex(data[2:] if data.startswith("0x") else data)
+        sender = sender.lower()
+
+        with self._lock:
+            self._mine()
+            gas = self._estimate(raw)
+            if gas > self.gas_limit:
+                raise RpcError(f"gas {gas} exceeds block gas limit {self.gas_limit}", -32000)
+
+            nonce = self.nonces.get(sender, 0)
+            self.nonces[sender] = nonce + 1
+            tx_hash = "0x" + hashlib.sha256(f"{sender}:{nonce}:{self.stats['submitted']}".encode()).hexdigest()
+            self.stats["submitted"] += 1
+
+            if self.random.random() < self.drop_rate:
+                self.stats["dropped"] += 1
+                return tx_hash
+
+            tx = {"hash": tx_hash, "from": sender, "to": to, "nonce": nonce, "gas": gas, "data": raw}
+            self.transactions[tx_hash] = tx
+            self.mempool.append(tx)
+            return tx_hash
+
+    # Node side
+
+    def call(self, method: str, params: Optional[list] = None) -> Any:
+        result = self.batch([(method, params or [])])[0]
+        if isinstance(result, RpcError):
+            raise result
+        return result
+
+    def batch(self, calls: List[Tuple[str, list]]) -> List[Any]:
+        self._wait()
+        with self._lock:
+            self._mine()
+            results = []
+            for method, params in calls:
+                try:
+                    results.append(self._dispatch(method, params))
+                except RpcError as e:
+                    results.append(e)
+            return results
+
+    def invalidate(self, method: Optional[str] = None):
+        """Nothing is cached; present for RpcClient compatibility"""
+
+    def _dispatch(self, method: str, params: list) -> Any:
+        if method == "eth_chainId":
+            return hex(self.chain_id)
+        if method == "eth_blockNumber":
+            return hex(self.head)
+        if method == "eth_gasPrice":
+            return hex(self.gas_price)
+        if method == "eth_getBalance":
+            return hex(self.balances.get(params[0].lower(), self.initial_balance_wei))
+        if method == "eth_getTransactionCount":
+            return hex(self.nonces.get(params[0].lower(), 0))
+        if method == "eth_estimateGas":
+            data = params[0].get("data", "0x")
+            return hex(self._estimate(bytes.fromhex(data[2:])))
+        if method == "eth_getTransactionReceipt":
+            return self.receipts.get(params[0])
+        if method == "eth_getTransactionByHash":
+            tx = self.transactions.get(params[0])
+            if tx is None:
+                return None
+            receipt = self.receipts.get(tx["hash"])
+            return {
+                "hash": tx["hash"],
+                "from": tx["from"],
+                "nonce": hex(tx["nonce"]),
+                "blockNumber": receipt["blockNumber"] if receipt else None,
+            }
+        raise RpcError(f"Method {method} not supported by the simulated chain", -32601)
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _estimate(self, data: bytes) -> int:
+        gas = TX_BASE_GAS + calldata_gas(data)
+        for address, _ in decode_score_writes(data) or []:
+            gas += CHANGED_SLOT_GAS if self.scores.get(address) else NEW_SLOT_GAS
+        if data[:4].hex() == COMMIT_SCORE_ROOT_SELECTOR:
+            gas += 2 * CHANGED_SLOT_GAS
+        return gas
+
+    def _mine(self):
+        """Produce every block whose time has come"""
+        target = int((self.clock() - self.genesis_at) / self.block_time)
+        while self.head < target:
+            self.head += 1
+            self.stats["blocks"] += 1
+            gas_left = self.gas_limit
+            while self.mempool and self.mempool[0]["gas"] <= gas_left:
+                tx = self.mempool.pop(0)
+                gas_left -= tx["gas"]
+                self._execute(tx)
+
+    def _execute(self, tx: Dict[str, Any]):
+        writes = decode_score_writes(tx["data"])
+        ok = writes is not None and self.random.random() >= self.revert_rate
+
+        if ok and tx["data"][:4].hex() == COMMIT_SCORE_ROOT_SELECTOR:
+            epoch = int.from_bytes(tx["data"][4:36], "big")
+            if epoch <= self.score_epoch:
+                ok = False  # StaleScoreEpoch
+            else:
+                self.score_epoch = epoch
+                self.score_root = tx["data"][36:68]
+        if ok:
+            for address, score in writes:
+                self.scores[address] = score
+        else:
+            self.stats["reverted"] += 1
+
+        self.stats["mined"] += 1
+        self.stats["gas_used"] += tx["gas"]
+        sender = tx["from"]
+        self.balances[sender] = self.balances.get(sender, self.initial_balance_wei) - tx["gas"] * self.gas_price
+        self.receipts[tx["hash"]] = {
+            "transactionHash": tx["hash"],
+            "blockNumber": hex(self.head),
+            "gasUsed": hex(tx["gas"]),
+            "status": "0x1" if ok else "0x0",
+        }
+
+
+class SimulatedSigner:
+    """Wallet on a SimulatedChain, usable wherever ChainWriter takes signers"""
+
+    def __init__(self, chain: SimulatedChain, address: str):
+        self.chain = chain
+        self.address = address
+
+    def send(self, call: Dict[str, Any]) -> str:
+        return self.chain.submit(self.address, call["to"], call["data"])
+
+
+def run_load_test(
+    chain: SimulatedChain,
+    updates: int = 20000,
+    batch_size: int = 200,
+    signers: int = 1,
+    accounts: Optional[int] = None,
+    confirmations: int = 1,
+    drop_timeout_seconds: int = 5,
+    packed: bool = False,
+    max_seconds: float = 600
+) -> Dict[str, Any]:
+    """
+    Push `updates` score changes through ChainWriter and ConfirmationTracker
+    against the simulated chain, resubmitting whatever is requeued, and
+    measure throughput and submit-to-confirmation latency
+    """
+    from chain_writer import ChainWriter
+    from confirmation_tracker import ConfirmationTracker
+
+    registry = "0x" + "00" * 19 + "01"
+    writer = ChainWriter(
+        registry_address=registry,
+        rpc_url=None,
+        chain_id=chain.chain_id,
+        rpc=chain,
+        packed=packed,
+        signers=[SimulatedSigner(chain, "0x" + format(i + 1, "040x")) for i in range(signers)],
+        pool_options={"min_balance_wei": 0}
+    )
+    tracker = ConfirmationTracker(chain, confirmations=confirmations, drop_timeout_seconds=drop_timeout_seconds)
+
+    accounts = accounts or updates
+    rng = random.Random(0)
+    queue = [
+        {"address": "0x" + format(0x10000 + rng.randrange(accounts), "040x"), "score": rng.randrange(1, 2000)}
+        for _ in range(updates)
+    ]
+    first_sent: Dict[int, float] = {}
+    latencies: List[float] = []
+    resubmitted = 0
+
+    started = time.monotonic()
+    while (queue or len(tracker)) and time.monotonic() - started < max_seconds:
+        in_flight = tracker.in_flight_addresses()
+        take, keep = [], []
+        for update in queue:
+            if len(take) < batch_size * signers and update["address"] not in in_flight:
+                take.append(update)
+            else:
+                keep.append(update)
+        queue = keep
+
+        if take:
+            now = time.monotonic()
+            chunks = [take[i:i + batch_size] for i in range(0, len(take), batch_size)]
+            batches = []
+            for chunk in chunks:
+                batches.extend(writer.plan_batches(chunk))
+            for batch, result in zip(batches, writer.send_batches(batches)):
+                if isinstance(result, Exception):
+                    queue.extend(batch["updates"])
+                    continue
+                for update in batch["updates"]:
+                    first_sent.setdefault(id(update), now)
+                tracker.track(result, batch["updates"])
+
+        confirmed, requeued = tracker.poll()
+        now = time.monotonic()
+        for entry in confirmed:
+            latencies.extend(now - first_sent[id(u)] for u in entry["updates"])
+        for entry in requeued:
+            resubmitted += len(entry["updates"])
+            queue.extend(entry["updates"])
+
+        if not take:
+            time.sleep(min(chain.block_time / 4, 0.25))
+
+    elapsed = time.monotonic() - started
+    latencies.sort()
+    return {
+        "updates": updates,
+        "confirmed": len(latencies),
+        "seconds": round(elapsed, 3),
+        "updates_per_second": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "latency_p50": round(statistics.median(latencies), 3) if latencies else None,
+        "latency_p95": round(latencies[int(0.95 * (len(latencies) - 1))], 3) if latencies else None,
+        "resubmitted": resubmitted,
+        "signers": signers,
+        "chain": dict(chain.stats),
+        "gas_per_update": round(chain.stats["gas_used"] / max(1, len(latencies)), 1),
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Load-test the write pipeline against a simulated chain")
+    parser.add_argument("--updates", type=int, default=20000)
+    parser.add_argument("--accounts", type=int, default=None, help="Distinct accounts (default: one per update)")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--signers", type=int, default=1)
+    parser.add_argument("--packed", action="store_true", help="Send batchUpdateScoresPacked")
+    parser.add_argument("--block-time", type=float, default=0.2)
+    parser.add_argument("--gas-limit", type=int, default=30_000_000)
+    parser.add_argument("--latency", type=float, default=0.01, help="Seconds added to every RPC call and send")
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--revert-rate", type=float, default=0.0)
+    parser.add_argument("--confirmations", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level="WARNING", format="%(asctime)s [%(levelname)s] %(message)s")
+
+    chain = SimulatedChain(
+        block_time=args.block_time,
+        gas_limit=args.gas_limit,
+        latency=args.latency,
+        drop_rate=args.drop_rate,
+        revert_rate=args.revert_rate,
+        seed=args.seed
+    )
+    result = run_load_test(
+        chain,
+        updates=args.updates,
+        batch_size=args.batch_size,
+        signers=args.signers,
+        accounts=args.accounts,
+        confirmations=args.confirmations,
+        packed=args.packed
+    )
+
+    if args.json:
+        json.dump(result, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print(
+            f"{result['confirmed']}/{result['updates']} updates confirmed in {result['seconds']:.1f}s "
+            f"({result['updates_per_second']:.0f}/s) with {result['signers']} signer(s)"
+        )
+        print(f"latency p50 {result['latency_p50']}s  p95 {result['latency_p95']}s  resubmitted {result['resubmitted']}")
+        print(f"chain: {result['chain']}")
+
+
+if __name__ == "__main__":
+    main()
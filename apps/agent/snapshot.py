@@ -0,0 +1,252 @@
+"""
+Columnar on-disk snapshot of the scoring inputs
+One raw file per column plus a JSON manifest. Columns are memory-mapped and
+read through memoryviews, so scoring can run off-box without copying them.
+
+Usage: python snapshot.py export <directory>
+"""
+
+import os
+import sys
+import json
+import mmap
+import time
+import logging
+from array import array
+from typing import Dict, Any, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+# Column types: int64 and bool are native-endian fixed width, addresses are
+# stored as their 20 raw bytes. NULLs are written as 0.
+INT64 = "int64"
+BOOL = "bool"
+ADDRESS = "address"
+
+TYPECODES = {INT64: "q", BOOL: "b"}
+ADDRESS_SIZE = 20
+
+# Scoring columns of each table, in file order
+SNAPSHOT_TABLES: Dict[str, Dict[str, str]] = {
+    "account": {
+        "id": ADDRESS,
+        "total_score": INT64,
+        "first_tx_timestamp": INT64,
+        "last_updated": INT64,
+    },
+    "linked_wallet": {
+        "address": ADDRESS,
+        "main_account_id": ADDRESS,
+        "zora_mint_count": INT64,
+        "early_mint_count": INT64,
+        "first_tx_timestamp": INT64,
+    },
+    "zora_mint": {
+        "minter": ADDRESS,
+        "contract_address": ADDRESS,
+        "quantity": INT64,
+        "minted_at": INT64,
+        "is_early_mint": BOOL,
+        "collection_deployed_at": INT64,
+    },
+    "collection": {
+        "address": ADDRESS,
+        "deployed_at": INT64,
+    },
+}
+
+
+def encode_address(address: str) -> bytes:
+    raw = bytes.fromhex(address[2:] if address.startswith("0x") else address)
+    if len(raw) != ADDRESS_SIZE:
+        raise ValueError(f"Not a 20-byte address: {address}")
+    return raw
+
+
+class AddressColumn:
+    """Read-only sequence of "0x…" addresses over a packed 20-byte buffer"""
+
+    def __init__(self, buffer: memoryview):
+        self.buffer = buffer
+
+    def __len__(self) -> int:
+        return len(self.buffer) // ADDRESS_SIZE
+
+    def raw(self, i: int) -> bytes:
+        start = i * ADDRESS_SIZE
+        return bytes(self.buffer[start:start + ADDRESS_SIZE])
+
+    def __getitem__(self, i: int) -> str:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return "0x" + self.raw(i).hex()
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield "0x" + self.raw(i).hex()
+
+
+class SnapshotWriter:
+    """Streams table rows into per-column files, then writes the manifest"""
+
+    def __init__(self, path: str, flush_rows: int = 50000):
+        self.path = path
+        self.flush_rows = flush_rows
+        self.tables: Dict[str, Dict[str, Any]] = {}
+        os.makedirs(path, exist_ok=True)
+
+    def _column_path(self, table: str, column: str) -> str:
+        return os.path.join(self.path, f"{table}.{column}.bin")
+
+    def write_table(self, table: str, rows: Iterable[Dict[str, Any]]) -> int:
+        """Write every row of one table; returns the row count"""
+        columns = SNAPSHOT_TABLES[table]
+        files = {c: open(self._column_path(table, c), "wb") for c in columns}
+        buffers = self._empty_buffers(columns)
+        count = 0
+
+        try:
+            for row in rows:
+                for column, kind in columns.items():
+                    value = row.get(column)
+                    if kind == ADDRESS:
+                        buffers[column] += encode_address(value)
+                    else:
+                        buffers[column].append(int(value or 0))
+                count += 1
+                if count % self.flush_rows == 0:
+                    self._flush(files, buffers)
+                    buffers = self._empty_buffers(columns)
+            self._flush(files, buffers)
+        finally:
+            for f in files.values():
+                f.close()
+
+        self.tables[table] = {"rows": count, "columns": dict(columns)}
+        return count
+
+    @staticmethod
+    def _empty_buffers(columns: Dict[str, str]) -> Dict[str, Any]:
+        return {
+            c: bytearray() if kind == ADDRESS else array(TYPECODES[kind])
+            for c, kind in columns.items()
+        }
+
+    @staticmethod
+    def _flush(files: Dict[str, Any], buffers: Dict[str, Any]):
+        for column, buffer in buffers.items():
+            files[column].write(buffer if isinstance(buffer, bytearray) else buffer.tobytes())
+
+    def finish(self, metadata: Optional[Dict[str, Any]] = None):
+        """Write the manifest; a snapshot without one is incomplete"""
+        manifest = {
+            "version": FORMAT_VERSION,
+            "byteorder": sys.byteorder,
+            "created_at": int(time.time()),
+            "tables": self.tables,
+            **(metadata or {}),
+        }
+        tmp = os.path.join(self.path, "manifest.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp, os.path.join(self.path, "manifest.json"))
+
+
+class Snapshot:
+    """
+    A memory-mapped snapshot. column(table, name) returns a memoryview of
+    int64/bool values or an AddressColumn, backed directly by the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "manifest.json")) as f:
+            self.manifest = json.load(f)
+
+        if self.manifest["version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {self.manifest['version']}")
+        if self.manifest["byteorder"] != sys.byteorder:
+            raise ValueError(f"Snapshot was written on a {self.manifest['byteorder']}-endian host")
+
+        self._maps = []
+        self._views = []
+        self._columns: Dict[tuple, Any] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def created_at(self) -> int:
+        return self.manifest["created_at"]
+
+    def rows(self, table: str) -> int:
+        return self.manifest["tables"][table]["rows"]
+
+    def column(self, table: str, name: str):
+        key = (table, name)
+        if key not in self._columns:
+            kind = self.manifest["tables"][table]["columns"][name]
+            buffer = self._map(os.path.join(self.path, f"{table}.{name}.bin"))
+            if kind == ADDRESS:
+                self._columns[key] = AddressColumn(buffer)
+            else:
+                self._columns[key] = buffer.cast(TYPECODES[kind])
+        return self._columns[key]
+
+    def _map(self, file_path: str) -> memoryview:
+        with open(file_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return memoryview(b"")
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        self._maps.append(mapped)
+        self._views.append(view)
+        return view
+
+    def close(self):
+        """Release the maps; columns handed out must no longer be used"""
+        for column in self._columns.values():
+            if isinstance(column, memoryview):
+                column.release()
+        self._columns.clear()
+        for view in self._views:
+            view.release()
+        self._views.clear()
+        for mapped in self._maps:
+            mapped.close()
+        self._maps.clear()
+
+
+def open_snapshot(path: str) -> Snapshot:
+    return Snapshot(path)
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    from dotenv import load_dotenv
+    from database import Database
+
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2 or argv[0] != "export":
+        print("Usage: python snapshot.py export <directory>", file=sys.stderr)
+        sys.exit(2)
+
+    load_dotenv()
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), format="%(asctime)s [%(levelname)s] %(message)s")
+
+    db = Database(
+        os.getenv("DATABASE_URL"),
+        replica_url=os.getenv("DATABASE_REPLICA_URL") or None
+    )
+    db.export_snapshot(argv[1])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Startup-time benchmark for the agent
+Measures, in fresh interpreters, the cost of importing main (broken down by
+top-level package via -X importtime) and of constructing BaseRankAgent.
+Nothing touches the network: engines connect lazily and no RPC URL or CDP
+credentials are passed.
+
+Usage: python startup_benchmark.py [--runs 5] [--json] [--max-seconds S]
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+import tempfile
+from typing import List, Dict, Any, Optional
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Runs in the child interpreter; prints one JSON line of timings
+_PROBE = """
+import json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+main.BaseRankAgent()
+ready = time.perf_counter()
+print(json.dumps({
+    "import_seconds": imported - started,
+    "init_seconds": ready - imported,
+    "cdp_imported": "coinbase_agentkit" in __import__("sys").modules,
+}))
+"""
+
+
+def _probe_env(journal_path: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    for name in ("RPC_URL", "CDP_API_KEY_NAME", "CDP_API_KEY_PRIVATE_KEY", "DATABASE_REPLICA_URL"):
+        env.pop(name, None)
+    env.setdefault("DATABASE_URL", "postgresql+psycopg2://benchmark@localhost/benchmark")
+    env["AGENT_JOURNAL_PATH"] = journal_path
+    env["LOG_LEVEL"] = "WARNING"
+    return env
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """
+    Cumulative import time in microseconds per top-level package, from
+    `python -X importtime` output
+    """
+    packages: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        package = name.strip().split(".")[0]
+        packages[package] = max(packages.get(package, 0), int(cumulative))
+    return packages
+
+
+def measure(runs: int = 5) -> Dict[str, Any]:
+    """Median startup timings over `runs` fresh interpreters"""
+    samples: List[Dict[str, Any]] = []
+    packages: Dict[str, List[int]] = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = _probe_env(os.path.join(tmp, "journal.db"))
+        for _ in range(runs):
+            probe = subprocess.run(
+                [sys.executable, "-c", _PROBE],
+                cwd=HERE, env=env, capture_output=True, text=True, check=True
+            )
+            samples.append(json.loads(probe.stdout.strip().splitlines()[-1]))
+
+            trace = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", "import main"],
+                cwd=HERE, env=env, capture_output=True, text=True, check=True
+            )
+            for package, micros in parse_importtime(trace.stderr).items():
+                packages.setdefault(package, []).append(micros)
+
+    import_seconds = statistics.median(s["import_seconds"] for s in samples)
+    init_seconds = statistics.median(s["init_seconds"] for s in samples)
+    slowest = sorted(
+        ((p, statistics.median(v) / 1e6) for p, v in packages.items() if p != "main"),
+        key=lambda item: item[1],
+        reverse=True
+    )[:10]
+
+    return {
+        "runs": runs,
+        "python": sys.version.split()[0],
+        "import_seconds": round(import_seconds, 4),
+        "init_seconds": round(init_seconds, 4),
+        "total_seconds": round(import_seconds + init_seconds, 4),
+        "cdp_imported_at_startup": any(s["cdp_imported"] for s in samples),
+        "slowest_imports": {p: round(t, 4) for p, t in slowest},
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Measure agent import and initialization time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--max-seconds", type=float, default=None,
+                        help="Exit non-zero if median startup exceeds this budget")
+    args = parser.parse_args(argv)
+
+    result = measure(args.runs)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"import: {result['import_seconds']:.3f}s  init: {result['init_seconds']:.3f}s  "
+              f"total: {result['total_seconds']:.3f}s  (median of {result['runs']})")
+        for package, seconds in result["slowest_imports"].items():
+            print(f"  {package:<24}{seconds:.3f}s")
+
+    if args.max_seconds is not None and result["total_seconds"] > args.max_seconds:
+        print(f"Startup {result['total_seconds']:.3f}s exceeds budget of {args.max_seconds:.3f}s", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
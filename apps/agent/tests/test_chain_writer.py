@@ -0,0 +1,250 @@
+"""
+Tests for ChainWriter
+"""
+
+import pytest
+from decimal import Decimal
+from unittest.mock import Mock
+from chain_writer import (
+    ChainWriter,
+    is_simulated_tx,
+    encode_batch_update_scores,
+    encode_batch_update_scores_packed,
+    encode_packed_scores,
+    decode_packed_scores,
+)
+from rpc_client import RpcError
+
+
+@pytest.fixture
+def rpc():
+    return Mock()
+
+
+@pytest.fixture
+def writer(rpc):
+    writer = ChainWriter(
+        registry_address="0x" + "00" * 19 + "01",
+        rpc_url="http://rpc.test",
+        rpc=rpc
+    )
+    writer.agent = Mock(wallet_address="0x" + "aa" * 20)
+    return writer
+
+
+class TestEncoding:
+    """Tests for local ABI encoding"""
+
+    def test_batch_update_scores_calldata_layout(self):
+        data = encode_batch_update_scores(["0x" + "11" * 20], [7])
+
+        assert data.startswith("0x340458da")
+        words = [data[10 + i:10 + i + 64] for i in range(0, len(data) - 10, 64)]
+        assert int(words[0], 16) == 0x40
+        assert int(words[1], 16) == 0x80
+        assert int(words[2], 16) == 1
+        assert words[3] == "00" * 12 + "11" * 20
+        assert int(words[4], 16) == 1
+        assert int(words[5], 16) == 7
+
+
+class TestReads:
+    """Tests for pooled RPC reads"""
+
+    def test_wallet_balance_in_ether(self, writer, rpc):
+        rpc.call.return_value = hex(15 * 10 ** 17)
+
+        assert writer.get_wallet_balance() == Decimal("1.5")
+        rpc.call.assert_called_once_with("eth_getBalance", [writer.agent.wallet_address, "latest"])
+
+    def test_balance_none_without_wallet(self, writer, rpc):
+        writer.agent = None
+        assert writer.get_wallet_balance() is None
+        rpc.call.assert_not_called()
+
+    def test_read_errors_return_none(self, writer, rpc):
+        rpc.call.side_effect = RpcError("down")
+        assert writer.get_gas_price() is None
+        assert writer.get_nonce() is None
+
+    def test_chain_state_is_one_batch(self, writer, rpc):
+        rpc.batch.return_value = ["0x64", "0x3b9aca00", "0xde0b6b3a7640000", "0x5"]
+
+        state = writer.get_chain_state()
+
+        rpc.batch.assert_called_once()
+        assert state == {
+            "block_number": 100,
+            "gas_price": 10 ** 9,
+            "balance_wei": 10 ** 18,
+            "nonce": 5,
+        }
+
+    def test_estimate_gas_uses_local_calldata(self, writer, rpc):
+        rpc.call.return_value = "0x5208"
+        updates = [{"address": "0x" + "11" * 20, "score": 7}]
+
+        assert writer.estimate_gas(updates) == 21000
+        method, params = rpc.call.call_args[0]
+        assert method == "eth_estimateGas"
+        assert params[0]["data"] == encode_batch_update_scores(["0x" + "11" * 20], [7])
+
+
+class TestSimulation:
+    """Tests for simulation mode"""
+
+    def test_simulated_batch_returns_placeholder_hash(self, rpc):
+        writer = ChainWriter(registry_address="0x0", rpc_url=None, rpc=rpc)
+        first = writer.batch_update_scores([{"address": "0xa", "score": 1}])
+        second = writer.batch_update_scores([{"address": "0xa", "score": 1}])
+        assert is_simulated_tx(first) and is_simulated_tx(second)
+        assert first != second
+
+
+def make_updates(n):
+    return [{"address": "0x" + format(i + 1, "040x"), "score": i * 37} for i in range(n)]
+
+
+class TestPackedEncoding:
+    """Tests for the packed calldata encoding"""
+
+    def test_round_trip(self):
+        updates = make_updates(50) + [{"address": "0x" + "ff" * 20, "score": 2 ** 32 - 1}]
+        assert decode_packed_scores(encode_packed_scores(updates)) == updates
+
+    def test_record_size(self):
+        assert len(encode_packed_scores(make_updates(10))) == 24 * 10
+
+    def test_rejects_score_over_uint32(self):
+        with pytest.raises(ValueError):
+            encode_packed_scores([{"address": "0x" + "11" * 20, "score": 2 ** 32}])
+
+    def test_rejects_truncated_data(self):
+        with pytest.raises(ValueError):
+            decode_packed_scores(b"\x00" * 25)
+
+    def test_calldata_matches_abi_bytes_encoding(self):
+        from eth_abi import encode
+
+        updates = make_updates(3)
+        calldata = encode_batch_update_scores_packed(updates)
+
+        expected = encode(["bytes"], [encode_packed_scores(updates)]).hex()
+        assert calldata == "0x0b942b36" + expected
+
+    def test_packed_calldata_at_least_halves_bytes(self):
+        updates = make_updates(200)
+        plain = encode_batch_update_scores(
+            [u["address"] for u in updates],
+            [u["score"] for u in updates]
+        )
+        packed = encode_batch_update_scores_packed(updates)
+
+        assert len(packed) * 2 <= len(plain)
+
+
+class TestPackedWrites:
+    """Tests for choosing the packed write path"""
+
+    def test_packed_writer_calls_packed_method(self, writer):
+        writer.packed = True
+        writer.agent.invoke_contract.return_value = {"transaction_hash": "0x1"}
+        updates = make_updates(2)
+
+        writer.batch_update_scores(updates)
+
+        kwargs = writer.agent.invoke_contract.call_args.kwargs
+        assert kwargs["method"] == "batchUpdateScoresPacked"
+        assert kwargs["args"] == ["0x" + encode_packed_scores(updates).hex()]
+
+    def test_falls_back_when_score_too_large(self, writer):
+        writer.packed = True
+        writer.agent.invoke_contract.return_value = {"transaction_hash": "0x1"}
+
+        writer.batch_update_scores([{"address": "0x" + "11" * 20, "score": 2 ** 40}])
+
+        assert writer.agent.invoke_contract.call_args.kwargs["method"] == "batchUpdateScores"
+
+    def test_unpacked_by_default(self, writer):
+        updates = make_updates(2)
+        assert writer.encode_batch_calldata(updates).startswith("0x340458da")
+
+
+class TestCommitments:
+    """Tests for Merkle-root commitment mode"""
+
+    @pytest.fixture
+    def committer(self, rpc, tmp_path):
+        writer = ChainWriter(
+            registry_address="0x" + "00" * 19 + "01",
+            rpc_url="http://rpc.test",
+            rpc=rpc,
+            commitment_path=str(tmp_path / "tree.bin")
+        )
+        writer.agent = Mock(wallet_address="0x" + "aa" * 20)
+        writer.agent.invoke_contract.return_value = {"transaction_hash": "0x1"}
+        return writer
+
+    def test_commits_root_instead_of_scores(self, committer):
+        committer.batch_update_scores(make_updates(3))
+
+        kwargs = committer.agent.invoke_contract.call_args.kwargs
+        assert kwargs["method"] == "commitScoreRoot"
+        assert kwargs["args"] == [1, "0x" + committer.commitments.root.hex(), 3]
+        assert committer.commitments.epoch == 1
+
+    def test_failed_commit_rolls_tree_back(self, committer):
+        committer.batch_update_scores(make_updates(2))
+        root = committer.commitments.root
+        committer.agent.invoke_contract.side_effect = Exception("reverted")
+
+        with pytest.raises(Exception):
+            committer.batch_update_scores(make_updates(4))
+
+        assert committer.commitments.root == root
+        assert len(committer.commitments) == 2
+        assert committer.commitments.epoch == 1
+
+    def test_tree_survives_restart(self, committer, rpc):
+        committer.batch_update_scores(make_updates(3))
+
+        restarted = ChainWriter(
+            registry_address=committer.registry_address,
+            rpc_url="http://rpc.test",
+            rpc=rpc,
+            commitment_path=committer.commitment_path
+        )
+
+        assert restarted.commitments.root == committer.commitments.root
+        assert restarted.commitments.epoch == 1
+
+    def test_proof_verifies_against_root(self, committer):
+        from merkle import leaf_hash, verify_proof
+
+        updates = make_updates(5)
+        committer.batch_update_scores(updates)
+        proof = committer.get_score_proof(updates[2]["address"])
+
+        leaf = leaf_hash(bytes.fromhex(proof["address"][2:]), proof["score"], proof["epoch"])
+        assert proof["root"] == "0x" + committer.commitments.root.hex()
+        assert verify_proof([bytes.fromhex(p[2:]) for p in proof["proof"]], committer.commitments.root, leaf)
+
+    def test_seed_adds_only_new_accounts(self, committer):
+        committer.batch_update_scores([{"address": "0x" + "11" * 20, "score": 5}])
+
+        added = committer.seed_commitments([
+            {"id": "0x" + "11" * 20, "total_score": 1},
+            {"id": "0x" + "22" * 20, "total_score": 9},
+        ])
+
+        assert added == 1
+        assert committer.commitments.get("0x" + "11" * 20) == (5, 1)
+        assert committer.commitments.get("0x" + "22" * 20) == (9, 2)
+
+    def test_commit_calldata_layout(self, committer):
+        data = committer.encode_batch_calldata(make_updates(2))
+        assert data.startswith("0x2d36c352")
+        assert len(data) == 2 + 8 + 3 * 64
+
+    def test_no_proofs_outside_commitment_mode(self, writer):
+        assert writer.get_score_proof("0x" + "11" * 20) is None
@@ -0,0 +1,150 @@
+"""
+Tests for CollectionIndex
+"""
+
+import pytest
+from unittest.mock import Mock
+from collection_index import CollectionIndex
+from score_calculator import ScoreCalculator
+
+
+@pytest.fixture
+def index():
+    index = CollectionIndex()
+    index.load([
+        {"address": "0xAAA", "deployed_at": 1000},
+        {"address": "0xbbb", "deployed_at": 5000},
+    ])
+    return index
+
+
+class TestCollectionIndexLoad:
+    """Tests for loading and refreshing the index"""
+
+    def test_lookup_is_case_insensitive(self, index):
+        assert index.get_deployed_at("0xaaa") == 1000
+        assert index.get_deployed_at("0xAAA") == 1000
+        assert "0xBBB" in index
+
+    def test_missing_address(self, index):
+        assert index.get_deployed_at("0xccc") is None
+        assert index.get_deployed_at(None) is None
+
+    def test_watermark_tracks_latest_deploy(self, index):
+        assert index.watermark == 5000
+
+    def test_load_counts_only_new_addresses(self, index):
+        added = index.load([
+            {"address": "0xbbb", "deployed_at": 5000},
+            {"address": "0xccc", "deployed_at": 6000},
+        ])
+        assert added == 1
+        assert len(index) == 3
+
+    def test_refresh_reads_overlap_behind_watermark(self, index):
+        db = Mock()
+        db.get_collections.return_value = [{"address": "0xddd", "deployed_at": 7000}]
+        db.count_collections.return_value = 3
+
+        added = index.refresh(db)
+
+        db.get_collections.assert_called_once_with(deployed_since=5000 - index.overlap_seconds)
+        assert added == 1
+        assert index.watermark == 7000
+
+    def test_late_insert_within_overlap_is_picked_up(self, index):
+        # 0xlate was deployed before the watermark but indexed afterwards
+        db = Mock()
+        db.get_collections.return_value = [{"address": "0xlate", "deployed_at": 4900}]
+        db.count_collections.return_value = 3
+
+        assert index.refresh(db) == 1
+        assert index.get_deployed_at("0xlate") == 4900
+        assert index.watermark == 5000
+
+    def test_late_insert_beyond_overlap_triggers_full_reload(self):
+        index = CollectionIndex(overlap_seconds=60)
+        index.load([{"address": "0xaaa", "deployed_at": 1000}, {"address": "0xbbb", "deployed_at": 5000}])
+        db = Mock()
+        db.get_collections.side_effect = [
+            [],
+            [
+                {"address": "0xaaa", "deployed_at": 1000},
+                {"address": "0xold", "deployed_at": 2000},
+                {"address": "0xbbb", "deployed_at": 5000},
+            ],
+        ]
+        db.count_collections.return_value = 3
+
+        assert index.refresh(db) == 1
+        assert db.get_collections.call_args_list[1].kwargs["deployed_since"] is None
+        assert index.get_deployed_at("0xold") == 2000
+
+    def test_first_refresh_loads_everything(self):
+        db = Mock()
+        db.get_collections.return_value = []
+
+        CollectionIndex().refresh(db)
+
+        db.get_collections.assert_called_once_with(deployed_since=None)
+        db.count_collections.assert_not_called()
+
+
+class TestBackfillEarlyMints:
+    """Tests for batch backfill of is_early_mint"""
+
+    def test_backfill_updates_known_collections(self, index):
+        db = Mock()
+        db.get_mints_missing_deploy_time.side_effect = [
+            [
+                {"id": "a", "contract_address": "0xaaa", "minted_at": 2000},
+                {"id": "b", "contract_address": "0xbbb", "minted_at": 100000},
+                {"id": "c", "contract_address": "0xccc", "minted_at": 2000},
+            ],
+        ]
+
+        updated = index.backfill_early_mints(db, window_seconds=86400, batch_size=10)
+
+        assert updated == 2
+        db.update_mint_timeliness.assert_called_once_with([
+            {"id": "a", "collection_deployed_at": 1000, "is_early_mint": True},
+            {"id": "b", "collection_deployed_at": 5000, "is_early_mint": False},
+        ])
+
+    def test_backfill_pages_by_id(self, index):
+        db = Mock()
+        db.get_mints_missing_deploy_time.side_effect = [
+            [{"id": "a", "contract_address": "0xaaa", "minted_at": 2000}],
+            [{"id": "b", "contract_address": "0xaaa", "minted_at": 3000}],
+            [],
+        ]
+
+        updated = index.backfill_early_mints(db, window_seconds=86400, batch_size=1)
+
+        assert updated == 2
+        calls = db.get_mints_missing_deploy_time.call_args_list
+        assert calls[1].kwargs["after_id"] == "a"
+        assert calls[2].kwargs["after_id"] == "b"
+
+
+class TestCalculatorWithIndex:
+    """Tests for timeliness checks backed by the index"""
+
+    def test_early_mint_without_denormalized_deploy_time(self, index):
+        calculator = ScoreCalculator(collection_index=index)
+        mint = {"contract_address": "0xaaa", "minted_at": 2000, "quantity": 1}
+        assert calculator._is_early_mint(mint) is True
+
+    def test_row_deploy_time_takes_precedence(self, index):
+        calculator = ScoreCalculator(collection_index=index)
+        mint = {
+            "contract_address": "0xaaa",
+            "minted_at": 2000,
+            "collection_deployed_at": 1500,
+        }
+        assert calculator._is_early_mint(mint) is True
+
+    def test_unknown_collection_is_not_early(self, index):
+        calculator = ScoreCalculator(collection_index=index)
+        mint = {"contract_address": "0xccc", "minted_at": 2000}
+        assert calculator._is_early_mint(mint) is False
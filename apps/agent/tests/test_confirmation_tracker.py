@@ -0,0 +1,118 @@
+"""
+Tests for ConfirmationTracker
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+from confirmation_tracker import ConfirmationTracker
+from chain_writer import ChainWriter, simulated_tx_hash
+from rpc_client import RpcError
+
+
+UPDATES = [{"address": "0xaaa", "score": 100}]
+
+
+def receipt(block, status="0x1"):
+    return {"blockNumber": hex(block), "status": status}
+
+
+@pytest.fixture
+def rpc():
+    return Mock()
+
+
+@pytest.fixture
+def tracker(rpc):
+    return ConfirmationTracker(rpc, confirmations=3, drop_timeout_seconds=300)
+
+
+class TestPoll:
+    """Tests for receipt polling"""
+
+    def test_confirms_at_depth(self, tracker, rpc):
+        tracker.track("0x1", UPDATES, cycle_id=7)
+        rpc.batch.return_value = [hex(102), receipt(100), {"hash": "0x1"}]
+
+        confirmed, requeued = tracker.poll()
+
+        assert [e["cycle_id"] for e in confirmed] == [7]
+        assert requeued == []
+        assert len(tracker) == 0
+
+    def test_waits_until_deep_enough(self, tracker, rpc):
+        tracker.track("0x1", UPDATES)
+        rpc.batch.return_value = [hex(101), receipt(100), {"hash": "0x1"}]
+
+        confirmed, requeued = tracker.poll()
+
+        assert confirmed == [] and requeued == []
+        assert "0xaaa" in tracker.in_flight_addresses()
+
+    def test_reverted_tx_is_requeued(self, tracker, rpc):
+        tracker.track("0x1", UPDATES)
+        rpc.batch.return_value = [hex(200), receipt(100, status="0x0"), {"hash": "0x1"}]
+
+        confirmed, requeued = tracker.poll()
+
+        assert confirmed == []
+        assert requeued[0]["updates"] == UPDATES
+
+    def test_dropped_tx_requeued_after_timeout(self, tracker, rpc):
+        with patch("time.time", return_value=1000):
+            tracker.track("0x1", UPDATES)
+        rpc.batch.return_value = [hex(200), None, None]
+
+        with patch("time.time", return_value=1100):
+            assert tracker.poll() == ([], [])
+        with patch("time.time", return_value=1400):
+            confirmed, requeued = tracker.poll()
+
+        assert len(requeued) == 1
+
+    def test_mempool_tx_stays_pending(self, tracker, rpc):
+        with patch("time.time", return_value=1000):
+            tracker.track("0x1", UPDATES)
+        rpc.batch.return_value = [hex(200), None, {"hash": "0x1"}]
+
+        with patch("time.time", return_value=5000):
+            assert tracker.poll() == ([], [])
+        assert len(tracker) == 1
+
+    def test_polls_all_hashes_in_one_batch(self, tracker, rpc):
+        tracker.track("0x1", UPDATES)
+        tracker.track("0x2", [{"address": "0xbbb", "score": 1}])
+        rpc.batch.return_value = [hex(200), receipt(100), {}, receipt(100), {}]
+
+        confirmed, _ = tracker.poll()
+
+        rpc.batch.assert_called_once()
+        assert len(rpc.batch.call_args[0][0]) == 5
+        assert len(confirmed) == 2
+
+    def test_rpc_failure_keeps_everything_pending(self, tracker, rpc):
+        tracker.track("0x1", UPDATES)
+        rpc.batch.side_effect = RpcError("down")
+
+        assert tracker.poll() == ([], [])
+        assert len(tracker) == 1
+
+    def test_simulated_batches_are_tracked_separately(self, rpc):
+        writer = ChainWriter(registry_address="0x0", rpc_url=None, rpc=rpc)
+        tracker = ConfirmationTracker(None)
+        first = [{"address": "0xa", "score": 1}]
+        second = [{"address": "0xb", "score": 2}]
+        tracker.track(writer.batch_update_scores(first), first)
+        tracker.track(writer.batch_update_scores(second), second)
+
+        assert tracker.in_flight_addresses() == {"0xa", "0xb"}
+        confirmed, _ = tracker.poll()
+        assert len(confirmed) == 2
+
+    def test_simulated_tx_confirms_without_rpc(self, rpc):
+        tracker = ConfirmationTracker(None)
+        tracker.track(simulated_tx_hash(), UPDATES)
+
+        confirmed, _ = tracker.poll()
+
+        assert len(confirmed) == 1
+        rpc.batch.assert_not_called()
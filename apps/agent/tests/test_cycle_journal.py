@@ -0,0 +1,107 @@
+"""
+Tests for CycleJournal
+"""
+
+import pytest
+from cycle_journal import (
+    CycleJournal,
+    STATUS_SCORED,
+    STATUS_SUBMITTED,
+    STATUS_CONFIRMED,
+    STATUS_COMPLETED,
+)
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = CycleJournal(str(tmp_path / "journal.db"))
+    yield journal
+    journal.close()
+
+
+UPDATES = [
+    {"address": "0xaaa", "score": 100},
+    {"address": "0xbbb", "score": 250},
+]
+
+
+class TestCycleLifecycle:
+    """Tests for recording cycle state"""
+
+    def test_begin_cycle_records_accounts_and_updates(self, journal):
+        cycle_id = journal.begin_cycle(["0xaaa", "0xbbb", "0xccc"], UPDATES)
+
+        cycle = journal.get_cycle(cycle_id)
+
+        assert cycle["status"] == STATUS_SCORED
+        assert cycle["accounts"] == ["0xaaa", "0xbbb", "0xccc"]
+        assert cycle["updates"] == UPDATES
+        assert cycle["tx_hash"] is None
+
+    def test_record_submission_stores_tx_hash(self, journal):
+        cycle_id = journal.begin_cycle(["0xaaa"], UPDATES[:1])
+
+        journal.record_submission(cycle_id, "0xdeadbeef")
+
+        cycle = journal.get_cycle(cycle_id)
+        assert cycle["status"] == STATUS_SUBMITTED
+        assert cycle["tx_hash"] == "0xdeadbeef"
+
+    def test_status_transitions(self, journal):
+        cycle_id = journal.begin_cycle(["0xaaa"], UPDATES[:1])
+        journal.record_submission(cycle_id, "0x1")
+        journal.record_confirmation(cycle_id)
+        assert journal.get_cycle(cycle_id)["status"] == STATUS_CONFIRMED
+
+        journal.complete_cycle(cycle_id)
+        assert journal.get_cycle(cycle_id)["status"] == STATUS_COMPLETED
+
+    def test_missing_cycle(self, journal):
+        assert journal.get_cycle(999) is None
+
+
+class TestIncompleteCycles:
+    """Tests for crash-recovery queries"""
+
+    def test_only_open_cycles_returned(self, journal):
+        done = journal.begin_cycle(["0xaaa"], UPDATES[:1])
+        journal.complete_cycle(done)
+        failed = journal.begin_cycle(["0xaaa"], UPDATES[:1])
+        journal.fail_cycle(failed)
+        submitted = journal.begin_cycle(["0xbbb"], UPDATES[1:])
+        journal.record_submission(submitted, "0x2")
+
+        pending = journal.incomplete_cycles()
+
+        assert [c["id"] for c in pending] == [submitted]
+        assert pending[0]["updates"] == UPDATES[1:]
+
+    def test_survives_reopen(self, tmp_path):
+        path = str(tmp_path / "journal.db")
+        journal = CycleJournal(path)
+        cycle_id = journal.begin_cycle(["0xaaa"], UPDATES[:1])
+        journal.record_submission(cycle_id, "0x3")
+        journal.close()
+
+        reopened = CycleJournal(path)
+        pending = reopened.incomplete_cycles()
+        reopened.close()
+
+        assert pending[0]["tx_hash"] == "0x3"
+        assert pending[0]["status"] == STATUS_SUBMITTED
+
+
+class TestPrune:
+    """Tests for journal pruning"""
+
+    def test_prune_keeps_open_cycles(self, journal):
+        done = journal.begin_cycle(["0xaaa"], UPDATES[:1])
+        journal.complete_cycle(done)
+        open_cycle = journal.begin_cycle(["0xbbb"], UPDATES[1:])
+
+        removed = journal.prune(older_than_seconds=-1)
+
+        assert removed == 1
+        assert journal.get_cycle(done) is None
+        assert journal.get_cycle(open_cycle) is not None
+        assert journal.get_cycle(open_cycle)["status"] == STATUS_SCORED
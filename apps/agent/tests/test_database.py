@@ -325,3 +325,640 @@ class TestGetTopAccounts:
 
         call_args = mock_session.execute.call_args
         assert call_args[0][1]["limit"] == 50
+
+
+class TestGetCollections:
+    """Tests for get_collections"""
+
+    def test_passes_watermark(self, db, mock_session):
+        mock_result = Mock()
+        mock_result.__iter__ = Mock(return_value=iter([]))
+        mock_session.execute.return_value = mock_result
+
+        db.Session.return_value.__enter__ = Mock(return_value=mock_session)
+        db.Session.return_value.__exit__ = Mock(return_value=False)
+
+        db.get_collections(deployed_since=1234)
+
+        call_args = mock_session.execute.call_args
+        assert call_args[0][1]["deployed_since"] == 1234
+
+
+class TestUpdateMintTimeliness:
+    """Tests for update_mint_timeliness"""
+
+    def test_executes_batch_and_commits(self, db, mock_session):
+        db.Session.return_value.__enter__ = Mock(return_value=mock_session)
+        db.Session.return_value.__exit__ = Mock(return_value=False)
+
+        rows = [{"id": "a", "collection_deployed_at": 1, "is_early_mint": True}]
+        db.update_mint_timeliness(rows)
+
+        call_args = mock_session.execute.call_args
+        assert call_args[0][1] == rows
+        mock_session.commit.assert_called_once()
+
+    def test_noop_for_empty_batch(self, db, mock_session):
+        db.Session.return_value.__enter__ = Mock(return_value=mock_session)
+        db.Session.return_value.__exit__ = Mock(return_value=False)
+
+        db.update_mint_timeliness([])
+
+        mock_session.execute.assert_not_called()
+
+
+class TestBulkFetches:
+    """Tests for multi-account fetches"""
+
+    def test_mints_grouped_by_account(self, db, mock_session):
+        mock_result = Mock()
+        rows = []
+        for account_id, mint_id in [("0xa", "m1"), ("0xa", "m2"), ("0xb", "m3")]:
+            row = Mock()
+            row._mapping = {"account_id": account_id, "id": mint_id, "quantity": 1}
+            rows.append(row)
+        mock_result.__iter__ = Mock(return_value=iter(rows))
+        mock_session.execute.return_value = mock_result
+
+        db.Session.return_value.__enter__ = Mock(return_value=mock_session)
+        db.Session.return_value.__exit__ = Mock(return_value=False)
+
+        mints = db.get_mints_for_accounts(["0xA", "0xB", "0xC"])
+
+        assert [m["id"] for m in mints["0xa"]] == ["m1", "m2"]
+        assert [m["id"] for m in mints["0xb"]] == ["m3"]
+        assert mints["0xc"] == []
+        assert "account_id" not in mints["0xa"][0]
+        call_args = mock_session.execute.call_args
+        assert call_args[0][1]["addresses"] == ["0xa", "0xb", "0xc"]
+
+    def test_linked_wallets_grouped_by_main_account(self, db, mock_session):
+        mock_result = Mock()
+        row = Mock()
+        row._mapping = {"main_account_id": "0xa", "address": "0xl", "zora_mint_count": 2}
+        mock_result.__iter__ = Mock(return_value=iter([row]))
+        mock_session.execute.return_value = mock_result
+
+        db.Session.return_value.__enter__ = Mock(return_value=mock_session)
+        db.Session.return_value.__exit__ = Mock(return_value=False)
+
+        wallets = db.get_linked_wallets_for_accounts(["0xa", "0xb"])
+
+        assert wallets["0xa"] == [{"address": "0xl", "zora_mint_count": 2}]
+        assert wallets["0xb"] == []
+
+    def test_empty_input_skips_query(self, db, mock_session):
+        db.Session.return_value.__enter__ = Mock(return_value=mock_session)
+        db.Session.return_value.__exit__ = Mock(return_value=False)
+
+        assert db.get_mints_for_accounts([]) == {}
+        assert db.get_linked_wallets_for_accounts([]) == {}
+        assert db.get_accounts([]) == []
+        mock_session.execute.assert_not_called()
+
+
+class TestGetUpdateCandidates:
+    """Tests for get_update_candidates"""
+
+    def test_returns_candidates_with_activity(self, db, mock_session):
+        mock_result = Mock()
+        mock_row = Mock()
+        mock_row._mapping = {
+            "id": "0x123",
+            "total_score": 600,
+            "last_updated": 2000,
+            "new_mint_quantity": 4,
+            "new_early_quantity": 1,
+        }
+        mock_result.__iter__ = Mock(return_value=iter([mock_row]))
+        mock_session.execute.return_value = mock_result
+
+        db.Session.return_value.__enter__ = Mock(return_value=mock_session)
+        db.Session.return_value.__exit__ = Mock(return_value=False)
+
+        candidates = db.get_update_candidates(limit=200)
+
+        assert candidates[0]["new_early_quantity"] == 1
+        call_args = mock_session.execute.call_args
+        assert call_args[0][1]["limit"] == 200
+
+
+class TestGetMintsSince:
+    """Tests for get_mints_since"""
+
+    def test_returns_mint_rows_after_bound(self, db, mock_session):
+        mock_result = Mock()
+        mock_result.__iter__ = Mock(return_value=iter([
+            Mock(_mapping={"id": "m1", "minter": "0xa", "minted_at": 150}),
+        ]))
+        mock_session.execute.return_value = mock_result
+
+        db.Session.return_value.__enter__ = Mock(return_value=mock_session)
+        db.Session.return_value.__exit__ = Mock(return_value=False)
+
+        mints = db.get_mints_since(100)
+
+        assert mints == [{"id": "m1", "minter": "0xa", "minted_at": 150}]
+        assert mock_session.execute.call_args[0][1] == {"since": 100}
+
+
+class TestReadReplicaRouting:
+    """Tests for read/write split and statement timeouts"""
+
+    @pytest.fixture
+    def replicated_db(self):
+        engines = [Mock(name="primary"), Mock(name="replica")]
+        sessions = [MagicMock(name="PrimarySession"), MagicMock(name="ReplicaSession")]
+        with patch('database.create_engine', side_effect=engines) as mock_create:
+            with patch('database.sessionmaker', side_effect=sessions):
+                db = Database(
+                    "postgresql://primary/test",
+                    replica_url="postgresql://replica/test",
+                    max_replica_lag_seconds=5,
+                )
+        db.mock_create = mock_create
+        return db
+
+    def _session(self, session_factory, lag=0):
+        session = MagicMock()
+        result = MagicMock()
+        result.scalar.return_value = lag
+        result.__iter__ = Mock(return_value=iter([]))
+        session.execute.return_value = result
+        session_factory.return_value.__enter__ = Mock(return_value=session)
+        session_factory.return_value.__exit__ = Mock(return_value=False)
+        return session
+
+    def test_creates_both_engines_with_timeouts(self, replicated_db):
+        calls = replicated_db.mock_create.call_args_list
+        assert len(calls) == 2
+        assert "statement_timeout=5000" in calls[0].kwargs["connect_args"]["options"]
+        assert "statement_timeout=15000" in calls[1].kwargs["connect_args"]["options"]
+
+    def test_reads_go_to_healthy_replica(self, replicated_db):
+        primary = self._session(replicated_db.Session)
+        replica = self._session(replicated_db.ReplicaSession, lag=1)
+
+        replicated_db.get_top_accounts(limit=5)
+
+        primary.execute.assert_not_called()
+        assert replica.execute.call_args[0][1]["limit"] == 5
+
+    def test_lagging_replica_falls_back_to_primary(self, replicated_db):
+        primary = self._session(replicated_db.Session)
+        self._session(replicated_db.ReplicaSession, lag=60)
+
+        replicated_db.get_top_accounts(limit=5)
+
+        assert primary.execute.call_args[0][1]["limit"] == 5
+        assert replicated_db.replica_lag == 60
+
+    def test_writes_always_go_to_primary(self, replicated_db):
+        primary = self._session(replicated_db.Session)
+        replica = self._session(replicated_db.ReplicaSession)
+
+        replicated_db.mark_account_updated("0xabc")
+
+        primary.commit.assert_called_once()
+        replica.execute.assert_not_called()
+
+    def test_per_query_statement_timeout(self, db, mock_session):
+        mock_result = Mock()
+        mock_result.__iter__ = Mock(return_value=iter([]))
+        mock_session.execute.return_value = mock_result
+
+        db.Session.return_value.__enter__ = Mock(return_value=mock_session)
+        db.Session.return_value.__exit__ = Mock(return_value=False)
+
+        db.rank_early_minters()
+
+        timeout_call = mock_session.execute.call_args_list[0]
+        assert "statement_timeout" in str(timeout_call[0][0])
+        assert timeout_call[0][1]["timeout"] == "120000"
+
+    def test_early_minter_pages_read_from_replica(self, replicated_db):
+        primary = self._session(replicated_db.Session)
+        replica = self._session(replicated_db.ReplicaSession, lag=1)
+
+        replicated_db.get_early_minters(hours=24, limit=10)
+
+        assert any("FROM agent_early_minter_rank" in str(c[0][0]) for c in replica.execute.call_args_list)
+        primary.execute.assert_not_called()
+
+
+class TestKeysetPagination:
+    """Tests for keyset-paginated and streamed analytics queries"""
+
+    def _rows(self, mock_session, pages):
+        results = []
+        for page in pages:
+            result = Mock()
+            rows = []
+            for mapping in page:
+                row = Mock()
+                row._mapping = mapping
+                rows.append(row)
+            result.__iter__ = Mock(return_value=iter(rows))
+            results.append(result)
+        # First execute of each session sets the statement timeout
+        side_effect = []
+        for result in results:
+            side_effect += [Mock(), result]
+        mock_session.execute.side_effect = side_effect
+
+    def test_top_accounts_first_page_has_no_cursor(self, db, mock_session):
+        self._rows(mock_session, [[]])
+        db.Session.return_value.__enter__ = Mock(return_value=mock_session)
+        db.Session.return_value.__exit__ = Mock(return_value=False)
+
+        db.get_top_accounts(limit=10)
+
+        query, params = mock_session.execute.call_args[0]
+        assert "after_score" not in params
+        assert "(total_score, id) <" not in str(query)
+
+    def test_top_accounts_after_cursor(self, db, mock_session):
+        self._rows(mock_session, [[]])
+        db.Session.return_value.__enter__ = Mock(return_value=mock_session)
+        db.Session.return_value.__exit__ = Mock(return_value=False)
+
+        db.get_top_accounts(limit=10, after=(500, "0xabc"))
+
+        query, params = mock_session.execute.call_args[0]
+        assert params["after_score"] == 500
+        assert params["after_id"] == "0xabc"
+        assert "(total_score, id) <" in str(query)
+
+    def test_iter_top_accounts_walks_pages(self, db, mock_session):
+        self._rows(mock_session, [
+            [{"id": "0xc", "total_score": 30}, {"id": "0xb", "total_score": 20}],
+            [{"id": "0xa", "total_score": 10}],
+        ])
+        db.Session.return_value.__enter__ = Mock(return_value=mock_session)
+        db.Session.return_value.__exit__ = Mock(return_value=False)
+
+        ids = [a["id"] for a in db.iter_top_accounts(page_size=2)]
+
+        assert ids == ["0xc", "0xb", "0xa"]
+        second_page_params = mock_session.execute.call_args_list[3][0][1]
+        assert (second_page_params["after_score"], second_page_params["after_id"]) == (20, "0xb")
+
+    def test_early_minters_uses_hours_window(self, db, mock_session):
+        self._rows(mock_session, [[]])
+        db.Session.return_value.__enter__ = Mock(return_value=mock_session)
+        db.Session.return_value.__exit__ = Mock(return_value=False)
+
+        db.get_early_minters(hours=6, limit=50, after=(3, "0xabc"))
+
+        query, params = mock_session.execute.call_args[0]
+        assert params["window"] == 6 * 3600
+        assert params["limit"] == 50
+        assert (params["after_count"], params["after_minter"]) == (3, "0xabc")
+        assert "FROM agent_early_minter_rank" in str(query)
+        assert "GROUP BY" not in str(query)
+
+    def test_early_minter_pages_never_rank(self, db, mock_session):
+        mock_session.execute.return_value.__iter__ = Mock(return_value=iter([]))
+        db.Session.return_value.__enter__ = Mock(return_value=mock_session)
+        db.Session.return_value.__exit__ = Mock(return_value=False)
+
+        db.get_early_minters(hours=24, limit=10)
+        db.get_early_minters(hours=24, limit=10, after=(2, "0xb"))
+
+        statements = [str(c.args[0]) for c in mock_session.execute.call_args_list]
+        assert not any(word in s for s in statements for word in ("GROUP BY", "INSERT", "DELETE", "CREATE"))
+        mock_session.commit.assert_not_called()
+
+    def test_rank_early_minters_swaps_ranking_under_lock(self, db, mock_session):
+        db.Session.return_value.__enter__ = Mock(return_value=mock_session)
+        db.Session.return_value.__exit__ = Mock(return_value=False)
+
+        db.rank_early_minters(hours=24)
+
+        statements = [str(c.args[0]).strip() for c in mock_session.execute.call_args_list]
+        assert "pg_advisory_xact_lock" in statements[1]
+        assert statements[2].startswith("DELETE FROM agent_early_minter_rank")
+        assert statements[3].startswith("INSERT INTO agent_early_minter_rank")
+        assert sum("GROUP BY m.minter" in s for s in statements) == 1
+        assert not any("CREATE" in s for s in statements)
+        mock_session.commit.assert_called_once()
+
+    def test_iter_early_minters_streams(self, db, mock_session):
+        self._rows(mock_session, [[{"minter": "0xa", "early_mint_count": 2}]])
+        db.Session.return_value.__enter__ = Mock(return_value=mock_session)
+        db.Session.return_value.__exit__ = Mock(return_value=False)
+
+        minters = db.iter_early_minters(hours=24, batch_size=500)
+        mock_session.execute.assert_not_called()
+
+        assert list(minters) == [{"minter": "0xa", "early_mint_count": 2}]
+        query = mock_session.execute.call_args[0][0]
+        assert query.get_execution_options()["stream_results"] is True
+        assert query.get_execution_options()["yield_per"] == 500
+
+
+class TestEarlyMintCounters:
+    """Tests for the per-minter counter table"""
+
+    def test_cursor_round_trips_as_tuple(self, db, mock_session):
+        mock_session.execute.return_value.scalar.return_value = '[1700000000, "m9"]'
+        db.Session.return_value.__enter__ = Mock(return_value=mock_session)
+        db.Session.return_value.__exit__ = Mock(return_value=False)
+
+        assert db.get_early_mint_counter_cursor() == (1700000000, "m9")
+
+    def test_missing_cursor(self, db, mock_session):
+        mock_session.execute.return_value.scalar.return_value = None
+        db.Session.return_value.__enter__ = Mock(return_value=mock_session)
+        db.Session.return_value.__exit__ = Mock(return_value=False)
+
+        assert db.get_early_mint_counter_cursor() is None
+
+    def test_mints_after_cursor(self, db, mock_session):
+        mock_session.execute.return_value.__iter__ = Mock(return_value=iter([]))
+        db.Session.return_value.__enter__ = Mock(return_value=mock_session)
+        db.Session.return_value.__exit__ = Mock(return_value=False)
+
+        db.get_mints_after(after=(100, "m1"), limit=10)
+
+        query, params = mock_session.execute.call_args[0]
+        assert (params["after_minted_at"], params["after_id"]) == (100, "m1")
+        assert "(m.minted_at, m.id) >" in str(query)
+
+    def test_apply_upserts_deltas_and_cursor_in_one_commit(self, db, mock_session):
+        db.Session.return_value.__enter__ = Mock(return_value=mock_session)
+        db.Session.return_value.__exit__ = Mock(return_value=False)
+
+        db.apply_early_mint_counters({"0xa": {"mint_quantity": 2}}, (100, "m1"))
+
+        upsert, cursor = mock_session.execute.call_args_list
+        assert upsert[0][1] == [{"minter": "0xa", "last_minted_at": None, "mint_quantity": 2}]
+        assert "ON CONFLICT (minter)" in str(upsert[0][0])
+        assert "GREATEST(agent_early_mint_counter.last_minted_at" in str(upsert[0][0])
+        assert cursor[0][1]["value"] == '[100, "m1"]'
+        mock_session.commit.assert_called_once()
+
+    def test_apply_swaps_ledger_rows_in_the_same_commit(self, db, mock_session):
+        db.Session.return_value.__enter__ = Mock(return_value=mock_session)
+        db.Session.return_value.__exit__ = Mock(return_value=False)
+        mint = {"id": "m2", "minter": "0xa", "contract_address": "0xc", "quantity": 1, "minted_at": 90}
+
+        db.apply_early_mint_counters({}, (100, "m1"), applied=[mint], removed=["m2"], horizon=40)
+
+        statements = [str(c.args[0]) for c in mock_session.execute.call_args_list]
+        assert "DELETE FROM agent_early_mint_applied WHERE id" in statements[0]
+        assert "INSERT INTO agent_early_mint_applied" in statements[1]
+        assert mock_session.execute.call_args_list[1].args[1][0]["is_early_mint"] is False
+        assert "minted_at < :horizon" in statements[2]
+        assert "agent_state" in statements[3]
+        mock_session.commit.assert_called_once()
+
+    def test_counters_for_accounts_default_to_zero(self, db, mock_session):
+        row = Mock()
+        row._mapping = {
+            "account_id": "0xa", "mint_quantity": 5, "early_mint_count": 1,
+            "early_quantity": 2, "quantity_1h": 1, "quantity_24h": 2, "quantity_7d": 3,
+            "last_minted_at": 1700000000,
+        }
+        mock_session.execute.return_value.__iter__ = Mock(return_value=iter([row]))
+        db.Session.return_value.__enter__ = Mock(return_value=mock_session)
+        db.Session.return_value.__exit__ = Mock(return_value=False)
+
+        counters = db.get_mint_counters_for_accounts(["0xA", "0xB"])
+
+        assert counters["0xa"]["mint_quantity"] == 5
+        assert counters["0xb"]["early_quantity"] == 0
+        assert counters["0xb"]["last_minted_at"] is None
+
+    def test_report_rejects_unknown_window(self, db):
+        with pytest.raises(ValueError):
+            db.get_early_minters_from_counters(window="1y")
+
+    def test_report_orders_by_window_column(self, db, mock_session):
+        mock_session.execute.return_value.__iter__ = Mock(return_value=iter([]))
+        db.Session.return_value.__enter__ = Mock(return_value=mock_session)
+        db.Session.return_value.__exit__ = Mock(return_value=False)
+
+        db.get_early_minters_from_counters(window="1h", limit=5, after=(3, "0xb"))
+
+        query, params = mock_session.execute.call_args[0]
+        assert "ORDER BY quantity_1h DESC" in str(query)
+        assert (params["after_quantity"], params["after_minter"]) == (3, "0xb")
+
+
+class TestScoringStreams:
+    """Tests for whole-table scoring input streams"""
+
+    def test_mints_stream_through_server_side_cursor(self, db, mock_session):
+        row = Mock()
+        row._mapping = {"account_id": "0xa", "quantity": 1}
+        mock_session.execute.side_effect = [Mock(), iter([row])]
+        db.Session.return_value.__enter__ = Mock(return_value=mock_session)
+        db.Session.return_value.__exit__ = Mock(return_value=False)
+
+        mints = list(db.iter_scoring_mints(batch_size=250))
+
+        assert mints == [{"account_id": "0xa", "quantity": 1}]
+        query = mock_session.execute.call_args[0][0]
+        assert query.get_execution_options()["yield_per"] == 250
+        assert "linked_wallet" in str(query)
+
+
+class TestScoreSnapshotWrites:
+    """Tests for the score history bulk load"""
+
+    def test_insert_stages_copy_and_keeps_existing_rows(self, db):
+        connection = Mock()
+        cursor = connection.cursor.return_value
+        cursor.rowcount = 1
+        db.engine.raw_connection.return_value = connection
+
+        inserted = db.insert_score_snapshots(
+            [("0xa-100", "0xa", 5, "Novice", 100)],
+            state_key="job:0x4000", state_value="{}"
+        )
+
+        assert inserted == 1
+        statements = [c[0][0] for c in cursor.execute.call_args_list]
+        assert "set_config('statement_timeout'" in statements[0]
+        assert cursor.execute.call_args_list[0][0][1]["timeout"] == "600000"
+        assert "CREATE TEMP TABLE score_snapshot_staging" in statements[1]
+        copy_sql, buffer = cursor.copy_expert.call_args[0]
+        assert copy_sql.startswith("COPY score_snapshot_staging")
+        assert buffer.getvalue() == "0xa-100\t0xa\t5\tNovice\t100\n"
+        assert "ON CONFLICT (id) DO NOTHING" in statements[2]
+        assert not any("DELETE" in sql for sql in statements)
+        assert cursor.execute.call_args_list[3][0][1]["key"] == "job:0x4000"
+        connection.commit.assert_called_once()
+        connection.close.assert_called_once()
+
+    def test_insert_rolls_back_on_failure(self, db):
+        connection = Mock()
+        connection.cursor.return_value.copy_expert.side_effect = RuntimeError("boom")
+        db.engine.raw_connection.return_value = connection
+
+        with pytest.raises(RuntimeError):
+            db.insert_score_snapshots([], state_key="k", state_value="{}")
+
+        connection.rollback.assert_called_once()
+        connection.commit.assert_not_called()
+
+    def test_state_prefix_is_escaped(self, db, mock_session):
+        db.Session.return_value.__enter__ = Mock(return_value=mock_session)
+        db.Session.return_value.__exit__ = Mock(return_value=False)
+        mock_session.execute.return_value = []
+
+        db.get_agent_state("score_history:1")
+
+        assert mock_session.execute.call_args[0][1]["pattern"] == "score\\_history:1%"
+
+
+class TestIndexMaintenance:
+    """Tests for index catalog reads and concurrent builds"""
+
+    def test_create_index_runs_in_autocommit_without_timeout(self, db, mock_engine):
+        conn = MagicMock()
+        connection = MagicMock()
+        connection.__enter__.return_value = conn
+        mock_engine.connect.return_value.execution_options.return_value = connection
+
+        db.create_index_concurrently("CREATE INDEX CONCURRENTLY x ON account (id)", drop_invalid="x")
+
+        mock_engine.connect.return_value.execution_options.assert_called_once_with(isolation_level="AUTOCOMMIT")
+        statements = [str(c.args[0]) for c in conn.execute.call_args_list]
+        assert statements == [
+            "SET statement_timeout = 0",
+            'DROP INDEX CONCURRENTLY IF EXISTS "x"',
+            "CREATE INDEX CONCURRENTLY x ON account (id)",
+            "RESET statement_timeout",
+        ]
+
+    def test_create_index_restores_timeout_when_build_fails(self, db, mock_engine):
+        conn = MagicMock()
+        conn.execute.side_effect = [None, Exception("deadlock detected"), None]
+        connection = MagicMock()
+        connection.__enter__.return_value = conn
+        mock_engine.connect.return_value.execution_options.return_value = connection
+
+        with pytest.raises(Exception, match="deadlock"):
+            db.create_index_concurrently("CREATE INDEX CONCURRENTLY x ON account (id)")
+
+        assert str(conn.execute.call_args_list[-1].args[0]) == "RESET statement_timeout"
+        conn.invalidate.assert_not_called()
+
+    def test_create_index_discards_connection_it_cannot_reset(self, db, mock_engine):
+        conn = MagicMock()
+        conn.execute.side_effect = [None, Exception("server closed the connection"), Exception("closed")]
+        connection = MagicMock()
+        connection.__enter__.return_value = conn
+        mock_engine.connect.return_value.execution_options.return_value = connection
+
+        with pytest.raises(Exception):
+            db.create_index_concurrently("CREATE INDEX CONCURRENTLY x ON account (id)")
+
+        conn.invalidate.assert_called_once()
+
+    def test_explain_disables_seqscan_and_rolls_back(self, db, mock_session):
+        db.Session = Mock(return_value=mock_session)
+        mock_session.__enter__.return_value = mock_session
+        mock_session.execute.return_value.scalar.return_value = '[{"Plan": {"Node Type": "Result"}}]'
+
+        plan = db.explain("SELECT 1", {}, allow_seqscan=False)
+
+        assert plan[0]["Plan"]["Node Type"] == "Result"
+        statements = [str(c.args[0]) for c in mock_session.execute.call_args_list]
+        assert "SET LOCAL enable_seqscan = off" in statements
+        mock_session.rollback.assert_called_once()
+
+
+class TestMintPartitions:
+    """Tests for the monthly-partitioned mint table and pruning-friendly reads"""
+
+    @pytest.fixture
+    def session(self, db, mock_session):
+        db.Session.return_value.__enter__ = Mock(return_value=mock_session)
+        db.Session.return_value.__exit__ = Mock(return_value=False)
+        mock_session.execute.return_value.__iter__ = Mock(return_value=iter([]))
+        return mock_session
+
+    def test_month_bounds(self):
+        from database import month_bounds
+
+        assert month_bounds(1700000000) == (1698796800, 1701388800)   # November 2023
+        assert month_bounds(1703980800)[1] == 1704067200              # December rolls over
+
+    def test_recent_reads_use_literal_minted_at_bounds(self, db, session):
+        db.get_accounts_needing_update(limit=5)
+        query, params = session.execute.call_args[0]
+        assert "m.minted_at > :stale_before" in str(query)
+        assert "NOW()" not in str(query)
+
+        db.get_mints_after(after=(100, "m1"), limit=10)
+        assert "m.minted_at >= :after_minted_at" in str(session.execute.call_args[0][0])
+
+    def test_reads_switch_table_once_backfilled(self, db, session):
+        db.get_agent_state = Mock(return_value={"mint_partition_backfill": "[5, \"m\"]"})
+        assert db.use_mint_partitions() is False
+
+        db.get_agent_state.return_value = {"mint_partition_backfill": "done"}
+        assert db.use_mint_partitions() is True
+
+        db.get_update_candidates(limit=10)
+        assert "FROM zora_mint_by_month m" in str(session.execute.call_args[0][0])
+
+    def test_mints_since_read_only_the_recent_range(self, db, session):
+        db.mint_table = "zora_mint_by_month"
+
+        db.get_mints_for_account("0xA")
+        assert "FROM zora_mint m" in str(session.execute.call_args[0][0])
+
+        db.get_mints_for_account("0xA", since=1000)
+        query, params = session.execute.call_args[0]
+        assert "FROM zora_mint_by_month m" in str(query)
+        assert params == {"address": "0xa", "since": 1000}
+
+    def test_ensure_creates_monthly_partitions_and_trigger(self, db, session):
+        session.execute.return_value.scalar.return_value = None
+
+        with patch("database.time.time", return_value=1700000000):
+            months = db.ensure_mint_partitions(start=1690000000, months_ahead=2)
+
+        statements = [str(c.args[0]) for c in session.execute.call_args_list]
+        partitions = [s for s in statements if "PARTITION OF zora_mint_by_month FOR VALUES" in s]
+        assert months == len(partitions) == 7   # July 2023 through January 2024
+        assert "zora_mint_by_month_p202307" in partitions[0]
+        assert any("CREATE TRIGGER zora_mint_mirror" in s for s in statements)
+        session.commit.assert_called_once()
+
+    def test_ensure_runs_under_its_own_timeout_before_any_ddl(self, db, session):
+        session.execute.return_value.scalar.return_value = None
+        db.query_timeouts_ms["ensure_mint_partitions"] = 123456
+
+        db.ensure_mint_partitions()
+
+        first = session.execute.call_args_list[0]
+        assert "set_config('statement_timeout'" in str(first.args[0])
+        assert first.args[1] == {"timeout": "123456"}
+
+    def test_backfill_resumes_and_marks_done(self, db, session):
+        db.ensure_agent_state_table = Mock()
+        db.get_agent_state = Mock(return_value={"mint_partition_backfill": "[100, \"m9\"]"})
+        full = Mock(minted_at=200, id="m20", batch_rows=2)
+        partial = Mock(minted_at=300, id="m30", batch_rows=1)
+        session.execute.return_value.fetchone.side_effect = [full, partial]
+
+        copied = db.backfill_mint_partitions(batch_size=2)
+
+        copies = [c for c in session.execute.call_args_list if "INSERT INTO zora_mint_by_month" in str(c.args[0])]
+        saves = [c.args[1]["value"] for c in session.execute.call_args_list if "agent_state" in str(c.args[0])]
+        assert copied == 3
+        assert (copies[0].args[1]["after_minted_at"], copies[0].args[1]["after_id"]) == (100, "m9")
+        assert (copies[1].args[1]["after_minted_at"], copies[1].args[1]["after_id"]) == (200, "m20")
+        assert saves == ['[200, "m20"]', "done"]
+
+    def test_backfill_stops_after_max_batches(self, db, session):
+        db.ensure_agent_state_table = Mock()
+        db.get_agent_state = Mock(return_value={})
+        session.execute.return_value.fetchone.return_value = Mock(minted_at=1, id="a", batch_rows=2)
+
+        assert db.backfill_mint_partitions(batch_size=2, max_batches=3) == 6
@@ -0,0 +1,192 @@
+"""
+Tests for incrementally maintained early-mint counters
+"""
+
+from unittest.mock import Mock
+from early_mint_counters import EarlyMintCounters, COUNTER_COLUMNS, empty_counters
+from collection_index import CollectionIndex
+from score_calculator import ScoreCalculator
+
+
+def _mint(mint_id, minter, minted_at, deployed_at=None, quantity=1, **extra):
+    return {
+        "id": mint_id,
+        "minter": minter,
+        "contract_address": "0xcol",
+        "quantity": quantity,
+        "minted_at": minted_at,
+        "collection_deployed_at": deployed_at,
+        **extra,
+    }
+
+
+class FakeCounterDb:
+    """zora_mint, the counters, their cursor and applied-mint ledger in memory"""
+
+    def __init__(self, mints=()):
+        self.mints = list(mints)
+        self.counters = {}
+        self.applied = {}
+        self.cursor = None
+
+    def get_early_mint_counter_cursor(self):
+        return self.cursor
+
+    def get_mints_after(self, after=None, limit=5000):
+        rows = sorted(self.mints, key=lambda m: (m["minted_at"], m["id"]))
+        return [m for m in rows if after is None or (m["minted_at"], m["id"]) > after][:limit]
+
+    def get_mints_between(self, since, through):
+        return [m for m in self.mints if m["minted_at"] >= since and (m["minted_at"], m["id"]) <= through]
+
+    def get_applied_early_mints(self, since):
+        return {i: m for i, m in self.applied.items() if m["minted_at"] >= since}
+
+    def apply_early_mint_counters(self, deltas, cursor, applied=(), removed=(), horizon=None,
+                                  recheck_last_minted=()):
+        for minter, delta in deltas.items():
+            counters = self.counters.setdefault(minter, empty_counters())
+            for column in COUNTER_COLUMNS:
+                counters[column] += delta[column]
+            if delta["last_minted_at"] is not None:
+                counters["last_minted_at"] = max(counters["last_minted_at"] or 0, delta["last_minted_at"])
+        for minter in recheck_last_minted:
+            self.counters[minter]["last_minted_at"] = max(
+                (m["minted_at"] for m in self.mints if m["minter"] == minter), default=None
+            )
+        for mint_id in removed:
+            self.applied.pop(mint_id, None)
+        for mint in applied:
+            self.applied.setdefault(mint["id"], dict(mint))
+        if horizon is not None:
+            self.applied = {i: m for i, m in self.applied.items() if m["minted_at"] >= horizon}
+        self.cursor = cursor
+
+    def recount(self, calculator):
+        return {
+            minter: counters
+            for minter, counters in EarlyMintCounters(self, calculator).aggregate(self.mints).items()
+        }
+
+
+class TestAggregate:
+    """Tests for folding mint rows into counter deltas"""
+
+    def test_buckets_by_time_since_deploy(self):
+        counters = EarlyMintCounters(Mock(), ScoreCalculator())
+
+        deltas = counters.aggregate([
+            _mint("m1", "0xa", 1000 + 60, deployed_at=1000, quantity=2),
+            _mint("m2", "0xa", 1000 + 2 * 86400, deployed_at=1000),
+            _mint("m3", "0xb", 5000),
+        ])
+
+        assert deltas["0xa"]["mint_quantity"] == 3
+        assert deltas["0xa"]["early_mint_count"] == 1
+        assert deltas["0xa"]["early_quantity"] == 2
+        assert deltas["0xa"]["quantity_1h"] == 2
+        assert deltas["0xa"]["quantity_24h"] == 2
+        assert deltas["0xa"]["quantity_7d"] == 3
+        assert deltas["0xb"]["mint_quantity"] == 1
+        assert deltas["0xb"]["quantity_7d"] == 0
+        assert deltas["0xa"]["last_minted_at"] == 1000 + 2 * 86400
+
+    def test_uses_collection_index_for_missing_deploy_time(self):
+        index = CollectionIndex()
+        index.load([{"address": "0xcol", "deployed_at": 1000}])
+        counters = EarlyMintCounters(Mock(), ScoreCalculator(collection_index=index))
+
+        deltas = counters.aggregate([_mint("m1", "0xa", 1100)])
+
+        assert deltas["0xa"]["early_quantity"] == 1
+        assert deltas["0xa"]["quantity_1h"] == 1
+
+    def test_stored_flag_counts_as_early(self):
+        counters = EarlyMintCounters(Mock(), ScoreCalculator())
+
+        deltas = counters.aggregate([_mint("m1", "0xa", 1100, is_early_mint=True)])
+
+        assert deltas["0xa"]["early_mint_count"] == 1
+
+
+class TestUpdate:
+    """Tests for cursor-driven incremental updates"""
+
+    def test_walks_batches_and_advances_cursor(self):
+        db = Mock()
+        db.get_early_mint_counter_cursor.return_value = None
+        db.get_mints_after.side_effect = [
+            [_mint("m1", "0xa", 10), _mint("m2", "0xa", 20)],
+            [_mint("m3", "0xb", 30)],
+        ]
+        db.get_mints_between.return_value = [_mint("m1", "0xa", 10), _mint("m2", "0xa", 20), _mint("m3", "0xb", 30)]
+        db.get_applied_early_mints.return_value = {
+            m["id"]: m for m in db.get_mints_between.return_value
+        }
+        counters = EarlyMintCounters(db, ScoreCalculator(), batch_size=2)
+
+        assert counters.update() == 3
+
+        assert db.get_mints_after.call_args_list[1].kwargs["after"] == (20, "m2")
+        last_deltas, last_cursor = db.apply_early_mint_counters.call_args[0]
+        assert last_cursor == (30, "m3")
+        assert set(last_deltas) == {"0xb"}
+
+    def test_resumes_from_stored_cursor(self):
+        db = Mock()
+        db.get_early_mint_counter_cursor.return_value = (50, "m5")
+        db.get_mints_after.return_value = []
+        db.get_mints_between.return_value = []
+        db.get_applied_early_mints.return_value = {}
+        counters = EarlyMintCounters(db, ScoreCalculator())
+
+        assert counters.update() == 0
+
+        assert db.get_mints_after.call_args.kwargs["after"] == (50, "m5")
+        db.apply_early_mint_counters.assert_not_called()
+
+    def test_late_insert_behind_cursor_is_counted_once(self):
+        calculator = ScoreCalculator()
+        db = FakeCounterDb([_mint("m1", "0xa", 1000), _mint("m2", "0xb", 2000)])
+        counters = EarlyMintCounters(db, calculator, overlap_seconds=600)
+        counters.update()
+        assert db.cursor == (2000, "m2")
+
+        # Indexed from the lagging chain after the cursor passed its minted_at
+        db.mints.append(_mint("m0", "0xc", 1500, quantity=3))
+        assert counters.update() == 1
+        assert counters.update() == 0
+
+        assert db.counters["0xc"]["mint_quantity"] == 3
+        assert db.counters == db.recount(calculator)
+
+    def test_reorged_out_mint_is_subtracted(self):
+        calculator = ScoreCalculator()
+        db = FakeCounterDb([_mint("m1", "0xa", 1000, quantity=2), _mint("m2", "0xa", 1100)])
+        counters = EarlyMintCounters(db, calculator, overlap_seconds=600)
+        counters.update()
+
+        db.mints = [m for m in db.mints if m["id"] != "m2"]
+        counters.update()
+
+        assert db.counters["0xa"]["mint_quantity"] == 2
+        assert db.counters["0xa"]["last_minted_at"] == 1000
+        assert "m2" not in db.applied
+
+    def test_ledger_only_keeps_overlap_window(self):
+        db = FakeCounterDb([_mint("m1", "0xa", 100), _mint("m2", "0xa", 5000)])
+        counters = EarlyMintCounters(db, ScoreCalculator(), overlap_seconds=600)
+
+        counters.update()
+
+        assert set(db.applied) == {"m2"}
+
+    def test_rebuild_resets_first(self):
+        db = Mock()
+        db.get_early_mint_counter_cursor.return_value = None
+        db.get_mints_after.return_value = []
+        counters = EarlyMintCounters(db, ScoreCalculator())
+
+        counters.rebuild()
+
+        db.reset_early_mint_counters.assert_called_once()
@@ -0,0 +1,180 @@
+"""
+Tests for the index advisor
+"""
+
+import os
+import re
+import glob
+import pytest
+from unittest.mock import Mock
+from index_advisor import (
+    IndexAdvisor,
+    REQUIRED_INDEXES,
+    create_statement,
+    ensure_indexes,
+    find_index,
+    seq_scans,
+)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+
+
+def catalog_row(spec, name=None, valid=True, columns=None, predicate=None):
+    return {
+        "table_name": spec["table"],
+        "index_name": name or spec["name"],
+        "valid": valid,
+        "predicate": f"({spec['where']})" if spec.get("where") and predicate is None else predicate,
+        "columns": columns or [part.split()[0] for part in spec["key"].split(",")],
+    }
+
+
+def index_plan():
+    return [{"Plan": {"Node Type": "Limit", "Plans": [
+        {"Node Type": "Index Only Scan", "Relation Name": "account", "Index Name": "account_last_updated_idx"}
+    ]}}]
+
+
+def seq_plan(table):
+    return [{"Plan": {"Node Type": "Hash Join", "Plans": [
+        {"Node Type": "Seq Scan", "Relation Name": table},
+        {"Node Type": "Hash", "Plans": [{"Node Type": "Index Scan", "Relation Name": "account"}]},
+    ]}}]
+
+
+@pytest.fixture
+def db():
+    db = Mock()
+    db.get_indexes.return_value = [catalog_row(spec) for spec in REQUIRED_INDEXES]
+    db.explain.return_value = index_plan()
+    return db
+
+
+class TestMigrationFiles:
+    """The SQL migrations and REQUIRED_INDEXES must not drift apart"""
+
+    def test_every_required_index_is_in_a_migration(self):
+        sql = ""
+        for path in sorted(glob.glob(os.path.join(MIGRATIONS_DIR, "*.sql"))):
+            with open(path) as f:
+                sql += " " + re.sub(r"--[^\n]*", "", f.read())
+        sql = re.sub(r"\s+", " ", sql)
+
+        for spec in REQUIRED_INDEXES:
+            assert create_statement(spec) + ";" in sql
+
+    def test_partial_index_statement(self):
+        spec = next(s for s in REQUIRED_INDEXES if s.get("where"))
+        assert create_statement(spec).endswith(f"WHERE {spec['where']}")
+
+
+class TestIndexMatching:
+    """Tests for recognising existing indexes"""
+
+    def test_equivalent_index_under_another_name_counts(self):
+        spec = {"name": "account_last_updated_idx", "table": "account", "key": "last_updated"}
+        row = catalog_row(spec, name="account_by_last_updated", columns=["last_updated", "id"])
+
+        assert find_index(spec, [row]) is row
+
+    def test_wrong_leading_column_does_not_count(self):
+        spec = {"name": "zora_mint_minted_at_idx", "table": "zora_mint", "key": "minted_at, id"}
+        row = catalog_row(spec, name="zora_mint_id_minted_at", columns=["id", "minted_at"])
+
+        assert find_index(spec, [row]) is None
+
+    def test_full_index_does_not_stand_in_for_partial(self):
+        spec = {"name": "p", "table": "zora_mint", "key": "id", "where": "collection_deployed_at IS NULL"}
+        row = catalog_row(spec, name="zora_mint_pkey", predicate=None)
+        row["predicate"] = None
+
+        assert find_index(spec, [row]) is None
+
+    def test_valid_index_preferred_over_invalid(self):
+        spec = {"name": "account_last_updated_idx", "table": "account", "key": "last_updated"}
+        invalid = catalog_row(spec, valid=False)
+        valid = catalog_row(spec, name="other")
+
+        assert find_index(spec, [invalid, valid]) is valid
+
+
+class TestIndexAdvisor:
+    """Tests for checks and the opt-in migration"""
+
+    def test_all_present_is_clean(self, db):
+        assert IndexAdvisor(db).check() == {"indexes": [], "plans": []}
+        for call in db.explain.call_args_list:
+            assert call.kwargs["allow_seqscan"] is False
+
+    def test_missing_and_invalid_reported(self, db):
+        rows = db.get_indexes.return_value
+        rows[:] = [r for r in rows if r["index_name"] != "zora_mint_minted_at_idx"]
+        next(r for r in rows if r["index_name"] == "account_last_updated_idx")["valid"] = False
+
+        problems = {p["spec"]["name"]: p["problem"] for p in IndexAdvisor(db).check_indexes()}
+
+        assert problems == {"zora_mint_minted_at_idx": "missing", "account_last_updated_idx": "invalid"}
+
+    def test_name_taken_by_other_definition(self, db):
+        row = next(r for r in db.get_indexes.return_value if r["index_name"] == "account_last_updated_idx")
+        row["columns"] = ["first_tx_timestamp"]
+
+        problems = IndexAdvisor(db).check_indexes()
+
+        assert [(p["spec"]["name"], p["problem"]) for p in problems] == [("account_last_updated_idx", "mismatched")]
+
+    def test_seq_scan_plan_reported(self, db):
+        db.explain.side_effect = lambda sql, params, allow_seqscan: seq_plan("zora_mint") if "zora_mint" in sql else index_plan()
+
+        plans = IndexAdvisor(db).check_plans()
+
+        assert plans and all(p["seq_scans"] == ["zora_mint"] for p in plans)
+
+    def test_apply_builds_missing_and_rebuilds_invalid(self, db):
+        rows = [catalog_row(spec) for spec in REQUIRED_INDEXES if spec["name"] != "zora_mint_minted_at_idx"]
+        next(r for r in rows if r["index_name"] == "account_last_updated_idx")["valid"] = False
+        db.get_indexes.side_effect = [rows, [catalog_row(spec) for spec in REQUIRED_INDEXES]]
+
+        report = IndexAdvisor(db).check(apply=True)
+
+        assert report["indexes"] == []
+        calls = {c.args[0].split()[6]: c.kwargs["drop_invalid"] for c in db.create_index_concurrently.call_args_list}
+        assert calls == {"zora_mint_minted_at_idx": None, "account_last_updated_idx": "account_last_updated_idx"}
+
+    def test_mismatched_index_is_not_rebuilt(self, db):
+        row = next(r for r in db.get_indexes.return_value if r["index_name"] == "account_last_updated_idx")
+        row["columns"] = ["first_tx_timestamp"]
+        advisor = IndexAdvisor(db)
+
+        assert advisor.apply(advisor.check_indexes()) == []
+        db.create_index_concurrently.assert_not_called()
+
+    def test_dry_run_only_lists_statements(self, db):
+        db.get_indexes.return_value = []
+        advisor = IndexAdvisor(db)
+
+        statements = advisor.apply(advisor.check_indexes(), dry_run=True)
+
+        assert len(statements) == len(REQUIRED_INDEXES)
+        db.create_index_concurrently.assert_not_called()
+
+
+class TestStartupCheck:
+    """Tests for the INDEX_CHECK modes"""
+
+    def test_warn_mode_logs_and_continues(self, db, caplog):
+        db.get_indexes.return_value = []
+        assert ensure_indexes(db, mode="warn") is False
+        assert "zora_mint_minted_at_idx" in caplog.text
+
+    def test_fail_mode_raises(self, db):
+        db.get_indexes.return_value = []
+        with pytest.raises(RuntimeError):
+            ensure_indexes(db, mode="fail")
+
+    def test_off_mode_skips_database(self, db):
+        assert ensure_indexes(db, mode="off") is True
+        db.get_indexes.assert_not_called()
+
+    def test_seq_scan_helper_ignores_other_tables(self):
+        assert seq_scans(seq_plan("collection"), ["account", "zora_mint"]) == []
@@ -0,0 +1,121 @@
+"""
+Tests for the incremental score Merkle tree
+"""
+
+import random
+import pytest
+from merkle import MerkleTree, EMPTY_ROOT, leaf_hash, hash_pair, verify_proof
+
+
+def address(i):
+    return "0x" + format(i, "040x")
+
+
+def full_root(tree):
+    """Root rebuilt from scratch over the tree's current leaves"""
+    level = [
+        leaf_hash(tree._address(i), tree.scores[i], tree.epochs[i])
+        for i in range(len(tree))
+    ]
+    if not level:
+        return EMPTY_ROOT
+    while len(level) > 1:
+        level = [
+            hash_pair(level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+            for i in range(0, len(level), 2)
+        ]
+    return level[0]
+
+
+class TestMerkleTree:
+    """Tests for building and updating the tree"""
+
+    def test_empty_root(self):
+        assert MerkleTree().root == EMPTY_ROOT
+
+    def test_single_leaf_is_root(self):
+        tree = MerkleTree()
+        tree.update([{"address": address(1), "score": 10}], epoch=1)
+
+        assert tree.root == leaf_hash(bytes.fromhex(address(1)[2:]), 10, 1)
+        assert tree.proof(address(1)) == []
+
+    @pytest.mark.parametrize("size", [2, 3, 5, 8, 13])
+    def test_matches_full_rebuild(self, size):
+        tree = MerkleTree()
+        tree.update([{"address": address(i), "score": i} for i in range(size)], epoch=1)
+        assert tree.root == full_root(tree)
+
+    def test_incremental_updates_match_full_rebuild(self):
+        rng = random.Random(7)
+        tree = MerkleTree()
+        for epoch in range(1, 30):
+            tree.update(
+                [{"address": address(rng.randrange(50)), "score": rng.randrange(4)} for _ in range(6)],
+                epoch
+            )
+            assert tree.root == full_root(tree)
+
+    def test_unchanged_score_keeps_leaf_epoch(self):
+        tree = MerkleTree()
+        tree.update([{"address": address(1), "score": 10}], epoch=1)
+        root = tree.root
+
+        tree.update([{"address": address(1), "score": 10}], epoch=2)
+
+        assert tree.get(address(1)) == (10, 1)
+        assert tree.root == root
+
+    def test_revert_restores_root_and_leaves(self):
+        tree = MerkleTree()
+        tree.update([{"address": address(i), "score": i} for i in range(5)], epoch=1)
+        root = tree.root
+
+        undo = tree.update([
+            {"address": address(2), "score": 99},
+            {"address": address(7), "score": 1},
+            {"address": address(2), "score": 98},
+        ], epoch=2)
+        tree.revert(undo)
+
+        assert tree.root == root
+        assert len(tree) == 5
+        assert tree.get(address(2)) == (2, 1)
+        assert tree.get(address(7)) is None
+
+    def test_proofs_verify_for_every_leaf(self):
+        tree = MerkleTree()
+        tree.update([{"address": address(i), "score": i * 3} for i in range(11)], epoch=4)
+
+        for i in range(11):
+            score, epoch = tree.get(address(i))
+            leaf = leaf_hash(bytes.fromhex(address(i)[2:]), score, epoch)
+            assert verify_proof(tree.proof(address(i)), tree.root, leaf)
+
+    def test_proof_rejects_wrong_score(self):
+        tree = MerkleTree()
+        tree.update([{"address": address(i), "score": i} for i in range(4)], epoch=1)
+
+        leaf = leaf_hash(bytes.fromhex(address(2)[2:]), 3, 1)
+        assert not verify_proof(tree.proof(address(2)), tree.root, leaf)
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        tree = MerkleTree()
+        tree.update([{"address": address(i), "score": 2 ** 40 + i} for i in range(9)], epoch=3)
+        tree.epoch = 3
+        path = str(tmp_path / "tree.bin")
+
+        tree.save(path)
+        loaded = MerkleTree.load(path)
+
+        assert loaded.root == tree.root
+        assert loaded.epoch == 3
+        assert loaded.get(address(4)) == (2 ** 40 + 4, 3)
+        assert loaded.proof(address(8)) == tree.proof(address(8))
+
+    def test_load_rejects_other_files(self, tmp_path):
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"\x00" * 64)
+
+        with pytest.raises(ValueError):
+            MerkleTree.load(str(path))
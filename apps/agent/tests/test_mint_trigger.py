@@ -0,0 +1,162 @@
+"""
+Tests for the continuous-mode mint trigger
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+from mint_trigger import MintTrigger, MicroBatchPolicy, MINT_CHANNEL
+
+
+class TestMicroBatchPolicy:
+    """Tests for debounce / latency policy"""
+
+    def test_not_ready_when_empty(self):
+        policy = MicroBatchPolicy()
+        assert policy.ready(1000) is False
+
+    def test_fires_after_debounce_once_batch_is_big_enough(self):
+        policy = MicroBatchPolicy(min_batch_size=3, max_latency_seconds=60, debounce_seconds=2)
+        policy.add(3, now=100)
+
+        assert policy.ready(101) is False
+        assert policy.ready(102) is True
+
+    def test_small_batch_waits_for_max_latency(self):
+        policy = MicroBatchPolicy(min_batch_size=10, max_latency_seconds=30, debounce_seconds=2)
+        policy.add(1, now=100)
+
+        assert policy.ready(120) is False
+        assert policy.ready(130) is True
+
+    def test_burst_keeps_debouncing(self):
+        policy = MicroBatchPolicy(min_batch_size=2, max_latency_seconds=60, debounce_seconds=2)
+        policy.add(5, now=100)
+        policy.add(5, now=101.5)
+
+        assert policy.ready(102) is False
+        assert policy.ready(103.5) is True
+
+    def test_reset(self):
+        policy = MicroBatchPolicy(min_batch_size=1, debounce_seconds=0)
+        policy.add(1, now=100)
+        policy.reset()
+        assert policy.ready(200) is False
+
+
+class TestMintTrigger:
+    """Tests for collecting minters into micro-batches"""
+
+    def test_rejects_unknown_mode(self):
+        with pytest.raises(ValueError):
+            MintTrigger(Mock(), MicroBatchPolicy(), mode="carrier-pigeon")
+
+    def test_notify_mode_listens_on_channel(self):
+        db = Mock()
+        trigger = MintTrigger(db, MicroBatchPolicy(), mode="notify")
+
+        trigger.start()
+
+        db.listen.assert_called_once_with(MINT_CHANNEL)
+
+    def test_notify_mode_releases_minters_when_ready(self):
+        db = Mock()
+        db.poll_notifications.side_effect = [{"0xa", "0xb"}, {"0xb", "0xc"}]
+        policy = MicroBatchPolicy(min_batch_size=3, max_latency_seconds=60, debounce_seconds=0)
+        trigger = MintTrigger(db, policy, mode="notify")
+        trigger.start()
+
+        with patch("time.monotonic", return_value=100):
+            assert trigger.wait() is None
+        with patch("time.monotonic", return_value=101):
+            assert trigger.wait() == {"0xa", "0xb", "0xc"}
+        assert trigger.minters == set()
+
+    def test_poll_mode_advances_watermark(self):
+        db = Mock()
+        db.get_mint_watermark.return_value = 500
+        db.get_mints_since.side_effect = [
+            [{"id": "m0", "minter": "0xold", "minted_at": 450}],
+            [{"id": "m0", "minter": "0xold", "minted_at": 450}, {"id": "m1", "minter": "0xa", "minted_at": 700}],
+        ]
+        policy = MicroBatchPolicy(min_batch_size=1, debounce_seconds=0)
+        trigger = MintTrigger(db, policy, mode="poll", poll_interval_seconds=0, overlap_seconds=100)
+        trigger.start()
+
+        assert trigger.wait() == {"0xa"}
+        assert db.get_mints_since.call_args_list[1].args == (400,)
+        assert trigger.watermark == 700
+
+    def test_poll_mode_picks_up_late_insert_behind_watermark(self):
+        # m2 is indexed after m1 although it was minted earlier (lagging chain)
+        db = Mock()
+        db.get_mint_watermark.return_value = 1000
+        db.get_mints_since.side_effect = [
+            [{"id": "m1", "minter": "0xa", "minted_at": 1000}],
+            [{"id": "m1", "minter": "0xa", "minted_at": 1000}, {"id": "m2", "minter": "0xlate", "minted_at": 950}],
+            [{"id": "m1", "minter": "0xa", "minted_at": 1000}, {"id": "m2", "minter": "0xlate", "minted_at": 950}],
+        ]
+        policy = MicroBatchPolicy(min_batch_size=1, debounce_seconds=0)
+        trigger = MintTrigger(db, policy, mode="poll", poll_interval_seconds=0, overlap_seconds=100)
+        trigger.start()
+
+        assert trigger.wait() == {"0xlate"}
+        assert trigger.wait() is None
+        assert trigger.watermark == 1000
+
+    def test_poll_mode_forgets_ids_behind_overlap(self):
+        db = Mock()
+        db.get_mint_watermark.return_value = 0
+        db.get_mints_since.side_effect = [
+            [{"id": "m1", "minter": "0xa", "minted_at": 100}],
+            [{"id": "m2", "minter": "0xb", "minted_at": 500}],
+        ]
+        trigger = MintTrigger(db, MicroBatchPolicy(), mode="poll", poll_interval_seconds=0, overlap_seconds=100)
+        trigger.start()
+        trigger.wait()
+
+        assert trigger.seen == {"m2": 500}
+
+    def test_dropped_listen_connection_reconnects_and_catches_up(self):
+        db = Mock()
+        first, second = Mock(), Mock()
+        db.listen.side_effect = [first, RuntimeError("refused"), second]
+        db.poll_notifications.side_effect = [RuntimeError("server closed the connection")]
+        db.get_mints_since.return_value = [{"id": "m1", "minter": "0xa", "minted_at": 990}]
+        policy = MicroBatchPolicy(min_batch_size=1, debounce_seconds=0)
+        trigger = MintTrigger(db, policy, mode="notify", overlap_seconds=100, reconnect_backoff_seconds=5)
+        trigger.start()
+
+        with patch("time.time", return_value=1000), patch("time.monotonic", return_value=100):
+            assert trigger.wait() is None
+        first.close.assert_called_once()
+        assert trigger.connection is None
+
+        with patch("time.monotonic", return_value=100):
+            assert trigger.wait() is None
+        assert trigger._reconnect_at == 105
+
+        with patch("time.monotonic", return_value=105):
+            assert trigger.wait() == {"0xa"}
+        assert trigger.connection is second
+        db.get_mints_since.assert_called_once_with(900)
+
+    def test_reconnect_waits_for_backoff(self):
+        db = Mock()
+        trigger = MintTrigger(db, MicroBatchPolicy(), mode="notify")
+        trigger._reconnect_at = 200
+
+        with patch("time.monotonic", return_value=199), patch("time.sleep") as sleep:
+            assert trigger.wait(timeout=5) is None
+
+        sleep.assert_called_once_with(1)
+        db.listen.assert_not_called()
+
+    def test_stop_closes_connection(self):
+        db = Mock()
+        trigger = MintTrigger(db, MicroBatchPolicy(), mode="notify")
+        trigger.start()
+        connection = trigger.connection
+
+        trigger.stop()
+
+        connection.close.assert_called_once()
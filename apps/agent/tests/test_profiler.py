@@ -0,0 +1,148 @@
+"""
+Tests for the per-cycle profiler
+"""
+
+import json
+import os
+import time
+import pytest
+from sqlalchemy import create_engine, text
+from profiler import (
+    CycleProfiler,
+    QueryRecorder,
+    StackSampler,
+    diff_profiles,
+    normalize_statement,
+    summarize_stacks,
+)
+
+
+def busy_work(seconds):
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(100))
+    return total
+
+
+@pytest.fixture
+def engine():
+    return create_engine("sqlite://")
+
+
+class TestSampling:
+    """Tests for stack sampling and summaries"""
+
+    def test_samples_the_running_function(self):
+        import threading
+
+        sampler = StackSampler(threading.get_ident(), interval_seconds=0.001)
+        sampler.start()
+        busy_work(0.1)
+        sampler.stop()
+
+        assert sampler.samples > 0
+        assert any("busy_work" in stack for stack in sampler.stacks)
+
+    def test_summary_counts_self_and_total(self):
+        functions = summarize_stacks({"main;a;b": 3, "main;a": 1})
+        by_name = {f["function"]: f for f in functions}
+
+        assert by_name["main"] == {"function": "main", "self": 0, "total": 4}
+        assert by_name["a"]["self"] == 1
+        assert by_name["b"]["total"] == 3
+
+    def test_recursive_frames_count_once(self):
+        functions = summarize_stacks({"f;f;f": 2})
+        assert functions == [{"function": "f", "self": 2, "total": 2}]
+
+
+class TestQueryRecorder:
+    """Tests for SQL statement timing"""
+
+    def test_records_statements_while_attached(self, engine):
+        recorder = QueryRecorder([engine])
+        recorder.attach()
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT   1"))
+        recorder.detach()
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 2"))
+
+        assert recorder.queries["SELECT 1"]["count"] == 2
+        assert "SELECT 2" not in recorder.queries
+
+    def test_failed_explain_is_reported(self, engine):
+        recorder = QueryRecorder([engine], slow_query_ms=0)
+        recorder.attach()
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        recorder.detach()
+
+        explained = recorder.explain_slow()
+
+        assert explained[0]["statement"] == "SELECT 1"
+        assert "error" in explained[0]["plan"]
+
+    def test_writes_are_not_explained(self, engine):
+        recorder = QueryRecorder([engine], slow_query_ms=0)
+        recorder.attach()
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (x INTEGER)"))
+        recorder.detach()
+
+        assert recorder.explain_slow()[0]["plan"] == {"skipped": "not a read"}
+
+    def test_normalize_statement(self):
+        assert normalize_statement("\n  SELECT *\n    FROM account ") == "SELECT * FROM account"
+
+
+class TestCycleProfiler:
+    """Tests for profile artifacts"""
+
+    def test_writes_profile_and_folded_stacks(self, engine, tmp_path):
+        profiler = CycleProfiler(str(tmp_path), [engine, None], interval_seconds=0.001, always=True)
+
+        with profiler.profile():
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            busy_work(0.05)
+
+        (run,) = os.listdir(tmp_path)
+        with open(tmp_path / run / "profile.json") as f:
+            profile = json.load(f)
+        assert profile["query_count"] == 1
+        assert profile["samples"] > 0
+        assert (tmp_path / run / "stacks.folded").read_text().strip()
+
+    def test_signal_mode_profiles_one_cycle(self, tmp_path):
+        profiler = CycleProfiler(str(tmp_path), [])
+        assert not profiler.should_profile()
+
+        profiler.arm()
+        assert profiler.should_profile()
+        with profiler.profile():
+            pass
+        assert not profiler.should_profile()
+
+
+class TestDiff:
+    """Tests for comparing two profiles"""
+
+    def test_largest_changes_first(self):
+        old = {
+            "duration_seconds": 2.0, "query_ms": 100.0, "samples": 100,
+            "functions": [{"function": "score", "self": 50, "total": 50}, {"function": "io", "self": 10, "total": 10}],
+            "queries": [{"statement": "SELECT a", "total_ms": 80.0}],
+        }
+        new = {
+            "duration_seconds": 1.0, "query_ms": 300.0, "samples": 100,
+            "functions": [{"function": "score", "self": 10, "total": 10}, {"function": "io", "self": 12, "total": 12}],
+            "queries": [{"statement": "SELECT a", "total_ms": 80.0}, {"statement": "SELECT b", "total_ms": 220.0}],
+        }
+
+        result = diff_profiles(old, new)
+
+        assert result["functions"][0] == {"function": "score", "old": 0.5, "new": 0.1}
+        assert result["queries"][0] == {"statement": "SELECT b", "old_ms": 0.0, "new_ms": 220.0}
@@ -0,0 +1,205 @@
+"""
+Tests for RpcClient
+"""
+
+import json
+import httpx
+import pytest
+from rpc_client import RpcClient, RpcError
+
+
+def make_client(handler):
+    return RpcClient(
+        "http://rpc.test",
+        client=httpx.Client(transport=httpx.MockTransport(handler))
+    )
+
+
+class TestBatch:
+    """Tests for batched JSON-RPC requests"""
+
+    def test_batch_sends_one_request(self):
+        requests = []
+
+        def handler(request):
+            payload = json.loads(request.content)
+            requests.append(payload)
+            return httpx.Response(200, json=[
+                {"jsonrpc": "2.0", "id": item["id"], "result": item["method"]}
+                for item in payload
+            ])
+
+        rpc = make_client(handler)
+        results = rpc.batch([("eth_blockNumber", []), ("eth_chainId", [])])
+
+        assert len(requests) == 1
+        assert results == ["eth_blockNumber", "eth_chainId"]
+
+    def test_batch_matches_out_of_order_responses(self):
+        def handler(request):
+            payload = json.loads(request.content)
+            return httpx.Response(200, json=[
+                {"jsonrpc": "2.0", "id": item["id"], "result": item["params"][0]}
+                for item in reversed(payload)
+            ])
+
+        rpc = make_client(handler)
+        results = rpc.batch([("eth_getBalance", ["a"]), ("eth_getBalance", ["b"])])
+
+        assert results == ["a", "b"]
+
+    def test_batch_returns_per_call_errors(self):
+        def handler(request):
+            payload = json.loads(request.content)
+            return httpx.Response(200, json=[
+                {"jsonrpc": "2.0", "id": payload[0]["id"], "result": "0x1"},
+                {"jsonrpc": "2.0", "id": payload[1]["id"], "error": {"code": -32000, "message": "boom"}},
+            ])
+
+        rpc = make_client(handler)
+        results = rpc.batch([("eth_blockNumber", []), ("eth_call", [])])
+
+        assert results[0] == "0x1"
+        assert isinstance(results[1], RpcError)
+        assert results[1].code == -32000
+
+    def test_empty_batch_makes_no_request(self):
+        rpc = make_client(lambda request: pytest.fail("unexpected request"))
+        assert rpc.batch([]) == []
+
+
+class TestCall:
+    """Tests for single calls"""
+
+    def test_call_raises_on_error(self):
+        def handler(request):
+            payload = json.loads(request.content)
+            return httpx.Response(200, json=[
+                {"jsonrpc": "2.0", "id": payload[0]["id"], "error": {"message": "nope"}}
+            ])
+
+        with pytest.raises(RpcError):
+            make_client(handler).call("eth_blockNumber")
+
+    def test_transport_failure_raises(self):
+        rpc = make_client(lambda request: httpx.Response(503))
+        with pytest.raises(RpcError):
+            rpc.call("eth_blockNumber")
+
+
+def counting_handler(counter, result="0x10"):
+    def handler(request):
+        payload = json.loads(request.content)
+        counter.append(len(payload))
+        return httpx.Response(200, json=[
+            {"jsonrpc": "2.0", "id": item["id"], "result": result}
+            for item in payload
+        ])
+    return handler
+
+
+class TestCaching:
+    """Tests for short-TTL read caching"""
+
+    def test_cacheable_reads_served_from_cache(self):
+        sent = []
+        rpc = make_client(counting_handler(sent))
+
+        assert rpc.call("eth_gasPrice") == "0x10"
+        assert rpc.call("eth_gasPrice") == "0x10"
+
+        assert len(sent) == 1
+        assert rpc.stats["cache_hits"] == 1
+
+    def test_cache_keyed_by_params(self):
+        sent = []
+        rpc = make_client(counting_handler(sent))
+
+        rpc.call("eth_getBalance", ["0xa", "latest"])
+        rpc.call("eth_getBalance", ["0xb", "latest"])
+
+        assert len(sent) == 2
+
+    def test_non_cacheable_calls_always_sent(self):
+        sent = []
+        rpc = make_client(counting_handler(sent))
+
+        rpc.call("eth_getTransactionReceipt", ["0x1"])
+        rpc.call("eth_getTransactionReceipt", ["0x1"])
+
+        assert len(sent) == 2
+
+    def test_invalidate_method(self):
+        sent = []
+        rpc = make_client(counting_handler(sent))
+
+        rpc.call("eth_getTransactionCount", ["0xa", "pending"])
+        rpc.invalidate("eth_getTransactionCount")
+        rpc.call("eth_getTransactionCount", ["0xa", "pending"])
+
+        assert len(sent) == 2
+
+    def test_expired_entries_refetched(self):
+        sent = []
+        rpc = make_client(counting_handler(sent))
+        rpc.cache_ttls = {"eth_blockNumber": 0.0}
+
+        rpc.call("eth_blockNumber")
+        rpc.call("eth_blockNumber")
+
+        assert len(sent) == 2
+
+    def test_errors_not_cached(self):
+        calls = []
+
+        def handler(request):
+            payload = json.loads(request.content)
+            calls.append(payload)
+            return httpx.Response(200, json=[
+                {"jsonrpc": "2.0", "id": payload[0]["id"], "error": {"message": "busy"}}
+            ])
+
+        rpc = make_client(handler)
+        for _ in range(2):
+            with pytest.raises(RpcError):
+                rpc.call("eth_gasPrice")
+
+        assert len(calls) == 2
+
+
+class TestCoalescing:
+    """Tests for request coalescing"""
+
+    def test_duplicate_reads_in_one_batch_sent_once(self):
+        sent = []
+        rpc = make_client(counting_handler(sent))
+
+        results = rpc.batch([("eth_gasPrice", []), ("eth_gasPrice", [])])
+
+        assert results == ["0x10", "0x10"]
+        assert sent == [1]
+
+    def test_concurrent_reads_share_one_request(self):
+        import threading
+
+        sent = []
+        release = threading.Event()
+
+        def handler(request):
+            release.wait(2)
+            return counting_handler(sent)(request)
+
+        rpc = make_client(handler)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(rpc.call("eth_blockNumber")))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        release.set()
+        for t in threads:
+            t.join()
+
+        assert results == ["0x10"] * 5
+        assert sum(sent) == 1
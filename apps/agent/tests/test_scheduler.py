@@ -0,0 +1,130 @@
+"""
+Tests for PriorityScheduler
+"""
+
+import pytest
+from score_calculator import ScoreCalculator
+from scheduler import PriorityScheduler
+
+NOW = 1700000000
+
+
+@pytest.fixture
+def scheduler():
+    return PriorityScheduler(
+        ScoreCalculator(),
+        badge_threshold=1000,
+        max_wait_seconds=24 * 3600,
+        fairness_share=0.0
+    )
+
+
+def account(id, last_updated_ago=7200, score=0, mints=0, early=0, first_tx=None):
+    return {
+        "id": id,
+        "total_score": score,
+        "last_updated": NOW - last_updated_ago,
+        "first_tx_timestamp": first_tx,
+        "new_mint_quantity": mints,
+        "new_early_quantity": early,
+    }
+
+
+class TestExpectedDelta:
+    """Tests for score-delta estimation"""
+
+    def test_mints_and_early_mints(self, scheduler):
+        assert scheduler.expected_delta(account("0xa", mints=3, early=2), NOW) == 30 + 200
+
+    def test_tenure_accrues_while_idle(self, scheduler):
+        a = account("0xa", last_updated_ago=3 * 86400, first_tx=NOW - 100 * 86400)
+        assert scheduler.expected_delta(a, NOW) == 3
+
+    def test_no_tenure_without_first_tx(self, scheduler):
+        assert scheduler.expected_delta(account("0xa", last_updated_ago=3 * 86400), NOW) == 0
+
+
+class TestThresholdProximity:
+    """Tests for tier/badge boundary proximity"""
+
+    def test_crossing_boundary(self, scheduler):
+        assert scheduler.threshold_proximity(90, 20) == 1.0
+
+    def test_just_below_boundary(self, scheduler):
+        assert 0 < scheduler.threshold_proximity(450, 0) < 0.5
+
+    def test_far_from_boundary(self, scheduler):
+        assert scheduler.threshold_proximity(200, 0) == 0.0
+
+    def test_above_all_boundaries(self, scheduler):
+        assert scheduler.threshold_proximity(5000, 10) == 0.0
+
+
+class TestSelect:
+    """Tests for batch selection"""
+
+    def test_active_early_minter_beats_idle_accounts(self, scheduler):
+        idle = [account(f"0x{i}", last_updated_ago=20 * 3600) for i in range(10)]
+        busy = account("0xbusy", last_updated_ago=600, early=100)
+
+        selected = scheduler.select(idle + [busy], limit=1, now=NOW)
+
+        assert [a["id"] for a in selected] == ["0xbusy"]
+
+    def test_boundary_crossing_prioritised(self, scheduler):
+        near = account("0xnear", score=95, mints=1)
+        far = account("0xfar", score=200, mints=1)
+
+        selected = scheduler.select([far, near], limit=1, now=NOW)
+
+        assert selected[0]["id"] == "0xnear"
+
+    def test_overdue_accounts_always_selected(self, scheduler):
+        overdue = account("0xold", last_updated_ago=48 * 3600)
+        busy = [account(f"0xb{i}", early=50) for i in range(5)]
+
+        selected = scheduler.select(busy + [overdue], limit=2, now=NOW)
+
+        assert selected[0]["id"] == "0xold"
+        assert len(selected) == 2
+
+    def test_fairness_share_reserves_stalest(self):
+        scheduler = PriorityScheduler(ScoreCalculator(), badge_threshold=1000, fairness_share=0.5)
+        stale = [account(f"0xs{i}", last_updated_ago=10 * 3600 + i) for i in range(4)]
+        busy = [account(f"0xb{i}", last_updated_ago=600, early=10) for i in range(4)]
+
+        selected = scheduler.select(busy + stale, limit=4, now=NOW)
+        ids = [a["id"] for a in selected]
+
+        assert ids[:2] == ["0xs3", "0xs2"]
+        assert set(ids[2:]) <= {a["id"] for a in busy}
+
+    def test_limit_and_empty_input(self, scheduler):
+        assert scheduler.select([], limit=5, now=NOW) == []
+        assert scheduler.select([account("0xa")], limit=0, now=NOW) == []
+        assert len(scheduler.select([account("0xa"), account("0xb")], limit=5, now=NOW)) == 2
+
+
+class TestReanchors:
+    """Tests for scheduled decay re-anchors"""
+
+    def test_due_in_time_order(self, scheduler):
+        scheduler.schedule_reanchor("0xb", NOW + 20)
+        scheduler.schedule_reanchor("0xa", NOW + 10)
+
+        assert scheduler.due_reanchors(NOW) == []
+        assert scheduler.due_reanchors(NOW + 30) == ["0xa", "0xb"]
+        assert scheduler.due_reanchors(NOW + 30) == []
+
+    def test_rescheduling_supersedes(self, scheduler):
+        scheduler.schedule_reanchor("0xa", NOW + 10)
+        scheduler.schedule_reanchor("0xa", NOW + 100)
+
+        assert scheduler.due_reanchors(NOW + 50) == []
+        assert scheduler.due_reanchors(NOW + 100) == ["0xa"]
+
+    def test_none_cancels(self, scheduler):
+        scheduler.schedule_reanchor("0xa", NOW + 10)
+        scheduler.schedule_reanchor("0xa", None)
+
+        assert scheduler.due_reanchors(NOW + 50) == []
@@ -328,3 +328,94 @@ class TestScoreBreakdown:
             assert breakdown["breakdown"]["zora_mints"]["count"] == 2
             assert breakdown["breakdown"]["zora_mints"]["early_mints"] == 1
             assert breakdown["breakdown"]["timeliness"]["score"] == 100
+
+    def test_score_breakdown_includes_linked_wallets(self, calculator):
+        with patch('time.time', return_value=1700000000):
+            linked_wallets = [
+                {
+                    "first_tx_timestamp": 1700000000 - (86400 * 50),
+                    "zora_mint_count": 3,
+                    "early_mint_count": 1,
+                }
+            ]
+            kwargs = dict(
+                account_id="0x123",
+                mints=[{"quantity": 2}],
+                first_tx_timestamp=1700000000 - (86400 * 10),
+                linked_wallets=linked_wallets
+            )
+            breakdown = calculator.calculate_score_breakdown(**kwargs)
+            total = calculator.calculate_total_score(**kwargs)
+
+            # 10 + 50 (tenure) + 50 (5 mints) + 100 (1 early) = 210
+            assert breakdown["total_score"] == total == 210
+            assert breakdown["breakdown"]["base_tenure"]["days"] == 10
+            assert breakdown["breakdown"]["zora_mints"]["count"] == 5
+            assert breakdown["breakdown"]["timeliness"]["early_adopter_count"] == 1
+            assert breakdown["breakdown"]["linked_wallets"]["count"] == 1
+
+
+class TestBulkBreakdowns:
+    """Tests for scoring many accounts at once"""
+
+    def test_breakdowns_keyed_by_account(self, calculator):
+        accounts = [
+            {"id": "0xa", "first_tx_timestamp": 1700000000 - 86400 * 5},
+            {"id": "0xb", "first_tx_timestamp": None},
+        ]
+        mints = {
+            "0xa": [{"minted_at": 1000, "collection_deployed_at": 500, "quantity": 1}],
+            "0xb": [{"quantity": 3}],
+        }
+        linked = {"0xb": [{"zora_mint_count": 1, "early_mint_count": 0}]}
+
+        breakdowns = calculator.calculate_breakdowns(accounts, mints, linked, now=1700000000)
+
+        assert breakdowns["0xa"]["total_score"] == 5 + 10 + 100
+        assert breakdowns["0xb"]["total_score"] == 40
+
+    def test_bulk_matches_single_account_scoring(self, calculator):
+        with patch('time.time', return_value=1700000000):
+            account = {"id": "0xa", "first_tx_timestamp": 1700000000 - 86400 * 7}
+            mints = [{"is_early_mint": True, "quantity": 2}, {"quantity": 1}]
+
+            single = calculator.calculate_total_score("0xa", mints, account["first_tx_timestamp"])
+            bulk = calculator.calculate_breakdowns([account], {"0xa": mints})
+
+            assert bulk["0xa"]["total_score"] == single
+
+    def test_missing_mints_score_zero(self, calculator):
+        breakdowns = calculator.calculate_breakdowns([{"id": "0xa"}], {}, now=1700000000)
+        assert breakdowns["0xa"]["total_score"] == 0
+
+    def test_counter_totals_match_mint_rows(self, calculator):
+        account = {"id": "0xa", "first_tx_timestamp": 1700000000 - 86400 * 7}
+        mints = [{"is_early_mint": True, "quantity": 2}, {"quantity": 1}]
+        totals = {"0xa": {"mint_quantity": 3, "early_quantity": 2}}
+
+        from_rows = calculator.calculate_breakdowns([account], {"0xa": mints}, now=1700000000)
+        from_counters = calculator.calculate_breakdowns(
+            [account], {}, now=1700000000, totals_by_account=totals
+        )
+
+        assert from_counters["0xa"] == from_rows["0xa"]
+
+    def test_counter_totals_match_mint_rows_with_decay(self):
+        from unittest.mock import Mock
+        from early_mint_counters import EarlyMintCounters
+
+        calculator = ScoreCalculator(rules={"decay": {"rate": 0.1}})
+        now = 1700000000
+        account = {"id": "0xa", "first_tx_timestamp": now - 86400 * 7}
+        mints = [
+            {"id": "m1", "minter": "0xa", "minted_at": now - 400 * 86400, "is_early_mint": True, "quantity": 2},
+            {"id": "m2", "minter": "0xa", "minted_at": now - 200 * 86400, "quantity": 100},
+        ]
+        totals = EarlyMintCounters(Mock(), calculator).aggregate(mints)
+
+        from_rows = calculator.calculate_breakdowns([account], {"0xa": mints}, now=now)
+        from_counters = calculator.calculate_breakdowns([account], {}, now=now, totals_by_account=totals)
+
+        assert from_rows["0xa"]["total_score"] < from_rows["0xa"]["decay"]["value"]
+        assert from_counters["0xa"]["total_score"] == from_rows["0xa"]["total_score"]
+        assert from_counters["0xa"]["decay"] == from_rows["0xa"]["decay"]
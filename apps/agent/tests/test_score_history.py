@@ -0,0 +1,120 @@
+"""
+Tests for the historical score snapshot backfill
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+import score_history
+from score_history import (
+    address_ranges, as_of_times, job_key, chunk_key, replay_chunk, backfill_chunk, run_backfill
+)
+from score_calculator import ScoreCalculator
+
+DAY = 86400
+T0 = 1700000000 // DAY * DAY
+
+
+class TestChunking:
+    """Tests for address ranges and as-of times"""
+
+    def test_ranges_cover_address_space(self):
+        ranges = address_ranges(4)
+
+        assert ranges == [
+            (None, "0x4000"), ("0x4000", "0x8000"), ("0x8000", "0xc000"), ("0xc000", None)
+        ]
+
+    def test_single_chunk_is_unbounded(self):
+        assert address_ranges(1) == [(None, None)]
+
+    def test_times_aligned_to_interval(self):
+        assert as_of_times(T0 + 10, T0 + 3 * DAY, DAY) == [T0 + DAY, T0 + 2 * DAY, T0 + 3 * DAY]
+
+
+class TestReplayChunk:
+    """Tests for replaying scores at as-of times"""
+
+    def test_matches_calculator_at_each_time(self):
+        calculator = ScoreCalculator()
+        accounts = [{"id": "0xa", "first_tx_timestamp": T0 - 10 * DAY}]
+        mints = [
+            {"account_id": "0xa", "quantity": 1, "minted_at": T0 + 100,
+             "collection_deployed_at": T0, "is_early_mint": False},
+            {"account_id": "0xa", "quantity": 2, "minted_at": T0 + DAY + 100,
+             "collection_deployed_at": T0 - 5 * DAY, "is_early_mint": False},
+        ]
+        linked = [{"main_account_id": "0xa", "address": "0xw", "linked_at": T0 + DAY,
+                   "first_tx_timestamp": T0 - 2 * DAY}]
+        times = as_of_times(T0, T0 + 2 * DAY, DAY)
+
+        rows = replay_chunk(calculator, accounts, linked, mints, times)
+
+        assert [r[4] for r in rows] == times
+        for row_id, account_id, score, tier, as_of in rows:
+            visible = [m for m in mints if m["minted_at"] <= as_of]
+            wallets = [w for w in linked if w["linked_at"] <= as_of]
+            expected = calculator.calculate_score_breakdown(
+                "0xa", visible, accounts[0]["first_tx_timestamp"], wallets, now=as_of
+            )["total_score"]
+            assert score == expected
+            assert row_id == f"0xa-{as_of}"
+            assert tier == calculator.get_tier(score)
+
+    def test_linked_wallet_mints_count_once_linked(self):
+        calculator = ScoreCalculator()
+        accounts = [{"id": "0xa", "first_tx_timestamp": None}]
+        linked = [{"main_account_id": "0xa", "address": "0xw", "linked_at": T0 + 2 * DAY}]
+        mints = [
+            {"account_id": "0xa", "minter": "0xa", "quantity": 1, "minted_at": T0 + 10},
+            {"account_id": "0xa", "minter": "0xw", "quantity": 3, "minted_at": T0 + 20},
+        ]
+
+        rows = replay_chunk(calculator, accounts, linked, mints, [T0 + DAY, T0 + 2 * DAY])
+
+        # Minted before the link, so counted from linked_at on, in full
+        assert [r[2] for r in rows] == [10, 40]
+
+    def test_skips_times_before_account_existed(self):
+        accounts = [
+            {"id": "0xa", "first_tx_timestamp": None},
+            {"id": "0xb", "first_tx_timestamp": None},
+        ]
+        mints = [{"account_id": "0xa", "quantity": 1, "minted_at": T0 + DAY + 5}]
+
+        rows = replay_chunk(ScoreCalculator(), accounts, [], mints, [T0, T0 + DAY, T0 + 2 * DAY])
+
+        assert [(r[1], r[4]) for r in rows] == [("0xa", T0 + 2 * DAY)]
+
+
+class TestBackfill:
+    """Tests for chunk writes and resumption"""
+
+    def test_chunk_written_with_completion_marker(self):
+        db = Mock()
+        db.get_score_history_chunk.return_value = (
+            [{"id": "0x4abc", "first_tx_timestamp": T0 - DAY}], [], []
+        )
+        # One as-of time already has an indexer snapshot
+        db.insert_score_snapshots.return_value = 1
+
+        written = backfill_chunk("0x4000", "0x8000", [T0, T0 + DAY], "job", db=db, calculator=ScoreCalculator())
+
+        assert written == 1
+        (rows,) = db.insert_score_snapshots.call_args[0]
+        assert [r[0] for r in rows] == [f"0x4abc-{T0}", f"0x4abc-{T0 + DAY}"]
+        assert db.insert_score_snapshots.call_args.kwargs["state_key"] == "job:0x4000"
+        assert json.loads(db.insert_score_snapshots.call_args.kwargs["state_value"])["rows"] == 2
+
+    def test_completed_chunks_are_skipped(self):
+        db = Mock()
+        db.get_score_history_chunk.return_value = ([], [], [])
+        job = job_key(T0, T0 + DAY, DAY)
+        db.get_agent_state.return_value = {chunk_key(job, None): "{}"}
+
+        with patch.object(score_history, "ProcessPoolExecutor", ThreadPoolExecutor), \
+                patch.object(score_history, "_init_worker"), \
+                patch.dict(score_history._worker, {"db": db, "calculator": ScoreCalculator()}):
+            run_backfill(db, "postgresql://test", T0, T0 + DAY, DAY, chunks=2, workers=1)
+
+        db.get_score_history_chunk.assert_called_once_with("0x8000", None)
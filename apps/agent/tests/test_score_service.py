@@ -0,0 +1,160 @@
+"""
+Tests for the read-side score service
+"""
+
+import json
+import pytest
+import urllib.request
+import urllib.error
+from unittest.mock import Mock
+from score_service import ScoreCache, ScoreService, etag_for
+import main
+
+ALICE = "0x" + "a1" * 20
+BOB = "0x" + "b2" * 20
+
+
+def breakdown(score, tier="Novice"):
+    return {"total_score": score, "tier": tier, "breakdown": {"zora_mints": {"score": score, "count": 1}}}
+
+
+@pytest.fixture
+def service():
+    service = ScoreService(ScoreCache(max_entries=10), port=0, max_batch=3)
+    service.start()
+    yield service
+    service.stop()
+
+
+def request(service, path, body=None, headers=None):
+    req = urllib.request.Request(
+        f"http://127.0.0.1:{service.port}{path}",
+        data=json.dumps(body).encode() if body is not None else None,
+        headers={"Content-Type": "application/json", **(headers or {})}
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=5) as response:
+            return response.status, dict(response.headers), json.loads(response.read() or b"null")
+    except urllib.error.HTTPError as e:
+        raw = e.read()
+        return e.code, dict(e.headers), json.loads(raw) if raw else None
+
+
+class TestScoreCache:
+    """Tests for versioning and eviction"""
+
+    def test_unchanged_rescore_keeps_version(self):
+        cache = ScoreCache()
+        cache.put_many({ALICE: breakdown(10)})
+        version = cache.entries[ALICE]["version"]
+
+        assert cache.put_many({ALICE: breakdown(10)}) == 0
+        assert cache.entries[ALICE]["version"] == version
+        assert cache.put_many({ALICE: breakdown(11)}) == 1
+        assert cache.entries[ALICE]["version"] > version
+
+    def test_least_recently_read_is_evicted(self):
+        cache = ScoreCache(max_entries=2)
+        cache.put_many({ALICE: breakdown(1), BOB: breakdown(2)})
+        cache.get_many([ALICE])
+
+        cache.put_many({"0x" + "c3" * 20: breakdown(3)})
+
+        assert ALICE in cache.entries and BOB not in cache.entries
+        assert cache.stats["evictions"] == 1
+
+    def test_misses_are_queued_until_scored(self):
+        cache = ScoreCache()
+        cache.get_many([ALICE, BOB])
+        cache.put_many({BOB: breakdown(2)})
+
+        assert cache.take_misses(10) == [ALICE]
+        assert cache.take_misses(10) == []
+
+    def test_etag_follows_versions(self):
+        cache = ScoreCache()
+        cache.put_many({ALICE: breakdown(1)})
+        found, missing = cache.get_many([ALICE, BOB])
+        before = etag_for(found, missing)
+
+        cache.put_many({ALICE: breakdown(2)})
+        found, missing = cache.get_many([ALICE, BOB])
+
+        assert etag_for(found, missing) != before
+
+
+class TestScoreService:
+    """Tests for the HTTP endpoints"""
+
+    def test_single_account_with_etag(self, service):
+        service.cache.put_many({ALICE: breakdown(42, "Bronze")})
+
+        status, headers, body = request(service, f"/scores/{ALICE.upper().replace('0X', '0x')}")
+        assert status == 200
+        assert body["total_score"] == 42 and body["tier"] == "Bronze"
+
+        status, _, _ = request(service, f"/scores/{ALICE}", headers={"If-None-Match": headers["ETag"]})
+        assert status == 304
+
+    def test_unscored_account_is_404_and_queued(self, service):
+        status, _, _ = request(service, f"/scores/{ALICE}")
+        assert status == 404
+        assert service.cache.take_misses(10) == [ALICE]
+
+    def test_bulk_get_and_post(self, service):
+        service.cache.put_many({ALICE: breakdown(1)})
+
+        status, headers, body = request(service, f"/scores?addresses={ALICE},{BOB}")
+        assert status == 200
+        assert set(body["scores"]) == {ALICE} and body["missing"] == [BOB]
+
+        status, _, posted = request(service, "/scores", body={"addresses": [ALICE, BOB]})
+        assert posted == body
+
+        status, _, _ = request(service, "/scores", body={"addresses": [BOB, ALICE]},
+                               headers={"If-None-Match": headers["ETag"]})
+        assert status == 304
+
+    def test_bulk_limits_and_validation(self, service):
+        too_many = ["0x" + format(i, "040x") for i in range(4)]
+        assert request(service, "/scores", body={"addresses": too_many})[0] == 400
+        assert request(service, "/scores", body={"addresses": ["nope"]})[0] == 400
+        assert request(service, "/scores", body=[ALICE])[0] == 400
+
+    def test_health(self, service):
+        service.cache.put_many({ALICE: breakdown(1)})
+        status, _, body = request(service, "/health")
+        assert status == 200 and body["entries"] == 1
+
+
+class TestAgentCacheFill:
+    """Tests for the agent filling the cache"""
+
+    def test_warm_scores_requested_accounts(self):
+        agent = Mock(score_cache=ScoreCache(), batch_size=50)
+        agent._score_accounts.side_effect = lambda accounts: {a["id"]: breakdown(5) for a in accounts}
+        agent.db.get_accounts.side_effect = lambda addresses: [{"id": a} for a in addresses]
+        agent.get_score_breakdowns.side_effect = lambda addresses: main.BaseRankAgent.get_score_breakdowns(agent, addresses)
+        agent.score_cache.get_many([ALICE])
+
+        assert main.BaseRankAgent.warm_score_cache(agent) == 1
+        assert agent.score_cache.get_many([ALICE])[0][ALICE]["total_score"] == 5
+
+
+class TestLazyDecayReads:
+    """Tests for decayed scores evaluated at read time"""
+
+    def test_served_score_decays_without_rescoring(self):
+        from score_calculator import ScoreCalculator
+
+        calculator = ScoreCalculator(rules={"decay": {"rate": 0.1}})
+        cache = ScoreCache()
+        cache.put_many({ALICE: {**breakdown(600, "Silver"), "decay": {"value": 600, "reference_time": 0}}})
+        service = ScoreService(cache, port=0, calculator=calculator)
+        try:
+            entry = service.present(cache.get_many([ALICE])[0][ALICE])
+        finally:
+            service.server.server_close()
+
+        assert entry["total_score"] == 300 and entry["tier"] == "Bronze"
+        assert cache.entries[ALICE]["total_score"] == 600
@@ -0,0 +1,227 @@
+"""
+Tests for declarative scoring rules
+"""
+
+import json
+import pytest
+from scoring_rules import DEFAULT_RULES, merge_rules, load_rules, compile_rules
+from score_calculator import ScoreCalculator
+from chain_writer import encode_packed_scores
+
+
+class TestMergeRules:
+    """Tests for overlaying partial configs on the defaults"""
+
+    def test_defaults_untouched(self):
+        rules = merge_rules({"mints": {"points": 20}})
+
+        assert rules["mints"]["points"] == 20
+        assert rules["mints"]["scale"] == "linear"
+        assert DEFAULT_RULES["mints"]["points"] == 10
+
+    def test_tiers_replace_whole_table(self):
+        rules = merge_rules({"tiers": {"Top": 500, "Rest": 0}})
+        assert rules["tiers"] == {"Top": 500, "Rest": 0}
+
+    def test_unknown_section_rejected(self):
+        with pytest.raises(ValueError):
+            merge_rules({"karma": {}})
+
+    def test_unknown_key_rejected(self):
+        with pytest.raises(ValueError):
+            merge_rules({"mints": {"pointz": 1}})
+
+    def test_load_from_json(self, tmp_path):
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps({"early_mints": {"bonus": 50}}))
+
+        assert load_rules(str(path))["early_mints"]["bonus"] == 50
+
+
+class TestCompiledRules:
+    """Tests for the compiled evaluator"""
+
+    def test_caps(self):
+        rules = compile_rules({"tenure": {"max_days": 365}, "mints": {"max_count": 5}})
+
+        assert rules.tenure_points(1000) == 365
+        assert rules.mint_points(10) == 50
+
+    def test_log_scale(self):
+        rules = compile_rules({"mints": {"points": 10, "scale": "log"}})
+
+        assert rules.mint_points(0) == 0
+        assert rules.mint_points(1) == 10
+        assert rules.mint_points(7) == 30
+
+    def test_unknown_scale_rejected(self):
+        with pytest.raises(ValueError):
+            compile_rules({"mints": {"scale": "cubic"}})
+
+    def test_fractional_linear_points_stay_integers(self):
+        rules = compile_rules({"mints": {"points": 2.5}})
+
+        assert rules.mint_points(3) == 7
+        assert isinstance(rules.mint_points(3), int)
+
+    def test_zero_decay_period_rejected(self):
+        with pytest.raises(ValueError):
+            compile_rules({"decay": {"rate": 0.1, "period_days": 0}})
+        assert compile_rules({"decay": {"period_days": 0}}).decay_factor is None
+
+    def test_fractional_max_score_rejected(self):
+        with pytest.raises(ValueError):
+            compile_rules({"max_score": 99.5})
+
+    def test_decay_disabled_by_default(self):
+        assert compile_rules().decay_factor is None
+
+    def test_decay_steps_down_to_floor(self):
+        rules = compile_rules({"decay": {"rate": 0.05, "max_decay": 0.5}})
+
+        assert rules.decay_factor(10 * 86400) == 1.0
+        assert rules.decay_factor(31 * 86400) == pytest.approx(0.95)
+        assert rules.decay_factor(61 * 86400) == pytest.approx(0.90)
+        assert rules.decay_factor(5000 * 86400) == pytest.approx(0.5)
+
+    def test_tier_lookup(self):
+        rules = compile_rules()
+
+        assert rules.tier(0) == "Novice"
+        assert rules.tier(850) == "Gold"
+        assert rules.tier(999) == "Gold"
+        assert rules.tier(5000) == "BASED"
+
+
+class TestCalculatorWithRules:
+    """Tests for ScoreCalculator driven by a rule config"""
+
+    def test_default_rules_match_constants(self):
+        calculator = ScoreCalculator()
+
+        assert calculator.ZORA_MINT_POINTS == ScoreCalculator.ZORA_MINT_POINTS
+        assert calculator.TIER_THRESHOLDS == ScoreCalculator.TIER_THRESHOLDS
+
+    def test_custom_rules_change_score_and_window(self):
+        calculator = ScoreCalculator(rules={
+            "mints": {"points": 5},
+            "early_mints": {"bonus": 50, "window_seconds": 3600},
+            "max_score": 100,
+        })
+        mints = [
+            {"minted_at": 1000 + 60, "collection_deployed_at": 1000, "quantity": 1},
+            {"minted_at": 1000 + 7200, "collection_deployed_at": 1000, "quantity": 1},
+        ]
+
+        breakdown = calculator.calculate_score_breakdown("0xa", mints, now=10000)
+
+        assert breakdown["breakdown"]["zora_mints"]["score"] == 10
+        assert breakdown["breakdown"]["timeliness"]["score"] == 50
+        assert breakdown["total_score"] == 60
+        assert calculator.EARLY_MINT_WINDOW_SECONDS == 3600
+
+    def test_score_clamped_to_max(self):
+        calculator = ScoreCalculator(rules={"max_score": 100})
+
+        breakdown = calculator.calculate_score_breakdown("0xa", [{"quantity": 50}], now=10000)
+
+        assert breakdown["total_score"] == 100
+
+    def test_fractional_points_encode_on_chain(self):
+        calculator = ScoreCalculator(rules={"mints": {"points": 2.5}})
+
+        score = calculator.calculate_score_breakdown("0xa", [{"quantity": 3}], now=10000)["total_score"]
+
+        assert score == 7
+        assert encode_packed_scores([{"address": "0x" + "11" * 20, "score": score}])
+
+    def test_decay_uses_last_mint(self):
+        calculator = ScoreCalculator(rules={"decay": {"rate": 0.1}})
+        now = 1700000000
+        mints = [{"minted_at": now - 40 * 86400, "quantity": 10}]
+
+        breakdown = calculator.calculate_score_breakdown("0xa", mints, now=now)
+
+        assert breakdown["total_score"] == 90
+
+
+class TestLazyDecay:
+    """Tests for decay evaluated from (value, reference time)"""
+
+    DAY = 86400
+    NOW = 1700000000
+
+    @pytest.fixture
+    def calculator(self):
+        return ScoreCalculator(rules={"decay": {"rate": 0.1, "grace_days": 30, "period_days": 30, "max_decay": 0.5}})
+
+    # Scored from mint rows, or from early-mint counters (EARLY_MINT_COUNTERS)
+    @pytest.fixture(params=["rows", "counters"])
+    def source(self, request):
+        return request.param
+
+    @pytest.fixture
+    def score(self, calculator, source):
+        def breakdown(mints, last_minted_ago=0):
+            minted_at = self.NOW - last_minted_ago
+            if source == "rows":
+                return calculator.calculate_score_breakdown(
+                    "0xa", [{"minted_at": minted_at, "quantity": mints}], now=self.NOW
+                )
+            totals = {"0xa": {"mint_quantity": mints, "early_quantity": 0, "last_minted_at": minted_at}}
+            return calculator.calculate_breakdowns(
+                [{"id": "0xa", "first_tx_timestamp": None}], {}, now=self.NOW, totals_by_account=totals
+            )["0xa"]
+        return breakdown
+
+    def test_breakdown_carries_value_and_reference(self, calculator, score):
+        breakdown = score(60, last_minted_ago=40 * self.DAY)
+
+        assert breakdown["decay"] == {"value": 600, "reference_time": self.NOW - 40 * self.DAY}
+        assert breakdown["total_score"] == 540
+
+    def test_score_as_of_matches_rescoring_later(self, calculator, score):
+        breakdown = score(60)
+        later = self.NOW + 75 * self.DAY
+
+        rescored = calculator.calculate_score_breakdown(
+            "0xa", [{"minted_at": self.NOW, "quantity": 60}], now=later
+        )
+        assert calculator.score_as_of(breakdown, later) == rescored["total_score"] == 480
+
+    def test_decayed_score_waits_for_threshold(self, calculator, score):
+        decayed = score(60, last_minted_ago=40 * self.DAY)
+
+        assert decayed["total_score"] == 540
+        assert not calculator.needs_write(decayed, 600, write_threshold=100)
+        assert calculator.needs_write(decayed, 600, write_threshold=50)
+
+    def test_small_decay_drop_is_not_written(self, calculator):
+        assert not calculator.needs_write({"total_score": 540}, 600, write_threshold=100)
+        assert calculator.needs_write({"total_score": 480}, 600, write_threshold=100)
+        assert calculator.needs_write({"total_score": 650}, 600, write_threshold=100)
+        assert calculator.needs_write({"total_score": 540}, 600, write_threshold=50)
+
+    def test_drops_always_written_without_decay(self):
+        assert ScoreCalculator().needs_write({"total_score": 599}, 600, write_threshold=100)
+
+    def test_reanchor_at_first_tier_crossing(self, calculator, score):
+        breakdown = score(60)
+
+        at = calculator.next_reanchor_time(breakdown, 600, self.NOW, write_threshold=200)
+
+        assert at == self.NOW + 60 * self.DAY
+        assert calculator.score_as_of(breakdown, at - 1) == 540
+        assert calculator.score_as_of(breakdown, at) == 480
+
+    def test_reanchor_after_now_only(self, calculator, score):
+        breakdown = score(100, last_minted_ago=45 * self.DAY)
+
+        at = calculator.next_reanchor_time(breakdown, 900, self.NOW, write_threshold=50)
+
+        assert at == self.NOW + 15 * self.DAY
+
+    def test_no_reanchor_when_floor_stays_in_tier(self, calculator, score):
+        breakdown = score(2)
+        assert calculator.next_reanchor_time(breakdown, 20, self.NOW, write_threshold=50) is None
+        assert ScoreCalculator().next_reanchor_time(breakdown, 20, self.NOW) is None
@@ -0,0 +1,254 @@
+"""
+Tests for SignerPool and LocalSigner
+"""
+
+import time
+import threading
+import pytest
+from decimal import Decimal
+from unittest.mock import Mock
+from signer_pool import SignerPool, LocalSigner
+from chain_writer import ChainWriter
+
+# anvil's first two prefunded development keys
+DEV_KEYS = [
+    "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80",
+    "0x59c6995e998f97a5a0044966f0945389dc9e86dae88c7a8412f4603b6b78690d",
+]
+
+
+class FakeSigner:
+    def __init__(self, name, delay=0.0, error=None):
+        self.address = "0x" + name * 20
+        self.delay = delay
+        self.error = error
+        self.sent = []
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def send(self, call):
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        with self._lock:
+            self._count += 1
+            self.sent.append(call)
+            return f"0x{self.address[2:6]}{self._count}"
+
+
+def make_updates(n):
+    return [{"address": "0x" + format(i + 1, "040x"), "score": i} for i in range(n)]
+
+
+def echo(updates):
+    return {"updates": updates}
+
+
+class TestRouting:
+    """Tests for assigning accounts to signers"""
+
+    def test_every_update_lands_in_one_batch(self):
+        pool = SignerPool([FakeSigner("aa"), FakeSigner("bb"), FakeSigner("cc")])
+        batches = pool.partition(make_updates(300))
+
+        assert sum(len(b["updates"]) for b in batches) == 300
+        assert len(batches) == 3
+
+    def test_routing_is_stable(self):
+        pool = SignerPool([FakeSigner("aa"), FakeSigner("bb")])
+        assert [pool.route(u["address"]) for u in make_updates(50)] == \
+               [pool.route(u["address"]) for u in make_updates(50)]
+
+    def test_benched_signer_only_moves_its_accounts(self):
+        pool = SignerPool([FakeSigner("aa"), FakeSigner("bb"), FakeSigner("cc")])
+        before = {u["address"]: pool.route(u["address"]) for u in make_updates(200)}
+
+        pool.stats[1]["benched_until"] = time.monotonic() + 60
+        after = {address: pool.route(address) for address in before}
+
+        moved = [a for a in before if before[a] != after[a]]
+        assert moved and all(before[a] == 1 for a in moved)
+        assert 1 not in after.values()
+
+    def test_underfunded_signer_gets_nothing(self):
+        pool = SignerPool([FakeSigner("aa"), FakeSigner("bb")], min_balance_wei=10 ** 15)
+        balances = {"0x" + "aa" * 20: Decimal("0.0001"), "0x" + "bb" * 20: Decimal("1")}
+
+        pool.refresh_balances(balances.get)
+
+        assert {pool.route(u["address"]) for u in make_updates(50)} == {1}
+
+    def test_slow_signer_gets_fewer_accounts(self):
+        pool = SignerPool([FakeSigner("aa"), FakeSigner("bb")])
+        pool.stats[0]["latency"] = 9.0
+
+        routes = [pool.route(u["address"]) for u in make_updates(400)]
+        assert routes.count(0) < routes.count(1) / 3
+
+    def test_no_signer_available(self):
+        pool = SignerPool([FakeSigner("aa")])
+        pool.stats[0]["benched_until"] = time.monotonic() + 60
+
+        with pytest.raises(RuntimeError):
+            pool.partition(make_updates(1))
+
+
+class TestSending:
+    """Tests for concurrent sends and failover"""
+
+    def test_batches_go_out_in_parallel(self):
+        signers = [FakeSigner(name, delay=0.2) for name in ("aa", "bb", "cc", "dd")]
+        pool = SignerPool(signers)
+        batches = pool.partition(make_updates(200))
+
+        started = time.monotonic()
+        results = pool.send(batches, echo)
+
+        assert time.monotonic() - started < 0.2 * len(batches) / 2
+        assert all(isinstance(r, str) for r in results)
+
+    def test_failed_signer_is_benched_and_batch_fails_over(self):
+        broken = FakeSigner("aa", error=RuntimeError("nonce too low"))
+        healthy = FakeSigner("bb")
+        pool = SignerPool([broken, healthy])
+
+        results = pool.send([{"signer": 0, "updates": make_updates(3)}], echo)
+
+        assert results[0].startswith("0xbbbb")
+        assert healthy.sent[0]["updates"] == make_updates(3)
+        assert pool.weight(0) == 0.0
+
+    def test_stalled_signer_fails_over_when_resend_allowed(self):
+        pool = SignerPool([FakeSigner("aa", delay=1.0), FakeSigner("bb")], send_timeout_seconds=0.1)
+
+        started = time.monotonic()
+        results = pool.send([{"signer": 0, "updates": make_updates(1)}], echo, resend_on_timeout=True)
+
+        assert results[0].startswith("0xbbbb")
+        assert time.monotonic() - started < 0.8
+        assert pool.stats[0]["failures"] == 1
+
+    def test_stalled_score_write_is_awaited_not_duplicated(self):
+        slow, spare = FakeSigner("aa", delay=0.3), FakeSigner("bb")
+        pool = SignerPool([slow, spare], send_timeout_seconds=0.1)
+
+        results = pool.send([{"signer": 0, "updates": make_updates(1)}], echo)
+
+        assert results[0].startswith("0xaaaa")
+        assert spare.sent == []
+        assert pool.weight(0) == 0.0
+
+    def test_error_returned_when_every_signer_fails(self):
+        pool = SignerPool([FakeSigner("aa", error=RuntimeError("down")), FakeSigner("bb", error=RuntimeError("down"))])
+
+        results = pool.send([{"signer": 0, "updates": make_updates(1)}], echo)
+
+        assert isinstance(results[0], RuntimeError)
+
+    def test_success_records_latency(self):
+        pool = SignerPool([FakeSigner("aa")])
+        pool.send([{"signer": 0, "updates": make_updates(1)}], echo)
+        assert pool.stats[0]["latency"] is not None
+
+
+class TestLocalSigner:
+    """Tests for the locally signing devnet wallet"""
+
+    @pytest.fixture
+    def rpc(self):
+        rpc = Mock()
+        replies = {
+            "eth_getTransactionCount": "0x5",
+            "eth_estimateGas": "0x5208",
+            "eth_gasPrice": "0x3b9aca00",
+            "eth_sendRawTransaction": "0xabc",
+        }
+        rpc.call.side_effect = lambda method, params=None: replies[method]
+        return rpc
+
+    def test_signs_and_sends_with_local_nonces(self, rpc):
+        from eth_account import Account
+
+        signer = LocalSigner(DEV_KEYS[0], rpc, chain_id=31337)
+        call = {"to": "0x" + "00" * 19 + "01", "data": "0x1234"}
+
+        signer.send(call)
+        signer.send(call)
+
+        sent = [c.args[1][0] for c in rpc.call.call_args_list if c.args[0] == "eth_sendRawTransaction"]
+        assert len(sent) == 2
+        assert Account.recover_transaction(sent[1]) == signer.address
+        nonce_reads = [c for c in rpc.call.call_args_list if c.args[0] == "eth_getTransactionCount"]
+        assert len(nonce_reads) == 1
+        assert signer._nonce == 7
+
+    def test_failed_send_rereads_nonce(self, rpc):
+        signer = LocalSigner(DEV_KEYS[0], rpc, chain_id=31337)
+        rpc.call.side_effect = Exception("connection refused")
+
+        with pytest.raises(Exception):
+            signer.send({"to": "0x" + "00" * 19 + "01", "data": "0x"})
+
+        assert signer._nonce is None
+
+
+class TestPooledWriter:
+    """Tests for ChainWriter sending through a signer pool"""
+
+    @pytest.fixture
+    def writer(self):
+        writer = ChainWriter(
+            registry_address="0x" + "00" * 19 + "01",
+            rpc_url="http://rpc.test",
+            rpc=Mock(),
+            signer_keys=DEV_KEYS
+        )
+        writer.pool.signers = [FakeSigner("aa"), FakeSigner("bb")]
+        return writer
+
+    def test_pool_makes_writer_live(self, writer):
+        assert writer.is_live
+        assert len(writer.pool) == 2
+
+    def test_one_batch_per_signer(self, writer):
+        batches = writer.plan_batches(make_updates(40))
+        results = writer.send_batches(batches)
+
+        assert len(batches) == 2
+        assert all(r.startswith("0x") for r in results)
+        call = writer.pool.signers[0].sent[0]
+        assert call["method"] == "batchUpdateScores"
+        assert call["data"] == writer.encode_batch_calldata(batches[0]["updates"])
+
+    def test_single_batch_without_pool(self):
+        writer = ChainWriter(registry_address="0x" + "00" * 19 + "01", rpc_url="http://rpc.test", rpc=Mock())
+        batches = writer.plan_batches(make_updates(10))
+        assert len(batches) == 1
+        assert writer.send_batches(batches)[0].startswith("0x_simulated_tx_")
+
+    def test_slow_root_commit_is_not_resent(self, tmp_path):
+        writer = ChainWriter(
+            registry_address="0x" + "00" * 19 + "01",
+            rpc_url="http://rpc.test",
+            rpc=Mock(),
+            signer_keys=DEV_KEYS,
+            commitment_path=str(tmp_path / "scores.tree")
+        )
+        writer.pool.signers = [FakeSigner("aa", delay=0.3), FakeSigner("bb", delay=0.3)]
+        writer.pool.send_timeout_seconds = 0.1
+
+        writer.send_batches(writer.plan_batches(make_updates(3)))
+
+        sent = [call for signer in writer.pool.signers for call in signer.sent]
+        assert [call["method"] for call in sent] == ["commitScoreRoot"]
+        assert writer.commitments.epoch == 1
+
+    def test_slow_score_batch_is_not_resent(self, writer):
+        writer.pool.signers = [FakeSigner("aa", delay=0.3), FakeSigner("bb", delay=0.3)]
+        writer.pool.send_timeout_seconds = 0.1
+
+        results = writer.send_batches(writer.plan_batches(make_updates(40)))
+
+        sent = [call for signer in writer.pool.signers for call in signer.sent]
+        assert all(r.startswith("0x") for r in results)
+        assert len(sent) == len(results)
@@ -0,0 +1,141 @@
+"""
+Tests for the simulated chain backend
+"""
+
+import pytest
+from sim_chain import SimulatedChain, SimulatedSigner, decode_score_writes, run_load_test
+from chain_writer import (
+    ChainWriter,
+    encode_batch_update_scores,
+    encode_batch_update_scores_packed,
+    encode_commit_score_root,
+)
+from confirmation_tracker import ConfirmationTracker
+from rpc_client import RpcError
+
+REGISTRY = "0x" + "00" * 19 + "01"
+A = "0x" + "11" * 20
+B = "0x" + "22" * 20
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def chain(clock):
+    return SimulatedChain(block_time=2.0, seed=1, clock=clock)
+
+
+class TestDecoding:
+    """Tests for reading registry calldata"""
+
+    def test_batch_update_scores(self):
+        data = bytes.fromhex(encode_batch_update_scores([A, B], [5, 7])[2:])
+        assert decode_score_writes(data) == [(A, 5), (B, 7)]
+
+    def test_packed(self):
+        data = bytes.fromhex(encode_batch_update_scores_packed([{"address": A, "score": 9}])[2:])
+        assert decode_score_writes(data) == [(A, 9)]
+
+    def test_unknown_selector_is_rejected(self):
+        assert decode_score_writes(bytes.fromhex("deadbeef")) is None
+
+
+class TestBlocks:
+    """Tests for mining, receipts and registry state"""
+
+    def test_mined_at_next_block(self, chain, clock):
+        tx_hash = chain.submit(A, REGISTRY, encode_batch_update_scores([B], [42]))
+        assert chain.call("eth_getTransactionReceipt", [tx_hash]) is None
+        assert chain.call("eth_getTransactionByHash", [tx_hash])["blockNumber"] is None
+
+        clock.now = 2.0
+
+        receipt = chain.call("eth_getTransactionReceipt", [tx_hash])
+        assert receipt["status"] == "0x1"
+        assert receipt["blockNumber"] == "0x1"
+        assert chain.scores[B] == 42
+
+    def test_block_gas_limit_spills_to_next_block(self, clock):
+        chain = SimulatedChain(block_time=1.0, gas_limit=60000, clock=clock)
+        first = chain.submit(A, REGISTRY, encode_batch_update_scores([A], [1]))
+        second = chain.submit(A, REGISTRY, encode_batch_update_scores([B], [1]))
+
+        clock.now = 1.0
+        assert chain.call("eth_getTransactionReceipt", [first]) is not None
+        assert chain.call("eth_getTransactionReceipt", [second]) is None
+
+        clock.now = 2.0
+        assert chain.call("eth_getTransactionReceipt", [second])["blockNumber"] == "0x2"
+
+    def test_oversized_transaction_is_rejected(self, clock):
+        chain = SimulatedChain(gas_limit=50000, clock=clock)
+        with pytest.raises(RpcError):
+            chain.submit(A, REGISTRY, encode_batch_update_scores([A, B], [1, 2]))
+
+    def test_reverted_transaction_leaves_state(self, clock):
+        chain = SimulatedChain(block_time=1.0, revert_rate=1.0, clock=clock)
+        tx_hash = chain.submit(A, REGISTRY, encode_batch_update_scores([B], [42]))
+
+        clock.now = 1.0
+
+        assert chain.call("eth_getTransactionReceipt", [tx_hash])["status"] == "0x0"
+        assert B not in chain.scores
+
+    def test_dropped_transaction_is_unknown(self, clock):
+        chain = SimulatedChain(block_time=1.0, drop_rate=1.0, clock=clock)
+        tx_hash = chain.submit(A, REGISTRY, encode_batch_update_scores([B], [42]))
+
+        clock.now = 5.0
+
+        assert chain.call("eth_getTransactionByHash", [tx_hash]) is None
+        assert chain.stats["dropped"] == 1
+
+    def test_stale_root_epoch_reverts(self, chain, clock):
+        chain.submit(A, REGISTRY, encode_commit_score_root(2, b"\x01" * 32, 1))
+        stale = chain.submit(A, REGISTRY, encode_commit_score_root(2, b"\x02" * 32, 1))
+
+        clock.now = 2.0
+
+        assert chain.call("eth_getTransactionReceipt", [stale])["status"] == "0x0"
+        assert chain.score_epoch == 2
+
+    def test_gas_is_charged_to_sender(self, chain, clock):
+        chain.submit(A, REGISTRY, encode_batch_update_scores([B], [42]))
+        clock.now = 2.0
+        assert int(chain.call("eth_getBalance", [A, "latest"]), 16) < chain.initial_balance_wei
+
+
+class TestPipeline:
+    """Tests for ChainWriter and ConfirmationTracker on the simulated chain"""
+
+    def test_writer_and_tracker_settle_updates(self, chain, clock):
+        writer = ChainWriter(REGISTRY, rpc_url=None, rpc=chain, signers=[SimulatedSigner(chain, A)])
+        tracker = ConfirmationTracker(chain, confirmations=2)
+        updates = [{"address": B, "score": 77}]
+
+        tracker.track(writer.batch_update_scores(updates), updates)
+        clock.now = 4.0
+        confirmed, requeued = tracker.poll()
+
+        assert writer.is_live
+        assert [e["updates"] for e in confirmed] == [updates]
+        assert chain.scores[B] == 77
+
+    def test_load_test_confirms_everything(self):
+        chain = SimulatedChain(block_time=0.02, seed=3)
+        result = run_load_test(chain, updates=500, batch_size=50, signers=2)
+
+        assert result["confirmed"] == 500
+        assert result["chain"]["mined"] >= 10
+        assert result["updates_per_second"] > 0
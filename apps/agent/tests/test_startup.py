@@ -0,0 +1,105 @@
+"""
+Tests for lazy imports, run-once mode, the startup benchmark and cycle upkeep
+"""
+
+import os
+import sys
+import subprocess
+import pytest
+from unittest.mock import Mock, patch
+import main
+from startup_benchmark import parse_importtime
+
+AGENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestLazyImports:
+    """Heavy SDKs must not load at import time"""
+
+    def test_importing_main_skips_cdp_agentkit(self):
+        probe = subprocess.run(
+            [sys.executable, "-c", "import sys, main; print('coinbase_agentkit' in sys.modules)"],
+            cwd=AGENT_DIR, capture_output=True, text=True, check=True
+        )
+        assert probe.stdout.strip().splitlines()[-1] == "False"
+
+    def test_importing_main_skips_web3(self):
+        probe = subprocess.run(
+            [sys.executable, "-c",
+             "import sys, main; print(any(m in sys.modules for m in ('web3', 'eth_account', 'eth_hash')))"],
+            cwd=AGENT_DIR, capture_output=True, text=True, check=True
+        )
+        assert probe.stdout.strip().splitlines()[-1] == "False"
+
+    def test_signer_keys_without_chain_extra_fail_clearly(self):
+        from chain_writer import ChainWriter
+
+        with patch("chain_writer.importlib.util.find_spec", return_value=None):
+            with pytest.raises(ImportError, match=r"baserank-agent\[chain\]"):
+                ChainWriter("0xregistry", "http://rpc", signer_keys=["0x01"], signers=[])
+
+
+class TestRunOnce:
+    """Tests for the single-cycle entry point"""
+
+    def _agent(self, ok=True, pending=0):
+        agent = Mock()
+        agent.run_cycle.return_value = ok
+        agent.tracker.__len__ = Mock(return_value=pending)
+        return agent
+
+    def test_exit_code_follows_cycle_result(self):
+        with patch.object(main, "start_agent", return_value=self._agent(ok=True)):
+            assert main.run_once() == 0
+        with patch.object(main, "start_agent", return_value=self._agent(ok=False)):
+            assert main.run_once() == 1
+
+    def test_does_not_wait_for_confirmations_by_default(self):
+        agent = self._agent(pending=1)
+        with patch.object(main, "start_agent", return_value=agent), \
+                patch.dict(os.environ, {"RUN_ONCE_CONFIRM_WAIT_SECONDS": "0"}):
+            main.run_once()
+        agent.poll_confirmations.assert_not_called()
+
+    def test_main_dispatches_run_once(self):
+        with patch.object(sys, "argv", ["main.py", "run-once"]), \
+                patch.object(main, "run_once", return_value=0) as run_once:
+            try:
+                main.main()
+            except SystemExit as e:
+                assert e.code == 0
+        run_once.assert_called_once()
+
+
+class TestStartupBenchmark:
+    """Tests for -X importtime parsing"""
+
+    def test_parse_importtime_by_package(self):
+        stderr = "\n".join([
+            "import time: self [us] | cumulative | imported package",
+            "import time:       100 |        100 |     sqlalchemy.sql",
+            "import time:       500 |       2000 |   sqlalchemy",
+            "import time:        50 |         50 | json",
+        ])
+
+        assert parse_importtime(stderr) == {"sqlalchemy": 2000, "json": 50}
+
+
+class TestMintPartitionUpkeep:
+    """Partition DDL runs when the month rolls over, not every cycle"""
+
+    def test_partitions_ensured_once_per_month(self):
+        agent = Mock(mint_partitions=True, mint_partition_months_ahead=2, mint_partitions_month=None)
+        agent.db.mint_table = "zora_mint_by_month"
+        june, july = 1717200000, 1719792000  # 2024-06-01, 2024-07-01 UTC
+
+        with patch("main.time.time", return_value=june + 86400):
+            main.BaseRankAgent.advance_mint_partitions(agent)
+        with patch("main.time.time", return_value=june + 2 * 86400):
+            main.BaseRankAgent.advance_mint_partitions(agent)
+        assert agent.db.ensure_mint_partitions.call_count == 1
+
+        with patch("main.time.time", return_value=july + 60):
+            main.BaseRankAgent.advance_mint_partitions(agent)
+        assert agent.db.ensure_mint_partitions.call_count == 2
+        assert agent.mint_partitions_month == july
@@ -0,0 +1,88 @@
+"""
+Tests for UpdateBuffer
+"""
+
+import pytest
+from unittest.mock import Mock
+import main
+from update_buffer import UpdateBuffer
+from score_calculator import ScoreCalculator
+
+A = "0x" + "11" * 20
+B = "0x" + "22" * 20
+
+
+@pytest.fixture
+def buffer():
+    return UpdateBuffer(ScoreCalculator().get_tier, max_size=3, max_age_seconds=100)
+
+
+class TestCoalescing:
+    """Tests for absorbing intermediate scores"""
+
+    def test_keeps_latest_score(self, buffer):
+        buffer.add(A, 110, 100, now=0)
+        buffer.add(A, 120, 100, now=10)
+        buffer.add(A, 130, 100, now=20)
+
+        assert buffer.flush(now=20, force=True) == [{"address": A, "score": 130}]
+        assert buffer.stats["absorbed"] == 2
+
+    def test_unchanged_score_is_not_buffered(self, buffer):
+        buffer.add(A, 100, 100, now=0)
+        assert len(buffer) == 0
+
+    def test_return_to_chain_score_cancels_write(self, buffer):
+        buffer.add(A, 110, 100, now=0)
+        buffer.add(A, 100, 100, now=10)
+
+        assert A not in buffer
+        assert buffer.stats["cancelled"] == 1
+
+    def test_age_counts_from_first_change(self, buffer):
+        buffer.add(A, 110, 100, now=0)
+        buffer.add(A, 120, 100, now=90)
+        assert buffer.flush_reason(now=100) == "age"
+
+
+class TestFlushing:
+    """Tests for flush triggers"""
+
+    def test_holds_until_due(self, buffer):
+        buffer.add(A, 110, 100, now=0)
+        assert buffer.flush(now=50) == []
+        assert len(buffer) == 1
+
+    def test_size_limit(self, buffer):
+        for i in range(3):
+            buffer.add("0x" + format(i, "040x"), 110, 100, now=0)
+        assert buffer.flush_reason(now=0) == "size"
+        assert len(buffer.flush(now=0)) == 3
+        assert len(buffer) == 0
+
+    def test_tier_crossing_flushes_everything(self, buffer):
+        buffer.add(A, 110, 100, now=0)
+        buffer.add(B, 520, 450, now=0)  # Bronze -> Silver
+
+        assert buffer.flush_reason(now=0) == "tier"
+        assert {u["address"] for u in buffer.flush(now=0)} == {A, B}
+
+    def test_empty_buffer_never_flushes(self, buffer):
+        assert buffer.flush(now=10 ** 9, force=True) == []
+
+
+class TestAgentSelection:
+    """Buffered accounts keep being rescored by the agent"""
+
+    def test_buffered_accounts_stay_candidates(self, buffer):
+        buffer.add(A, 150, 100, now=0)
+        agent = Mock(buffer=buffer, rescore_first=[], batch_size=10, candidate_pool_factor=2)
+        agent.scheduler.due_reanchors.return_value = []
+        agent.tracker.in_flight_addresses.return_value = set()
+        agent.db.get_update_candidates.return_value = [{"id": A}, {"id": B}]
+        agent.scheduler.select.side_effect = lambda candidates, n: candidates[:n]
+
+        selected = main.BaseRankAgent._select_accounts(agent)
+
+        assert [a["id"] for a in selected] == [A, B]
+
@@ -0,0 +1,173 @@
+"""
+Tests for the what-if re-scoring simulator
+"""
+
+from unittest.mock import Mock
+from score_calculator import ScoreCalculator
+from scoring_rules import compile_rules
+from collection_index import CollectionIndex
+from scoring_inputs import ScoringInputs, load_inputs
+from what_if import compare, simulate, format_report
+
+NOW = 1700000000
+DAY = 86400
+
+
+def _dataset():
+    accounts = [
+        {"id": "0xA", "first_tx_timestamp": NOW - 400 * DAY, "total_score": 900},
+        {"id": "0xb", "first_tx_timestamp": None, "total_score": 0},
+        {"id": "0xc", "first_tx_timestamp": NOW - 3 * DAY, "total_score": 120},
+    ]
+    linked = [
+        {"main_account_id": "0xa", "first_tx_timestamp": NOW - 10 * DAY, "zora_mint_count": 2, "early_mint_count": 1},
+    ]
+    mints = [
+        {"account_id": "0xa", "quantity": 3, "minted_at": NOW - 50 * DAY,
+         "collection_deployed_at": NOW - 50 * DAY - 60, "is_early_mint": False},
+        {"account_id": "0xa", "quantity": 1, "minted_at": NOW - 40 * DAY,
+         "collection_deployed_at": NOW - 45 * DAY, "is_early_mint": False},
+        {"account_id": "0xc", "quantity": 2, "minted_at": NOW - DAY,
+         "contract_address": "0xcol", "collection_deployed_at": None, "is_early_mint": False},
+        {"account_id": "0xc", "quantity": 1, "minted_at": NOW - DAY,
+         "collection_deployed_at": None, "is_early_mint": True},
+    ]
+    return accounts, linked, mints
+
+
+def _inputs(index=None):
+    accounts, linked, mints = _dataset()
+    inputs = ScoringInputs()
+    for account in accounts:
+        inputs.add_account(account)
+    for wallet in linked:
+        inputs.add_linked_wallet(wallet)
+    for mint in mints:
+        inputs.add_mint(mint, index)
+    return inputs
+
+
+def _index():
+    index = CollectionIndex()
+    index.load([{"address": "0xcol", "deployed_at": NOW - DAY - 600}])
+    return index
+
+
+class TestScoreInputs:
+    """Columnar scoring must agree with ScoreCalculator"""
+
+    def _calculator_scores(self, rules, index):
+        accounts, linked, mints = _dataset()
+        calculator = ScoreCalculator(collection_index=index, rules=rules)
+        scores = []
+        for account in accounts:
+            account_id = account["id"].lower()
+            own_mints = [m for m in mints if m["account_id"] == account_id]
+            own_linked = [w for w in linked if w["main_account_id"] == account_id]
+            breakdown = calculator.calculate_score_breakdown(
+                account_id, own_mints, account["first_tx_timestamp"], own_linked, now=NOW
+            )
+            scores.append(breakdown["total_score"])
+        return scores
+
+    def test_matches_calculator_with_default_rules(self):
+        index = _index()
+        scores = ScoreCalculator().score_inputs(_inputs(index), NOW)
+        assert list(scores) == self._calculator_scores(None, index)
+
+    def test_matches_calculator_with_custom_rules(self):
+        rules = {
+            "tenure": {"max_days": 100},
+            "mints": {"scale": "log"},
+            "early_mints": {"window_seconds": 3600, "bonus": 40},
+            "decay": {"rate": 0.05},
+            "max_score": 500,
+        }
+        index = _index()
+        scores = ScoreCalculator(rules=rules).score_inputs(_inputs(index), NOW)
+        assert list(scores) == self._calculator_scores(rules, index)
+
+    def test_unknown_owners_are_skipped(self):
+        inputs = ScoringInputs()
+        inputs.add_account({"id": "0xa"})
+        assert inputs.add_mint({"account_id": "0xz", "quantity": 1}) is False
+        assert inputs.add_linked_wallet({"main_account_id": "0xz"}) is False
+
+
+class TestCompare:
+    """Tests for migration matrices and write estimates"""
+
+    def test_unchanged_rules_need_no_writes(self):
+        inputs = ScoringInputs()
+        inputs.add_account({"id": "0xa", "total_score": 10})
+        inputs.add_mint({"account_id": "0xa", "quantity": 1, "minted_at": NOW})
+
+        result = compare(inputs, compile_rules(), compile_rules(), NOW)
+
+        assert result["writes"] == 0
+        assert result["tier_changes"] == 0
+        assert result["migrations"] == {"Novice": {"Novice": 1}}
+
+    def test_drift_since_last_write_is_not_a_rule_change(self):
+        inputs = ScoringInputs()
+        # Stored long ago; tenure has grown since
+        inputs.add_account({"id": "0xa", "first_tx_timestamp": NOW - 300 * DAY, "total_score": 100})
+
+        result = compare(inputs, compile_rules(), compile_rules(), NOW)
+
+        assert result["writes"] == 0
+        assert result["tier_changes"] == 0
+        assert result["mean_score_delta"] == 0
+
+    def test_small_decay_drops_wait_for_threshold(self):
+        inputs = ScoringInputs()
+        inputs.add_account({"id": "0xa", "total_score": 600})
+        inputs.add_mint({"account_id": "0xa", "quantity": 60, "minted_at": NOW - 40 * DAY})
+
+        decay = compile_rules({"decay": {"rate": 0.1}})
+
+        assert compare(inputs, decay, compile_rules(), NOW, write_threshold=100)["writes"] == 0
+        assert compare(inputs, decay, compile_rules(), NOW, write_threshold=50)["writes"] == 1
+
+    def test_counts_tier_migrations_and_writes(self):
+        inputs = ScoringInputs()
+        inputs.add_account({"id": "0xa", "total_score": 100})
+        inputs.add_mint({"account_id": "0xa", "quantity": 10, "minted_at": NOW})
+
+        result = compare(inputs, compile_rules({"mints": {"points": 50}}), compile_rules(), NOW)
+
+        assert result["writes"] == 1
+        assert result["tier_changes"] == 1
+        assert result["migrations"] == {"Bronze": {"Silver": 1}}
+        assert result["mean_score_delta"] == 400
+
+
+class TestSimulate:
+    """Tests for side-by-side evaluation"""
+
+    def test_parallel_matches_serial(self):
+        inputs = _inputs(_index())
+        candidates = {
+            "current": {},
+            "double_bonus": {"early_mints": {"bonus": 200}},
+            "lower_tiers": {"tiers": {"BASED": 500, "Gold": 300, "Silver": 200, "Bronze": 50, "Novice": 0}},
+        }
+
+        serial = simulate(inputs, candidates, now=NOW, workers=1)
+        parallel = simulate(inputs, candidates, now=NOW, workers=2)
+
+        assert parallel == serial
+        assert "== double_bonus ==" in format_report(serial)
+
+    def test_load_inputs_from_database(self):
+        accounts, linked, mints = _dataset()
+        db = Mock()
+        db.iter_scoring_accounts.return_value = iter(accounts)
+        db.iter_scoring_linked_wallets.return_value = iter(linked)
+        db.iter_scoring_mints.return_value = iter(mints)
+
+        inputs = load_inputs(db, collection_index=_index())
+
+        assert len(inputs) == 3
+        assert inputs.mint_count == 4
+        assert list(inputs.linked_owner) == [0]
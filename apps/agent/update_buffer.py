@@ -0,0 +1,90 @@
+"""
+Coalescing buffer between score calculation and chain writes
+Holds the latest pending score per address across cycles, so an account
+whose score changes several cycles in a row is written once, with its
+final value
+"""
+
+import time
+import logging
+from typing import List, Dict, Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class UpdateBuffer:
+    """
+    Pending writes keyed by address. A newer score replaces the buffered one;
+    a score back at its on-chain value cancels the write. Everything is
+    flushed together once the buffer holds max_size accounts, its oldest
+    entry is max_age_seconds old, or a buffered score changes tier.
+    """
+
+    def __init__(
+        self,
+        tier_of: Callable[[int], str],
+        max_size: int = 200,
+        max_age_seconds: float = 3600
+    ):
+        self.tier_of = tier_of
+        self.max_size = max_size
+        self.max_age_seconds = max_age_seconds
+        self.pending: Dict[str, Dict[str, Any]] = {}
+        self.stats = {"buffered": 0, "absorbed": 0, "cancelled": 0, "flushed": 0}
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+    def __contains__(self, address: str) -> bool:
+        return address in self.pending
+
+    def add(self, address: str, score: int, chain_score: int, now: Optional[float] = None):
+        """Record an account's latest score next to the score currently on chain"""
+        now = time.time() if now is None else now
+        entry = self.pending.get(address)
+
+        if entry is None:
+            if score != chain_score:
+                self.pending[address] = {
+                    "address": address,
+                    "score": score,
+                    "chain_score": chain_score,
+                    "buffered_at": now,
+                }
+                self.stats["buffered"] += 1
+            return
+
+        if score == entry["chain_score"]:
+            del self.pending[address]
+            self.stats["cancelled"] += 1
+        elif score != entry["score"]:
+            entry["score"] = score
+            self.stats["absorbed"] += 1
+
+    def flush_reason(self, now: Optional[float] = None) -> Optional[str]:
+        """Why the buffer should be flushed now, or None"""
+        if not self.pending:
+            return None
+        now = time.time() if now is None else now
+        if len(self.pending) >= self.max_size:
+            return "size"
+        if now - min(e["buffered_at"] for e in self.pending.values()) >= self.max_age_seconds:
+            return "age"
+        if any(self.tier_of(e["score"]) != self.tier_of(e["chain_score"]) for e in self.pending.values()):
+            return "tier"
+        return None
+
+    def flush(self, now: Optional[float] = None, force: bool = False) -> List[Dict[str, Any]]:
+        """Take every pending update if a flush is due (or forced)"""
+        reason = "forced" if force and self.pending else self.flush_reason(now)
+        if reason is None:
+            return []
+
+        updates = [{"address": e["address"], "score": e["score"]} for e in self.pending.values()]
+        self.pending = {}
+        self.stats["flushed"] += len(updates)
+        logger.info(
+            f"Flushing {len(updates)} buffered updates ({reason}); "
+            f"{self.stats['absorbed']} intermediate scores absorbed so far"
+        )
+        return updates
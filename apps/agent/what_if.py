@@ -0,0 +1,208 @@
+"""
+What-if re-scoring simulator
+Loads the scoring inputs of every account once into compact columns (from
+Postgres, or memory-mapped from a snapshot written by snapshot.py) and
+evaluates candidate rule sets side by side across processes, reporting tier
+migrations and how many on-chain writes each rule set would trigger.
+Read-only: never touches the chain or writes to the database.
+
+Usage: python what_if.py candidate.json [other.json ...] [--snapshot DIR] [--workers N] [--json]
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional
+
+from scoring_rules import CompiledRules, compile_rules, load_rules
+from scoring_inputs import ScoringInputs, load_inputs
+from score_calculator import ScoreCalculator
+from snapshot import open_snapshot
+
+logger = logging.getLogger(__name__)
+
+
+def compare(
+    inputs: ScoringInputs,
+    rules: CompiledRules,
+    baseline: CompiledRules,
+    now: int,
+    write_threshold: int = 0,
+    baseline_scores=None
+) -> Dict[str, Any]:
+    """
+    Rescore under `rules` and compare with the same accounts rescored under
+    the baseline (current) rules as of the same time, so tenure and decay
+    since the stored scores were written do not count as the rule change.
+    Writes are the accounts the agent would rewrite (see needs_write)
+    """
+    calculator = ScoreCalculator(rules=rules)
+    scores = calculator.score_inputs(inputs, now)
+    if baseline_scores is None:
+        baseline_scores = ScoreCalculator(rules=baseline).score_inputs(inputs, now)
+
+    migrations: Dict[str, Dict[str, int]] = {}
+    tiers: Dict[str, int] = {}
+    writes = 0
+    tier_changes = 0
+    score_delta = 0
+
+    for current, new in zip(baseline_scores, scores):
+        before = baseline.tier(current)
+        after = rules.tier(new)
+        row = migrations.setdefault(before, {})
+        row[after] = row.get(after, 0) + 1
+        tiers[after] = tiers.get(after, 0) + 1
+        if calculator.needs_write({"total_score": new}, current, write_threshold):
+            writes += 1
+        score_delta += new - current
+        if before != after:
+            tier_changes += 1
+
+    return {
+        "accounts": len(inputs),
+        "writes": writes,
+        "tier_changes": tier_changes,
+        "mean_score_delta": score_delta / len(inputs) if len(inputs) else 0.0,
+        "tiers": tiers,
+        "migrations": migrations,
+    }
+
+
+# Inputs handed to pool workers once, at fork, instead of per task
+_worker_inputs: Optional[ScoringInputs] = None
+
+
+def _init_worker(inputs: ScoringInputs):
+    global _worker_inputs
+    _worker_inputs = inputs
+
+
+def _compare_in_worker(
+    rules: Dict[str, Any],
+    baseline: Dict[str, Any],
+    now: int,
+    write_threshold: int
+) -> Dict[str, Any]:
+    return compare(_worker_inputs, compile_rules(rules), compile_rules(baseline), now, write_threshold)
+
+
+def simulate(
+    inputs: ScoringInputs,
+    candidates: Dict[str, Dict[str, Any]],
+    baseline: Optional[Dict[str, Any]] = None,
+    now: Optional[int] = None,
+    workers: Optional[int] = None,
+    write_threshold: int = 0
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Evaluate each named candidate rule config against the same inputs
+    Candidates run in parallel processes when workers > 1
+    write_threshold is the agent's DECAY_WRITE_THRESHOLD
+    Returns {name: comparison} (see compare)
+    """
+    if now is None:
+        now = int(time.time())
+    baseline = baseline or {}
+    if workers is None:
+        workers = min(len(candidates), os.cpu_count() or 1)
+
+    if workers <= 1 or len(candidates) <= 1:
+        baseline_rules = compile_rules(baseline)
+        baseline_scores = ScoreCalculator(rules=baseline_rules).score_inputs(inputs, now)
+        return {
+            name: compare(inputs, compile_rules(rules), baseline_rules, now, write_threshold, baseline_scores)
+            for name, rules in candidates.items()
+        }
+
+    # Forked workers share the loaded columns copy-on-write
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(inputs,)
+    ) as pool:
+        futures = {
+            name: pool.submit(_compare_in_worker, rules, baseline, now, write_threshold)
+            for name, rules in candidates.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
+
+
+def format_report(results: Dict[str, Dict[str, Any]]) -> str:
+    """Plain-text summary with one migration matrix per candidate"""
+    lines = []
+    for name, result in results.items():
+        lines.append(f"== {name} ==")
+        lines.append(
+            f"accounts={result['accounts']} writes={result['writes']} "
+            f"tier_changes={result['tier_changes']} "
+            f"mean_delta={result['mean_score_delta']:+.1f}"
+        )
+
+        migrations = result["migrations"]
+        columns = sorted({t for row in migrations.values() for t in row})
+        width = max([len("from \\ to")] + [len(t) for t in columns] + [len(t) for t in migrations]) + 2
+        lines.append("from \\ to".ljust(width) + "".join(c.rjust(width) for c in columns))
+        for before in sorted(migrations):
+            row = migrations[before]
+            lines.append(before.ljust(width) + "".join(str(row.get(c, 0)).rjust(width) for c in columns))
+        lines.append("")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point"""
+    from dotenv import load_dotenv
+    from database import Database
+    from collection_index import CollectionIndex
+
+    parser = argparse.ArgumentParser(description="Compare candidate scoring rules against all accounts")
+    parser.add_argument("candidates", nargs="+", help="JSON rule configs to evaluate")
+    parser.add_argument("--baseline", help="JSON rule config currently in use (defaults to SCORING_RULES_PATH)")
+    parser.add_argument("--snapshot", help="Read inputs from a snapshot directory instead of the database")
+    parser.add_argument("--workers", type=int, default=None, help="Parallel processes (default: one per candidate)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), format="%(asctime)s [%(levelname)s] %(message)s")
+
+    baseline_path = args.baseline or os.getenv("SCORING_RULES_PATH")
+    baseline = load_rules(baseline_path) if baseline_path else None
+    candidates = {os.path.basename(path): load_rules(path) for path in args.candidates}
+
+    if args.snapshot:
+        inputs = ScoringInputs.from_snapshot(open_snapshot(args.snapshot))
+    else:
+        db = Database(
+            os.getenv("DATABASE_URL"),
+            replica_url=os.getenv("DATABASE_REPLICA_URL") or None
+        )
+        collections = CollectionIndex()
+        collections.refresh(db)
+        inputs = load_inputs(db, collection_index=collections)
+
+    started = time.monotonic()
+    results = simulate(
+        inputs, candidates, baseline=baseline, workers=args.workers,
+        write_threshold=int(os.getenv("DECAY_WRITE_THRESHOLD", "50"))
+    )
+    logger.info(f"Evaluated {len(candidates)} rule sets in {time.monotonic() - started:.1f}s")
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print(format_report(results))
+
+
+if __name__ == "__main__":
+    main()
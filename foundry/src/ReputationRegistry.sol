@@ -4,6 +4,7 @@ pragma solidity ^0.8.23;
 import {ECDSA} from "solady/utils/ECDSA.sol";
 import {EIP712} from "solady/utils/EIP712.sol";
 import {Ownable} from "solady/auth/Ownable.sol";
+import {MerkleProofLib} from "solady/utils/MerkleProofLib.sol";
 
 contract ReputationRegistry is Ownable, EIP712 {
     using ECDSA for bytes32;
@@ -14,11 +15,23 @@ contract ReputationRegistry is Ownable, EIP712 {
     error InvalidSignature();
     error DeadlineExpired();
     error ArrayLengthMismatch();
+    error MalformedPackedScores();
+    error StaleScoreEpoch();
+
+    event ScoreRootCommitted(uint64 indexed epoch, bytes32 root, uint256 leafCount);
+    event UpdaterSet(address indexed updater, bool allowed);
 
     mapping(address => address) public walletLinks;
     mapping(address => address[]) private _linkedWallets;
     mapping(address => uint256) public reputationScores;
     mapping(address => uint256) public nonces;
+    // Wallets besides the owner allowed to write scores, so updates can be
+    // sent from several nonce sequences in parallel
+    mapping(address => bool) public updaters;
+
+    // Commitment mode: one Merkle root per epoch covers every account's score
+    bytes32 public scoreRoot;
+    uint64 public scoreEpoch;
 
     bytes32 constant LINK_TYPEHASH = keccak256(
         "LinkWallet(address main,address secondary,uint256 nonce,uint256 deadline)"
@@ -28,6 +41,11 @@ contract ReputationRegistry is Ownable, EIP712 {
         _initializeOwner(msg.sender);
     }
 
+    modifier onlyUpdater() {
+        if (!updaters[msg.sender] && msg.sender != owner()) revert Unauthorized();
+        _;
+    }
+
     function _domainNameAndVersion() internal pure override returns (string memory, string memory) {
         return ("The Base Standard", "1");
     }
@@ -71,17 +89,55 @@ contract ReputationRegistry is Ownable, EIP712 {
         return _linkedWallets[main];
     }
 
-    function updateScore(address user, uint256 score) public onlyOwner {
+    function setUpdater(address updater, bool allowed) external onlyOwner {
+        updaters[updater] = allowed;
+        emit UpdaterSet(updater, allowed);
+    }
+
+    function updateScore(address user, uint256 score) public onlyUpdater {
         reputationScores[user] = score;
     }
 
-    function batchUpdateScores(address[] calldata users, uint256[] calldata scores) external onlyOwner {
+    function batchUpdateScores(address[] calldata users, uint256[] calldata scores) external onlyUpdater {
         if (users.length != scores.length) revert ArrayLengthMismatch();
         for (uint256 i = 0; i < users.length; i++) {
             updateScore(users[i], scores[i]);
         }
     }
 
+    // Each 24-byte record is address (20 bytes) || uint32 score (4 bytes), big-endian.
+    // Costs 24 bytes of calldata per user instead of 64 for batchUpdateScores.
+    function batchUpdateScoresPacked(bytes calldata packed) external onlyUpdater {
+        if (packed.length % 24 != 0) revert MalformedPackedScores();
+        for (uint256 offset = 0; offset < packed.length; offset += 24) {
+            uint256 word;
+            assembly {
+                word := calldataload(add(packed.offset, offset))
+            }
+            reputationScores[address(uint160(word >> 96))] = uint32(word >> 64);
+        }
+    }
+
+    // Leaves are keccak256(abi.encodePacked(user, score, epoch)), where epoch is the
+    // commitment epoch in which that score was last set; pairs are hashed sorted.
+    function commitScoreRoot(uint64 epoch, bytes32 root, uint256 leafCount) external onlyUpdater {
+        if (epoch <= scoreEpoch) revert StaleScoreEpoch();
+        scoreRoot = root;
+        scoreEpoch = epoch;
+        emit ScoreRootCommitted(epoch, root, leafCount);
+    }
+
+    function verifyScore(
+        address user,
+        uint256 score,
+        uint64 epoch,
+        bytes32[] calldata proof
+    ) external view returns (bool) {
+        if (epoch > scoreEpoch) return false;
+        bytes32 leaf = keccak256(abi.encodePacked(user, score, epoch));
+        return MerkleProofLib.verifyCalldata(proof, scoreRoot, leaf);
+    }
+
     function reputationTiers(address user) external view returns (string memory) {
         uint256 score = reputationScores[user];
         if (score >= 1000) return "BASED";
@@ -292,6 +292,41 @@ contract ReputationRegistryTest is Test {
         registry.batchUpdateScores(users, scores);
     }
 
+    function test_BatchUpdateScoresPacked() public {
+        address third = vm.addr(0xCA7);
+        bytes memory packed = abi.encodePacked(
+            mainWallet, uint32(100),
+            secWallet, uint32(200),
+            third, type(uint32).max
+        );
+
+        registry.batchUpdateScoresPacked(packed);
+
+        assertEq(registry.reputationScores(mainWallet), 100);
+        assertEq(registry.reputationScores(secWallet), 200);
+        assertEq(registry.reputationScores(third), type(uint32).max);
+    }
+
+    function test_BatchUpdateScoresPacked_Empty() public {
+        registry.batchUpdateScoresPacked("");
+        assertEq(registry.reputationScores(mainWallet), 0);
+    }
+
+    function test_RevertWhen_BatchUpdateScoresPacked_Malformed() public {
+        bytes memory packed = abi.encodePacked(mainWallet, uint16(100));
+
+        vm.expectRevert(ReputationRegistry.MalformedPackedScores.selector);
+        registry.batchUpdateScoresPacked(packed);
+    }
+
+    function test_RevertWhen_BatchUpdateScoresPacked_NotOwner() public {
+        bytes memory packed = abi.encodePacked(mainWallet, uint32(100));
+
+        vm.prank(mainWallet);
+        vm.expectRevert(Ownable.Unauthorized.selector);
+        registry.batchUpdateScoresPacked(packed);
+    }
+
     // ========== Tier Calculation Tests ==========
 
     function test_TierCalculation_Novice() public {
@@ -450,4 +485,99 @@ contract ReputationRegistryTest is Test {
 
         assertTrue(hash1 != hash2);
     }
+
+    function _hashPair(bytes32 a, bytes32 b) internal pure returns (bytes32) {
+        return a < b ? keccak256(abi.encodePacked(a, b)) : keccak256(abi.encodePacked(b, a));
+    }
+
+    function _scoreLeaf(address user, uint256 score, uint64 epoch) internal pure returns (bytes32) {
+        return keccak256(abi.encodePacked(user, score, epoch));
+    }
+
+    // Three leaves: (l0, l1) hashed together, l2 carried up unchanged
+    function _commitThreeLeaves() internal returns (bytes32 l0, bytes32 l1, bytes32 l2) {
+        l0 = _scoreLeaf(mainWallet, 900, 1);
+        l1 = _scoreLeaf(secWallet, 120, 2);
+        l2 = _scoreLeaf(address(0xCAFE), 5, 2);
+        registry.commitScoreRoot(2, _hashPair(_hashPair(l0, l1), l2), 3);
+    }
+
+    function test_CommitScoreRoot() public {
+        bytes32 root = keccak256("root");
+        registry.commitScoreRoot(1, root, 10);
+
+        assertEq(registry.scoreRoot(), root);
+        assertEq(registry.scoreEpoch(), 1);
+    }
+
+    function test_CommitScoreRoot_RevertIfStaleEpoch() public {
+        registry.commitScoreRoot(2, keccak256("root"), 10);
+
+        vm.expectRevert(ReputationRegistry.StaleScoreEpoch.selector);
+        registry.commitScoreRoot(2, keccak256("other"), 10);
+    }
+
+    function test_CommitScoreRoot_RevertIfNotOwner() public {
+        vm.prank(mainWallet);
+        vm.expectRevert();
+        registry.commitScoreRoot(1, keccak256("root"), 10);
+    }
+
+    function test_VerifyScore() public {
+        (, bytes32 l1, bytes32 l2) = _commitThreeLeaves();
+
+        bytes32[] memory proof = new bytes32[](2);
+        proof[0] = l1;
+        proof[1] = l2;
+        assertTrue(registry.verifyScore(mainWallet, 900, 1, proof));
+
+        bytes32[] memory carried = new bytes32[](1);
+        carried[0] = _hashPair(_scoreLeaf(mainWallet, 900, 1), l1);
+        assertTrue(registry.verifyScore(address(0xCAFE), 5, 2, carried));
+    }
+
+    function test_VerifyScore_RejectsWrongScore() public {
+        (, bytes32 l1, bytes32 l2) = _commitThreeLeaves();
+
+        bytes32[] memory proof = new bytes32[](2);
+        proof[0] = l1;
+        proof[1] = l2;
+        assertFalse(registry.verifyScore(mainWallet, 901, 1, proof));
+    }
+
+    function test_VerifyScore_RejectsFutureEpoch() public {
+        bytes32 leaf = _scoreLeaf(mainWallet, 900, 3);
+        registry.commitScoreRoot(2, leaf, 1);
+
+        assertFalse(registry.verifyScore(mainWallet, 900, 3, new bytes32[](0)));
+    }
+
+    function test_SetUpdater_AllowsScoreWrites() public {
+        registry.setUpdater(secWallet, true);
+
+        vm.prank(secWallet);
+        registry.updateScore(mainWallet, 300);
+
+        bytes memory packed = abi.encodePacked(mainWallet, uint32(400));
+        vm.prank(secWallet);
+        registry.batchUpdateScoresPacked(packed);
+
+        assertTrue(registry.updaters(secWallet));
+        assertEq(registry.reputationScores(mainWallet), 400);
+    }
+
+    function test_SetUpdater_Revoke() public {
+        registry.setUpdater(secWallet, true);
+        registry.setUpdater(secWallet, false);
+
+        vm.prank(secWallet);
+        vm.expectRevert(Ownable.Unauthorized.selector);
+        registry.updateScore(mainWallet, 300);
+    }
+
+    function test_RevertWhen_SetUpdater_NotOwner() public {
+        vm.prank(mainWallet);
+        vm.expectRevert(Ownable.Unauthorized.selector);
+        registry.setUpdater(mainWallet, true);
+    }
 }